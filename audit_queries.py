@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 查询计划审计脚本
+
+对Database的每个查询方法运行 EXPLAIN QUERY PLAN，标出全表扫描和临时B树排序。
+审计会真实执行写入方法，默认先把数据库复制到内存再审计，不修改原文件。
+
+使用方法:
+    python3 audit_queries.py                          # 审计默认数据库
+    python3 audit_queries.py --db data/archive.db -v  # 指定数据库并输出SQL
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.storage.query_audit import audit_database, copy_to_memory, format_audit_report
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='审计数据库查询计划')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help='输出每条被审计的SQL')
+    args = parser.parse_args()
+
+    if not Path(args.db).exists():
+        print(f"✗ 数据库不存在: {args.db}")
+        sys.exit(1)
+
+    db = copy_to_memory(args.db)
+    results = audit_database(db)
+    db.close()
+
+    print(format_audit_report(results, verbose=args.verbose))
+    sys.exit(1 if any(r['warnings'] for r in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+基准测试公共fixture
+
+语料规模通过环境变量 BENCH_SCALES 控制（逗号分隔），默认只跑1k：
+    BENCH_SCALES=1000,10000,100000 pytest benchmarks
+"""
+
+import os
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub_llm_server import StubLLMServer
+from src.storage.database import Database
+
+
+def _scales():
+    raw = os.getenv('BENCH_SCALES', '1000')
+    return [int(s) for s in raw.split(',') if s.strip()]
+
+
+SCALES = _scales()
+
+_corpus_cache = {}
+
+
+def get_corpus(size: int):
+    """按规模缓存语料，避免每个benchmark重复生成"""
+    if size not in _corpus_cache:
+        _corpus_cache[size] = generate_corpus(size)
+    return _corpus_cache[size]
+
+
+@pytest.fixture(params=SCALES, ids=lambda n: f'{n // 1000}k' if n >= 1000 else str(n))
+def scale(request):
+    """语料规模"""
+    return request.param
+
+
+@pytest.fixture
+def corpus(scale):
+    """指定规模的合成语料"""
+    return get_corpus(scale)
+
+
+@pytest.fixture
+def populated_db(tmp_path, corpus):
+    """写入语料的文件数据库"""
+    db = Database(str(tmp_path / 'bench.db'))
+    db.insert_articles(corpus)
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope='session')
+def stub_llm():
+    """会话级LLM桩服务"""
+    with StubLLMServer() as server:
+        yield server
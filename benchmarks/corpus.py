@@ -0,0 +1,126 @@
+"""
+合成语料生成器
+
+生成可复现的中文IDC行业文章语料，用于性能基准测试。
+同一个seed总是生成完全相同的语料。
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+
+COMPANIES = [
+    '万国数据', '世纪互联', '秦淮数据', '润泽科技', '光环新网', '数据港',
+    '奥飞数据', '宝信软件', '中国电信', '中国移动', '中国联通', '阿里云',
+    '腾讯云', '华为云', '百度智能云', '浪潮信息', '中科曙光', '英伟达',
+]
+
+REGIONS = [
+    '北京', '上海', '广州', '深圳', '杭州', '成都', '重庆', '贵州',
+    '内蒙古', '宁夏', '甘肃', '河北', '张家口', '乌兰察布', '庆阳', '芜湖',
+]
+
+SOURCES = [
+    ('中国IDC圈', 1), ('数据中心世界', 1), ('通信世界网', 1), ('DTDATA', 1),
+    ('36氪', 2), ('InfoQ', 2), ('量子位', 2), ('IT之家', 2), ('新浪科技', 2),
+]
+
+# (分类, 标题模板)
+TITLE_TEMPLATES = [
+    ('投资', '{company}宣布投资{amount}亿元在{region}建设数据中心'),
+    ('投资', '{company}完成{amount}亿元融资，加码{region}算力中心'),
+    ('投资', '{company}拟以{amount}亿元收购{region}IDC资产'),
+    ('技术', '{company}发布新一代液冷服务器，PUE降至{pue}'),
+    ('技术', '{company}推出GPU集群方案，算力提升{pct}%'),
+    ('技术', '{company}智算中心实现{racks}个机柜上线'),
+    ('政策', '{region}印发算力基础设施高质量发展行动计划'),
+    ('政策', '工信部等六部门发布绿色数据中心指导意见，要求PUE低于{pue}'),
+    ('政策', '国家数据局：推进东数西算工程{region}枢纽建设'),
+    ('市场', '{region}数据中心市场规模增长{pct}%，竞争格局生变'),
+    ('市场', '报告：{company}云服务市场份额排名第{rank}'),
+    ('其他', '{company}举办年度开发者大会'),
+    ('其他', '{region}白酒销售旺季来临'),
+]
+
+CONTENT_SENTENCES = [
+    '项目总投资{amount}亿元，规划建设{racks}个标准机柜。',
+    '该数据中心设计PUE为{pue}，采用液冷与自然冷却相结合的方案。',
+    '{company}表示，将持续加大在AI算力和云计算领域的投入。',
+    '项目建成后将成为{region}重要的算力枢纽节点。',
+    '据悉，新园区总IT负载约{mw}MW，预计明年投产。',
+    '业内人士认为，智算中心需求增长将持续推动IDC行业发展。',
+    '本次合作涵盖服务器采购、边缘计算节点部署和CDN网络优化。',
+    '点击查看更多精彩内容，扫码关注我们的公众号。',
+    '责任编辑：小王',
+]
+
+
+def _fill(template: str, rng: random.Random) -> str:
+    return template.format(
+        company=rng.choice(COMPANIES),
+        region=rng.choice(REGIONS),
+        amount=rng.choice([0.5, 1.2, 3, 5, 8.8, 12, 26.2, 50, 120]),
+        racks=rng.choice([800, 2000, 5000, 8000, 12000, 30000]),
+        pue=rng.choice([1.08, 1.15, 1.2, 1.25, 1.3]),
+        pct=rng.randint(5, 80),
+        rank=rng.randint(1, 5),
+        mw=rng.choice([10, 24, 50, 100, 200]),
+    )
+
+
+def generate_article(index: int, rng: random.Random, today: Optional[date] = None,
+                     days_span: int = 30) -> Dict:
+    """
+    生成单篇合成文章
+
+    Args:
+        index: 文章序号（用于生成唯一URL）
+        rng: 随机数生成器
+        today: 基准日期（默认今天）
+        days_span: 发布日期分布的天数范围
+
+    Returns:
+        字段与Database.insert_article参数一致的文章字典
+    """
+    today = today or date.today()
+    category, template = rng.choice(TITLE_TEMPLATES)
+    source, tier = rng.choice(SOURCES)
+
+    title = _fill(template, rng)
+    sentences = [_fill(s, rng) for s in rng.sample(CONTENT_SENTENCES, k=rng.randint(3, 6))]
+    content = title + '。' + ''.join(sentences)
+    score = rng.randint(10, 95)
+
+    return {
+        'title': title,
+        'url': f'https://bench.example.com/{source}/{index}.html',
+        'source': source,
+        'source_tier': tier,
+        'publish_date': today - timedelta(days=rng.randrange(days_span)),
+        'content': content,
+        'summary': content[:120],
+        'category': category,
+        'priority': '高' if score >= 70 else ('中' if score >= 40 else '低'),
+        'score': score,
+        'llm_relevance_score': rng.randint(0, 20),
+        'llm_importance_score': rng.randint(0, 20),
+    }
+
+
+def generate_corpus(size: int, seed: int = 42, today: Optional[date] = None,
+                    days_span: int = 30) -> List[Dict]:
+    """
+    生成合成文章语料
+
+    Args:
+        size: 文章数量
+        seed: 随机种子
+        today: 基准日期（默认今天）
+        days_span: 发布日期分布的天数范围
+
+    Returns:
+        文章字典列表
+    """
+    rng = random.Random(seed)
+    return [generate_article(i, rng, today, days_span) for i in range(size)]
@@ -0,0 +1,216 @@
+"""
+LLM客户端并发压测
+
+以指定并发驱动 LLMArticleAnalyzer / WeeklyReportSummarizer，统计吞吐量、延迟分位数
+和错误分布，用于确定并发数和超时设置。默认启动内置桩服务，也可指向任意OpenAI兼容端点。
+
+示例：
+    # 内置桩服务：300ms±100ms延迟，5%限流，并发扫描1/4/8/16
+    python -m benchmarks.llm_load_test --target analyzer --requests 200 \\
+        --concurrency 1,4,8,16 --latency-ms 300 --jitter-ms 100 --rate-limit-rate 0.05
+
+    # 指向已有端点
+    python -m benchmarks.llm_load_test --api-base http://127.0.0.1:8808 --concurrency 8
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.stub_llm_server import StubLLMServer
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.reporting.report_summarizer import WeeklyReportSummarizer
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    计算分位数（最近秩法）
+
+    Args:
+        sorted_values: 已升序排序的数值
+        pct: 分位（0-100）
+
+    Returns:
+        分位数值，空列表返回0
+    """
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+class _CallRecorder:
+    """包装客户端的 _call_llm_api，按线程记录最近一次调用的异常类型"""
+
+    def __init__(self, client):
+        self._local = threading.local()
+        original = client._call_llm_api
+
+        def wrapped(*args, **kwargs):
+            self._local.outcome = 'ok'
+            try:
+                return original(*args, **kwargs)
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                self._local.outcome = 'rate_limited' if status == 429 else f'http_{status}'
+                raise
+            except requests.exceptions.Timeout:
+                self._local.outcome = 'timeout'
+                raise
+            except Exception as e:
+                self._local.outcome = type(e).__name__
+                raise
+
+        client._call_llm_api = wrapped
+
+    def take(self) -> str:
+        outcome = getattr(self._local, 'outcome', 'ok')
+        self._local.outcome = 'ok'
+        return outcome
+
+
+def _analyzer_workload(api_base: str, model: str, timeout: float, corpus: List[Dict]):
+    analyzer = LLMArticleAnalyzer('load-test', api_base, model)
+    analyzer.timeout = timeout
+    recorder = _CallRecorder(analyzer)
+
+    def call(i: int) -> str:
+        article = corpus[i % len(corpus)]
+        analyzer.analyze_article(article['title'], article['content'])
+        return recorder.take()
+
+    return call
+
+
+def _summarizer_workload(api_base: str, model: str, timeout: float, corpus: List[Dict]):
+    summarizer = WeeklyReportSummarizer(api_key='load-test', api_base=api_base, model=model)
+    summarizer.timeout = timeout
+    recorder = _CallRecorder(summarizer)
+
+    by_category: Dict[str, List[Dict]] = {}
+    for article in corpus:
+        by_category.setdefault(article['category'], []).append(article)
+
+    def call(i: int) -> str:
+        summarizer.generate_insights(corpus, by_category)
+        return recorder.take()
+
+    return call
+
+
+WORKLOADS = {
+    'analyzer': _analyzer_workload,
+    'summarizer': _summarizer_workload,
+}
+
+
+def run_load_test(call: Callable[[int], str], total_requests: int, concurrency: int) -> Dict:
+    """
+    以固定并发执行请求并统计结果
+
+    Args:
+        call: 执行第i个请求的函数，返回结果分类（'ok'或错误类型）
+        total_requests: 请求总数
+        concurrency: 并发数
+
+    Returns:
+        统计结果字典
+    """
+    latencies = []
+    outcomes: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def one(i: int):
+        start = time.perf_counter()
+        outcome = call(i)
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total_requests)))
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        'concurrency': concurrency,
+        'requests': total_requests,
+        'ok': outcomes.get('ok', 0),
+        'outcomes': outcomes,
+        'wall_seconds': wall,
+        'throughput': total_requests / wall if wall > 0 else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p90_ms': percentile(latencies, 90) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'max_ms': (latencies[-1] if latencies else 0) * 1000,
+    }
+
+
+def format_result(result: Dict) -> str:
+    """格式化单行结果"""
+    errors = ', '.join(f'{k}={v}' for k, v in sorted(result['outcomes'].items()) if k != 'ok')
+    return (
+        f"{result['concurrency']:>5} {result['requests']:>6} {result['ok']:>6} "
+        f"{result['throughput']:>9.1f} {result['p50_ms']:>9.1f} {result['p90_ms']:>9.1f} "
+        f"{result['p99_ms']:>9.1f} {result['max_ms']:>9.1f}  {errors or '-'}"
+    )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='LLM客户端并发压测')
+    parser.add_argument('--target', choices=sorted(WORKLOADS), default='analyzer')
+    parser.add_argument('--requests', type=int, default=100, help='每个并发级别的请求数')
+    parser.add_argument('--concurrency', type=str, default='1,4,8', help='并发级别（逗号分隔）')
+    parser.add_argument('--timeout', type=float, default=30, help='客户端超时（秒）')
+    parser.add_argument('--model', type=str, default='stub')
+    parser.add_argument('--api-base', type=str, default=None, help='目标端点（不指定则启动内置桩服务）')
+    parser.add_argument('--latency-ms', type=float, default=200)
+    parser.add_argument('--jitter-ms', type=float, default=50)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    server = None
+    api_base = args.api_base
+    if not api_base:
+        server = StubLLMServer(
+            latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+        ).start()
+        api_base = server.url
+        print(f'内置桩服务: {api_base} (延迟 {args.latency_ms}±{args.jitter_ms}ms, '
+              f'错误率 {args.error_rate}, 限流率 {args.rate_limit_rate})')
+
+    corpus = generate_corpus(max(args.requests, 50))
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+
+    print(f'目标: {args.target}  端点: {api_base}  超时: {args.timeout}s')
+    print(f"{'并发':>5} {'请求':>6} {'成功':>6} {'吞吐/s':>9} {'p50ms':>9} {'p90ms':>9} "
+          f"{'p99ms':>9} {'maxms':>9}  错误")
+
+    results = []
+    try:
+        for level in levels:
+            call = WORKLOADS[args.target](api_base, args.model, args.timeout, corpus)
+            result = run_load_test(call, args.requests, level)
+            results.append(result)
+            print(format_result(result))
+    finally:
+        if server:
+            print(f'服务端统计: {server.config.stats()}')
+            server.stop()
+
+    return results
+
+
+if __name__ == '__main__':
+    main()
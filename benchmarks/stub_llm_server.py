@@ -0,0 +1,319 @@
+"""
+本地LLM桩服务
+
+实现OpenAI兼容的 /v1/chat/completions 接口，按prompt内容返回确定性的结果：
+- 文章分析prompt（含relevance_score）：返回LLMArticleAnalyzer所需的JSON
+- 周报摘要prompt（含executive_summary）：返回WeeklyReportSummarizer所需的JSON
+- 其他prompt：返回一段摘要文本
+
+支持注入延迟、5xx错误和429限流，用于基准测试和并发/超时容量评估，不消耗真实API配额。
+请求带 "stream": true 时按SSE分块返回（chunk_delay_ms模拟逐token生成）。
+
+命令行启动：
+    python -m benchmarks.stub_llm_server --port 8808 --latency-ms 300 --jitter-ms 100 \\
+        --error-rate 0.02 --rate-limit-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from src.processing.prompt_builder import estimate_tokens
+
+
+def _digest(text: str) -> int:
+    return int(hashlib.md5(text.encode('utf-8')).hexdigest(), 16)
+
+
+def build_completion_text(prompt: str) -> str:
+    """
+    根据prompt生成确定性的回复内容
+
+    Args:
+        prompt: 最后一条用户消息
+
+    Returns:
+        回复文本
+    """
+    h = _digest(prompt)
+
+    if 'executive_summary' in prompt:
+        return json.dumps({
+            'executive_summary': '本周IDC行业呈现三大特点：一是政策密集出台，二是算力投资持续升温，三是液冷技术加速落地。',
+            'section_insights': {
+                '政策法规': '算力政策密集出台，地方配套加速落地',
+                '投资动态': '百亿级项目频现，AI算力中心成投资热点',
+                '技术进展': '液冷方案规模化部署，能效持续优化',
+                '市场动态': '区域市场分化，头部厂商份额集中',
+            },
+        }, ensure_ascii=False)
+
+    if 'relevance_score' in prompt:
+        return json.dumps({
+            'relevance_score': h % 21,
+            'importance_score': (h >> 8) % 21,
+            'category_score': (h >> 16) % 11,
+            'category': ['投资', '技术', '政策', '市场', '投资,技术'][(h >> 24) % 5],
+            'reason': '桩服务确定性评分',
+            'summary': '某公司宣布在数据中心与AI算力领域的新进展，涉及投资、机柜部署与能效优化等核心信息，具有一定行业参考价值。',
+        }, ensure_ascii=False)
+
+    return '某公司宣布在数据中心与AI算力领域的新进展，涉及投资规模、机柜部署与PUE能效优化等核心信息，对IDC行业具有一定参考价值。'
+
+
+class StubConfig:
+    """桩服务行为配置"""
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        seed: Optional[int] = None,
+        chunk_delay_ms: float = 0,
+    ):
+        """
+        Args:
+            latency_ms: 每个请求的基础延迟（毫秒）
+            jitter_ms: 延迟随机抖动上限（毫秒，均匀分布）
+            error_rate: 返回500错误的概率（0-1）
+            rate_limit_rate: 返回429限流的概率（0-1）
+            seed: 随机种子（固定后故障注入序列可复现）
+            chunk_delay_ms: 流式输出时每个分块之间的延迟（毫秒）
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.chunk_delay_ms = chunk_delay_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+        # 服务端统计
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.connections = 0
+
+    def record_connection(self):
+        """记录一个新建的TCP连接（用于验证客户端长连接复用）"""
+        with self._lock:
+            self.connections += 1
+
+    def next_outcome(self):
+        """
+        抽取下一个请求的延迟和结果
+
+        Returns:
+            (延迟秒数, 'ok' | 'error' | 'rate_limited')
+        """
+        with self._lock:
+            self.requests += 1
+            delay = (self.latency_ms + self._rng.uniform(0, self.jitter_ms)) / 1000
+            roll = self._rng.random()
+            if roll < self.rate_limit_rate:
+                self.rate_limited += 1
+                return delay, 'rate_limited'
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.errors += 1
+                return delay, 'error'
+            return delay, 'ok'
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'connections': self.connections,
+            }
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """OpenAI兼容接口的请求处理器"""
+
+    # 支持长连接（所有响应都带Content-Length）
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # 头部和正文分开写出，长连接下需关闭Nagle算法，否则每个响应多出约40ms的延迟确认等待
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.config.record_connection()
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前断开（如流式输出提前终止）
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        # 基准测试时不输出访问日志
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+
+        delay, outcome = self.server.config.next_outcome()
+        if delay:
+            time.sleep(delay)
+
+        if outcome == 'rate_limited':
+            self._send_json(429, {
+                'error': {'message': 'Rate limit exceeded', 'type': 'rate_limit_error'}
+            }, extra_headers={'Retry-After': '1'})
+            return
+        if outcome == 'error':
+            self._send_json(500, {
+                'error': {'message': 'Injected server error', 'type': 'server_error'}
+            })
+            return
+
+        messages = payload.get('messages') or [{}]
+        prompt = messages[-1].get('content', '')
+        text = build_completion_text(prompt)
+
+        if payload.get('stream'):
+            self._send_stream(payload.get('model', 'stub'), text)
+            return
+
+        self._send_json(200, {
+            'id': f'stub-{_digest(prompt) % 10**8}',
+            'object': 'chat.completion',
+            'model': payload.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': text},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': estimate_tokens(prompt),
+                'completion_tokens': estimate_tokens(text),
+                'total_tokens': estimate_tokens(prompt) + estimate_tokens(text),
+            },
+        })
+
+    def _send_stream(self, model: str, text: str, chunk_size: int = 8):
+        """以SSE分块返回（HTTP/1.1 chunked编码）；客户端提前断开时停止发送"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        events = [
+            {'choices': [{'index': 0, 'delta': {'content': text[i:i + chunk_size]}}], 'model': model}
+            for i in range(0, len(text), chunk_size)
+        ]
+        try:
+            for event in events:
+                self._write_chunk(f'data: {json.dumps(event, ensure_ascii=False)}\n\n')
+                if self.server.config.chunk_delay_ms:
+                    time.sleep(self.server.config.chunk_delay_ms / 1000)
+            self._write_chunk('data: [DONE]\n\n')
+            self.wfile.write(b'0\r\n\r\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, data: str):
+        encoded = data.encode('utf-8')
+        self.wfile.write(f'{len(encoded):X}\r\n'.encode('ascii') + encoded + b'\r\n')
+        self.wfile.flush()
+
+    def _send_json(self, status: int, body: Dict, extra_headers: Optional[Dict] = None):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubLLMServer:
+    """
+    在后台线程中运行的LLM桩服务
+
+    用法：
+        with StubLLMServer(latency_ms=200, rate_limit_rate=0.05) as server:
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub')
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **config):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口（0表示自动分配）
+            **config: StubConfig参数（latency_ms, jitter_ms, error_rate, rate_limit_rate, seed, chunk_delay_ms）
+        """
+        self.httpd = ThreadingHTTPServer((host, port), StubLLMHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = StubConfig(**config)
+        self._thread = None
+
+    @property
+    def config(self) -> StubConfig:
+        return self.httpd.config
+
+    @property
+    def url(self) -> str:
+        """服务根地址（作为api_base使用）"""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StubLLMServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地OpenAI兼容LLM桩服务')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8808)
+    parser.add_argument('--latency-ms', type=float, default=0, help='基础延迟（毫秒）')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='延迟抖动上限（毫秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500错误概率')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='429限流概率')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子')
+    parser.add_argument('--chunk-delay-ms', type=float, default=0, help='流式输出分块间隔（毫秒）')
+    args = parser.parse_args()
+
+    server = StubLLMServer(
+        args.host, args.port,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+        chunk_delay_ms=args.chunk_delay_ms,
+    )
+    print(f'LLM桩服务已启动: {server.url}  (LLM_API_BASE={server.url})')
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f'服务端统计: {server.config.stats()}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+周报/分类/优先级查询基准测试
+
+语料发布日期分布在两年内（模拟长期运行的数据库），90%的文章标记为可出报告。
+除计时外，断言每个查询的执行计划与v3索引设计一致，索引被误删或查询改写导致
+退化为全表扫描时直接失败。
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from src.storage.database import Database
+from src.storage.query_audit import explain
+
+_history_cache = {}
+
+
+@pytest.fixture
+def history_db(tmp_path, scale):
+    """两年跨度、90%文章可出报告的文件数据库"""
+    if scale not in _history_cache:
+        _history_cache[scale] = generate_corpus(scale, days_span=730)
+    db = Database(str(tmp_path / 'history.db'))
+    db.insert_articles(_history_cache[scale])
+    db.conn.execute("""
+        UPDATE articles SET processed = 1, summary_generated = 1, link_valid = 1
+        WHERE id % 10 != 0
+    """)
+    db.conn.commit()
+    db.conn.execute("ANALYZE")
+    yield db
+    db.close()
+
+
+def _captured_plan(db, call):
+    captured = []
+    db.conn.set_trace_callback(captured.append)
+    try:
+        call()
+    finally:
+        db.conn.set_trace_callback(None)
+    selects = [sql for sql in captured if sql.lstrip().upper().startswith('SELECT')]
+    return explain(db.conn, selects[-1])
+
+
+def test_get_articles_for_weekly_report_history(benchmark, history_db, scale):
+    """周报查询：日期范围走索引，只对窗口内的行排序"""
+    result = benchmark(history_db.get_articles_for_weekly_report, 7)
+
+    plan = _captured_plan(history_db, lambda: history_db.get_articles_for_weekly_report(7))
+    assert any(line.startswith('SEARCH articles') and 'publish_date>' in line for line in plan)
+    benchmark.extra_info.update(articles=scale, rows=len(result), plan=plan)
+
+
+def test_get_articles_ready_for_report(benchmark, history_db, scale):
+    """就绪查询：使用部分索引idx_ready_publish_date"""
+    result = benchmark(history_db.get_articles_ready_for_report, 7)
+
+    plan = _captured_plan(history_db, lambda: history_db.get_articles_ready_for_report(7))
+    assert any('idx_ready_publish_date' in line for line in plan)
+    benchmark.extra_info.update(articles=scale, rows=len(result), plan=plan)
+
+
+def test_get_articles_by_priority(benchmark, history_db, scale):
+    """按优先级查询：复合索引直接给出排序，无临时B树"""
+    result = benchmark(history_db.get_articles_by_priority, '高')
+
+    plan = _captured_plan(history_db, lambda: history_db.get_articles_by_priority('高'))
+    assert any('idx_priority_score' in line for line in plan)
+    assert not any('TEMP B-TREE' in line for line in plan)
+    benchmark.extra_info.update(articles=scale, rows=len(result), plan=plan)
+
+
+def test_get_articles_by_category_recent(benchmark, history_db, scale):
+    """分类+日期查询：在article_categories上过滤排序，只回表取结果行"""
+    start = date.today() - timedelta(days=7)
+    result = benchmark(history_db.get_articles_by_category, '投资', start)
+
+    plan = _captured_plan(history_db, lambda: history_db.get_articles_by_category('投资', start))
+    assert not any(line.startswith('SCAN') for line in plan)
+    assert not any('TEMP B-TREE' in line for line in plan)
+    benchmark.extra_info.update(articles=scale, rows=len(result), plan=plan)
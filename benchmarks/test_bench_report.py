@@ -0,0 +1,39 @@
+"""
+周报生成与解析基准测试
+
+LLM摘要调用指向本地桩服务，测量的是生成器本身加一次本地HTTP往返的开销。
+"""
+
+import pytest
+
+from src.notification.email_template_v2 import parse_weekly_report
+from src.reporting.report_generator import WeeklyReportGenerator
+from src.reporting.report_summarizer import WeeklyReportSummarizer
+
+
+@pytest.fixture
+def generator(populated_db, stub_llm):
+    """连接桩服务的周报生成器"""
+    generator = WeeklyReportGenerator(database=populated_db, enable_llm_summary=True)
+    generator.summarizer = WeeklyReportSummarizer(
+        api_key='bench', api_base=stub_llm.url, model='stub'
+    )
+    return generator
+
+
+def test_generate_report(benchmark, generator, corpus):
+    """WeeklyReportGenerator.generate_report(days=7)"""
+    report = benchmark.pedantic(generator.generate_report, args=(7,), rounds=3, iterations=1)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    assert '本周概览' in report
+
+
+def test_parse_weekly_report(benchmark, generator, corpus):
+    """parse_weekly_report 解析生成的Markdown"""
+    report = generator.generate_report(days=7)
+
+    result = benchmark(parse_weekly_report, report)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    assert result['sections']
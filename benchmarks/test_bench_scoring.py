@@ -0,0 +1,82 @@
+"""
+评分与分类热路径基准测试
+
+评分、批量分类及两者合计（与ArticleProcessor处理一篇文章相同）分别按两种关键词匹配模式计时；
+分词模式每轮开始前清空分词缓存，避免重复轮次直接命中上一轮的结果。
+"""
+
+import pytest
+
+from src.classification.category_classifier import CategoryClassifier
+from src.processing.segmenter import MATCH_MODES, get_segmenter
+from src.scoring.priority_scorer import PriorityScorer
+
+
+@pytest.fixture(params=MATCH_MODES)
+def match_mode(request):
+    """关键词匹配模式"""
+    return request.param
+
+
+def _cold_cache():
+    get_segmenter().cache_clear()
+    return (), {}
+
+
+def test_calculate_total_score(benchmark, corpus, match_mode):
+    """PriorityScorer.calculate_total_score 全语料"""
+    scorer = PriorityScorer(match_mode=match_mode)
+
+    def run():
+        for article in corpus:
+            scorer.calculate_total_score(
+                title=article['title'],
+                content=article['content'],
+                publish_date=article['publish_date'],
+                source_tier=article['source_tier'],
+            )
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, setup=_cold_cache, rounds=3, iterations=1, warmup_rounds=1)
+
+
+def test_classify(benchmark, corpus):
+    """CategoryClassifier.classify 全语料"""
+    classifier = CategoryClassifier()
+
+    def run():
+        for article in corpus:
+            classifier.classify(article['title'], article['content'])
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, rounds=3, iterations=1)
+
+
+def test_classify_many(benchmark, corpus, match_mode):
+    """CategoryClassifier.classify_many 全语料"""
+    classifier = CategoryClassifier(match_mode=match_mode)
+
+    def run():
+        classifier.classify_many(corpus)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, setup=_cold_cache, rounds=3, iterations=1, warmup_rounds=1)
+
+
+def test_classify_and_score(benchmark, corpus, match_mode):
+    """逐篇classify_many + calculate_total_score（分词模式下两者共用同一篇文章的分词结果）"""
+    classifier = CategoryClassifier(match_mode=match_mode)
+    scorer = PriorityScorer(match_mode=match_mode)
+
+    def run():
+        for article in corpus:
+            classifier.select_labels(classifier.classify_many([article])[0])
+            scorer.calculate_total_score(
+                title=article['title'],
+                content=article['content'],
+                publish_date=article['publish_date'],
+                source_tier=article['source_tier'],
+            )
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, setup=_cold_cache, rounds=3, iterations=1, warmup_rounds=1)
@@ -0,0 +1,61 @@
+"""
+数据库写入与周报查询基准测试
+"""
+
+import itertools
+
+from src.storage.database import Database
+
+_db_counter = itertools.count()
+
+
+def _fresh_db(tmp_path):
+    return Database(str(tmp_path / f'insert_{next(_db_counter)}.db'))
+
+
+def test_insert_article_one_by_one(benchmark, tmp_path, corpus):
+    """逐条insert_article（每条一次commit）"""
+
+    def setup():
+        return (_fresh_db(tmp_path),), {}
+
+    def run(db):
+        for article in corpus:
+            db.insert_article(**article)
+        db.close()
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, setup=setup, rounds=1, iterations=1)
+
+
+def test_insert_articles_bulk(benchmark, tmp_path, corpus):
+    """批量insert_articles（单个事务）"""
+
+    def setup():
+        return (_fresh_db(tmp_path),), {}
+
+    def run(db):
+        inserted = db.insert_articles(corpus)
+        db.close()
+        assert inserted == len(corpus)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.pedantic(run, setup=setup, rounds=3, iterations=1)
+
+
+def test_get_articles_for_weekly_report(benchmark, populated_db, corpus):
+    """get_articles_for_weekly_report(days=7)"""
+    result = benchmark(populated_db.get_articles_for_weekly_report, 7)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.extra_info['rows'] = len(result)
+    assert result
+
+
+def test_get_articles_for_weekly_report_records(benchmark, populated_db, corpus):
+    """get_articles_for_weekly_report(days=7, as_records=True)：包装查询行，不转换dict"""
+    result = benchmark(populated_db.get_articles_for_weekly_report, 7, True)
+
+    benchmark.extra_info['articles'] = len(corpus)
+    benchmark.extra_info['rows'] = len(result)
+    assert result
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 数据库维护脚本
+
+使用方法:
+    python3 db_maintenance.py stats                        # 在线库空间与数据分布
+    python3 db_maintenance.py archive --days 365 --dry-run # 预览将归档的月份
+    python3 db_maintenance.py archive --days 365           # 归档一年前的文章到 data/archive/
+    python3 db_maintenance.py vacuum --pages 1000          # 增量回收空闲页
+    python3 db_maintenance.py vacuum --enable-incremental  # 旧库切换到增量回收（整库VACUUM一次）
+    python3 db_maintenance.py history --start 2024-01-01 --end 2024-03-31  # 跨归档库查询
+"""
+
+import argparse
+import sys
+from datetime import datetime
+
+from src.storage.database import Database
+from src.storage.retention import (
+    DEFAULT_ARCHIVE_DIR,
+    archive_old_articles,
+    database_stats,
+    enable_incremental_vacuum,
+    get_articles_with_archive,
+    incremental_vacuum,
+    list_archives,
+)
+
+
+def _print_stats(db: Database, archive_dir: str):
+    stats = database_stats(db)
+    print(f"文章数: {stats['articles']}（{stats['oldest'] or '-'} ~ {stats['newest'] or '-'}）")
+    print(f"文件大小: {stats['size_bytes'] / 1024 / 1024:.1f} MB "
+          f"（{stats['page_count']} 页 × {stats['page_size']} 字节，空闲 {stats['freelist_count']} 页）")
+    print(f"auto_vacuum: {stats['auto_vacuum']}")
+    archives = list_archives(archive_dir)
+    print(f"归档月份: {len(archives)}" + (f"（{archives[0]} ~ {archives[-1]}）" if archives else ''))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='数据库保留、归档与空间回收')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('--archive-dir', type=str, default=DEFAULT_ARCHIVE_DIR,
+                        help=f'归档目录（默认: {DEFAULT_ARCHIVE_DIR}）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='在线库空间与数据分布')
+
+    archive_parser = subparsers.add_parser('archive', help='按月归档超过保留期的文章')
+    archive_parser.add_argument('--days', type=int, default=365,
+                                help='在线库保留天数（默认365）')
+    archive_parser.add_argument('--dry-run', action='store_true',
+                                help='只统计，不迁移')
+    archive_parser.add_argument('--no-vacuum', action='store_true',
+                                help='归档后不回收空闲页')
+
+    vacuum_parser = subparsers.add_parser('vacuum', help='回收空闲页')
+    vacuum_parser.add_argument('--pages', type=int, default=None,
+                               help='最多回收的页数（默认全部）')
+    vacuum_parser.add_argument('--enable-incremental', action='store_true',
+                               help='切换到auto_vacuum=INCREMENTAL（整库VACUUM一次）')
+
+    history_parser = subparsers.add_parser('history', help='跨在线库和归档库按日期查询')
+    history_parser.add_argument('--start', type=str, required=True, help='开始日期（YYYY-MM-DD）')
+    history_parser.add_argument('--end', type=str, required=True, help='结束日期（YYYY-MM-DD）')
+    history_parser.add_argument('--limit', type=int, default=20, help='显示条数（默认20）')
+
+    args = parser.parse_args()
+
+    with Database(args.db) as db:
+        if args.command == 'stats':
+            _print_stats(db, args.archive_dir)
+
+        elif args.command == 'archive':
+            archived = archive_old_articles(db, args.days, args.archive_dir, dry_run=args.dry_run)
+            if not archived:
+                print(f"没有早于 {args.days} 天的文章")
+                return
+            action = '将归档' if args.dry_run else '已归档'
+            for month, count in archived.items():
+                print(f"  {month}: {count} 篇")
+            print(f"{action} {sum(archived.values())} 篇 -> {args.archive_dir}/")
+            if not args.dry_run and not args.no_vacuum:
+                print(f"回收空闲页: {incremental_vacuum(db)}")
+
+        elif args.command == 'vacuum':
+            if args.enable_incremental:
+                switched = enable_incremental_vacuum(db)
+                print("✓ 已切换到auto_vacuum=INCREMENTAL" if switched else "已是auto_vacuum=INCREMENTAL")
+            else:
+                print(f"回收空闲页: {incremental_vacuum(db, args.pages)}")
+
+        elif args.command == 'history':
+            try:
+                start = datetime.strptime(args.start, '%Y-%m-%d').date()
+                end = datetime.strptime(args.end, '%Y-%m-%d').date()
+            except ValueError:
+                print("✗ 日期格式应为YYYY-MM-DD")
+                sys.exit(1)
+            articles = get_articles_with_archive(db, start, end, args.archive_dir)
+            print(f"共 {len(articles)} 篇")
+            for article in articles[:args.limit]:
+                where = f"归档{article['archive']}" if article['archive'] else '在线'
+                print(f"  {article['publish_date']} [{where}] {article['title']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 分析数据导出脚本
+
+把文章表（不含正文）按发布月份导出为Parquet，供pandas/DuckDB等工具分析。
+默认增量导出（只导出上次导出之后新增的文章），需要安装pyarrow：pip install pyarrow pandas
+
+使用方法:
+    python3 export_parquet.py                      # 增量导出到 data/analytics/
+    python3 export_parquet.py --full               # 删除已有导出，全量重新导出
+    python3 export_parquet.py --summary --start 2024-01-01 --end 2024-06-30  # 读取导出并按来源汇总
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from src.storage.database import Database
+from src.storage.parquet_export import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_EXPORT_DIR,
+    export_articles,
+    load_articles_frame,
+    load_state,
+)
+
+
+def _print_summary(output: str, start: str, end: str):
+    try:
+        start_date = datetime.strptime(start, '%Y-%m-%d').date()
+        end_date = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        print("✗ 日期格式应为YYYY-MM-DD")
+        sys.exit(1)
+
+    frame = load_articles_frame(output, start_date, end_date, columns=['source', 'score'])
+    print(f"{start_date} ~ {end_date}: {len(frame)} 篇")
+    if frame.empty:
+        return
+    summary = frame.groupby('source')['score'].agg(['count', 'mean']).sort_values('count', ascending=False)
+    for source, row in summary.iterrows():
+        print(f"  {source}: {int(row['count'])} 篇，平均评分 {row['mean']:.1f}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='导出文章到按月分区的Parquet文件')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('--output', type=str, default=DEFAULT_EXPORT_DIR,
+                        help=f'导出目录（默认: {DEFAULT_EXPORT_DIR}）')
+    parser.add_argument('--full', action='store_true',
+                        help='删除已有导出，全量重新导出（评分更新后使用）')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'每批读取的行数（默认{DEFAULT_BATCH_SIZE}）')
+    parser.add_argument('--summary', action='store_true',
+                        help='不导出，读取已导出的数据并按来源汇总')
+    parser.add_argument('--start', type=str, help='汇总开始日期（YYYY-MM-DD）')
+    parser.add_argument('--end', type=str, help='汇总结束日期（YYYY-MM-DD）')
+    args = parser.parse_args()
+
+    try:
+        if args.summary:
+            if not args.start or not args.end:
+                print("✗ --summary 需要 --start 和 --end")
+                sys.exit(1)
+            _print_summary(args.output, args.start, args.end)
+            return
+
+        if not Path(args.db).exists():
+            print(f"✗ 数据库不存在: {args.db}")
+            sys.exit(1)
+
+        with Database(args.db) as db:
+            exported = export_articles(db, args.output, full=args.full, batch_size=args.batch_size)
+    except ImportError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    if not exported:
+        print("没有新增文章")
+        return
+    for month, count in exported.items():
+        print(f"  {month}: {count} 篇")
+    state = load_state(args.output)
+    print(f"✓ 已导出 {sum(exported.values())} 篇 -> {args.output}/（累计 {state['rows']} 篇，最大id {state['last_id']}）")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 实体索引脚本
+
+按 config/entities.json 词典抽取文章中的公司/区域，并按实体查询文章时间线。
+新采集的文章在入库时自动抽取；修改词典或升级旧库后执行 --all 重建。
+
+使用方法:
+    python3 extract_entities.py --all                     # 按词典重建全部文章的实体
+    python3 extract_entities.py --top --days 30           # 近30天文章数最多的实体
+    python3 extract_entities.py --entity 万国数据 --days 90  # 某公司近90天的文章时间线
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.processing.entity_extractor import DEFAULT_ENTITIES_PATH, EntityExtractor, reindex_entities
+from src.storage.database import Database
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='文章实体（公司/区域）索引与查询')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('--entities', type=str, default=DEFAULT_ENTITIES_PATH,
+                        help=f'实体词典路径（默认: {DEFAULT_ENTITIES_PATH}）')
+    parser.add_argument('--all', action='store_true',
+                        help='按词典重建全部文章的实体')
+    parser.add_argument('--top', action='store_true',
+                        help='列出文章数最多的实体')
+    parser.add_argument('--type', type=str, choices=['company', 'region'], default=None,
+                        help='--top 只统计某类实体')
+    parser.add_argument('--entity', type=str, default=None,
+                        help='查询实体的文章时间线（标准名称或别名）')
+    parser.add_argument('--days', type=int, default=None,
+                        help='最近N天（默认全部）')
+    parser.add_argument('--limit', type=int, default=20,
+                        help='显示条数（默认20）')
+    args = parser.parse_args()
+
+    if not (args.all or args.top or args.entity):
+        parser.print_help()
+        sys.exit(1)
+    if not Path(args.db).exists():
+        print(f"✗ 数据库不存在: {args.db}")
+        sys.exit(1)
+
+    extractor = EntityExtractor.from_file(args.entities) if Path(args.entities).exists() else None
+
+    with Database(args.db) as db:
+        if args.all:
+            if extractor is None:
+                print(f"✗ 实体词典不存在: {args.entities}")
+                sys.exit(1)
+            totals = reindex_entities(db, extractor)
+            print(f"✓ 已处理 {totals['articles']} 篇文章，写入 {totals['entities']} 条实体关联")
+
+        if args.top:
+            period = f"近{args.days}天" if args.days else "全部"
+            print(f"{period}文章数最多的实体:")
+            for row in db.get_entity_counts(days=args.days, entity_type=args.type, limit=args.limit):
+                print(f"  {row['entity']} [{row['entity_type']}]: {row['article_count']} 篇"
+                      f"（标题提及 {row['title_count']}，最近 {row['last_date']}）")
+
+        if args.entity:
+            name = (extractor.canonical(args.entity) if extractor else None) or args.entity
+            articles = db.articles_for_entity(name, days=args.days, limit=args.limit)
+            print(f"{name}: {len(articles)} 篇")
+            for article in articles:
+                marker = '★' if article['in_title'] else ' '
+                print(f"  {article['publish_date']} {marker} [{article['source']}] {article['title']}")
+
+
+if __name__ == '__main__':
+    main()
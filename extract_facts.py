@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 数值事实统计脚本
+
+文章中的投资额（亿元）、机柜数、功率（MW）、PUE在入库时提取到article_facts表，
+本脚本按周/区域/来源汇总公布的投资额；升级旧库或调整提取规则后执行 --all 重建。
+
+使用方法:
+    python3 extract_facts.py --all                          # 重新提取全部文章的数值事实
+    python3 extract_facts.py --investment --by week --days 90  # 近90天每周公布的投资额
+    python3 extract_facts.py --investment --by region       # 按区域汇总（区域来自实体索引）
+    python3 extract_facts.py --stats --days 30              # 近30天各类事实的统计
+"""
+
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict
+
+from src.scoring.priority_scorer import PriorityScorer
+from src.storage.database import Database
+
+
+def backfill_facts(db: Database, scorer: PriorityScorer, batch_size: int = 500) -> Dict[str, int]:
+    """
+    重新提取全部已有文章的数值事实（按id分批，每批一个事务）
+
+    Returns:
+        {'articles': 处理的文章数, 'facts': 写入的事实数}
+    """
+    totals = {'articles': 0, 'facts': 0}
+    last_id = 0
+    while True:
+        rows = db.conn.execute(
+            "SELECT id, title, summary FROM articles WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        contents = db.get_article_contents([row['id'] for row in rows])
+        with db.batch():
+            for row in rows:
+                facts = scorer.extract_facts(row['title'], contents.get(row['id']) or row['summary'])
+                db.save_article_facts(row['id'], facts)
+                totals['facts'] += len(facts)
+        totals['articles'] += len(rows)
+        last_id = rows[-1]['id']
+    return totals
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='文章数值事实（投资额、机柜数、功率、PUE）提取与统计')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('--all', action='store_true',
+                        help='重新提取全部文章的数值事实')
+    parser.add_argument('--investment', action='store_true',
+                        help='汇总公布的投资额（亿元）')
+    parser.add_argument('--by', type=str, choices=Database.INVESTMENT_GROUPS, default='week',
+                        help='投资额分组方式（默认week）')
+    parser.add_argument('--stats', action='store_true',
+                        help='各类事实的统计')
+    parser.add_argument('--days', type=int, default=90,
+                        help='最近N天（默认90）')
+    args = parser.parse_args()
+
+    if not (args.all or args.investment or args.stats):
+        parser.print_help()
+        sys.exit(1)
+    if not Path(args.db).exists():
+        print(f"✗ 数据库不存在: {args.db}")
+        sys.exit(1)
+
+    end_date = date.today()
+    start_date = end_date - timedelta(days=args.days - 1)
+
+    with Database(args.db) as db:
+        if args.all:
+            totals = backfill_facts(db, PriorityScorer())
+            print(f"✓ 已处理 {totals['articles']} 篇文章，写入 {totals['facts']} 条数值事实")
+
+        if args.investment:
+            print(f"投资额汇总（{start_date} ~ {end_date}，按{args.by}）:")
+            for row in db.get_investment_totals(start_date, end_date, group_by=args.by):
+                print(f"  {row[args.by]}: {row['total_amount']:.2f} 亿元"
+                      f"（{row['article_count']} 篇，最大 {row['max_amount']:.2f} 亿元）")
+
+        if args.stats:
+            print(f"数值事实统计（{start_date} ~ {end_date}）:")
+            for row in db.get_fact_stats(start_date, end_date):
+                print(f"  {row['fact_type']}: {row['article_count']} 篇，"
+                      f"最小 {row['min_value']:g}，最大 {row['max_value']:g}，平均 {row['avg_value']:g} {row['unit']}")
+
+
+if __name__ == '__main__':
+    main()
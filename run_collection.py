@@ -6,66 +6,97 @@ IDC行业竞争情报系统 - 生产环境采集脚本
     python3 run_collection.py                # 采集所有active源
     python3 run_collection.py --sources 3    # 只采集前3个源
     python3 run_collection.py --limit 20     # 每个源限制20篇
+    python3 run_collection.py --record       # 采集并存档列表页HTML
+    python3 run_collection.py --replay 20251108-080000 --no-llm  # 离线回放存档
+    python3 run_collection.py --pipeline --llm-workers 8   # 流水线模式（各阶段并发）
+    python3 run_collection.py --resume                     # 续采最近一次中途退出或失败的运行
 """
 
 import json
 import sys
+import time
 import argparse
-from datetime import date, datetime
+from datetime import datetime
 from pathlib import Path
 
 from src.storage.database import Database
 from src.scrapers.generic_scraper import GenericScraper
+from src.scrapers.page_archive import PageArchive
 from src.processing.llm_analyzer import LLMArticleAnalyzer  # 新：整合分析器
 from src.scoring.priority_scorer import PriorityScorer
+from src.scoring.scoring_engine import DEFAULT_SCORING_PATH, ScoringEngine, load_scorer
 from src.classification.category_classifier import CategoryClassifier
+from src.classification.relevance_model import DEFAULT_MODEL_PATH, load_model_if_exists
+from src.processing.article_processor import ArticleProcessor, new_source_stats
+from src.processing.entity_extractor import DEFAULT_ENTITIES_PATH, load_extractor_if_exists
+from src.processing.pipeline import CollectionPipeline
+from src.utils.metrics import RunMetrics, NullMetrics
 
 
-def load_active_sources(config_path='config/media-sources.json'):
-    """加载所有active媒体源"""
+def load_all_sources(config_path='config/media-sources.json'):
+    """加载全部媒体源配置（含停用的源）"""
     with open(config_path, 'r', encoding='utf-8') as f:
         config = json.load(f)
+    return config['sources']
+
 
-    active_sources = [s for s in config['sources'] if s.get('active', False)]
+def load_active_sources(config_path='config/media-sources.json'):
+    """加载所有active媒体源"""
+    active_sources = [s for s in load_all_sources(config_path) if s.get('active', False)]
     return active_sources
 
 
-def collect_from_source(source, db, llm_analyzer=None, scorer=None, classifier=None, limit=20):
-    """从单个源采集文章"""
+def collect_from_source(source, db, llm_analyzer=None, scorer=None, classifier=None, limit=20,
+                        archive=None, run_id=None, replay=False, metrics=None, relevance_model=None,
+                        journal_run_id=None, llm_cache=None, entity_extractor=None):
+    """
+    从单个源采集文章
+
+    Args:
+        archive: 页面存档（PageArchive，可选）。非回放模式下用于记录列表页HTML
+        run_id: 存档运行ID
+        replay: 是否为回放模式（从存档读取HTML，不访问网络）
+        metrics: 运行指标（RunMetrics，可选），记录各阶段耗时
+        relevance_model: 本地相关性模型（RelevanceModel，可选）。明确不相关的直接拒绝、
+            明确相关的直接接受，只有不确定的文章才调用LLM
+        journal_run_id: 运行日志ID（可选）。LLM分析结果写入run_articles表，供续采复用
+        llm_cache: 续采时已有的LLM分析结果 {url_hash: llm_result}
+        entity_extractor: 实体抽取器（EntityExtractor，可选），抽取的公司/区域随文章入库
+    """
+    metrics = metrics or NullMetrics()
+    source_start = time.perf_counter()
+
     print(f"\n{'='*70}")
     print(f"采集源: {source['name']} (Tier {source['tier']})")
     print(f"URL: {source['scraper_config']['list_url']}")
     print(f"{'='*70}")
 
-    # 负面关键词（快速过滤明显不相关的内容）
-    NEGATIVE_KEYWORDS = ['白酒', '房地产', '汽车销售', '娱乐', '影视',
-                         '游戏', '餐饮', '零售', '服装', '美妆', '食品']
-
-    stats = {
-        'source': source['name'],
-        'tier': source['tier'],
-        'status': 'pending',
-        'fetched': 0,
-        'quick_filtered': 0,  # 快速过滤数量
-        'llm_rejected': 0,    # LLM拒绝数量（相关性<8）
-        'stored': 0,
-        'duplicates': 0,
-        'errors': 0,
-        'avg_llm_score': 0,   # 平均LLM评分
-        'avg_relevance': 0    # 平均相关性评分
-    }
+    stats = new_source_stats(source)
+    processor = ArticleProcessor(llm_analyzer, scorer, classifier, relevance_model, metrics,
+                                 llm_cache=llm_cache, entity_extractor=entity_extractor)
 
     try:
         # 创建scraper
         scraper = GenericScraper(source)
 
-        # 采集文章
-        print(f"正在采集文章（限制{limit}篇）...")
-        articles = scraper.fetch_articles(limit=limit)
+        # 采集文章（回放模式直接读取存档HTML）
+        if replay:
+            print(f"回放存档页面（运行 {run_id}，限制{limit}篇）...")
+            html = archive.load_page(run_id, source['name'])
+        else:
+            print(f"正在采集文章（限制{limit}篇）...")
+            html = scraper.fetch_html(metrics=metrics)
+            if html and archive:
+                with metrics.timer('archive'):
+                    archive.save_page(run_id, source['name'], scraper.list_url, html)
+
+        with metrics.timer('parse'):
+            articles = scraper.parse_articles(html)[:limit] if html else []
 
         if not articles:
             print("⚠️  未采集到文章")
             stats['status'] = 'no_articles'
+            stats['duration_seconds'] = round(time.perf_counter() - source_start, 3)
             return stats
 
         stats['fetched'] = len(articles)
@@ -80,108 +111,54 @@ def collect_from_source(source, db, llm_analyzer=None, scorer=None, classifier=N
         relevance_scores = []
 
         for article in articles:
-            if not article.get('title') or not article.get('url'):
-                stats['errors'] += 1
-                continue
-
             try:
-                # 步骤1：快速预过滤（负面关键词）
-                title_lower = article['title'].lower()
-                if any(keyword in title_lower for keyword in NEGATIVE_KEYWORDS):
+                # 步骤1：预过滤（负面关键词 + 本地相关性模型）
+                prefiltered = processor.prefilter(article)
+                outcome = prefiltered['outcome']
+                if outcome == 'invalid':
+                    stats['errors'] += 1
+                    continue
+                if outcome == 'quick_filtered':
                     stats['quick_filtered'] += 1
                     print(f"    ⊗ 快速过滤: {article['title'][:40]}...")
                     continue
+                if outcome == 'model_rejected':
+                    stats['model_rejected'] += 1
+                    print(f"    ⊗ 模型拒绝 [{prefiltered['probability']:.2f}]: {article['title'][:40]}...")
+                    continue
 
                 # 步骤2：LLM智能分析（整合：相关性+重要性+分类+摘要）
-                llm_result = None
-                if llm_analyzer:
-                    try:
-                        llm_result = llm_analyzer.analyze_article(
-                            title=article['title'],
-                            content=article.get('summary', article.get('content', article['title']))
-                        )
-
-                        # 步骤3：相关性阈值过滤（<8分拒绝）
-                        if llm_result['relevance_score'] < 8:
-                            stats['llm_rejected'] += 1
-                            print(f"    ✗ LLM拒绝 [{llm_result['relevance_score']}/20]: {article['title'][:40]}...")
-                            continue
-
-                        llm_scores.append(llm_result['total_score'])
-                        relevance_scores.append(llm_result['relevance_score'])
-
-                        # 使用LLM生成的摘要和分类
-                        summary = llm_result['summary']
-                        category = llm_result['category']
-
-                        print(f"    ✓ LLM分析 [相关:{llm_result['relevance_score']}/20 重要:{llm_result['importance_score']}/20]: {article['title'][:30]}...")
-
-                    except Exception as e:
-                        print(f"    ⚠️  LLM分析失败: {e}")
-                        llm_result = None
-
-                # LLM降级处理
-                if not llm_result:
-                    summary = article.get('summary', '')
-                    category = "其他"
-                    llm_result = {
-                        'relevance_score': 10,
-                        'importance_score': 10,
-                        'category_score': 5,
-                        'total_score': 20,
-                        'category': category,
-                        'reason': 'LLM不可用，使用默认值'
-                    }
-
-                # 步骤4：调用传统评分系统（整合LLM评分）
-                if scorer:
-                    score_result = scorer.calculate_total_score(
-                        title=article['title'],
-                        content=article.get('content', ''),
-                        publish_date=article.get('publish_date', date.today()),
-                        source_tier=source['tier'],
-                        llm_total_score=llm_result['total_score']  # 传递LLM评分
-                    )
-                    score = score_result['total_score']
-                    priority = score_result['priority']
-                    score_relevance = score_result['relevance_score']
-                    score_timeliness = score_result['timeliness_score']
-                    score_impact = score_result['impact_score']
-                    score_credibility = score_result['credibility_score']
+                analysis = processor.analyze(article, prefiltered)
+                llm_result = analysis['llm_result']
+                if analysis['label']:
+                    db.save_relevance_label(source=source['name'], **analysis['label'])
+                if analysis['journal'] and journal_run_id:
+                    db.save_run_article(journal_run_id, article['url'], analysis['journal'], source['name'])
+
+                if analysis['outcome'] == 'llm_rejected':
+                    stats['llm_rejected'] += 1
+                    print(f"    ✗ LLM拒绝 [{llm_result['relevance_score']}/20]: {article['title'][:40]}...")
+                    continue
+                if analysis['outcome'] == 'model_accepted':
+                    stats['model_accepted'] += 1
+                    print(f"    ✓ 模型接受 [{prefiltered['probability']:.2f}]: {article['title'][:40]}...")
+                elif analysis['outcome'] == 'llm_ok':
+                    llm_scores.append(llm_result['total_score'])
+                    relevance_scores.append(llm_result['relevance_score'])
+                    print(f"    ✓ LLM分析 [相关:{llm_result['relevance_score']}/20 重要:{llm_result['importance_score']}/20]: {article['title'][:30]}...")
+                elif analysis['llm_error']:
+                    print(f"    ⚠️  LLM分析失败: {analysis['llm_error']}")
+
+                # 步骤3：调用传统评分系统（整合LLM评分）
+                record = processor.build_record(article, source, analysis)
+
+                # 步骤4：存储到数据库（包含LLM评分）
+                with metrics.timer('db_write'):
+                    article_id = db.insert_article(**record)
+                if article_id is None:
+                    stats['duplicates'] += 1
                 else:
-                    # 降级：使用LLM评分
-                    score = llm_result['total_score']
-                    priority = "高" if score >= 35 else ("中" if score >= 20 else "低")
-                    score_relevance = 0
-                    score_timeliness = 0
-                    score_impact = 0
-                    score_credibility = 0
-
-                # 步骤5：存储到数据库（包含LLM评分）
-                db.insert_article(
-                    title=article['title'],
-                    url=article['url'],
-                    source=source['name'],
-                    source_tier=source['tier'],
-                    publish_date=article.get('publish_date', date.today()),
-                    content=article.get('content', ''),
-                    summary=summary,
-                    category=category,
-                    priority=priority,
-                    score=score,
-                    score_relevance=score_relevance,
-                    score_timeliness=score_timeliness,
-                    score_impact=score_impact,
-                    score_credibility=score_credibility,
-                    llm_relevance_score=llm_result['relevance_score'],
-                    llm_importance_score=llm_result['importance_score'],
-                    llm_category_score=llm_result['category_score'],
-                    llm_total_score=llm_result['total_score'],
-                    llm_category_suggestion=llm_result['category'],
-                    llm_reason=llm_result.get('reason', ''),
-                    link_valid=True
-                )
-                stats['stored'] += 1
+                    stats['stored'] += 1
 
             except Exception as e:
                 if "UNIQUE constraint failed" in str(e):
@@ -200,6 +177,8 @@ def collect_from_source(source, db, llm_analyzer=None, scorer=None, classifier=N
             print(f"  (快速过滤 {stats['quick_filtered']} 篇)")
         if stats['llm_rejected'] > 0:
             print(f"  (LLM拒绝 {stats['llm_rejected']} 篇)")
+        if stats['model_rejected'] or stats['model_accepted']:
+            print(f"  (本地模型拒绝 {stats['model_rejected']} 篇，直接接受 {stats['model_accepted']} 篇)")
         if stats['duplicates'] > 0:
             print(f"  (跳过 {stats['duplicates']} 篇重复)")
         if stats['errors'] > 0:
@@ -214,9 +193,58 @@ def collect_from_source(source, db, llm_analyzer=None, scorer=None, classifier=N
         stats['status'] = 'failed'
         stats['error'] = str(e)[:200]
 
+    stats['duration_seconds'] = round(time.perf_counter() - source_start, 3)
     return stats
 
 
+def run_pipeline(args, sources, llm_analyzer, scorer, classifier, relevance_model,
+                 archive, archive_run_id, metrics, journal_run_id=None, llm_cache=None,
+                 entity_extractor=None):
+    """流水线模式采集所有源（各阶段并发执行）"""
+    print(f"流水线模式: 抓取 {args.fetch_workers} 线程，LLM {args.llm_workers} 线程，"
+          f"批大小 {args.batch_size}，队列容量 {args.queue_size}")
+
+    def on_event(event, data):
+        if event == 'fetched':
+            print(f"  ✓ {data['source']}: 采集到 {data['count']} 篇")
+        elif event == 'error':
+            print(f"  ✗ 阶段 {data['stage']} 失败: {data['error'][:100]}")
+
+    processor = ArticleProcessor(llm_analyzer, scorer, classifier, relevance_model, metrics,
+                                 llm_cache=llm_cache, entity_extractor=entity_extractor)
+    pipeline = CollectionPipeline(
+        args.db, processor,
+        limit=args.limit,
+        fetch_workers=args.fetch_workers,
+        llm_workers=args.llm_workers,
+        batch_size=args.batch_size,
+        queue_size=args.queue_size,
+        archive=archive,
+        run_id=archive_run_id,
+        replay=bool(args.replay),
+        metrics=metrics,
+        on_event=on_event,
+        journal_run_id=journal_run_id,
+    )
+    return pipeline.run(sources)
+
+
+def record_source_stats(metrics, stats):
+    """将单个源的统计结果累加到运行指标"""
+    metrics.add_source(stats)
+    metrics.incr('sources_total')
+    if stats['status'] == 'success':
+        metrics.incr('sources_ok')
+    metrics.incr('articles_fetched', stats['fetched'])
+    metrics.incr('articles_quick_filtered', stats.get('quick_filtered', 0))
+    metrics.incr('articles_llm_rejected', stats.get('llm_rejected', 0))
+    metrics.incr('articles_model_rejected', stats.get('model_rejected', 0))
+    metrics.incr('articles_model_accepted', stats.get('model_accepted', 0))
+    metrics.incr('articles_stored', stats['stored'])
+    metrics.incr('articles_duplicates', stats['duplicates'])
+    metrics.incr('articles_errors', stats['errors'])
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='IDC行业竞争情报采集')
@@ -228,9 +256,44 @@ def main():
                        help='数据库文件路径')
     parser.add_argument('--no-llm', action='store_true',
                        help='禁用LLM摘要生成')
+    parser.add_argument('--record', action='store_true',
+                       help='存档采集到的列表页HTML，供离线回放')
+    parser.add_argument('--replay', type=str, default=None, metavar='RUN_ID',
+                       help='离线回放指定运行的存档页面（不访问网络）')
+    parser.add_argument('--archive-dir', type=str, default='data/page_archive',
+                       help='页面存档目录')
+    parser.add_argument('--relevance-model', type=str, default=DEFAULT_MODEL_PATH,
+                       help='本地相关性模型路径（由 train_relevance_model.py 生成，不存在时跳过）')
+    parser.add_argument('--no-relevance-model', action='store_true',
+                       help='禁用本地相关性模型预判，全部文章交给LLM')
+    parser.add_argument('--entities', type=str, default=DEFAULT_ENTITIES_PATH,
+                       help=f'实体词典路径（公司/区域，默认 {DEFAULT_ENTITIES_PATH}，不存在时跳过）')
+    parser.add_argument('--no-entities', action='store_true',
+                       help='不抽取实体')
+    parser.add_argument('--scoring', type=str, default=DEFAULT_SCORING_PATH,
+                       help=f'评分配置路径（默认 {DEFAULT_SCORING_PATH}，不存在时使用内置规则）')
+    parser.add_argument('--resume', type=str, nargs='?', const='latest', default=None, metavar='RUN_ID',
+                       help='续采中途退出或失败的运行：跳过已完成的源，复用已完成的LLM分析（默认最近一次）')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='流水线模式：抓取/去重/预过滤/LLM/评分/入库各阶段并发执行')
+    parser.add_argument('--fetch-workers', type=int, default=2,
+                       help='流水线模式：抓取线程数（默认2）')
+    parser.add_argument('--llm-workers', type=int, default=4,
+                       help='流水线模式：LLM分析线程数（默认4）')
+    parser.add_argument('--batch-size', type=int, default=50,
+                       help='流水线模式：入库批大小（默认50）')
+    parser.add_argument('--queue-size', type=int, default=100,
+                       help='流水线模式：阶段间队列容量（默认100）')
+    parser.add_argument('--run-report-dir', type=str, default='data/run_reports',
+                       help='JSON运行报告输出目录')
+    parser.add_argument('--prometheus-textfile', type=str, default=None, metavar='PATH',
+                       help='同时输出Prometheus textfile格式指标（如 /var/lib/node_exporter/ci.prom）')
 
     args = parser.parse_args()
 
+    if args.record and args.replay:
+        parser.error('--record 与 --replay 不能同时使用')
+
     print("="*80)
     print("IDC行业竞争情报系统 - 数据采集")
     print("="*80)
@@ -240,13 +303,51 @@ def main():
     sources = load_active_sources()
     print(f"✓ 找到 {len(sources)} 个active媒体源")
 
+    # 初始化数据库
+    db = Database(args.db)
+    print(f"✓ 数据库已连接: {args.db}")
+
+    # 本次运行ID和运行指标（续采时沿用中断运行的ID）
+    completed_sources = {}
+    llm_cache = {}
+    if args.resume:
+        run_id = db.get_resumable_run() if args.resume == 'latest' else args.resume
+        if not run_id:
+            print("✗ 没有可续采的运行（最近一次运行已正常结束）")
+            sys.exit(1)
+        completed_sources = db.get_run_sources(run_id)
+        llm_cache = db.get_run_articles(run_id)
+        print(f"✓ 续采运行 {run_id}：已完成 {len(completed_sources)} 个源，"
+              f"复用 {len(llm_cache)} 条LLM分析结果")
+    else:
+        run_id = PageArchive.new_run_id()
+    metrics = RunMetrics(run_id)
+
+    # 页面存档（记录或回放）
+    archive = None
+    archive_run_id = None
+    if args.replay:
+        archive = PageArchive(args.archive_dir)
+        archive_run_id = args.replay
+        recorded = archive.list_sources(archive_run_id)
+        if not recorded:
+            print(f"✗ 未找到存档运行: {archive_run_id}（目录: {args.archive_dir}）")
+            sys.exit(1)
+        sources = [s for s in sources if s['name'] in recorded]
+        print(f"✓ 回放模式: 运行 {archive_run_id}，存档 {len(recorded)} 个源，匹配 {len(sources)} 个")
+    elif args.record:
+        archive = PageArchive(args.archive_dir)
+        archive_run_id = run_id
+        print(f"✓ 记录模式: 列表页将存档为运行 {archive_run_id}")
+
     if args.sources:
         sources = sources[:args.sources]
         print(f"  (限制为前 {args.sources} 个源)")
 
-    # 初始化数据库
-    db = Database(args.db)
-    print(f"✓ 数据库已连接: {args.db}")
+    # 运行开始即写入runs表（状态running），进程中途退出后可用 --resume 续采
+    db.save_run(metrics.to_dict(), status='running')
+    # 同步媒体源配置（等级、启用状态）到sources表
+    db.sync_sources(load_all_sources())
 
     # 初始化LLM智能分析器（整合相关性判断+评分+分类+摘要）
     llm_analyzer = None
@@ -267,15 +368,45 @@ def main():
 
             llm_analyzer = LLMArticleAnalyzer(api_key, api_base, model)
             print(f"✓ LLM智能分析已启用（{model}）")
+            if llm_analyzer.cascade:
+                print(f"  级联模式：{llm_analyzer.triage_model} 初筛相关性，达标文章再由 {model} 完整分析")
             print(f"  功能：相关性判断 + 重要性评分 + 分类建议 + 摘要生成")
         except Exception as e:
             print(f"⚠️  LLM分析器初始化失败: {e}")
             print(f"  将使用传统评分系统")
 
     # 初始化评分和分类系统
-    scorer = PriorityScorer()
+    try:
+        scorer = load_scorer(args.scoring)
+    except Exception as e:
+        print(f"⚠️  评分配置加载失败: {e}，使用内置评分规则")
+        scorer = PriorityScorer()
     classifier = CategoryClassifier()
-    print(f"✓ 评分和分类系统已启用")
+    if isinstance(scorer, ScoringEngine):
+        print(f"✓ 评分和分类系统已启用（评分配置 {args.scoring}，修改后自动重新加载）")
+    else:
+        print(f"✓ 评分和分类系统已启用（内置评分规则）")
+
+    # 加载本地相关性模型（预判明确相关/不相关的文章，减少LLM调用）
+    relevance_model = None
+    if not args.no_relevance_model:
+        try:
+            relevance_model = load_model_if_exists(args.relevance_model)
+        except Exception as e:
+            print(f"⚠️  相关性模型加载失败: {e}")
+        if relevance_model:
+            print(f"✓ 本地相关性模型已启用（拒绝 < {relevance_model.low_threshold:.2f}，"
+                  f"接受 ≥ {relevance_model.high_threshold:.2f}）")
+
+    # 加载实体词典（抽取公司/区域，写入article_entities）
+    entity_extractor = None
+    if not args.no_entities:
+        try:
+            entity_extractor = load_extractor_if_exists(args.entities)
+        except Exception as e:
+            print(f"⚠️  实体词典加载失败: {e}")
+        if entity_extractor:
+            print(f"✓ 实体抽取已启用（词典 {len(entity_extractor)} 个实体）")
 
     # 开始采集
     print(f"\n{'='*80}")
@@ -284,10 +415,45 @@ def main():
 
     all_stats = []
 
-    for i, source in enumerate(sources, 1):
-        print(f"\n[{i}/{len(sources)}] ", end="")
-        stats = collect_from_source(source, db, llm_analyzer, scorer, classifier, args.limit)
-        all_stats.append(stats)
+    # 续采：已完成的源直接沿用上次的统计
+    if completed_sources:
+        for source in sources:
+            if source['name'] in completed_sources:
+                stats = dict(completed_sources[source['name']], resumed=True)
+                all_stats.append(stats)
+                record_source_stats(metrics, stats)
+        sources = [s for s in sources if s['name'] not in completed_sources]
+        print(f"  跳过已完成的源，剩余 {len(sources)} 个")
+
+    if args.pipeline:
+        pipeline_stats = run_pipeline(args, sources, llm_analyzer, scorer, classifier, relevance_model,
+                                      archive, archive_run_id, metrics, run_id, llm_cache,
+                                      entity_extractor)
+        # 各源处理完时已由流水线写入运行日志
+        for stats in pipeline_stats:
+            all_stats.append(stats)
+            record_source_stats(metrics, stats)
+    else:
+        for i, source in enumerate(sources, 1):
+            print(f"\n[{i}/{len(sources)}] ", end="")
+            stats = collect_from_source(source, db, llm_analyzer, scorer, classifier, args.limit,
+                                        archive=archive, run_id=archive_run_id,
+                                        replay=bool(args.replay), metrics=metrics,
+                                        relevance_model=relevance_model,
+                                        journal_run_id=run_id, llm_cache=llm_cache,
+                                        entity_extractor=entity_extractor)
+            all_stats.append(stats)
+            record_source_stats(metrics, stats)
+            # 记录已完成的源（失败的源在续采时重试）
+            if stats['status'] in ('success', 'no_articles'):
+                db.save_run_source(run_id, stats)
+
+    if llm_analyzer:
+        usage = llm_analyzer.token_usage.to_dict()
+        metrics.incr('llm_prompt_tokens', usage['prompt_tokens'])
+        metrics.incr('llm_completion_tokens', usage['completion_tokens'])
+        metrics.incr('llm_saved_tokens', usage['saved_tokens'])
+    metrics.finish()
 
     # 汇总统计
     print(f"\n{'='*80}")
@@ -297,6 +463,8 @@ def main():
     total_fetched = sum(s['fetched'] for s in all_stats)
     total_quick_filtered = sum(s.get('quick_filtered', 0) for s in all_stats)
     total_llm_rejected = sum(s.get('llm_rejected', 0) for s in all_stats)
+    total_model_rejected = sum(s.get('model_rejected', 0) for s in all_stats)
+    total_model_accepted = sum(s.get('model_accepted', 0) for s in all_stats)
     total_stored = sum(s['stored'] for s in all_stats)
     total_duplicates = sum(s['duplicates'] for s in all_stats)
     success_count = sum(1 for s in all_stats if s['status'] == 'success')
@@ -313,11 +481,17 @@ def main():
     print(f"  采集文章: {total_fetched} 篇")
     print(f"  快速过滤: {total_quick_filtered} 篇（负面关键词）")
     print(f"  LLM拒绝: {total_llm_rejected} 篇（相关性<8分）")
+    if relevance_model:
+        print(f"  模型拒绝: {total_model_rejected} 篇，模型直接接受: {total_model_accepted} 篇（未调用LLM）")
     print(f"  成功存储: {total_stored} 篇")
     print(f"  重复跳过: {total_duplicates} 篇")
     if avg_llm > 0:
         print(f"  平均LLM评分: {avg_llm:.1f}/50")
         print(f"  平均相关性: {avg_relevance:.1f}/20")
+    if llm_analyzer and llm_analyzer.token_usage.calls:
+        usage = llm_analyzer.token_usage.to_dict()
+        print(f"  LLM token: 输入 {usage['prompt_tokens']} / 输出 {usage['completion_tokens']}"
+              f"（内容压缩节省 {usage['saved_tokens']}，平均每次 {usage['prompt_tokens'] // usage['calls']}）")
 
     # 按源统计
     print(f"\n按源统计:")
@@ -340,11 +514,32 @@ def main():
     for source, count in sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:10]:
         print(f"    {source}: {count} 篇")
 
+    # 阶段耗时与运行报告
+    report = metrics.to_dict()
+    print(f"\n阶段耗时（运行 {run_id}，总耗时 {report['duration_seconds']:.1f}秒）:")
+    for stage, h in sorted(report['stages'].items(), key=lambda x: x[1]['sum'], reverse=True):
+        print(f"  {stage:<15} 合计 {h['sum']:>8.2f}秒  次数 {h['count']:>5}  平均 {h['avg']:.3f}秒  最大 {h['max']:.3f}秒")
+
+    db.save_run(report, status='success' if success_count else 'failed')
+    report_path = metrics.write_json(str(Path(args.run_report_dir) / f"{run_id}.json"))
+    print(f"✓ 运行报告: {report_path}")
+    if args.prometheus_textfile:
+        metrics.write_prometheus(args.prometheus_textfile)
+        print(f"✓ Prometheus指标: {args.prometheus_textfile}")
+
     db.close()
 
+    if args.record:
+        print(f"\n✓ 页面已存档，运行ID: {archive_run_id}")
+        print(f"  回放: python3 run_collection.py --replay {archive_run_id}")
+
     print(f"\n结束时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80)
 
+    if not success_count:
+        # 非零退出码：调度器据此用 --resume 重试
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
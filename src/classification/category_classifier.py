@@ -8,9 +8,19 @@
 4. 市场动态
 
 每篇文章可属于多个类别，按优先级排序：投资 > 技术 > 政策 > 市场
+
+classify() 按关键词是否出现给出类别；classify_many() 批量计算各类别的加权得分
+（关键词出现次数 × 权重，标题中的出现额外加权），用于LLM不可用时的降级分类。
+批量计算使用预先构建的"关键词 -> 类别"稀疏矩阵：出现在多个类别中的关键词只统计一次次数，
+再按矩阵的非零项分配到各类别。
+
+match_mode='segment' 时关键词在分词结果中匹配（见 src/processing/segmenter.py），
+"线上线下"不再命中"上线"、"OPEN"不再命中"PE"；分词结果与评分器共用缓存。
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.processing.segmenter import MATCH_SEGMENT, check_match_mode, get_segmenter
 
 
 class CategoryClassifier:
@@ -57,6 +67,47 @@ class CategoryClassifier:
     # 分类优先级
     CATEGORY_PRIORITY = ['投资', '技术', '政策', '市场']
 
+    # 加权得分：泛化程度高、单独出现不足以判定类别的关键词降权（未列出的为1.0）
+    KEYWORD_WEIGHTS = {
+        '发布': 0.5, '推出': 0.5, '技术': 0.5, '创新': 0.5, '性能': 0.5, '效率': 0.5, '优化': 0.5,
+        '国家': 0.5, '政府': 0.5, '部门': 0.5, '要求': 0.5, '意见': 0.5, '指导': 0.5, '通知': 0.5,
+        '市场': 0.5, '增长': 0.5, '分析': 0.5, '研究': 0.5, '需求': 0.5, '资本': 0.5,
+    }
+    # 标题中出现的关键词权重倍数
+    TITLE_BOOST = 3.0
+    # 降级分类：得分不低于MIN_LABEL_SCORE且不低于最高得分×LABEL_SHARE的类别入选
+    MIN_LABEL_SCORE = 1.0
+    LABEL_SHARE = 0.4
+
+    def __init__(self, match_mode: Optional[str] = None):
+        """
+        Args:
+            match_mode: 关键词匹配模式，'substring'（子串）或 'segment'（分词后匹配），
+                默认读取环境变量KEYWORD_MATCH_MODE（默认substring）
+        """
+        self._matrix = self._build_matrix()
+        self._rows = dict(self._matrix)
+        self.match_mode = check_match_mode(match_mode)
+        self._segmenter = None
+        if self.match_mode == MATCH_SEGMENT:
+            self._segmenter = get_segmenter()
+            self._segmenter.add_keywords(self._rows)
+
+    def _build_matrix(self) -> Tuple[Tuple[str, Tuple[Tuple[int, float], ...]], ...]:
+        """
+        构建关键词-类别稀疏矩阵（按行压缩：每个关键词一行，只存非零的(类别下标, 权重)）
+        """
+        groups = [
+            self.INVESTMENT_KEYWORDS, self.TECHNOLOGY_KEYWORDS, self.POLICY_KEYWORDS, self.MARKET_KEYWORDS,
+        ]
+        rows: Dict[str, List[Tuple[int, float]]] = {}
+        for index, keywords in enumerate(groups):
+            for keyword in keywords:
+                row = rows.setdefault(keyword, [])
+                if all(i != index for i, _ in row):
+                    row.append((index, self.KEYWORD_WEIGHTS.get(keyword, 1.0)))
+        return tuple((keyword, tuple(row)) for keyword, row in rows.items())
+
     def classify(self, title: Optional[str], content: Optional[str]) -> List[str]:
         """
         分类文章内容
@@ -73,7 +124,10 @@ class CategoryClassifier:
         if not content:
             content = ""
 
-        text = title + " " + content
+        if self._segmenter is not None:
+            text = self._segmenter.keywords_in(title, content)
+        else:
+            text = title + " " + content
         categories = []
 
         # 检查投资类
@@ -98,9 +152,70 @@ class CategoryClassifier:
 
         return categories
 
-    def _has_keywords(self, text: str, keywords: List[str]) -> bool:
-        """检查文本中是否包含任意关键词"""
+    def _has_keywords(self, text, keywords: List[str]) -> bool:
+        """检查文本（或分词模式下的关键词集合）中是否包含任意关键词"""
         for keyword in keywords:
             if keyword in text:
                 return True
         return False
+
+    def classify_many(self, articles: Iterable[Dict]) -> List[Dict[str, float]]:
+        """
+        批量计算各类别的加权得分
+
+        得分 = Σ 关键词在正文中的出现次数 × 权重 + Σ 关键词在标题中的出现次数 × 权重 × TITLE_BOOST
+
+        Args:
+            articles: 文章字典（title、content，没有content时使用summary）
+
+        Returns:
+            与输入顺序一致的 {类别: 得分}（只含得分大于0的类别，按CATEGORY_PRIORITY排序）
+        """
+        labels = self.CATEGORY_PRIORITY
+        matrix = self._matrix
+        boost = self.TITLE_BOOST
+        results = []
+        for article in articles:
+            title = article.get('title') or ''
+            body = article.get('content') or article.get('summary') or ''
+            if self._segmenter is not None:
+                results.append(self._segmented_scores(title, body))
+                continue
+            text = title + '\n' + body
+            scores = [0.0] * len(labels)
+            for keyword, row in matrix:
+                # 先对全文做一次子串判断：绝大多数关键词不出现，count只对命中的关键词执行
+                if keyword not in text:
+                    continue
+                hits = body.count(keyword) + title.count(keyword) * boost
+                for index, weight in row:
+                    scores[index] += hits * weight
+            results.append({labels[i]: round(score, 2) for i, score in enumerate(scores) if score > 0})
+        return results
+
+    def _segmented_scores(self, title: str, body: str) -> Dict[str, float]:
+        """分词模式的单篇得分：只遍历分词后出现的关键词"""
+        labels = self.CATEGORY_PRIORITY
+        scores = [0.0] * len(labels)
+        for counts, factor in ((self._segmenter.keyword_counts(body), 1.0),
+                               (self._segmenter.keyword_counts(title), self.TITLE_BOOST)):
+            for keyword, hits in counts.items():
+                for index, weight in self._rows.get(keyword, ()):
+                    scores[index] += hits * factor * weight
+        return {labels[i]: round(score, 2) for i, score in enumerate(scores) if score > 0}
+
+    def select_labels(self, scores: Dict[str, float]) -> List[str]:
+        """
+        按得分选出类别（降级分类使用）
+
+        Args:
+            scores: classify_many()返回的单篇得分
+
+        Returns:
+            类别列表（按CATEGORY_PRIORITY排序），没有达到阈值的类别时为["其他"]
+        """
+        if not scores:
+            return ['其他']
+        cutoff = max(self.MIN_LABEL_SCORE, max(scores.values()) * self.LABEL_SHARE)
+        selected = [label for label in self.CATEGORY_PRIORITY if scores.get(label, 0) >= cutoff]
+        return selected or ['其他']
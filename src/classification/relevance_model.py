@@ -0,0 +1,421 @@
+"""
+本地相关性模型
+
+在调用LLM之前对文章做低成本的相关性预判：
+- 特征：标题/内容的字符n-gram（1-3元），哈希到固定维度（无需词表和分词）
+- 模型：逻辑回归（纯Python随机梯度下降训练，无第三方依赖）
+- 标签：LLM相关性评分 ≥ 8 为相关（与采集流程的拒绝阈值一致）
+
+预测概率低于low_threshold直接拒绝、高于high_threshold直接接受，
+只有中间的不确定区间才交给LLM判定。阈值在留出集上按允许的误判率选取。
+"""
+
+import json
+import math
+import random
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# 相关性标签阈值（LLM相关性评分 ≥ 8 视为相关）
+RELEVANCE_THRESHOLD = 8
+
+DEFAULT_MODEL_PATH = 'data/models/relevance_model.json'
+
+# 路由结果
+ROUTE_REJECT = 'reject'
+ROUTE_ACCEPT = 'accept'
+ROUTE_UNCERTAIN = 'uncertain'
+
+
+class RelevanceModel:
+    """哈希字符n-gram逻辑回归相关性模型"""
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 18,
+        ngram_range: Tuple[int, int] = (1, 3),
+        content_chars: int = 300,
+        low_threshold: float = 0.0,
+        high_threshold: float = 1.0,
+    ):
+        """
+        Args:
+            n_features: 哈希空间维度
+            ngram_range: 字符n-gram范围（含两端）
+            content_chars: 参与特征提取的内容前缀长度
+            low_threshold: 低于该概率直接拒绝（0表示从不拒绝）
+            high_threshold: 不低于该概率直接接受（1表示从不接受）
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.content_chars = content_chars
+        self.low_threshold = low_threshold
+        self.high_threshold = high_threshold
+        self.bias = 0.0
+        self.weights: Dict[int, float] = {}
+        self.meta: Dict = {}
+
+    # ---------- 特征 ----------
+
+    def featurize(self, title: str, content: str = '') -> Dict[int, float]:
+        """
+        提取哈希特征（L2归一化的二值特征）
+
+        标题与内容的n-gram使用不同前缀，使同一片段在标题中出现时可以有更高的权重。
+
+        Args:
+            title: 文章标题
+            content: 文章内容或摘要
+
+        Returns:
+            {特征索引: 特征值}
+        """
+        indices = set()
+        for prefix, text in (('t', title or ''), ('c', (content or '')[:self.content_chars])):
+            text = ''.join(text.lower().split())
+            lo, hi = self.ngram_range
+            for n in range(lo, hi + 1):
+                for i in range(len(text) - n + 1):
+                    key = f'{prefix}:{text[i:i + n]}'
+                    indices.add(zlib.crc32(key.encode('utf-8')) % self.n_features)
+
+        if not indices:
+            return {}
+        value = 1.0 / math.sqrt(len(indices))
+        return {idx: value for idx in indices}
+
+    # ---------- 预测 ----------
+
+    def _margin(self, features: Dict[int, float]) -> float:
+        weights = self.weights
+        return self.bias + sum(weights.get(i, 0.0) * v for i, v in features.items())
+
+    @staticmethod
+    def _sigmoid(z: float) -> float:
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        ez = math.exp(z)
+        return ez / (1.0 + ez)
+
+    def predict_proba(self, title: str, content: str = '') -> float:
+        """
+        预测文章相关的概率
+
+        Args:
+            title: 文章标题
+            content: 文章内容或摘要
+
+        Returns:
+            0-1之间的概率
+        """
+        return self._sigmoid(self._margin(self.featurize(title, content)))
+
+    def route(self, probability: float) -> str:
+        """
+        根据概率决定处理方式
+
+        Returns:
+            'reject'（直接拒绝）/ 'accept'（直接接受）/ 'uncertain'（交给LLM）
+        """
+        if probability < self.low_threshold:
+            return ROUTE_REJECT
+        if probability >= self.high_threshold:
+            return ROUTE_ACCEPT
+        return ROUTE_UNCERTAIN
+
+    # ---------- 训练 ----------
+
+    def fit(
+        self,
+        samples: Sequence[Tuple[str, str]],
+        labels: Sequence[int],
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        seed: int = 42,
+    ) -> 'RelevanceModel':
+        """
+        随机梯度下降训练
+
+        正负样本按频率反比加权，避免已入库文章（多为相关）占多数时模型偏向接受。
+
+        Args:
+            samples: [(标题, 内容), ...]
+            labels: 0/1标签
+            epochs: 训练轮数
+            learning_rate: 初始学习率（按1/sqrt(t)衰减）
+            l2: L2正则系数
+            seed: 随机种子
+
+        Returns:
+            self
+        """
+        features = [self.featurize(t, c) for t, c in samples]
+        positives = sum(labels)
+        negatives = len(labels) - positives
+        class_weight = {
+            1: len(labels) / (2.0 * positives) if positives else 1.0,
+            0: len(labels) / (2.0 * negatives) if negatives else 1.0,
+        }
+
+        rng = random.Random(seed)
+        order = list(range(len(features)))
+        weights = self.weights
+        step = 0
+
+        for _ in range(epochs):
+            rng.shuffle(order)
+            for idx in order:
+                step += 1
+                lr = learning_rate / math.sqrt(1 + step / max(1, len(order)))
+                x, y = features[idx], labels[idx]
+                error = (self._sigmoid(self._margin(x)) - y) * class_weight[y]
+
+                self.bias -= lr * error
+                for i, v in x.items():
+                    w = weights.get(i, 0.0)
+                    weights[i] = w - lr * (error * v + l2 * w)
+
+        self.meta = {
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'n_samples': len(labels),
+            'n_positive': positives,
+            'n_negative': negatives,
+        }
+        return self
+
+    # ---------- 持久化 ----------
+
+    def to_dict(self) -> Dict:
+        return {
+            'version': 1,
+            'n_features': self.n_features,
+            'ngram_range': list(self.ngram_range),
+            'content_chars': self.content_chars,
+            'low_threshold': self.low_threshold,
+            'high_threshold': self.high_threshold,
+            'bias': self.bias,
+            # 稀疏存储，忽略接近0的权重
+            'weights': {str(i): round(w, 6) for i, w in self.weights.items() if abs(w) >= 1e-6},
+            'meta': self.meta,
+        }
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> str:
+        """保存模型为JSON文件"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        tmp.replace(path)
+        return str(path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'RelevanceModel':
+        """从JSON文件加载模型"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        model = cls(
+            n_features=data['n_features'],
+            ngram_range=tuple(data['ngram_range']),
+            content_chars=data.get('content_chars', 300),
+            low_threshold=data.get('low_threshold', 0.0),
+            high_threshold=data.get('high_threshold', 1.0),
+        )
+        model.bias = data['bias']
+        model.weights = {int(i): w for i, w in data['weights'].items()}
+        model.meta = data.get('meta', {})
+        return model
+
+
+def label_from_score(relevance_score: int) -> int:
+    """LLM相关性评分转为0/1标签"""
+    return 1 if relevance_score >= RELEVANCE_THRESHOLD else 0
+
+
+def choose_thresholds(
+    probs: Sequence[float],
+    labels: Sequence[int],
+    max_error: float = 0.02,
+    min_support: int = 10,
+) -> Tuple[float, float]:
+    """
+    按允许的误判率选择路由阈值
+
+    low_threshold：低于该概率的样本中，相关文章占比（误拒率）不超过max_error的最大阈值
+    high_threshold：不低于该概率的样本中，不相关文章占比（误收率）不超过max_error的最小阈值
+    两个阈值分别不超过/不低于0.5。
+
+    Args:
+        probs: 预测概率
+        labels: 真实标签
+        max_error: 允许的误判率
+        min_support: 区间内最少样本数（样本过少时不启用该侧路由）
+
+    Returns:
+        (low_threshold, high_threshold)
+    """
+    pairs = sorted(zip(probs, labels))
+    n = len(pairs)
+
+    low = 0.0
+    positives = 0
+    for i, (p, y) in enumerate(pairs):
+        positives += y
+        count = i + 1
+        # 阈值取下一个样本的概率，保证区间恰好包含前count个样本
+        if count >= min_support and positives / count <= max_error:
+            low = pairs[i + 1][0] if i + 1 < n else 1.0
+    high = 1.0
+    negatives = 0
+    for i in range(n - 1, -1, -1):
+        p, y = pairs[i]
+        negatives += 1 - y
+        count = n - i
+        if count >= min_support and negatives / count <= max_error:
+            high = p
+
+    # 不直接接受模型认为更可能不相关的文章，反之亦然
+    return min(low, 0.5), max(high, 0.5)
+
+
+def calibration_report(
+    probs: Sequence[float],
+    labels: Sequence[int],
+    low_threshold: float = 0.0,
+    high_threshold: float = 1.0,
+    n_bins: int = 10,
+) -> Dict:
+    """
+    生成校准报告
+
+    Args:
+        probs: 预测概率
+        labels: 真实标签
+        low_threshold: 拒绝阈值
+        high_threshold: 接受阈值
+        n_bins: 分箱数
+
+    Returns:
+        {'n', 'brier', 'log_loss', 'accuracy', 'bins': [...], 'routing': {...}}
+    """
+    n = len(probs)
+    bins = []
+    for b in range(n_bins):
+        lo, hi = b / n_bins, (b + 1) / n_bins
+        members = [(p, y) for p, y in zip(probs, labels)
+                   if lo <= p < hi or (b == n_bins - 1 and p == 1.0)]
+        if members:
+            bins.append({
+                'range': (lo, hi),
+                'count': len(members),
+                'mean_predicted': sum(p for p, _ in members) / len(members),
+                'observed_rate': sum(y for _, y in members) / len(members),
+            })
+
+    eps = 1e-12
+    rejected = [y for p, y in zip(probs, labels) if p < low_threshold]
+    accepted = [y for p, y in zip(probs, labels) if p >= high_threshold]
+
+    return {
+        'n': n,
+        'brier': sum((p - y) ** 2 for p, y in zip(probs, labels)) / n if n else 0.0,
+        'log_loss': -sum(
+            y * math.log(max(p, eps)) + (1 - y) * math.log(max(1 - p, eps))
+            for p, y in zip(probs, labels)
+        ) / n if n else 0.0,
+        'accuracy': sum((p >= 0.5) == bool(y) for p, y in zip(probs, labels)) / n if n else 0.0,
+        'bins': bins,
+        'routing': {
+            'low_threshold': low_threshold,
+            'high_threshold': high_threshold,
+            'rejected': len(rejected),
+            'accepted': len(accepted),
+            'uncertain': n - len(rejected) - len(accepted),
+            'llm_call_reduction': (len(rejected) + len(accepted)) / n if n else 0.0,
+            # 误拒：被直接拒绝的相关文章；误收：被直接接受的不相关文章
+            'false_rejects': sum(rejected),
+            'false_accepts': len(accepted) - sum(accepted),
+        },
+    }
+
+
+def format_calibration_report(report: Dict) -> str:
+    """格式化校准报告为文本"""
+    lines = [
+        f"样本数: {report['n']}",
+        f"Brier分数: {report['brier']:.4f}  对数损失: {report['log_loss']:.4f}  "
+        f"准确率(0.5): {report['accuracy']:.1%}",
+        '',
+        '校准分箱:',
+        f"  {'概率区间':<14}{'样本':>6}{'平均预测':>10}{'实际相关率':>12}",
+    ]
+    for b in report['bins']:
+        lo, hi = b['range']
+        lines.append(
+            f"  [{lo:.1f}, {hi:.1f}){'':<4}{b['count']:>6}{b['mean_predicted']:>10.3f}{b['observed_rate']:>12.3f}"
+        )
+
+    r = report['routing']
+    lines += [
+        '',
+        f"路由阈值: 拒绝 < {r['low_threshold']:.3f}，接受 ≥ {r['high_threshold']:.3f}",
+        f"  直接拒绝 {r['rejected']} 篇（误拒 {r['false_rejects']}）",
+        f"  直接接受 {r['accepted']} 篇（误收 {r['false_accepts']}）",
+        f"  交给LLM {r['uncertain']} 篇",
+        f"  LLM调用减少: {r['llm_call_reduction']:.1%}",
+    ]
+    return '\n'.join(lines)
+
+
+def load_model_if_exists(path: str = DEFAULT_MODEL_PATH) -> Optional['RelevanceModel']:
+    """模型文件存在时加载，否则返回None"""
+    if not Path(path).exists():
+        return None
+    return RelevanceModel.load(path)
+
+
+def train_from_records(
+    records: List[Dict],
+    holdout: float = 0.2,
+    max_error: float = 0.02,
+    seed: int = 42,
+    **fit_kwargs,
+) -> Tuple['RelevanceModel', Dict]:
+    """
+    从标注记录训练模型并在留出集上选择阈值
+
+    Args:
+        records: [{'title', 'content', 'relevance_score'}, ...]
+        holdout: 留出集比例
+        max_error: 允许的误判率
+        seed: 随机种子
+
+    Returns:
+        (模型, 留出集校准报告)
+    """
+    rows = list(records)
+    random.Random(seed).shuffle(rows)
+    split = max(1, int(len(rows) * (1 - holdout)))
+    train, test = rows[:split], rows[split:] or rows[:split]
+
+    model = RelevanceModel()
+    model.fit(
+        [(r['title'], r.get('content') or '') for r in train],
+        [label_from_score(r['relevance_score']) for r in train],
+        seed=seed,
+        **fit_kwargs,
+    )
+
+    probs = [model.predict_proba(r['title'], r.get('content') or '') for r in test]
+    labels = [label_from_score(r['relevance_score']) for r in test]
+    model.low_threshold, model.high_threshold = choose_thresholds(probs, labels, max_error)
+    model.meta['holdout'] = len(test)
+    model.meta['max_error'] = max_error
+
+    report = calibration_report(probs, labels, model.low_threshold, model.high_threshold)
+    return model, report
@@ -388,8 +388,8 @@ def generate_html_report(
     # 生成各部分HTML
     sections_html = ''
     for section in report_data['sections']:
-        # 跳过统计章节
-        if '统计' in section['title']:
+        # 跳过统计和趋势对比章节（卡片布局不展示）
+        if '统计' in section['title'] or '趋势' in section['title']:
             continue
         sections_html += generate_section_html(section)
 
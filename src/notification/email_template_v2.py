@@ -31,12 +31,14 @@ def parse_weekly_report(markdown_content: str) -> Dict:
         'week': '',
         'executive_summary': '',  # 新增：整体总结
         'sections': [],
+        'trends': [],  # 趋势对比（每项一行）
         'stats': {}
     }
 
     current_section = None
     current_article = None
     in_executive_summary = False  # 新增：标记是否在读取整体总结
+    in_trends = False  # 标记是否在读取趋势对比
 
     for line in lines:
         line = line.strip()
@@ -61,9 +63,21 @@ def parse_weekly_report(markdown_content: str) -> Dict:
             current_article = None
             continue
 
+        # 提取趋势对比（不作为文章板块）
+        elif line.startswith('## ') and '趋势' in line:
+            in_executive_summary = False
+            in_trends = True
+            current_section = None
+            current_article = None
+            continue
+
+        elif in_trends and line.startswith('- '):
+            result['trends'].append(line[2:].replace('**', '').strip())
+
         # 提取章节
         elif line.startswith('## '):
             in_executive_summary = False  # 结束整体总结
+            in_trends = False
             section_title = line[3:].strip()
             current_section = {
                 'title': section_title,
@@ -297,6 +311,27 @@ def generate_executive_summary_html(summary: str) -> str:
     '''
 
 
+def generate_trends_html(trends: List[str]) -> str:
+    """生成趋势对比HTML"""
+    if not trends:
+        return ''
+
+    items_html = ''.join(
+        f'<li style="margin: 6px 0;">{item}</li>' for item in trends
+    )
+    return f'''
+    <div style="background-color: #f8f9fa; border-radius: 12px; padding: 25px; margin: 20px 0;
+                border: 1px solid #e9ecef;">
+        <h3 style="margin: 0 0 15px 0; color: #2c3e50; font-size: 20px; font-weight: 600;">
+            📈 趋势对比
+        </h3>
+        <ul style="margin: 0; padding-left: 20px; color: #34495e; font-size: 14px; line-height: 1.7;">
+            {items_html}
+        </ul>
+    </div>
+    '''
+
+
 def generate_stats_dashboard(stats: Dict) -> str:
     """生成统计仪表板"""
 
@@ -356,6 +391,9 @@ def generate_html_report(
         if '统计' not in section['title'] and '概览' not in section['title']:
             sections_html += generate_section_block_html(section)
 
+    # 生成趋势对比
+    trends_html = generate_trends_html(report_data['trends'])
+
     # 生成统计仪表板
     stats_html = generate_stats_dashboard(report_data['stats']) if report_data['stats'] else ''
 
@@ -388,6 +426,7 @@ def generate_html_report(
         <div style="padding: 30px;">
             {executive_summary_html}
             {sections_html}
+            {trends_html}
             {stats_html}
         </div>
 
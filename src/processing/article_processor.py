@@ -0,0 +1,275 @@
+"""
+单篇文章处理步骤
+
+采集流程对每篇文章依次执行：
+1. 预过滤：负面关键词快速过滤 + 本地相关性模型预判
+2. LLM分析：相关性/重要性/分类/摘要（相关性<8分拒绝，LLM不可用时降级为默认值）
+3. 评分：传统评分系统（整合LLM评分）和实体抽取，生成入库记录
+
+串行采集（run_collection.collect_from_source）和流水线采集（src.processing.pipeline）
+共用这些步骤；数据库读写由调用方负责。
+"""
+
+from datetime import date
+from typing import Dict, Optional
+
+from src.storage.database import Database
+from src.utils.metrics import NullMetrics
+
+
+# 负面关键词（快速过滤明显不相关的内容）
+NEGATIVE_KEYWORDS = ['白酒', '房地产', '汽车销售', '娱乐', '影视',
+                     '游戏', '餐饮', '零售', '服装', '美妆', '食品']
+
+# LLM相关性低于该分数的文章被拒绝
+LLM_RELEVANCE_THRESHOLD = 8
+
+
+def new_source_stats(source: Dict) -> Dict:
+    """创建单个源的统计字典"""
+    return {
+        'source': source['name'],
+        'tier': source['tier'],
+        'status': 'pending',
+        'fetched': 0,
+        'quick_filtered': 0,  # 快速过滤数量
+        'llm_rejected': 0,    # LLM拒绝数量（相关性<8）
+        'model_rejected': 0,  # 本地模型拒绝数量
+        'model_accepted': 0,  # 本地模型直接接受数量（未调用LLM）
+        'stored': 0,
+        'duplicates': 0,
+        'errors': 0,
+        'avg_llm_score': 0,   # 平均LLM评分
+        'avg_relevance': 0    # 平均相关性评分
+    }
+
+
+class ArticleProcessor:
+    """单篇文章处理器（线程安全，可被多个工作线程共享）"""
+
+    def __init__(self, llm_analyzer=None, scorer=None, classifier=None,
+                 relevance_model=None, metrics=None, llm_cache: Optional[Dict[str, Dict]] = None,
+                 entity_extractor=None):
+        """
+        Args:
+            llm_analyzer: LLM分析器（可选）
+            scorer: 优先级评分引擎（可选）
+            classifier: 关键词分类器（可选，LLM不可用、调用失败或模型直接接受时分类）
+            relevance_model: 本地相关性模型（可选）
+            metrics: 运行指标（可选）
+            llm_cache: 已有的LLM分析结果 {url_hash: llm_result}（续采时复用，不再调用LLM）
+            entity_extractor: 实体抽取器（可选，EntityExtractor）
+        """
+        self.llm_analyzer = llm_analyzer
+        self.scorer = scorer
+        self.classifier = classifier
+        self.relevance_model = relevance_model
+        self.metrics = metrics or NullMetrics()
+        self.llm_cache = llm_cache or {}
+        self.entity_extractor = entity_extractor
+
+    def prefilter(self, article: Dict) -> Dict:
+        """
+        预过滤
+
+        Returns:
+            {
+                'outcome': 'invalid' | 'quick_filtered' | 'model_rejected' | 'pass',
+                'route': 本地模型路由结果（未启用模型时为None）,
+                'probability': 本地模型预测概率,
+                'llm_content': 送入LLM的内容
+            }
+        """
+        result = {'outcome': 'pass', 'route': None, 'probability': None, 'llm_content': ''}
+
+        if not article.get('title') or not article.get('url'):
+            result['outcome'] = 'invalid'
+            return result
+
+        # 快速预过滤（负面关键词）
+        title_lower = article['title'].lower()
+        if any(keyword in title_lower for keyword in NEGATIVE_KEYWORDS):
+            result['outcome'] = 'quick_filtered'
+            return result
+
+        result['llm_content'] = article.get('summary', article.get('content', article['title']))
+
+        # 本地相关性模型预判（只有不确定的文章才调用LLM）
+        if self.relevance_model:
+            with self.metrics.timer('relevance_model'):
+                probability = self.relevance_model.predict_proba(article['title'], result['llm_content'])
+                result['route'] = self.relevance_model.route(probability)
+                result['probability'] = probability
+            if result['route'] == 'reject':
+                result['outcome'] = 'model_rejected'
+
+        return result
+
+    def analyze(self, article: Dict, prefiltered: Dict) -> Dict:
+        """
+        LLM智能分析（整合：相关性+重要性+分类+摘要）
+
+        Args:
+            article: 文章
+            prefiltered: prefilter()的结果
+
+        Returns:
+            {
+                'outcome': 'llm_ok' | 'llm_rejected' | 'model_accepted' | 'fallback',
+                'llm_result': LLM评分结果（降级时为默认值）,
+                'summary': 摘要,
+                'category': 分类,
+                'label': 待记录的LLM相关性判定（无则为None）,
+                'journal': 待写入运行日志的LLM分析结果（复用缓存或降级时为None）,
+                'cached': 是否复用了已有的LLM分析结果,
+                'llm_error': LLM调用异常信息
+            }
+        """
+        route = prefiltered.get('route')
+        probability = prefiltered.get('probability')
+        result = {'outcome': 'fallback', 'llm_result': None, 'summary': '', 'category': '其他',
+                  'label': None, 'journal': None, 'cached': False, 'llm_error': None}
+
+        llm_result = None
+        cached = self.llm_cache.get(Database.generate_url_hash(article['url']))
+        if route == 'accept':
+            result['outcome'] = 'model_accepted'
+        elif cached is not None:
+            llm_result = cached
+            result['cached'] = True
+        elif self.llm_analyzer:
+            try:
+                self.metrics.incr('llm_calls')
+                with self.metrics.timer('llm'):
+                    llm_result = self.llm_analyzer.analyze_article(
+                        title=article['title'],
+                        content=prefiltered['llm_content']
+                    )
+            except Exception as e:
+                result['llm_error'] = str(e)
+            if llm_result and llm_result.get('is_default'):
+                # 分析器内部出错时返回默认评分（不抛异常）：按调用失败处理，走关键词分类
+                result['llm_error'] = llm_result['reason']
+
+            # 记录LLM判定（含拒绝），作为本地相关性模型的训练数据和续采缓存
+            if llm_result and not llm_result.get('is_default'):
+                result['journal'] = llm_result
+                result['label'] = {
+                    'url': article['url'],
+                    'title': article['title'],
+                    'relevance_score': llm_result['relevance_score'],
+                    'content': prefiltered['llm_content'],
+                }
+
+        if llm_result and not llm_result.get('is_default'):
+            # 相关性阈值过滤（<8分拒绝）
+            if llm_result['relevance_score'] < LLM_RELEVANCE_THRESHOLD:
+                if llm_result.get('cascade_stage') == 'triage' and not result['cached']:
+                    self.metrics.incr('llm_triage_rejected')
+                if llm_result.get('stream_aborted') and not result['cached']:
+                    self.metrics.incr('llm_stream_aborted')
+                result.update(outcome='llm_rejected', llm_result=llm_result)
+                return result
+
+            # 使用LLM生成的摘要和分类
+            result.update(outcome='llm_ok', llm_result=llm_result,
+                          summary=llm_result['summary'], category=llm_result['category'])
+            return result
+
+        # LLM降级处理（不可用、调用失败或模型直接接受）：按关键词加权得分分类
+        summary = article.get('summary', '')
+        category = "其他"
+        reason = 'LLM不可用，使用默认值'
+        if route == 'accept':
+            reason = f'本地模型判定相关（{probability:.2f}），使用默认值'
+        if self.classifier:
+            with self.metrics.timer('classify'):
+                scores = self.classifier.classify_many([
+                    {'title': article['title'], 'content': article.get('content') or summary}
+                ])[0]
+            category = ','.join(self.classifier.select_labels(scores))
+
+        result.update(summary=summary, category=category, llm_result={
+            'relevance_score': 10,
+            'importance_score': 10,
+            'category_score': 5,
+            'total_score': 20,
+            'category': category,
+            'reason': reason
+        })
+        return result
+
+    def build_record(self, article: Dict, source: Dict, analysis: Dict) -> Dict:
+        """
+        调用传统评分系统（整合LLM评分），生成入库记录
+
+        Args:
+            article: 文章
+            source: 媒体源配置
+            analysis: analyze()的结果
+
+        Returns:
+            Database.insert_article()的关键字参数
+        """
+        llm_result = analysis['llm_result']
+        publish_date = article.get('publish_date', date.today())
+
+        if self.scorer:
+            with self.metrics.timer('score'):
+                score_result = self.scorer.calculate_total_score(
+                    title=article['title'],
+                    content=article.get('content', ''),
+                    publish_date=publish_date,
+                    source_tier=source['tier'],
+                    llm_total_score=llm_result['total_score']  # 传递LLM评分
+                )
+            score = score_result['total_score']
+            priority = score_result['priority']
+            score_relevance = score_result['relevance_score']
+            score_timeliness = score_result['timeliness_score']
+            score_impact = score_result['impact_score']
+            score_credibility = score_result['credibility_score']
+        else:
+            # 降级：使用LLM评分
+            score = llm_result['total_score']
+            priority = "高" if score >= 35 else ("中" if score >= 20 else "低")
+            score_relevance = 0
+            score_timeliness = 0
+            score_impact = 0
+            score_credibility = 0
+
+        record = {
+            'title': article['title'],
+            'url': article['url'],
+            'source': source['name'],
+            'source_tier': source['tier'],
+            'publish_date': publish_date,
+            'content': article.get('content', ''),
+            'summary': analysis['summary'],
+            'category': analysis['category'],
+            'priority': priority,
+            'score': score,
+            'score_relevance': score_relevance,
+            'score_timeliness': score_timeliness,
+            'score_impact': score_impact,
+            'score_credibility': score_credibility,
+            'llm_relevance_score': llm_result['relevance_score'],
+            'llm_importance_score': llm_result['importance_score'],
+            'llm_category_score': llm_result['category_score'],
+            'llm_total_score': llm_result['total_score'],
+            'llm_category_suggestion': llm_result['category'],
+            'llm_reason': llm_result.get('reason', ''),
+            'link_valid': True,
+        }
+
+        if self.scorer:
+            with self.metrics.timer('facts'):
+                record['facts'] = self.scorer.extract_facts(article['title'], article.get('content', ''))
+
+        if self.entity_extractor:
+            # 列表页采集的文章可能没有正文，以摘要代替
+            with self.metrics.timer('entities'):
+                record['entities'] = self.entity_extractor.extract(
+                    article['title'], article.get('content') or analysis['summary'], llm_result.get('companies')
+                )
+        return record
@@ -0,0 +1,162 @@
+"""
+实体抽取（公司/区域）
+
+按 config/entities.json 的实体词典（标准名称 + 别名）用字典树一次扫描标题和正文，
+别名统一为标准名称。LLM分析结果中的公司名（companies字段）作为补充：
+词典中已有的归并到标准名称，词典外的只有在原文中出现时才收录（避免模型臆造）。
+
+抽取结果写入article_entities表，按实体查询时间线见 Database.articles_for_entity()。
+词典修改后用 reindex_entities()（extract_entities.py --all）按新词典重建已有文章的实体。
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.processing.keyword_trie import KeywordTrie
+from src.storage.database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENTITIES_PATH = 'config/entities.json'
+
+# 词典分组 -> 实体类型
+ENTITY_GROUPS = {
+    'companies': 'company',
+    'regions': 'region',
+}
+
+# LLM补充的实体名最大长度（超过的多为整句描述）
+MAX_LLM_NAME_LENGTH = 30
+
+
+class EntityExtractor:
+    """词典驱动的实体抽取器（只读，线程安全）"""
+
+    def __init__(self, entities: Dict[str, List[Dict]], llm_fill: bool = True):
+        """
+        Args:
+            entities: 实体词典 {'companies': [{'name', 'aliases'}], 'regions': [...]}
+            llm_fill: 是否收录LLM给出的词典外公司名
+        """
+        self.llm_fill = llm_fill
+        self.types: Dict[str, str] = {}
+        self._trie = KeywordTrie()
+        for group, entity_type in ENTITY_GROUPS.items():
+            for entry in entities.get(group, []):
+                name = entry['name'].strip()
+                self.types[name] = entity_type
+                for alias in [name] + list(entry.get('aliases', [])):
+                    self._trie.add(alias, name)
+
+    @classmethod
+    def from_file(cls, path: str = DEFAULT_ENTITIES_PATH, llm_fill: bool = True) -> 'EntityExtractor':
+        """从JSON词典文件加载"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), llm_fill=llm_fill)
+
+    def __len__(self) -> int:
+        """词典中的实体数"""
+        return len(self.types)
+
+    def canonical(self, name: str) -> Optional[str]:
+        """别名对应的标准名称（不在词典中返回None）"""
+        return self._trie.get(name)
+
+    def extract(
+        self,
+        title: Optional[str],
+        content: Optional[str] = '',
+        llm_names: Optional[Iterable[str]] = None,
+    ) -> List[Dict]:
+        """
+        抽取文章中的实体
+
+        Args:
+            title: 标题
+            content: 正文
+            llm_names: LLM识别的公司名（可选）
+
+        Returns:
+            [{'name', 'type', 'mentions', 'in_title', 'source': 'dict'|'llm'}]，
+            标题中出现的在前，其次按出现次数降序
+        """
+        title = title or ''
+        content = content or ''
+        title_counts = self._trie.count(title)
+        content_counts = self._trie.count(content)
+
+        entities: Dict[str, Dict] = {}
+        for name in list(title_counts) + [n for n in content_counts if n not in title_counts]:
+            entities[name] = {
+                'name': name,
+                'type': self.types[name],
+                'mentions': title_counts.get(name, 0) + content_counts.get(name, 0),
+                'in_title': name in title_counts,
+                'source': 'dict',
+            }
+
+        if self.llm_fill:
+            for raw in llm_names or ():
+                if not isinstance(raw, str):
+                    continue
+                name = raw.strip()
+                if not name or len(name) > MAX_LLM_NAME_LENGTH:
+                    continue
+                name = self.canonical(name) or name
+                if name in entities:
+                    continue
+                mentions = title.count(name) + content.count(name)
+                if mentions == 0:
+                    continue
+                entities[name] = {
+                    'name': name,
+                    'type': self.types.get(name, 'company'),
+                    'mentions': mentions,
+                    'in_title': name in title,
+                    'source': 'llm',
+                }
+
+        return sorted(entities.values(), key=lambda e: (not e['in_title'], -e['mentions'], e['name']))
+
+
+def load_extractor_if_exists(path: str = DEFAULT_ENTITIES_PATH) -> Optional[EntityExtractor]:
+    """词典文件存在时加载，否则返回None"""
+    if not Path(path).exists():
+        return None
+    return EntityExtractor.from_file(path)
+
+
+def reindex_entities(db: Database, extractor: EntityExtractor, batch_size: int = 500) -> Dict[str, int]:
+    """
+    按词典重新抽取全部已有文章的实体（替换已有关联，LLM补充的实体不保留）
+
+    按id分批读取标题、摘要和正文，每批在一个事务内写入。
+
+    Args:
+        db: 数据库
+        extractor: 实体抽取器
+        batch_size: 每批文章数
+
+    Returns:
+        {'articles': 处理的文章数, 'entities': 写入的实体关联数}
+    """
+    totals = {'articles': 0, 'entities': 0}
+    last_id = 0
+    while True:
+        rows = db.conn.execute(
+            "SELECT id, title, summary FROM articles WHERE id > ? ORDER BY id LIMIT ?",
+            (last_id, batch_size),
+        ).fetchall()
+        if not rows:
+            break
+        contents = db.get_article_contents([row['id'] for row in rows])
+        with db.batch():
+            for row in rows:
+                entities = extractor.extract(row['title'], contents.get(row['id']) or row['summary'])
+                db.save_article_entities(row['id'], entities)
+                totals['entities'] += len(entities)
+        totals['articles'] += len(rows)
+        last_id = rows[-1]['id']
+    return totals
@@ -0,0 +1,219 @@
+"""
+LLM返回JSON的容错提取
+
+LLM的返回经常不是严格JSON：包在markdown代码块里、前后带解释文字、末尾多逗号、
+用单引号、或因max_tokens截断。直接json.loads失败会浪费整次调用，这里按以下顺序尽量恢复：
+1. 定位第一个"{"，按括号配对（忽略字符串内的括号）找到完整对象
+2. 修复常见格式问题（末尾逗号、单引号键/值、全角冒号）
+3. 对象被截断时，丢弃最后一个不完整的成员并补齐括号，保留已完整输出的字段
+"""
+
+import json
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# 末尾逗号：{"a": 1,} / [1, 2,]
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+# 单引号键：{'a': 1}
+_SINGLE_QUOTED_KEY_RE = re.compile(r"([{,]\s*)'([^'\"\\]*)'\s*:")
+# 单引号值：{"a": 'x'}
+_SINGLE_QUOTED_VALUE_RE = re.compile(r"(:\s*)'([^'\"\\]*)'(\s*[,}\]])")
+# 键后的全角冒号：{"a"：1}
+_FULLWIDTH_COLON_RE = re.compile(r'("\s*)：')
+
+
+def _scan(text: str, start: int):
+    """
+    从start处的"{"开始扫描
+
+    Returns:
+        (对象结束位置（不含），未闭合时为None; 顶层最后一个逗号的位置，没有则为None)
+    """
+    stack: List[str] = []
+    in_string = False
+    escaped = False
+    quote = ''
+    last_member_end = None
+
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == '\\':
+                escaped = True
+            elif ch == quote:
+                in_string = False
+            continue
+
+        if ch in '"\'':
+            in_string = True
+            quote = ch
+        elif ch in '{[':
+            stack.append('}' if ch == '{' else ']')
+        elif ch in '}]':
+            if stack:
+                stack.pop()
+            if not stack:
+                return i + 1, last_member_end
+        elif ch == ',' and len(stack) == 1:
+            last_member_end = i
+
+    return None, last_member_end
+
+
+def repair_json(text: str) -> str:
+    """修复常见的JSON格式问题（末尾逗号、单引号、全角冒号）"""
+    text = _FULLWIDTH_COLON_RE.sub(r'\1:', text)
+    text = _SINGLE_QUOTED_KEY_RE.sub(r'\1"\2":', text)
+    text = _SINGLE_QUOTED_VALUE_RE.sub(r'\1"\2"\3', text)
+    return _TRAILING_COMMA_RE.sub(r'\1', text)
+
+
+def _loads(candidate: str) -> Optional[Dict]:
+    for text in (candidate, repair_json(candidate)):
+        try:
+            data = json.loads(text)
+        except (json.JSONDecodeError, ValueError):
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def extract_json_object(text: str) -> Optional[Dict]:
+    """
+    从LLM返回文本中提取第一个JSON对象
+
+    Args:
+        text: LLM返回的文本
+
+    Returns:
+        解析出的字典；找不到任何可恢复的对象时返回None。
+        截断的对象只包含已完整输出的字段。
+    """
+    if not text:
+        return None
+
+    start = text.find('{')
+    while start != -1:
+        end, last_member_end = _scan(text, start)
+
+        if end is not None:
+            data = _loads(text[start:end])
+            if data is not None:
+                return data
+        else:
+            # 截断：丢弃最后一个（可能不完整的）成员，补齐外层括号
+            if last_member_end is not None:
+                return _loads(text[start:last_member_end] + '}')
+            return None
+
+        start = text.find('{', start + 1)
+
+    return None
+
+
+def missing_fields(data: Optional[Dict], required: Iterable[str]) -> List[str]:
+    """
+    检查缺失（或为空）的字段
+
+    Args:
+        data: 解析出的字典
+        required: 必需字段
+
+    Returns:
+        缺失的字段列表（保持required中的顺序）
+    """
+    data = data or {}
+    return [f for f in required if data.get(f) in (None, '')]
+
+
+def build_reask_prompt(prompt: str, missing: Iterable[str]) -> str:
+    """
+    构建只补全缺失字段的追问Prompt
+
+    复用原Prompt（共享前缀便于服务端缓存），末尾要求只返回缺失的字段，输出远短于完整回答。
+
+    Args:
+        prompt: 原Prompt
+        missing: 缺失的字段
+
+    Returns:
+        追问Prompt
+    """
+    return (
+        f"{prompt}\n\n【补充要求】上一次的回答缺少以下字段：{', '.join(missing)}。"
+        f"只返回包含这些字段的JSON对象，不要重复其他字段。"
+    )
+
+
+def complete_number_field(text: str, field: str) -> Optional[float]:
+    """
+    从尚未输出完的JSON文本中读取数值字段（用于流式输出时提前判断）
+
+    只有数字之后已出现分隔符（逗号、右括号或换行）才认为数字已完整，
+    避免把"15"的前缀"1"当作结果。
+
+    Args:
+        text: 已收到的文本
+        field: 字段名
+
+    Returns:
+        字段值；字段尚未完整输出时返回None
+    """
+    match = re.search(rf'"{re.escape(field)}"\s*[:：]\s*(-?\d+(?:\.\d+)?)\s*[,}}\n]', text)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+# 端点拒绝response_format时错误信息中会出现的字段名
+_JSON_MODE_ERROR_MARKERS = ('response_format', 'json_object')
+
+
+def json_mode_unsupported(error_text: Optional[str]) -> bool:
+    """
+    判断400/422错误是否由response_format（JSON模式）引起
+
+    上下文超长、模型名错误等无关错误不应关闭JSON模式。
+
+    Args:
+        error_text: 错误响应正文
+
+    Returns:
+        错误信息中提到response_format或json_object时为True
+    """
+    text = (error_text or '').lower()
+    return any(marker in text for marker in _JSON_MODE_ERROR_MARKERS)
+
+
+def post_with_json_mode_fallback(session, url: str, payload: Dict, **kwargs) -> Tuple[Any, bool]:
+    """
+    发送chat completions请求，请求了JSON模式且返回400/422时去掉response_format重试一次
+
+    Args:
+        session: requests.Session（或兼容对象）
+        url: 请求地址
+        payload: 请求体（不会被修改）
+        **kwargs: 传给session.post的其他参数（headers、timeout、stream等）
+
+    Returns:
+        (响应, 端点是否支持JSON模式)。错误信息提到response_format时为False，调用方应关闭JSON模式；
+        其他请求错误（上下文超长等）只去掉本次的response_format，仍返回True
+    """
+    response = session.post(url, json=payload, **kwargs)
+    if 'response_format' not in payload or response.status_code not in (400, 422):
+        return response, True
+
+    supported = not json_mode_unsupported(response.text)
+    if supported:
+        logger.warning(f"LLM请求返回{response.status_code}，去掉response_format重试: {response.text[:200]}")
+    else:
+        logger.warning(f"LLM端点不支持response_format，关闭JSON模式: {response.text[:200]}")
+    payload = {key: value for key, value in payload.items() if key != 'response_format'}
+    return session.post(url, json=payload, **kwargs), supported
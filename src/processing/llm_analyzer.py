@@ -4,13 +4,89 @@ LLM文章智能分析器
 整合相关性判断、重要性评分、分类建议和摘要生成为单次API调用
 """
 
+import os
+import re
 import requests
 import json
 import logging
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.processing.json_extract import (
+    build_reask_prompt,
+    complete_number_field,
+    extract_json_object,
+    missing_fields,
+    post_with_json_mode_fallback,
+)
+from src.processing.prompt_builder import TokenUsage, estimate_tokens, prepare_content
+from src.utils.http_session import get_session, get_timeout
 
 logger = logging.getLogger(__name__)
 
+# 文章内容的默认token预算（约等于原先截取的800字中信息量最高的部分）
+DEFAULT_CONTENT_TOKEN_BUDGET = 500
+
+# 级联模式：初筛只需判断相关性，内容预算和输出长度都远小于完整分析
+DEFAULT_TRIAGE_TOKEN_BUDGET = 200
+TRIAGE_MAX_TOKENS = 30
+
+# 相关性低于该分数的文章被拒绝（与采集流程的阈值一致）
+RELEVANCE_THRESHOLD = 8
+
+# 完整分析必须返回的字段；缺失时只追问缺失的字段
+REQUIRED_FIELDS = ('relevance_score', 'importance_score', 'category', 'summary')
+REASK_MAX_TOKENS = 300
+
+# 初筛说明（只返回相关性评分）
+TRIAGE_INSTRUCTIONS = """判断下面的文章与IDC/数据中心/云计算/AI算力行业的相关性，给出0-20分：
+18-20核心业务（IDC建设、数据中心投资、算力中心、GPU集采、液冷、PUE、机柜），12-17直接相关（云计算、服务器、边缘计算、CDN），
+6-11间接相关（芯片、网络设备、存储、电力、制冷），0-5不相关（白酒、汽车、房地产、娱乐、消费品、金融理财等）。
+只返回JSON，不要解释：{"relevance_score": 分数}"""
+
+# 分析说明（每次调用相同）
+ANALYSIS_INSTRUCTIONS = """你是IDC行业竞争情报分析专家。请全面分析下面给出的文章。
+
+【分析任务】
+1. 相关性评分（0-20分）
+   - 18-20分：核心业务（IDC建设、数据中心投资、算力中心、GPU集采、液冷技术、PUE优化、机柜部署）
+   - 12-17分：直接相关（云计算平台、服务器采购、边缘计算节点、CDN网络、数据中心选址）
+   - 6-11分：间接相关（芯片供应、网络设备、存储技术、电力供应、制冷设备）
+   - 0-5分：不相关（其他行业如白酒、汽车、房地产、娱乐、消费品、金融理财）
+
+2. 重要性评分（0-20分）
+   - 考虑因素：投资规模、技术突破、政策影响力、行业地位
+   - 18-20分：重大事件（≥100亿投资、国家级政策、重大技术突破）
+   - 12-17分：重要事件（10-100亿投资、省级政策、行业标准、重要合作）
+   - 6-11分：一般事件（1-10亿投资、企业动态、技术进展）
+   - 0-5分：参考信息（百万级项目、一般新闻）
+
+3. 分类建议（置信度0-10分）
+   - 主分类：投资、技术、政策、市场
+   - 可多选（用逗号分隔，如"投资,技术"）
+   - 置信度：对分类把握的确定程度（10=非常确定，5=一般，0=无法判断）
+
+4. 判断理由
+   - 50字内说明评分依据（如"涉及50亿IDC投资，属核心业务"）
+
+5. 内容摘要
+   - 80-150字中文摘要
+   - 突出核心信息：金额、规模、技术要点、政策影响
+   - 使用专业术语（如GPU、液冷、PUE、算力、云服务）
+
+6. 涉及公司
+   - 文中出现的公司/机构名称（原文写法），最多5个，没有则返回空数组
+
+【返回格式】严格JSON（不要markdown代码块，直接返回JSON）：
+{
+  "relevance_score": 18,
+  "importance_score": 16,
+  "category_score": 9,
+  "category": "投资,技术",
+  "reason": "涉及50亿元AI算力中心建设，包含1万个GPU机柜",
+  "summary": "某公司宣布投资50亿元...",
+  "companies": ["某公司"]
+}"""
+
 
 class LLMArticleAnalyzer:
     """
@@ -23,7 +99,12 @@ class LLMArticleAnalyzer:
     4. 内容摘要 (80-150字) - 生成专业摘要
     """
 
-    def __init__(self, api_key: str, api_base: str, model: str = "GLM-4.5-Air"):
+    def __init__(self, api_key: str, api_base: str, model: str = "GLM-4.5-Air",
+                 content_token_budget: Optional[int] = None,
+                 cascade: Optional[bool] = None,
+                 triage_model: Optional[str] = None,
+                 json_mode: Optional[bool] = None,
+                 streaming: Optional[bool] = None):
         """
         初始化LLM分析器
 
@@ -31,11 +112,39 @@ class LLMArticleAnalyzer:
             api_key: API密钥
             api_base: API基础URL
             model: 使用的模型名称
+            content_token_budget: 文章内容的token预算（默认读取环境变量LLM_CONTENT_TOKEN_BUDGET）
+            cascade: 是否启用级联模式（默认读取环境变量LLM_CASCADE_ENABLED）。
+                启用后先用初筛模型只判断相关性，相关性达标的文章才进行完整分析
+            triage_model: 初筛模型（默认读取环境变量LLM_TRIAGE_MODEL，未设置时使用model）
+            json_mode: 是否请求JSON模式输出（response_format，默认读取环境变量LLM_JSON_MODE）。
+                端点不支持时自动关闭
+            streaming: 是否使用流式输出（默认读取环境变量LLM_STREAMING）。
+                流式输出中相关性评分一旦低于阈值即断开连接，不再等待完整输出
         """
         self.api_key = api_key
         self.api_base = api_base
         self.model = model
-        self.timeout = 30  # API调用超时时间（秒）
+        self.timeout = get_timeout()  # API调用超时（连接, 读取）秒
+        self.session = get_session()  # 共享连接池，复用长连接
+        self.content_token_budget = content_token_budget or int(
+            os.getenv('LLM_CONTENT_TOKEN_BUDGET', DEFAULT_CONTENT_TOKEN_BUDGET)
+        )
+        self.token_usage = TokenUsage()
+        if json_mode is None:
+            json_mode = os.getenv('LLM_JSON_MODE', 'true').lower() == 'true'
+        self.json_mode = json_mode
+        if streaming is None:
+            streaming = os.getenv('LLM_STREAMING', 'false').lower() == 'true'
+        self.streaming = streaming
+
+        # 级联模式配置
+        if cascade is None:
+            cascade = os.getenv('LLM_CASCADE_ENABLED', 'false').lower() == 'true'
+        self.cascade = cascade
+        self.triage_model = triage_model or os.getenv('LLM_TRIAGE_MODEL') or model
+        self.triage_token_budget = int(
+            os.getenv('LLM_TRIAGE_TOKEN_BUDGET', DEFAULT_TRIAGE_TOKEN_BUDGET)
+        )
 
     def analyze_article(self, title: str, content: str) -> Dict:
         """
@@ -53,18 +162,45 @@ class LLMArticleAnalyzer:
                 'total_score': int,          # 0-50分
                 'category': str,             # "投资,技术" 或 "政策"
                 'reason': str,               # 50字内判断理由
-                'summary': str               # 80-150字摘要
+                'summary': str,              # 80-150字摘要
+                'companies': List[str]       # 涉及的公司（最多5个，可能为空）
             }
+
+            级联模式下初筛拒绝的文章只有相关性评分（重要性/分类置信度为0），
+            并带有 'cascade_stage': 'triage' 标记
         """
         try:
-            # 构建Prompt
-            prompt = self._build_prompt(title, content)
+            # 级联模式：初筛拒绝的文章不再进行完整分析
+            if self.cascade:
+                triage_result = self._triage(title, content or '')
+                if triage_result is not None:
+                    return triage_result
+
+            # 按token预算压缩内容后构建Prompt
+            content_preview, content_stats = prepare_content(
+                title, content or '', self.content_token_budget
+            )
+            prompt = self._build_prompt(title, content_preview)
+
+            # 调用LLM API（流式输出时，相关性低于阈值即提前终止）
+            saved_tokens = content_stats['original_tokens'] - content_stats['content_tokens']
+            aborted = {}
+
+            def below_threshold(text: str) -> bool:
+                score = complete_number_field(text, 'relevance_score')
+                if score is not None and score < RELEVANCE_THRESHOLD:
+                    aborted['relevance_score'] = int(score)
+                    return True
+                return False
 
-            # 调用LLM API
-            response_text = self._call_llm_api(prompt)
+            response_text = self._call_llm_api(prompt, saved_tokens=saved_tokens,
+                                               stop_when=below_threshold if self.streaming else None)
+            if aborted:
+                # 截断的文本不一定能解析为JSON（如"relevance_score": 5后紧跟换行），直接按已读到的相关性拒绝
+                return self._aborted_result(title, aborted['relevance_score'])
 
-            # 解析返回结果
-            result = self._parse_response(response_text, title, content)
+            # 解析返回结果（缺失字段时只追问缺失的字段）
+            result = self._parse_response(response_text, title, content, prompt=prompt)
 
             logger.info(f"文章分析完成: {title[:30]}... | 相关性:{result['relevance_score']} 重要性:{result['importance_score']} 总分:{result['total_score']}")
 
@@ -75,62 +211,94 @@ class LLMArticleAnalyzer:
             # 返回默认评分，允许后续处理
             return self._get_default_result(title, content, str(e))
 
-    def _build_prompt(self, title: str, content: str) -> str:
-        """构建分析Prompt"""
-        # 截取内容前800字（避免超长内容）
-        content_preview = content[:800] if len(content) > 800 else content
-
-        prompt = f"""你是IDC行业竞争情报分析专家。请全面分析以下文章。
-
-【文章信息】
-标题：{title}
-内容：{content_preview}
-
-【分析任务】
-1. 相关性评分（0-20分）
-   - 18-20分：核心业务（IDC建设、数据中心投资、算力中心、GPU集采、液冷技术、PUE优化、机柜部署）
-   - 12-17分：直接相关（云计算平台、服务器采购、边缘计算节点、CDN网络、数据中心选址）
-   - 6-11分：间接相关（芯片供应、网络设备、存储技术、电力供应、制冷设备）
-   - 0-5分：不相关（其他行业如白酒、汽车、房地产、娱乐、消费品、金融理财）
+    def _triage(self, title: str, content: str) -> Optional[Dict]:
+        """
+        级联初筛：用初筛模型和精简Prompt只判断相关性
 
-2. 重要性评分（0-20分）
-   - 考虑因素：投资规模、技术突破、政策影响力、行业地位
-   - 18-20分：重大事件（≥100亿投资、国家级政策、重大技术突破）
-   - 12-17分：重要事件（10-100亿投资、省级政策、行业标准、重要合作）
-   - 6-11分：一般事件（1-10亿投资、企业动态、技术进展）
-   - 0-5分：参考信息（百万级项目、一般新闻）
+        Args:
+            title: 文章标题
+            content: 文章内容
 
-3. 分类建议（置信度0-10分）
-   - 主分类：投资、技术、政策、市场
-   - 可多选（用逗号分隔，如"投资,技术"）
-   - 置信度：对分类把握的确定程度（10=非常确定，5=一般，0=无法判断）
+        Returns:
+            相关性低于阈值时返回拒绝结果；达标或初筛失败时返回None（继续完整分析）
+        """
+        try:
+            content_preview, content_stats = prepare_content(title, content, self.triage_token_budget)
+            prompt = f"{TRIAGE_INSTRUCTIONS}\n\n标题：{title}\n内容：{content_preview}"
+            response_text = self._call_llm_api(
+                prompt,
+                saved_tokens=content_stats['original_tokens'] - content_stats['content_tokens'],
+                model=self.triage_model,
+                max_tokens=TRIAGE_MAX_TOKENS,
+            )
+        except Exception as e:
+            logger.warning(f"级联初筛失败，直接进行完整分析: {title[:30]}... | 错误: {e}")
+            return None
+
+        data = extract_json_object(response_text) or {}
+        score = data.get('relevance_score')
+        if score is None:
+            match = re.search(r'relevance_score"?\s*[:：]\s*(\d+)', response_text) or re.search(r'\d+', response_text)
+            if not match:
+                logger.warning(f"初筛结果无法解析，直接进行完整分析: {response_text[:100]}")
+                return None
+            score = match.group(match.lastindex or 0)
+
+        relevance_score = self._validate_score(score, 0, 20)
+        if relevance_score >= RELEVANCE_THRESHOLD:
+            return None
+
+        logger.info(f"初筛拒绝: {title[:30]}... | 相关性:{relevance_score}")
+        return {
+            'relevance_score': relevance_score,
+            'importance_score': 0,
+            'category_score': 0,
+            'total_score': relevance_score,
+            'category': '其他',
+            'reason': f'初筛相关性{relevance_score}分，未进行完整分析',
+            'summary': title if len(title) <= 150 else title[:147] + "...",
+            'cascade_stage': 'triage'
+        }
 
-4. 判断理由
-   - 50字内说明评分依据（如"涉及50亿IDC投资，属核心业务"）
+    def _aborted_result(self, title: str, score: int) -> Dict:
+        """流式输出因相关性低于阈值提前终止时的拒绝结果（未输出的字段记为0）"""
+        relevance_score = self._validate_score(score, 0, 20)
+        logger.info(f"流式输出提前终止: {title[:30]}... | 相关性:{relevance_score}")
+        return {
+            'relevance_score': relevance_score,
+            'importance_score': 0,
+            'category_score': 0,
+            'total_score': relevance_score,
+            'category': '其他',
+            'reason': f'相关性{relevance_score}分，提前终止输出',
+            'summary': title if len(title) <= 150 else title[:147] + "...",
+            'stream_aborted': True
+        }
 
-5. 内容摘要
-   - 80-150字中文摘要
-   - 突出核心信息：金额、规模、技术要点、政策影响
-   - 使用专业术语（如GPU、液冷、PUE、算力、云服务）
+    def _build_prompt(self, title: str, content: str) -> str:
+        """
+        构建分析Prompt
 
-【返回格式】严格JSON（不要markdown代码块，直接返回JSON）：
-{{
-  "relevance_score": 18,
-  "importance_score": 16,
-  "category_score": 9,
-  "category": "投资,技术",
-  "reason": "涉及50亿元AI算力中心建设，包含1万个GPU机柜",
-  "summary": "某公司宣布投资50亿元..."
-}}"""
+        固定的分析说明在前、文章信息在后，使各次调用共享相同的前缀（便于服务端前缀缓存）。
 
-        return prompt
+        Args:
+            title: 文章标题
+            content: 已按预算压缩的文章内容
+        """
+        return f"{ANALYSIS_INSTRUCTIONS}\n\n【文章信息】\n标题：{title}\n内容：{content}"
 
-    def _call_llm_api(self, prompt: str) -> str:
+    def _call_llm_api(self, prompt: str, saved_tokens: int = 0,
+                      model: Optional[str] = None, max_tokens: int = 500,
+                      stop_when: Optional[Callable[[str], bool]] = None) -> str:
         """
         调用LLM API
 
         Args:
             prompt: 提示词
+            saved_tokens: 内容压缩节省的token数（用于用量统计）
+            model: 使用的模型（默认self.model）
+            max_tokens: 最大输出token数
+            stop_when: 流式输出时的提前终止条件（参数为已收到的文本），返回True时断开连接
 
         Returns:
             API返回的文本内容
@@ -141,7 +309,7 @@ class LLMArticleAnalyzer:
         }
 
         payload = {
-            "model": self.model,
+            "model": model or self.model,
             "messages": [
                 {
                     "role": "user",
@@ -149,56 +317,112 @@ class LLMArticleAnalyzer:
                 }
             ],
             "temperature": 0.3,  # 降低随机性，提高稳定性
-            "max_tokens": 500
+            "max_tokens": max_tokens
         }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
+        if self.streaming:
+            payload["stream"] = True
 
         try:
-            response = requests.post(
+            response, json_supported = post_with_json_mode_fallback(
+                self.session,
                 f"{self.api_base}/v1/chat/completions",
+                payload,
                 headers=headers,
-                json=payload,
-                timeout=self.timeout
+                timeout=self.timeout,
+                stream=self.streaming
             )
+            if not json_supported:
+                # 端点不支持JSON模式：之后的调用不再请求
+                self.json_mode = False
 
             response.raise_for_status()
 
-            result = response.json()
-            content = result['choices'][0]['message']['content']
+            if self.streaming:
+                content, usage = self._read_stream(response, stop_when)
+            else:
+                result = response.json()
+                content = result['choices'][0]['message']['content']
+                usage = result.get('usage') or {}
+
+            entry = self.token_usage.record(
+                usage.get('prompt_tokens') or estimate_tokens(prompt),
+                usage.get('completion_tokens') or estimate_tokens(content),
+                saved_tokens,
+            )
+            logger.debug(f"LLM token用量: {entry}")
 
             return content.strip()
 
         except requests.exceptions.Timeout:
-            logger.error(f"LLM API调用超时（{self.timeout}秒）")
+            logger.error(f"LLM API调用超时（连接{self.timeout[0]}秒/读取{self.timeout[1]}秒）")
             raise
         except requests.exceptions.RequestException as e:
             logger.error(f"LLM API调用失败: {e}")
             raise
 
-    def _parse_response(self, response_text: str, title: str, content: str) -> Dict:
+    def _read_stream(self, response, stop_when: Optional[Callable[[str], bool]] = None) -> Tuple[str, Dict]:
+        """
+        读取SSE流式响应
+
+        Args:
+            response: stream=True的响应
+            stop_when: 提前终止条件。满足时关闭连接，服务端随之停止生成
+
+        Returns:
+            (已收到的文本, API返回的usage（流式响应通常没有，为空字典）)
+        """
+        # text/event-stream通常不带charset，requests会按ISO-8859-1解码
+        response.encoding = 'utf-8'
+        parts = []
+        usage = {}
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[5:].strip()
+                if data == '[DONE]':
+                    break
+
+                chunk = json.loads(data)
+                usage = chunk.get('usage') or usage
+                choices = chunk.get('choices') or []
+                delta = (choices[0].get('delta') or {}).get('content') if choices else None
+                if delta:
+                    parts.append(delta)
+                    if stop_when and stop_when(''.join(parts)):
+                        logger.debug("流式输出提前终止")
+                        break
+        finally:
+            response.close()
+
+        return ''.join(parts), usage
+
+    def _parse_response(self, response_text: str, title: str, content: str,
+                        prompt: Optional[str] = None) -> Dict:
         """
         解析LLM返回结果
 
+        容错提取JSON（代码块、前后说明文字、末尾逗号、截断等），
+        给出prompt时对缺失的必需字段追问一次。
+
         Args:
             response_text: LLM返回的文本
             title: 文章标题（用于容错）
             content: 文章内容（用于容错）
+            prompt: 原Prompt（用于追问缺失字段，不给出则不追问）
 
         Returns:
             标准化的分析结果
         """
         try:
-            # 尝试清理可能的markdown代码块
-            cleaned_text = response_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            if cleaned_text.startswith('```'):
-                cleaned_text = cleaned_text[3:]
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-            cleaned_text = cleaned_text.strip()
-
-            # 解析JSON
-            data = json.loads(cleaned_text)
+            data = extract_json_object(response_text)
+            if data is None:
+                raise json.JSONDecodeError("未找到JSON对象", response_text, 0)
+
+            if prompt:
+                data = self._complete_missing_fields(prompt, data)
 
             # 提取并验证字段
             relevance_score = self._validate_score(data.get('relevance_score', 10), 0, 20)
@@ -222,6 +446,12 @@ class LLMArticleAnalyzer:
                 # 摘要太短或为空，使用标题作为摘要
                 summary = title if len(title) <= 150 else title[:147] + "..."
 
+            # 获取涉及公司（可选字段，供实体抽取补充词典外的公司）
+            companies = data.get('companies') or []
+            if not isinstance(companies, list):
+                companies = []
+            companies = [c.strip() for c in companies if isinstance(c, str) and c.strip()][:5]
+
             return {
                 'relevance_score': relevance_score,
                 'importance_score': importance_score,
@@ -229,7 +459,8 @@ class LLMArticleAnalyzer:
                 'total_score': total_score,
                 'category': category,
                 'reason': reason,
-                'summary': summary
+                'summary': summary,
+                'companies': companies
             }
 
         except json.JSONDecodeError as e:
@@ -240,6 +471,37 @@ class LLMArticleAnalyzer:
             logger.warning(f"结果解析异常: {e}")
             return self._get_default_result(title, content, f"解析异常: {e}")
 
+    def _complete_missing_fields(self, prompt: str, data: Dict) -> Dict:
+        """
+        追问缺失的必需字段
+
+        空对象（整体无效的回答）和相关性已低于阈值（结果会被丢弃）的回答不追问。
+
+        Args:
+            prompt: 原Prompt
+            data: 已解析的字段
+
+        Returns:
+            补全后的字段
+        """
+        missing = missing_fields(data, REQUIRED_FIELDS)
+        if not missing or len(missing) == len(REQUIRED_FIELDS):
+            return data
+        if 'relevance_score' not in missing and \
+                self._validate_score(data['relevance_score'], 0, 20) < RELEVANCE_THRESHOLD:
+            return data
+
+        logger.info(f"LLM返回缺少字段 {missing}，追问补全")
+        try:
+            response_text = self._call_llm_api(build_reask_prompt(prompt, missing),
+                                               max_tokens=REASK_MAX_TOKENS)
+        except Exception as e:
+            logger.warning(f"追问缺失字段失败: {e}")
+            return data
+
+        extra = extract_json_object(response_text) or {}
+        return {**data, **{f: extra[f] for f in missing if extra.get(f) not in (None, '')}}
+
     def _validate_score(self, score: any, min_val: int, max_val: int) -> int:
         """
         验证并修正评分范围
@@ -282,5 +544,6 @@ class LLMArticleAnalyzer:
             'total_score': 20,
             'category': '其他',
             'reason': f'LLM分析{error_msg[:30]}，使用默认评分',
-            'summary': title if len(title) <= 150 else title[:147] + "..."
+            'summary': title if len(title) <= 150 else title[:147] + "...",
+            'is_default': True  # 标记为默认评分（不作为相关性训练标签）
         }
@@ -11,6 +11,9 @@ import time
 from typing import Optional, Dict
 from datetime import datetime
 
+from src.processing.prompt_builder import TokenUsage, estimate_tokens, prepare_content
+from src.utils.http_session import get_session, get_timeout
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +26,7 @@ class LLMSummarizer:
         api_base: Optional[str] = None,
         model: str = "gpt-3.5-turbo",
         provider: str = "openai",
+        content_token_budget: Optional[int] = None,
     ):
         """
         初始化LLM摘要生成器
@@ -32,11 +36,18 @@ class LLMSummarizer:
             api_base: API基础URL（可选，用于自定义端点）
             model: 模型名称
             provider: 提供商（openai/anthropic/custom）
+            content_token_budget: 文章内容的token预算（默认读取环境变量LLM_SUMMARY_TOKEN_BUDGET）
         """
         self.api_key = api_key or os.getenv("LLM_API_KEY")
         self.api_base = api_base or os.getenv("LLM_API_BASE")
         self.model = model or os.getenv("LLM_MODEL", "gpt-3.5-turbo")
         self.provider = provider
+        self.content_token_budget = content_token_budget or int(
+            os.getenv("LLM_SUMMARY_TOKEN_BUDGET", 1200)
+        )
+        self.token_usage = TokenUsage()
+        self.timeout = get_timeout()
+        self.session = get_session()
 
         if not self.api_key:
             raise ValueError("API密钥未设置")
@@ -62,8 +73,12 @@ class LLMSummarizer:
         Returns:
             生成的摘要，失败返回None
         """
-        # 如果内容为空，只使用标题
-        text = content if content else title
+        # 如果内容为空，只使用标题；否则清理样板文本并按token预算挑选句子
+        if content:
+            text, content_stats = prepare_content(title, content, self.content_token_budget)
+            saved_tokens = content_stats["original_tokens"] - content_stats["content_tokens"]
+        else:
+            text, saved_tokens = title, 0
 
         # 构建prompt
         prompt = f"""请为以下IDC/数据中心行业文章生成一个80-150字的中文摘要。
@@ -75,14 +90,14 @@ class LLMSummarizer:
 4. 不要包含"这篇文章"、"本文"等元信息
 
 文章标题：{title}
-文章内容：{text[:2000]}
+文章内容：{text}
 
 摘要："""
 
         # 重试机制
         for attempt in range(max_retries):
             try:
-                summary = self._call_api(prompt)
+                summary = self._call_api(prompt, saved_tokens=saved_tokens)
                 if summary:
                     # 清理摘要
                     summary = self._clean_summary(summary)
@@ -103,12 +118,13 @@ class LLMSummarizer:
 
         return None
 
-    def _call_api(self, prompt: str) -> Optional[str]:
+    def _call_api(self, prompt: str, saved_tokens: int = 0) -> Optional[str]:
         """
         调用LLM API
 
         Args:
             prompt: 提示词
+            saved_tokens: 内容压缩节省的token数（用于用量统计）
 
         Returns:
             API响应文本
@@ -135,11 +151,11 @@ class LLMSummarizer:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 url,
                 headers=headers,
                 json=payload,
-                timeout=30,
+                timeout=self.timeout,
             )
 
             response.raise_for_status()
@@ -148,6 +164,13 @@ class LLMSummarizer:
             # 提取响应内容
             if "choices" in result and len(result["choices"]) > 0:
                 content = result["choices"][0]["message"]["content"]
+                usage = result.get("usage") or {}
+                entry = self.token_usage.record(
+                    usage.get("prompt_tokens") or estimate_tokens(prompt),
+                    usage.get("completion_tokens") or estimate_tokens(content),
+                    saved_tokens,
+                )
+                logger.debug(f"LLM token用量: {entry}")
                 return content.strip()
             else:
                 logger.error(f"API响应格式异常: {result}")
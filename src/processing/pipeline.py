@@ -0,0 +1,423 @@
+"""
+流水线采集
+
+把采集流程拆成通过有界队列连接的阶段，各阶段并发执行：
+
+    抓取 → 去重 → 预过滤 → LLM分析 → 评分 → 批量入库
+
+- 每个阶段有独立的工作线程数（抓取和LLM通常最慢，可多开）
+- 队列有容量上限，下游处理不过来时上游阻塞（背压），内存占用有界
+- 不同源的抓取与其他源的LLM分析重叠进行，总耗时取决于最慢的阶段而不是各阶段之和
+- 数据库访问通过DatabasePool：去重阶段使用只读连接，入库阶段的写操作由连接池的写线程按批提交
+- 每个源的全部文章都处理完（入库、过滤、拒绝或出错）后立即写入运行日志（run_sources），
+  进程中途退出时已完成的源在续采时跳过
+
+统计结果与串行采集（run_collection.collect_from_source）格式一致。
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.processing.article_processor import ArticleProcessor, new_source_stats
+from src.scrapers.generic_scraper import GenericScraper
+from src.storage.database import Database
+from src.storage.pool import DatabasePool
+from src.utils.metrics import NullMetrics
+
+logger = logging.getLogger(__name__)
+
+# 阶段结束标记
+_DONE = object()
+
+
+class CollectionPipeline:
+    """流水线采集器"""
+
+    def __init__(
+        self,
+        db_path: str,
+        processor: ArticleProcessor,
+        limit: int = 20,
+        fetch_workers: int = 2,
+        llm_workers: int = 4,
+        score_workers: int = 1,
+        batch_size: int = 50,
+        queue_size: int = 100,
+        archive=None,
+        run_id: Optional[str] = None,
+        replay: bool = False,
+        metrics=None,
+        on_event: Optional[Callable[[str, Dict], None]] = None,
+        journal_run_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            db_path: 数据库路径（通过DatabasePool读写，不支持:memory:）
+            processor: 单篇文章处理器
+            limit: 每个源采集文章数量限制
+            fetch_workers: 抓取线程数
+            llm_workers: LLM分析线程数
+            score_workers: 评分线程数
+            batch_size: 入库批大小
+            queue_size: 阶段间队列容量
+            archive: 页面存档（PageArchive，可选）
+            run_id: 存档运行ID
+            replay: 是否为回放模式
+            metrics: 运行指标
+            on_event: 事件回调（事件名, 数据），用于输出进度
+            journal_run_id: 运行日志ID（可选）。LLM分析结果写入run_articles表、
+                处理完的源写入run_sources表，供续采复用
+        """
+        if db_path == ':memory:':
+            raise ValueError("流水线模式需要文件数据库（读写使用独立连接）")
+
+        self.db_path = db_path
+        self.processor = processor
+        self.limit = limit
+        self.fetch_workers = max(1, fetch_workers)
+        self.llm_workers = max(1, llm_workers)
+        self.score_workers = max(1, score_workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+        self.archive = archive
+        self.run_id = run_id
+        self.replay = replay
+        self.metrics = metrics or NullMetrics()
+        self.on_event = on_event or (lambda event, data: None)
+        self.journal_run_id = journal_run_id
+
+        self._stats: Dict[str, Dict] = {}
+        self._scores: Dict[str, List] = {}
+        self._pending: Dict[str, Optional[int]] = {}  # 各源尚未处理完的文章数（抓取前为None）
+        self._journaled: List = []  # 源完成记录的写操作
+        self._lock = threading.Lock()
+        self._errors: List[BaseException] = []
+        self._seen: set = set()
+        self._pool: Optional[DatabasePool] = None
+
+    # ---------- 公共接口 ----------
+
+    def run(self, sources: List[Dict]) -> List[Dict]:
+        """
+        执行流水线
+
+        Args:
+            sources: 媒体源配置列表
+
+        Returns:
+            各源统计结果（顺序与sources一致）
+        """
+        for source in sources:
+            self._stats[source['name']] = new_source_stats(source)
+            self._scores[source['name']] = []
+            self._pending[source['name']] = None
+
+        source_q = queue.Queue()
+        for source in sources:
+            source_q.put(source)
+        source_q.put(_DONE)
+
+        dedup_q = queue.Queue(self.queue_size)
+        prefilter_q = queue.Queue(self.queue_size)
+        llm_q = queue.Queue(self.queue_size)
+        score_q = queue.Queue(self.queue_size)
+        store_q = queue.Queue(self.queue_size)
+
+        stages = [
+            ('fetch', self._fetch, source_q, dedup_q, self.fetch_workers),
+            ('dedup', self._dedup, dedup_q, prefilter_q, 1),
+            ('prefilter', self._prefilter, prefilter_q, llm_q, 1),
+            ('llm', self._analyze, llm_q, score_q, self.llm_workers),
+            ('score', self._score, score_q, store_q, self.score_workers),
+        ]
+
+        self._pool = DatabasePool(self.db_path, readers=1, write_batch=self.batch_size)
+        try:
+            threads = []
+            for name, handler, in_q, out_q, workers in stages:
+                threads.extend(self._start_stage(name, handler, in_q, out_q, workers))
+            store_thread = threading.Thread(target=self._store, args=(store_q,), name='pipeline-store', daemon=True)
+            store_thread.start()
+            threads.append(store_thread)
+
+            for t in threads:
+                t.join()
+            for future in self._journaled:
+                future.result()
+        finally:
+            self._pool.close()
+            self._pool = None
+
+        if self._errors:
+            raise self._errors[0]
+
+        results = []
+        for source in sources:
+            self._finalize_stats(source['name'])
+            results.append(self._stats[source['name']])
+        return results
+
+    # ---------- 阶段调度 ----------
+
+    def _start_stage(self, name, handler, in_q, out_q, workers) -> List[threading.Thread]:
+        """
+        启动一个阶段的工作线程
+
+        handler(item, emit)处理单个条目，通过emit向下游输出（可输出0到多个）。
+        所有工作线程结束后向下游发送结束标记。
+        """
+        remaining = [workers]
+        remaining_lock = threading.Lock()
+
+        def emit(item):
+            out_q.put(item)
+
+        def worker():
+            try:
+                while True:
+                    item = in_q.get()
+                    if item is _DONE:
+                        # 让同阶段的其他线程也能收到结束标记
+                        in_q.put(_DONE)
+                        break
+                    try:
+                        handler(item, emit)
+                    except Exception as e:
+                        self._count_error(item, name, e)
+            except BaseException as e:  # 防止线程异常退出导致下游永久阻塞
+                self._errors.append(e)
+            finally:
+                with remaining_lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    out_q.put(_DONE)
+
+        threads = []
+        for i in range(workers):
+            t = threading.Thread(target=worker, name=f'pipeline-{name}-{i}', daemon=True)
+            t.start()
+            threads.append(t)
+        return threads
+
+    def _bump(self, source_name: str, key: str, n: int = 1):
+        with self._lock:
+            self._stats[source_name][key] += n
+
+    def _finalize_stats(self, source_name: str):
+        """计算源的平均LLM评分"""
+        with self._lock:
+            stats = self._stats[source_name]
+            scores = self._scores[source_name]
+            if scores:
+                stats['avg_llm_score'] = sum(s for s, _ in scores) / len(scores)
+                stats['avg_relevance'] = sum(r for _, r in scores) / len(scores)
+
+    def _settle(self, source_name: str, n: int = 1):
+        """n篇文章处理完毕（入库、过滤、拒绝或出错）；源的全部文章处理完时记录该源完成"""
+        with self._lock:
+            self._pending[source_name] -= n
+            done = self._pending[source_name] == 0
+        if done:
+            self._source_done(source_name)
+
+    def _source_done(self, source_name: str):
+        """源处理完毕：写入运行日志（由写线程随下一批提交），续采时跳过该源"""
+        self._finalize_stats(source_name)
+        stats = dict(self._stats[source_name])
+        if self.journal_run_id and stats['status'] in ('success', 'no_articles'):
+            self._journaled.append(self._pool.submit(Database.save_run_source, self.journal_run_id, stats))
+        self.on_event('source_done', stats)
+
+    def _count_error(self, item, stage: str, error: Exception):
+        source = item[0] if isinstance(item, tuple) else item
+        logger.warning(f"流水线阶段 {stage} 处理失败: {error}")
+        if isinstance(source, dict) and source.get('name') in self._stats:
+            if stage == 'fetch':
+                with self._lock:
+                    self._stats[source['name']]['status'] = 'failed'
+                    self._stats[source['name']]['error'] = str(error)[:200]
+            else:
+                self._bump(source['name'], 'errors')
+                self._settle(source['name'])
+        self.on_event('error', {'stage': stage, 'error': str(error)})
+
+    # ---------- 各阶段 ----------
+
+    def _fetch(self, source: Dict, emit):
+        """抓取：获取列表页HTML（或读取存档）并解析文章"""
+        start = time.perf_counter()
+        scraper = GenericScraper(source)
+
+        if self.replay:
+            html = self.archive.load_page(self.run_id, source['name'])
+        else:
+            html = scraper.fetch_html(metrics=self.metrics)
+            if html and self.archive:
+                with self.metrics.timer('archive'):
+                    self.archive.save_page(self.run_id, source['name'], scraper.list_url, html)
+
+        with self.metrics.timer('parse'):
+            articles = scraper.parse_articles(html)[:self.limit] if html else []
+
+        with self._lock:
+            stats = self._stats[source['name']]
+            stats['fetched'] = len(articles)
+            stats['status'] = 'success' if articles else 'no_articles'
+            stats['duration_seconds'] = round(time.perf_counter() - start, 3)
+            self._pending[source['name']] = len(articles)
+        self.on_event('fetched', {'source': source['name'], 'count': len(articles)})
+
+        if not articles:
+            self._source_done(source['name'])
+        for article in articles:
+            emit((source, article))
+
+    def _dedup(self, item, emit):
+        """去重：跳过本次运行中重复的URL和数据库中已存在的文章"""
+        source, article = item
+        url = article.get('url')
+        if url:
+            # 去重阶段只有一个工作线程，_seen无需加锁
+            if url in self._seen or self._pool.read(Database.article_exists, url):
+                self._bump(source['name'], 'duplicates')
+                self._settle(source['name'])
+                return
+            self._seen.add(url)
+        emit(item)
+
+    def _prefilter(self, item, emit):
+        """预过滤：负面关键词 + 本地相关性模型"""
+        source, article = item
+        prefiltered = self.processor.prefilter(article)
+        outcome = prefiltered['outcome']
+
+        if outcome == 'invalid':
+            self._bump(source['name'], 'errors')
+            self._settle(source['name'])
+        elif outcome in ('quick_filtered', 'model_rejected'):
+            self._bump(source['name'], outcome)
+            self._settle(source['name'])
+        else:
+            emit((source, article, prefiltered))
+
+    def _analyze(self, item, emit):
+        """LLM分析"""
+        source, article, prefiltered = item
+        analysis = self.processor.analyze(article, prefiltered)
+
+        # LLM判定记录和运行日志交给入库阶段写入（含被拒绝的文章）
+        if analysis['label']:
+            emit(('label', source, analysis['label']))
+        if analysis['journal'] and self.journal_run_id:
+            emit(('journal', source, {'url': article['url'], 'llm_result': analysis['journal']}))
+
+        outcome = analysis['outcome']
+        if outcome == 'llm_rejected':
+            self._bump(source['name'], 'llm_rejected')
+            self._settle(source['name'])
+            return
+        if outcome == 'model_accepted':
+            self._bump(source['name'], 'model_accepted')
+        elif outcome == 'llm_ok':
+            llm_result = analysis['llm_result']
+            with self._lock:
+                self._scores[source['name']].append(
+                    (llm_result['total_score'], llm_result['relevance_score'])
+                )
+        emit((source, article, analysis))
+
+    def _score(self, item, emit):
+        """评分：生成入库记录（LLM判定记录和运行日志直接透传）"""
+        if item[0] in ('label', 'journal'):
+            emit(item)
+            return
+        source, article, analysis = item
+        emit(('record', source, self.processor.build_record(article, source, analysis)))
+
+    def _store(self, store_q):
+        """入库：按批把文章和LLM判定记录提交给连接池的写线程"""
+        pool = self._pool
+        records: List = []
+        pending: List = []  # 不需要等待结果的写操作（判定记录、运行日志）
+
+        def flush():
+            if not records:
+                return
+            # 按源分组入库，以便统计各源的入库/重复数量
+            by_source: Dict[str, List[Dict]] = {}
+            for record in records:
+                by_source.setdefault(record['source'], []).append(record)
+            with self.metrics.timer('db_write'):
+                futures = [(name, pool.submit(self._insert_group, group)) for name, group in by_source.items()]
+                for name, future in futures:
+                    stored, duplicates, errors = future.result()
+                    with self._lock:
+                        self._stats[name]['stored'] += stored
+                        self._stats[name]['duplicates'] += duplicates
+                        self._stats[name]['errors'] += errors
+                    self._settle(name, stored + duplicates + errors)
+            self.on_event('stored', {'count': len(records)})
+            records.clear()
+
+        failed = False
+        try:
+            while True:
+                item = store_q.get()
+                if item is _DONE:
+                    break
+                if failed:
+                    # 入库已失败：继续取出条目，避免上游阻塞
+                    continue
+                kind, source, payload = item
+                if kind == 'journal':
+                    # 运行日志立即提交（随写线程的下一批提交），进程中途退出时已完成的LLM分析不会丢失
+                    pending.append(pool.submit(
+                        Database.save_run_article, self.journal_run_id, payload['url'],
+                        payload['llm_result'], source['name'],
+                    ))
+                elif kind == 'label':
+                    pending.append(pool.submit(Database.save_relevance_label, source=source['name'], **payload))
+                else:
+                    records.append(payload)
+                if len(records) >= self.batch_size:
+                    try:
+                        flush()
+                    except BaseException as e:
+                        self._errors.append(e)
+                        failed = True
+            if not failed:
+                flush()
+            for future in pending:
+                future.result()
+        except BaseException as e:
+            self._errors.append(e)
+
+    @staticmethod
+    def _insert_group(db: Database, group: List[Dict]):
+        """
+        批量插入一组文章，批量失败时逐条插入以定位问题记录（在连接池的写线程中执行）
+
+        Returns:
+            (入库数, 重复数, 失败数)
+        """
+        try:
+            inserted = db.insert_articles(group)
+            return inserted, len(group) - inserted, 0
+        except Exception as e:
+            logger.warning(f"批量入库失败，改为逐条入库: {e}")
+
+        stored = duplicates = errors = 0
+        for record in group:
+            try:
+                if db.insert_article(**record) is None:
+                    duplicates += 1
+                else:
+                    stored += 1
+            except Exception as e:
+                errors += 1
+                logger.warning(f"入库失败: {record.get('title', '')[:30]}... | {e}")
+        return stored, duplicates, errors
@@ -0,0 +1,261 @@
+"""
+Prompt构建与Token预算
+
+按token预算压缩送入LLM的文章内容，替代固定字符截断：
+1. 清理样板文本（多余空白、导航/分享/责任编辑等页面元素、重复的标题行）
+2. 估算token数（本地估算，无需下载分词器）
+3. 超出预算时按信息量挑选句子（含数字、业务关键词的句子优先），保持原文顺序
+4. 记录每次调用的token用量
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src.scoring.priority_scorer import PriorityScorer
+
+
+# 中日韩字符（一个汉字约等于一个token）
+_CJK_RE = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+# 非中文的连续字符（英文单词、数字等，约4个字符一个token）
+_ASCII_RUN_RE = re.compile(r'[A-Za-z0-9_]+')
+
+# 页面样板文本（整行匹配时删除）
+BOILERPLATE_PATTERNS = [
+    r'^(点击|扫码|长按)(查看|关注|识别|阅读).*$',
+    r'^(责任编辑|编辑|来源|作者|声明|免责声明|原标题)[:：].{0,40}$',
+    r'^(上一篇|下一篇|相关阅读|相关文章|推荐阅读|热门文章|延伸阅读)[:：]?.*$',
+    r'^分享到.*$',
+    r'^(首页|返回顶部|返回首页|打印本页|关闭窗口|收藏本文)$',
+    r'^(版权所有|Copyright|©).*$',
+    r'^.{0,20}(微信公众号|官方微博).{0,20}$',
+]
+_BOILERPLATE_RE = [re.compile(p, re.IGNORECASE) for p in BOILERPLATE_PATTERNS]
+
+# 句子切分（中文句末标点、英文句点后接空白、换行）
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[。！？；!?;])|(?<=\.)\s+|\n+')
+
+# 数字信息（金额、规模、能效等）
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?\s*(?:亿|万|千|%|％|MW|兆瓦|千瓦|kW|P|PFlops|个|台|架|张|卡|平方米|㎡)?')
+
+# 关键词权重：沿用评分引擎的三级关键词
+_KEYWORD_WEIGHTS = (
+    [(kw, 3) for kw in PriorityScorer.RELEVANCE_KEYWORDS['core']]
+    + [(kw, 2) for kw in PriorityScorer.RELEVANCE_KEYWORDS['important']]
+    + [(kw, 1) for kw in PriorityScorer.RELEVANCE_KEYWORDS['general']]
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本token数
+
+    汉字按1个token计，英文/数字按每4个字符1个token计，其余符号按2个字符1个token计。
+    与GLM/OpenAI分词器的实际结果误差在±20%以内，用于预算控制足够。
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的token数
+    """
+    if not text:
+        return 0
+
+    cjk = len(_CJK_RE.findall(text))
+    ascii_chars = 0
+    ascii_tokens = 0
+    for run in _ASCII_RUN_RE.findall(text):
+        ascii_chars += len(run)
+        ascii_tokens += (len(run) + 3) // 4
+
+    rest = len(text) - cjk - ascii_chars - text.count(' ')
+    return cjk + ascii_tokens + max(0, rest) // 2
+
+
+def compact_content(title: str, content: str) -> str:
+    """
+    清理文章内容中的样板文本
+
+    Args:
+        title: 文章标题（内容中与标题重复的行会被删除）
+        content: 原始内容
+
+    Returns:
+        清理后的内容（按行合并，行内空白压缩为单个空格）。内容只有标题时保留标题
+        （没有摘要和正文的文章以标题作为内容送入LLM）
+    """
+    if not content:
+        return ''
+
+    normalized_title = re.sub(r'\s+', '', title or '')
+    seen = set()
+    lines = []
+    title_line = ''
+
+    for raw_line in content.splitlines():
+        line = re.sub(r'\s+', ' ', raw_line).strip()
+        if not line:
+            continue
+
+        key = line.replace(' ', '')
+        if normalized_title and key == normalized_title:
+            title_line = title_line or line
+            continue
+        if key in seen:
+            continue
+        if any(p.match(line) for p in _BOILERPLATE_RE):
+            continue
+
+        seen.add(key)
+        lines.append(line)
+
+    return '\n'.join(lines) or title_line
+
+
+def split_sentences(text: str) -> List[str]:
+    """按中英文句末标点和换行切分句子"""
+    return [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s and s.strip()]
+
+
+def sentence_score(sentence: str) -> int:
+    """
+    计算句子的信息量得分
+
+    含数字（尤其带单位的金额、规模）和业务关键词的句子得分高。
+
+    Args:
+        sentence: 句子
+
+    Returns:
+        得分
+    """
+    score = 0
+    for match in _NUMBER_RE.finditer(sentence):
+        # 带单位的数字（如"50亿"、"1.2PUE"）比裸数字更有信息量
+        score += 2 if match.group(0).strip()[-1:].isdigit() else 3
+    for keyword, weight in _KEYWORD_WEIGHTS:
+        if keyword in sentence:
+            score += weight
+    return score
+
+
+def select_sentences(text: str, token_budget: int) -> str:
+    """
+    在token预算内挑选信息量最高的句子
+
+    首句（通常是导语）始终保留，其余句子按得分从高到低选入，输出时恢复原文顺序。
+
+    Args:
+        text: 已清理的内容
+        token_budget: token预算
+
+    Returns:
+        挑选后的内容
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return ''
+
+    costs = [estimate_tokens(s) for s in sentences]
+    chosen = set()
+    used = 0
+
+    # 导语句：超出预算时截断
+    if costs[0] > token_budget:
+        return _truncate_to_budget(sentences[0], token_budget)
+    chosen.add(0)
+    used += costs[0]
+
+    ranked = sorted(range(1, len(sentences)), key=lambda i: (-sentence_score(sentences[i]), i))
+    for i in ranked:
+        if used + costs[i] <= token_budget:
+            chosen.add(i)
+            used += costs[i]
+
+    return ''.join(
+        sentences[i] if sentences[i][-1:] in '。！？；!?;' else sentences[i] + ' '
+        for i in sorted(chosen)
+    ).strip()
+
+
+def _truncate_to_budget(text: str, token_budget: int) -> str:
+    """按预算截断单个超长句子"""
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= token_budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo]
+
+
+def prepare_content(title: str, content: str, token_budget: int) -> Tuple[str, Dict]:
+    """
+    清理并按预算压缩文章内容
+
+    Args:
+        title: 文章标题
+        content: 原始内容
+        token_budget: 内容部分的token预算
+
+    Returns:
+        (压缩后的内容, {'original_tokens': int, 'content_tokens': int})
+    """
+    original_tokens = estimate_tokens(content)
+    compacted = compact_content(title, content)
+    selected = select_sentences(compacted, token_budget)
+    return selected, {
+        'original_tokens': original_tokens,
+        'content_tokens': estimate_tokens(selected),
+    }
+
+
+class TokenUsage:
+    """
+    LLM调用token用量统计（线程安全）
+
+    prompt_tokens/completion_tokens优先使用API返回的usage字段，缺失时使用本地估算值。
+    saved_tokens为内容压缩节省的token数（原始内容估算值 - 压缩后估算值）。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.saved_tokens = 0
+        self.last: Optional[Dict] = None
+
+    def record(self, prompt_tokens: int, completion_tokens: int = 0, saved_tokens: int = 0) -> Dict:
+        """
+        记录一次调用
+
+        Returns:
+            本次调用的用量
+        """
+        entry = {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'saved_tokens': saved_tokens,
+        }
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.saved_tokens += saved_tokens
+            self.last = entry
+        return entry
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'saved_tokens': self.saved_tokens,
+            }
@@ -0,0 +1,267 @@
+"""
+分词式关键词匹配
+
+子串匹配会在不相关的词里命中关键词，例如：
+- "线上线下"命中"上线"
+- "标准机柜"命中"标准"
+- "没办法"命中"办法"
+- "OPEN"、"PUE"命中"PE"
+
+分词模式先把文本切成词，再统计切出的词中包含哪些关键词：
+- 词典 = 各评分器/分类器注册的关键词 + 词典词（DICTIONARY_WORDS 与 config/segment_words.txt）
+  + 相互重叠的关键词拼成的组合词（"云服务"+"服务器" -> "云服务器"，两个关键词都计入）
+- 正向最大匹配：词典放在KeywordTrie中，从左到右每个位置取词典中最长的词，切出的词互不重叠
+- 不区分大小写，英文字母/数字边界规则与KeywordTrie相同（"PE"不匹配"OPEN"，"PUE"匹配"PUE1.2"）
+- 切出的词计入其中包含的全部关键词（"AI算力"同时计入"算力"，与子串模式一致），
+  词典词可以声明不计入的关键词（"标准机柜"只计入"机柜"）
+
+全进程共用一个分词器（get_segmenter()），词典在第一次分词时才加载和编译，注册了新关键词后重新编译。
+标题等短文本的分词结果放在LRU缓存中；正文只缓存最近几篇，供同一篇文章的评分和分类复用。
+
+可选使用jieba分词（KEYWORD_SEGMENTER=jieba，需要 pip install jieba）：切分使用jieba的通用词典，
+关键词和词典词通过 jieba.add_word 加入；速度比内置的最大匹配慢。
+"""
+
+import logging
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.processing.keyword_trie import KeywordTrie
+
+try:
+    import jieba
+except ImportError:  # 可选依赖
+    jieba = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORDS_PATH = 'config/segment_words.txt'
+
+# 关键词匹配模式
+MATCH_SUBSTRING = 'substring'
+MATCH_SEGMENT = 'segment'
+MATCH_MODES = (MATCH_SUBSTRING, MATCH_SEGMENT)
+
+# 内置词典词：{词: 其中不计入的关键词}
+# 这些词包含关键词的片段或关键词本身，但含义与关键词无关
+DICTIONARY_WORDS = {
+    '线上': (), '线下': (),                    # "线上线下"不是"上线"
+    '标准机柜': ('标准',), '标准柜': ('标准',), '标准间': ('标准',),
+    '没办法': ('办法',), '想办法': ('办法',), '有办法': ('办法',),
+    '上市公司': ('上市',),
+    '突破口': ('突破',),
+    '意见领袖': ('意见',),
+    '指导价': ('指导',),
+}
+
+# 短文本（标题）的缓存条数和长度上限
+SHORT_CACHE_SIZE = 4096
+SHORT_TEXT_MAX_CHARS = 200
+# 长文本（正文）和标题+正文的关键词集合只缓存最近几篇
+RECENT_CACHE_SIZE = 32
+
+
+def default_match_mode() -> str:
+    """默认匹配模式（环境变量KEYWORD_MATCH_MODE，默认substring）"""
+    mode = os.getenv('KEYWORD_MATCH_MODE', MATCH_SUBSTRING).lower()
+    if mode not in MATCH_MODES:
+        logger.warning(f"未知的KEYWORD_MATCH_MODE: {mode}，使用子串匹配")
+        return MATCH_SUBSTRING
+    return mode
+
+
+def check_match_mode(match_mode: Optional[str]) -> str:
+    """校验匹配模式（None时使用默认值）"""
+    if match_mode is None:
+        return default_match_mode()
+    if match_mode not in MATCH_MODES:
+        raise ValueError(f"未知的关键词匹配模式: {match_mode}（可选: {', '.join(MATCH_MODES)}）")
+    return match_mode
+
+
+class Segmenter:
+    """基于关键词词典的正向最大匹配分词器（线程安全）"""
+
+    def __init__(
+        self,
+        words_path: Optional[str] = DEFAULT_WORDS_PATH,
+        backend: Optional[str] = None,
+        cache_size: int = SHORT_CACHE_SIZE,
+    ):
+        """
+        Args:
+            words_path: 词典词文件（不存在时只用内置词典词）
+            backend: 'trie'（内置最大匹配）或 'jieba'，默认读取环境变量KEYWORD_SEGMENTER
+            cache_size: 短文本分词结果的缓存条数
+        """
+        self.words_path = words_path
+        backend = (backend or os.getenv('KEYWORD_SEGMENTER', 'trie')).lower()
+        if backend == 'jieba' and jieba is None:
+            logger.warning("未安装jieba（pip install jieba），使用内置最大匹配分词")
+            backend = 'trie'
+        self.backend = backend
+
+        self._lock = threading.Lock()
+        self._keywords: Dict[str, set] = {}                    # 小写 -> 注册时的写法
+        self._words: Optional[Dict[str, Tuple[str, ...]]] = None  # 词典词（小写）-> 不计入的关键词
+        self._compiled: Optional[Tuple[KeywordTrie, Dict[str, Tuple[str, ...]]]] = None
+        self._cache_size = cache_size
+        self._reset_caches()
+
+    def _reset_caches(self):
+        self._short = lru_cache(maxsize=self._cache_size)(self._count)
+        self._recent = lru_cache(maxsize=RECENT_CACHE_SIZE)(self._count)
+        self._sets = lru_cache(maxsize=RECENT_CACHE_SIZE)(self._keywords_in)
+
+    def _load_words(self) -> Dict[str, Tuple[str, ...]]:
+        """
+        加载词典词
+
+        文件每行一个词，词后用空格分隔的关键词表示该词中不计入的关键词；#开头为注释
+        """
+        words = dict(DICTIONARY_WORDS)
+        if self.words_path and Path(self.words_path).exists():
+            with open(self.words_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.split('#', 1)[0].split()
+                    if parts:
+                        words[parts[0]] = tuple(parts[1:])
+        return {word.lower(): tuple(k.lower() for k in blocked) for word, blocked in words.items()}
+
+    def add_keywords(self, keywords: Iterable[str]):
+        """注册关键词（有新词时清空缓存，下次分词前重新编译词典）"""
+        with self._lock:
+            added = False
+            for keyword in keywords:
+                keyword = keyword.strip()
+                if keyword and keyword not in self._keywords.get(keyword.lower(), ()):
+                    self._keywords.setdefault(keyword.lower(), set()).add(keyword)
+                    added = True
+            if added:
+                self._compiled = None
+                self._reset_caches()
+
+    @staticmethod
+    def _compounds(keywords: Iterable[str]) -> List[str]:
+        """首尾重叠的两个关键词拼成的组合词（重叠部分为中文时）"""
+        keywords = list(keywords)
+        compounds = []
+        for left in keywords:
+            for right in keywords:
+                for size in range(1, min(len(left), len(right))):
+                    overlap = left[-size:]
+                    if overlap == right[:size] and not overlap.isascii():
+                        compounds.append(left + right[size:])
+        return compounds
+
+    def _compile(self) -> Tuple[KeywordTrie, Dict[str, Tuple[str, ...]]]:
+        with self._lock:
+            if self._compiled is not None:
+                return self._compiled
+            if self._words is None:
+                self._words = self._load_words()
+
+            keywords = [(lower, KeywordTrie([lower])) for lower in self._keywords]
+            vocabulary = set(self._words) | set(self._keywords) | set(self._compounds(self._keywords))
+
+            # 每个词计入的关键词（含注册时的各种写法）
+            expansions = {}
+            for word in vocabulary:
+                blocked = self._words.get(word, ())
+                expansions[word] = tuple(
+                    spelling
+                    for lower, trie in keywords
+                    if lower not in blocked and next(trie.finditer(word), None)
+                    for spelling in self._keywords[lower]
+                )
+
+            trie = KeywordTrie(vocabulary)
+            if self.backend == 'jieba':
+                for word in vocabulary:
+                    jieba.add_word(word)
+            self._compiled = (trie, expansions)
+            return self._compiled
+
+    def _get_compiled(self) -> Tuple[KeywordTrie, Dict[str, Tuple[str, ...]]]:
+        # 编译完成后不再加锁：注册新关键词时整体替换为None，读到旧值只会多用一次旧词典
+        compiled = self._compiled
+        return compiled if compiled is not None else self._compile()
+
+    def tokens(self, text: Optional[str]) -> List[str]:
+        """
+        切分文本
+
+        Returns:
+            小写的词。内置最大匹配：切出的词典词（按出现顺序，词典外的内容跳过）；jieba：全部分词结果
+        """
+        if not text:
+            return []
+        trie, _ = self._get_compiled()
+        if self.backend == 'jieba':
+            return [token for token in jieba.lcut(text.lower()) if token.strip()]
+        return trie.findall(text)
+
+    def _count(self, text: str) -> Dict[str, int]:
+        _, expansions = self._get_compiled()
+        counts: Dict[str, int] = {}
+        for token in self.tokens(text):
+            for keyword in expansions.get(token, ()):
+                counts[keyword] = counts.get(keyword, 0) + 1
+        return counts
+
+    def keyword_counts(self, text: Optional[str]) -> Dict[str, int]:
+        """
+        文本中各关键词的出现次数
+
+        Args:
+            text: 文本
+
+        Returns:
+            {关键词: 次数}（只含出现的关键词；结果来自缓存，调用方不要修改）
+        """
+        if not text:
+            return {}
+        if len(text) <= SHORT_TEXT_MAX_CHARS:
+            return self._short(text)
+        return self._recent(text)
+
+    def _keywords_in(self, *texts: Optional[str]) -> FrozenSet[str]:
+        found = set()
+        for text in texts:
+            found.update(self.keyword_counts(text))
+        return frozenset(found)
+
+    def keywords_in(self, *texts: Optional[str]) -> FrozenSet[str]:
+        """
+        多段文本（如标题和正文）中出现的关键词集合，各段分别分词
+
+        同一篇文章的相关性、影响范围评分和分类依次调用，结果按参数缓存最近几组。
+        """
+        return self._sets(*texts)
+
+    def cache_info(self) -> Dict[str, int]:
+        """短文本缓存的命中统计"""
+        info = self._short.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize}
+
+    def cache_clear(self):
+        """清空分词结果缓存（词典不变）"""
+        with self._lock:
+            self._reset_caches()
+
+
+_segmenter: Optional[Segmenter] = None
+_segmenter_lock = threading.Lock()
+
+
+def get_segmenter() -> Segmenter:
+    """全进程共用的分词器（第一次调用时创建）"""
+    global _segmenter
+    if _segmenter is None:
+        with _segmenter_lock:
+            if _segmenter is None:
+                _segmenter = Segmenter()
+    return _segmenter
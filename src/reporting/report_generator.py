@@ -12,6 +12,7 @@ from src.reporting.report_summarizer import (
     get_random_insight_label,
     get_insight_icon
 )
+from src.reporting.trend_analyzer import WeeklyTrendAnalyzer
 import logging
 import os
 
@@ -48,6 +49,10 @@ class WeeklyReportGenerator:
 
         self.use_random_labels = os.getenv('WEEKLY_INSIGHT_LABEL_RANDOM', 'true').lower() == 'true'
 
+        # 趋势对比（基于按日汇总表，环比上周）
+        self.enable_trends = os.getenv('WEEKLY_TREND_ENABLED', 'true').lower() == 'true'
+        self.trend_analyzer = WeeklyTrendAnalyzer(self.db)
+
         # 初始化摘要生成器
         if self.enable_llm_summary:
             try:
@@ -66,9 +71,9 @@ class WeeklyReportGenerator:
             days: 天数，默认7天
 
         Returns:
-            文章列表，按评分降序排列
+            文章列表（只读ArticleRecord，可按字典方式访问），按评分降序排列
         """
-        return self.db.get_articles_for_weekly_report(days=days)
+        return self.db.get_articles_for_weekly_report(days=days, as_records=True)
 
     def group_by_category(self, articles: List[Dict]) -> Dict[str, List[Dict]]:
         """
@@ -173,6 +178,13 @@ class WeeklyReportGenerator:
             insight=section_insights.get('其他动态', '')
         )
 
+        # 生成趋势对比
+        if self.enable_trends:
+            try:
+                report += self._generate_trend_section(days)
+            except Exception as e:
+                logger.warning(f"趋势对比生成失败: {e}，跳过该章节")
+
         # 生成统计信息
         report += self._generate_statistics(articles)
 
@@ -421,6 +433,66 @@ class WeeklyReportGenerator:
         section += "\n"
         return section
 
+    @staticmethod
+    def _format_change(current: float, previous: float, percent: bool = True) -> str:
+        """格式化环比变化（上周为0时显示"新增"）"""
+        if percent:
+            if not previous:
+                return "新增" if current else "持平"
+            change = (current - previous) / previous * 100
+        else:
+            change = current - previous
+        if abs(change) < 0.05:
+            return "持平"
+        arrow = "↑" if change > 0 else "↓"
+        return f"{arrow}{abs(change):.1f}%" if percent else f"{arrow}{abs(change):.1f}"
+
+    def _generate_trend_section(self, days: int = 7) -> str:
+        """生成趋势对比章节（本周与上周环比，近8周收录量走势）"""
+        trends = self.trend_analyzer.compare(days=days)
+        current, previous = trends['current'], trends['previous']
+
+        section = "## 📈 趋势对比\n\n"
+        section += (
+            f"- **收录文章**: 本周 {current['article_count']} 篇，上周 {previous['article_count']} 篇"
+            f"（{self._format_change(current['article_count'], previous['article_count'])}）\n"
+        )
+        if current['avg_score'] is not None and previous['avg_score'] is not None:
+            section += (
+                f"- **平均评分**: 本周 {current['avg_score']}，上周 {previous['avg_score']}"
+                f"（{self._format_change(current['avg_score'], previous['avg_score'], percent=False)}）\n"
+            )
+
+        categories = [c for c in trends['categories'] if c['name'] in ("投资", "技术", "政策", "市场")]
+        if categories:
+            section += "- **分类变化**: " + "、".join(
+                f"{c['name']} {c['current']}篇（{c['delta']:+d}）" for c in categories
+            ) + "\n"
+
+        movers = sorted((s for s in trends['sources'] if s['delta']), key=lambda s: s['delta'])
+        rising = [s for s in reversed(movers) if s['delta'] > 0][:3]
+        falling = [s for s in movers if s['delta'] < 0][:3]
+        if rising or falling:
+            parts = []
+            if rising:
+                parts.append("增长 " + "、".join(f"{s['name']}（{s['delta']:+d}）" for s in rising))
+            if falling:
+                parts.append("减少 " + "、".join(f"{s['name']}（{s['delta']:+d}）" for s in falling))
+            section += "- **来源变化**: " + "；".join(parts) + "\n"
+
+        keywords = self.trend_analyzer.rising_keywords(days=days)
+        if keywords:
+            section += "- **热度上升关键词**: " + "、".join(
+                f"{k['keyword']}（{k['previous']}→{k['current']}）" for k in keywords
+            ) + "\n"
+
+        series = self.trend_analyzer.weekly_series(weeks=8, days=days)
+        if any(week['article_count'] for week in series):
+            section += "- **近8周收录量**: " + " → ".join(str(week['article_count']) for week in series) + "\n"
+
+        section += "\n"
+        return section
+
     def _generate_statistics(self, articles: List[Dict]) -> str:
         """生成统计信息"""
         section = "---\n\n"
@@ -13,8 +13,16 @@ import random
 import os
 from typing import Dict, List, Optional
 
+from src.processing.json_extract import (
+    build_reask_prompt, extract_json_object, missing_fields, post_with_json_mode_fallback,
+)
+from src.utils.http_session import get_session, get_timeout
+
 logger = logging.getLogger(__name__)
 
+# 周报洞察必须返回的字段；缺失时只追问缺失的字段
+REQUIRED_FIELDS = ('executive_summary', 'section_insights')
+
 
 # 板块点评标题词库
 SECTION_INSIGHT_LABELS = {
@@ -121,7 +129,10 @@ class WeeklyReportSummarizer:
         self.api_key = api_key or os.getenv('LLM_API_KEY') or os.getenv('OPENAI_API_KEY')
         self.api_base = api_base or os.getenv('LLM_API_BASE') or 'https://api.openai.com'
         self.model = model or os.getenv('LLM_MODEL') or os.getenv('OPENAI_MODEL') or 'gpt-4-turbo-preview'
-        self.timeout = 30
+        self.timeout = get_timeout()
+        self.session = get_session()
+        # JSON模式（response_format），端点不支持时自动关闭
+        self.json_mode = os.getenv('LLM_JSON_MODE', 'true').lower() == 'true'
 
         if not self.api_key:
             logger.warning("未配置LLM API密钥，摘要生成功能将不可用")
@@ -159,8 +170,8 @@ class WeeklyReportSummarizer:
             # 调用LLM API
             response_text = self._call_llm_api(prompt)
 
-            # 解析结果
-            insights = self._parse_response(response_text)
+            # 解析结果（缺失字段时只追问缺失的字段）
+            insights = self._parse_response(response_text, prompt=prompt)
 
             logger.info(f"✓ 周报摘要生成成功，包含{len(insights.get('section_insights', {}))}个板块点评")
 
@@ -250,12 +261,13 @@ class WeeklyReportSummarizer:
 
         return prompt
 
-    def _call_llm_api(self, prompt: str) -> str:
+    def _call_llm_api(self, prompt: str, max_tokens: int = 600) -> str:
         """
         调用LLM API
 
         Args:
             prompt: 提示词
+            max_tokens: 最大输出token数
 
         Returns:
             API返回的文本内容
@@ -274,16 +286,22 @@ class WeeklyReportSummarizer:
                 }
             ],
             "temperature": 0.3,  # 降低随机性
-            "max_tokens": 600
+            "max_tokens": max_tokens
         }
+        if self.json_mode:
+            payload["response_format"] = {"type": "json_object"}
 
         try:
-            response = requests.post(
+            response, json_supported = post_with_json_mode_fallback(
+                self.session,
                 f"{self.api_base}/v1/chat/completions",
+                payload,
                 headers=headers,
-                json=payload,
                 timeout=self.timeout
             )
+            if not json_supported:
+                # 端点不支持JSON模式：之后的调用不再请求
+                self.json_mode = False
 
             response.raise_for_status()
 
@@ -293,35 +311,36 @@ class WeeklyReportSummarizer:
             return content.strip()
 
         except requests.exceptions.Timeout:
-            logger.error(f"LLM API调用超时（{self.timeout}秒）")
+            logger.error(f"LLM API调用超时（连接{self.timeout[0]}秒/读取{self.timeout[1]}秒）")
             raise
         except requests.exceptions.RequestException as e:
             logger.error(f"LLM API调用失败: {e}")
             raise
 
-    def _parse_response(self, response_text: str) -> Dict:
+    def _parse_response(self, response_text: str, prompt: Optional[str] = None) -> Dict:
         """
-        解析LLM返回的JSON
+        解析LLM返回的JSON（容错提取，给出prompt时对缺失字段追问一次）
 
         Args:
             response_text: LLM返回的文本
+            prompt: 原Prompt（用于追问缺失字段）
 
         Returns:
             解析后的字典
         """
         try:
-            # 清理可能的markdown代码块
-            cleaned_text = response_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            if cleaned_text.startswith('```'):
-                cleaned_text = cleaned_text[3:]
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-            cleaned_text = cleaned_text.strip()
-
-            # 解析JSON
-            data = json.loads(cleaned_text)
+            data = extract_json_object(response_text)
+            if data is None:
+                raise json.JSONDecodeError("未找到JSON对象", response_text, 0)
+
+            missing = missing_fields(data, REQUIRED_FIELDS)
+            if prompt and missing and len(missing) < len(REQUIRED_FIELDS):
+                logger.info(f"LLM返回缺少字段 {missing}，追问补全")
+                try:
+                    extra = extract_json_object(self._call_llm_api(build_reask_prompt(prompt, missing))) or {}
+                    data.update({f: extra[f] for f in missing if extra.get(f)})
+                except Exception as e:
+                    logger.warning(f"追问缺失字段失败: {e}")
 
             # 验证字段
             executive_summary = data.get('executive_summary', '')
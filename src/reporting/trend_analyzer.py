@@ -0,0 +1,163 @@
+"""
+周报趋势分析
+
+基于daily_aggregates按日汇总表（由数据库触发器在写入时维护）计算环比：
+本周与上周的收录量、平均评分、分类和来源变化，以及近N周的收录量走势。
+汇总表每天每个维度组合一行，多周对比的查询代价与天数成正比，不随文章总数增长。
+
+热度上升关键词需要标题文本，只读取本周和上周两个窗口内的标题。
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.classification.category_classifier import CategoryClassifier
+from src.storage.database import Database
+from src.storage.migrations import split_categories
+from src.storage.records import parse_date
+
+
+def default_keywords() -> List[str]:
+    """默认关键词表（分类器的关键词，去重后保持原顺序）"""
+    keywords = []
+    for group in (
+        CategoryClassifier.INVESTMENT_KEYWORDS,
+        CategoryClassifier.TECHNOLOGY_KEYWORDS,
+        CategoryClassifier.POLICY_KEYWORDS,
+        CategoryClassifier.MARKET_KEYWORDS,
+    ):
+        for keyword in group:
+            if keyword not in keywords:
+                keywords.append(keyword)
+    return keywords
+
+
+class WeeklyTrendAnalyzer:
+    """周环比趋势分析器"""
+
+    def __init__(self, db: Database, keywords: Optional[Iterable[str]] = None):
+        """
+        Args:
+            db: 数据库
+            keywords: 统计热度的关键词（默认使用分类器关键词）
+        """
+        self.db = db
+        self.keywords = list(keywords) if keywords is not None else default_keywords()
+
+    @staticmethod
+    def windows(days: int = 7, end_date: Optional[date] = None) -> Tuple[Tuple[date, date], Tuple[date, date]]:
+        """
+        本周与上周的日期窗口（与周报一致：含结束日期在内的最近days天）
+
+        Returns:
+            ((本周开始, 本周结束), (上周开始, 上周结束))
+        """
+        end_date = end_date or date.today()
+        current_start = end_date - timedelta(days=days - 1)
+        previous_end = current_start - timedelta(days=1)
+        return (current_start, end_date), (previous_end - timedelta(days=days - 1), previous_end)
+
+    def _totals(self, start_date: date, end_date: date) -> Dict[str, Any]:
+        rows = self.db.get_daily_aggregates(start_date, end_date)
+        if not rows:
+            return {'article_count': 0, 'avg_score': None, 'avg_llm_total': None}
+        return rows[0]
+
+    def _counts_by(self, dimension: str, start_date: date, end_date: date) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for row in self.db.get_daily_aggregates(start_date, end_date, group_by=dimension):
+            # 多分类文章（"投资,技术"）计入每个分类
+            keys = split_categories(row[dimension]) if dimension == 'category' else [row[dimension]]
+            for key in keys or ['其他']:
+                counts[key] = counts.get(key, 0) + row['article_count']
+        return counts
+
+    @staticmethod
+    def _deltas(current: Dict[str, int], previous: Dict[str, int]) -> List[Dict[str, Any]]:
+        result = [
+            {'name': name, 'current': current.get(name, 0), 'previous': previous.get(name, 0),
+             'delta': current.get(name, 0) - previous.get(name, 0)}
+            for name in set(current) | set(previous)
+        ]
+        result.sort(key=lambda item: (-item['current'], item['name']))
+        return result
+
+    def compare(self, days: int = 7, end_date: Optional[date] = None) -> Dict[str, Any]:
+        """
+        本周与上周对比
+
+        Returns:
+            {'current': 本周合计, 'previous': 上周合计,
+             'categories': [{'name', 'current', 'previous', 'delta'}], 'sources': [...]}
+        """
+        (cur_start, cur_end), (prev_start, prev_end) = self.windows(days, end_date)
+        return {
+            'current': self._totals(cur_start, cur_end),
+            'previous': self._totals(prev_start, prev_end),
+            'categories': self._deltas(
+                self._counts_by('category', cur_start, cur_end),
+                self._counts_by('category', prev_start, prev_end),
+            ),
+            'sources': self._deltas(
+                self._counts_by('source', cur_start, cur_end),
+                self._counts_by('source', prev_start, prev_end),
+            ),
+        }
+
+    def weekly_series(self, weeks: int = 8, days: int = 7, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        近N周的收录量与平均评分（按日汇总后在内存中分桶，只查询一次）
+
+        Returns:
+            [{'start', 'end', 'article_count', 'avg_score'}]，时间升序
+        """
+        end_date = end_date or date.today()
+        start_date = end_date - timedelta(days=weeks * days - 1)
+        buckets = [{'start': start_date + timedelta(days=i * days),
+                    'end': start_date + timedelta(days=(i + 1) * days - 1),
+                    'article_count': 0, 'score_sum': 0} for i in range(weeks)]
+
+        for row in self.db.get_daily_aggregates(start_date, end_date, group_by='day'):
+            index = (date.fromisoformat(row['day']) - start_date).days // days
+            if 0 <= index < weeks:
+                buckets[index]['article_count'] += row['article_count']
+                buckets[index]['score_sum'] += row['score_sum']
+
+        for bucket in buckets:
+            score_sum = bucket.pop('score_sum')
+            bucket['avg_score'] = round(score_sum / bucket['article_count'], 1) if bucket['article_count'] else None
+        return buckets
+
+    def rising_keywords(
+        self, days: int = 7, end_date: Optional[date] = None, top_n: int = 5, min_count: int = 2
+    ) -> List[Dict[str, Any]]:
+        """
+        热度上升的关键词（按标题中出现的文章数，本周减上周）
+
+        Args:
+            days: 窗口天数
+            end_date: 本周结束日期（默认今天）
+            top_n: 返回的关键词数
+            min_count: 本周至少出现的文章数
+
+        Returns:
+            [{'keyword', 'current', 'previous', 'delta'}]，按增量降序
+        """
+        (cur_start, cur_end), (prev_start, _) = self.windows(days, end_date)
+        current: Dict[str, int] = {}
+        previous: Dict[str, int] = {}
+        for row in self.db.get_article_titles(prev_start, cur_end):
+            counts = current if parse_date(row['publish_date']) >= cur_start else previous
+            title = row['title'] or ''
+            for keyword in self.keywords:
+                if keyword in title:
+                    counts[keyword] = counts.get(keyword, 0) + 1
+
+        rising = [
+            {'keyword': keyword, 'current': count, 'previous': previous.get(keyword, 0),
+             'delta': count - previous.get(keyword, 0)}
+            for keyword, count in current.items()
+            if count >= min_count and count > previous.get(keyword, 0)
+        ]
+        rising.sort(key=lambda item: (-item['delta'], -item['current'], item['keyword']))
+        return rising[:top_n]
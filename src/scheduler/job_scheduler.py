@@ -20,13 +20,16 @@ from apscheduler.triggers.cron import CronTrigger
 logger = logging.getLogger(__name__)
 
 
-def run_collection(limit: int = 20, no_llm: bool = False):
+def run_collection(limit: int = 20, no_llm: bool = False, resume_on_failure: bool = True):
     """
     运行数据采集任务
 
+    采集进程超时或异常退出时，使用 --resume 续采一次（跳过已完成的源，复用已完成的LLM分析）。
+
     Args:
         limit: 每个源采集文章数量
         no_llm: 是否禁用LLM
+        resume_on_failure: 失败后是否续采一次
     """
     import subprocess
     import sys
@@ -35,23 +38,27 @@ def run_collection(limit: int = 20, no_llm: bool = False):
     if no_llm:
         cmd.append('--no-llm')
 
-    try:
-        logger.info(f"开始执行采集任务: {' '.join(cmd)}")
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+    attempts = [cmd, cmd + ['--resume']] if resume_on_failure else [cmd]
+    for attempt, attempt_cmd in enumerate(attempts, 1):
+        try:
+            logger.info(f"开始执行采集任务: {' '.join(attempt_cmd)}")
+            result = subprocess.run(attempt_cmd, capture_output=True, text=True, timeout=3600)
 
-        if result.returncode == 0:
-            logger.info(f"采集任务完成: {result.stdout}")
-        else:
+            if result.returncode == 0:
+                logger.info(f"采集任务完成: {result.stdout}")
+                return True
             logger.error(f"采集任务失败: {result.stderr}")
 
-        return result.returncode == 0
+        except subprocess.TimeoutExpired:
+            logger.error("采集任务超时（1小时）")
+        except Exception as e:
+            logger.error(f"采集任务异常: {e}")
+            return False
 
-    except subprocess.TimeoutExpired:
-        logger.error("采集任务超时（1小时）")
-        return False
-    except Exception as e:
-        logger.error(f"采集任务异常: {e}")
-        return False
+        if attempt < len(attempts):
+            logger.info("采集任务未完成，续采中断的运行")
+
+    return False
 
 
 def generate_weekly_report(days: int = 7):
@@ -6,11 +6,57 @@
 2. 时效性（25分）- 基于发布日期衰减
 3. 影响范围（20分）- 基于投资额、项目规模等
 4. 来源可信度（15分）- 基于媒体源Tier
+
+影响范围评分用到的数值（投资金额、机柜数）连同功率（MW）、PUE由 extract_facts() 一并提取，
+入库时写入article_facts表，之后的统计直接查询该表，不再对正文重复运行正则。
+
+关键词默认按子串匹配；match_mode='segment' 时先分词再匹配（见 src/processing/segmenter.py），
+避免"标准机柜"命中"标准"之类的误判。
 """
 
 import re
 from datetime import date, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from src.processing.segmenter import MATCH_SEGMENT, check_match_mode, get_segmenter
+
+
+# 美元金额折算人民币的固定汇率（只用于投资额汇总的量级比较，不追求精确）
+USD_CNY_RATE = 7.2
+
+# 数值：允许千分位逗号（"1,200万元"）
+_NUMBER = r'(\d[\d,]*(?:\.\d+)?)'
+
+# 评分用金额：数字 + 亿/万
+_SCORE_AMOUNT_PATTERN = re.compile(r'(\d+\.?\d*)\s*(亿|万)')
+
+# 投资金额：数字 + 万亿/亿/万 + 元/美元/人民币（不带货币单位的"亿"多为人口、电量等，不作为投资额）
+_INVESTMENT_PATTERN = re.compile(_NUMBER + r'\s*(万亿|亿|万)\s*(美元|元|人民币)')
+_AMOUNT_UNITS = {'万亿': 10000, '亿': 1, '万': 0.0001}
+
+# 评分用机柜数：X万(个)机柜、X(个)机柜（沿用原有评分规则，"架/台/标准机柜"不计分）
+_SCORE_RACK_PATTERNS = (
+    (re.compile(r'(\d+\.?\d*)\s*万\s*(?:个)?机柜'), 10000),
+    (re.compile(r'(\d+\.?\d*)\s*(?:个)?机柜'), 1),
+)
+
+# 机柜数：数字 +（万）+（个/架/台）+（标准）机柜
+_RACK_PATTERN = re.compile(_NUMBER + r'\s*(万)?\s*(?:个|架|台)?\s*(?:标准)?机柜')
+
+# 功率：MW/兆瓦、GW/吉瓦、万千瓦（统一为MW；"MWh"等电量单位不匹配）
+_POWER_PATTERN = re.compile(_NUMBER + r'\s*(MW|兆瓦|GW|吉瓦|万千瓦)(?![A-Za-z])', re.IGNORECASE)
+_POWER_UNITS = {'mw': 1, '兆瓦': 1, 'gw': 1000, '吉瓦': 1000, '万千瓦': 10}
+
+# PUE：PUE后8个字符内的第一个小数（"PUE降至1.15"、"PUE值低于1.2"），
+# 以及紧随其后"降至"的目标值（"PUE从1.5降至1.2"两个值都提取）
+_PUE_PATTERN = re.compile(
+    r'PUE[^\d\n]{0,8}?(\d\.\d+)(?:\s*(?:降至|降到|降低至|降低到|优化至|优化到)\s*(\d\.\d+))?', re.IGNORECASE
+)
+_PUE_RANGE = (1.0, 3.0)
+
+
+def _to_number(text: str) -> float:
+    return float(text.replace(',', ''))
 
 
 class PriorityScorer:
@@ -66,6 +112,34 @@ class PriorityScorer:
         }
     }
 
+    def __init__(self, match_mode: Optional[str] = None):
+        """
+        Args:
+            match_mode: 关键词匹配模式，'substring'（子串）或 'segment'（分词后匹配），
+                默认读取环境变量KEYWORD_MATCH_MODE（默认substring）
+        """
+        self.match_mode = check_match_mode(match_mode)
+        self._segmenter = None
+        if self.match_mode == MATCH_SEGMENT:
+            self._segmenter = get_segmenter()
+            self._segmenter.add_keywords(self._match_keywords())
+
+    def _match_keywords(self) -> List[str]:
+        """分词模式下需要注册到分词器的关键词"""
+        keywords = [keyword for group in self.RELEVANCE_KEYWORDS.values() for keyword in group]
+        return keywords + list(self.IMPACT_PATTERNS['industry_impact'])
+
+    def _keyword_haystack(self, title: Optional[str], content: Optional[str], text: Optional[str] = None):
+        """
+        关键词匹配的对象（两种模式下都用 `keyword in haystack` 判断）
+
+        Returns:
+            子串模式为标题+正文文本，分词模式为其中出现的关键词集合
+        """
+        if self._segmenter is None:
+            return text if text is not None else (title or '') + " " + (content or '')
+        return self._segmenter.keywords_in(title, content)
+
     def calculate_relevance_score(self, title: Optional[str], content: Optional[str]) -> int:
         """
         计算业务相关性评分（40分）
@@ -82,7 +156,7 @@ class PriorityScorer:
         if not content:
             content = ""
 
-        text = title + " " + content
+        text = self._keyword_haystack(title, content)
         score = 0
         found_keywords = set()  # 记录已匹配的关键词，避免重复计分
 
@@ -173,28 +247,14 @@ class PriorityScorer:
         max_score = max(max_score, datacenter_score)
 
         # 3. 检测行业影响关键词
-        industry_score = self._extract_industry_impact_score(text)
+        industry_score = self._extract_industry_impact_score(self._keyword_haystack(title, content, text))
         max_score = max(max_score, industry_score)
 
         return min(max_score, 20)
 
     def _extract_funding_score(self, text: str) -> int:
         """提取融资金额并评分"""
-        # 匹配模式：数字 + 亿/万
-        patterns = [
-            r'(\d+\.?\d*)\s*亿',  # X亿
-            r'(\d+\.?\d*)\s*万',  # X万
-        ]
-
-        amounts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                amount = float(match)
-                # 转换为亿元
-                if '万' in pattern:
-                    amount = amount / 10000
-                amounts.append(amount)
+        amounts = self._find_amounts(text)
 
         if not amounts:
             return 0
@@ -211,21 +271,7 @@ class PriorityScorer:
 
     def _extract_datacenter_score(self, text: str) -> int:
         """提取数据中心规模并评分"""
-        # 匹配模式：数字 + 机柜（支持"万机柜"、"个机柜"等）
-        patterns = [
-            r'(\d+\.?\d*)\s*万\s*(?:个)?机柜',  # X万机柜 / X万个机柜
-            r'(\d+\.?\d*)\s*(?:个)?机柜',       # X机柜 / X个机柜
-        ]
-
-        counts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                count = float(match)
-                # 转换为机柜数
-                if '万' in pattern:
-                    count = count * 10000
-                counts.append(count)
+        counts = self._find_score_racks(text)
 
         if not counts:
             return 0
@@ -240,7 +286,92 @@ class PriorityScorer:
 
         return 0
 
-    def _extract_industry_impact_score(self, text: str) -> int:
+    @staticmethod
+    def _find_amounts(text: str) -> List[float]:
+        """评分用的金额（亿元）：所有"X亿"、"X万"，不要求货币单位"""
+        return [
+            float(match.group(1)) / (10000 if match.group(2) == '万' else 1)
+            for match in _SCORE_AMOUNT_PATTERN.finditer(text)
+        ]
+
+    @staticmethod
+    def _find_score_racks(text: str) -> List[float]:
+        """评分用的机柜数（"X万机柜"、"X个机柜"）"""
+        return [
+            float(match.group(1)) * multiplier
+            for pattern, multiplier in _SCORE_RACK_PATTERNS
+            for match in pattern.finditer(text)
+        ]
+
+    @staticmethod
+    def _find_investments(text: str) -> List[Tuple[float, str]]:
+        """投资金额（亿元，美元按USD_CNY_RATE折算），返回[(金额, 原文)]"""
+        results = []
+        for match in _INVESTMENT_PATTERN.finditer(text):
+            amount = _to_number(match.group(1)) * _AMOUNT_UNITS[match.group(2)]
+            if match.group(3) == '美元':
+                amount *= USD_CNY_RATE
+            results.append((round(amount, 4), match.group(0)))
+        return results
+
+    @staticmethod
+    def _find_racks(text: str) -> List[Tuple[float, str]]:
+        """机柜数（支持"3万机柜"、"5000个标准机柜"），返回[(机柜数, 原文)]"""
+        results = []
+        for match in _RACK_PATTERN.finditer(text):
+            count = _to_number(match.group(1)) * (10000 if match.group(2) else 1)
+            results.append((count, match.group(0)))
+        return results
+
+    @staticmethod
+    def _find_power(text: str) -> List[Tuple[float, str]]:
+        """IT负载/装机功率（MW），返回[(MW, 原文)]"""
+        return [
+            (round(_to_number(match.group(1)) * _POWER_UNITS[match.group(2).lower()], 4), match.group(0))
+            for match in _POWER_PATTERN.finditer(text)
+        ]
+
+    @staticmethod
+    def _find_pue(text: str) -> List[Tuple[float, str]]:
+        """PUE值（只保留1.0-3.0之间的合理值），返回[(PUE, 原文)]"""
+        low, high = _PUE_RANGE
+        return [
+            (float(value), match.group(0))
+            for match in _PUE_PATTERN.finditer(text)
+            for value in match.groups() if value and low <= float(value) <= high
+        ]
+
+    def extract_facts(self, title: Optional[str], content: Optional[str]) -> List[Dict]:
+        """
+        提取文章中的数值事实（入库时写入article_facts）
+
+        Args:
+            title: 文章标题
+            content: 文章内容
+
+        Returns:
+            [{'type': 'investment'|'racks'|'power'|'pue', 'value', 'unit', 'text': 原文片段}]，
+            同一类型的相同数值只保留第一次出现
+        """
+        text = (title or '') + ' ' + (content or '')
+        extractors = [
+            ('investment', '亿元', self._find_investments),
+            ('racks', '个', self._find_racks),
+            ('power', 'MW', self._find_power),
+            ('pue', '', self._find_pue),
+        ]
+
+        facts = []
+        seen = set()
+        for fact_type, unit, find in extractors:
+            for value, raw in find(text):
+                if value <= 0 or (fact_type, value) in seen:
+                    continue
+                seen.add((fact_type, value))
+                facts.append({'type': fact_type, 'value': value, 'unit': unit, 'text': raw.strip()})
+        return facts
+
+    def _extract_industry_impact_score(self, text) -> int:
         """提取行业影响关键词并评分"""
         max_score = 0
 
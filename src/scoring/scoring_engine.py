@@ -0,0 +1,363 @@
+"""
+配置驱动的评分引擎
+
+评分规则（关键词及权重、各维度上限、金额/机柜阈值、来源等级分、优先级阈值）从
+config/scoring.json 读取，启动时编译为匹配结构后在每篇文章上复用：
+- 关键词去重（同一关键词出现在多个分组时取最高权重），按权重降序，累计分达到上限即停止匹配
+- 阈值表按下限降序排列，行业影响关键词按分值降序排列，命中第一个即为最高分
+- 金额、机柜数的正则在模块加载时编译（与PriorityScorer共用）
+
+配置文件修改后自动重新加载（按修改时间，最多每 reload_interval 秒检查一次），
+新配置编译成功后整体替换，编译失败时保留旧配置；进行中的 score_many() 使用同一份配置。
+
+关键词匹配沿用子串语义（"AI算力"同时计入"算力"），几十个关键词时逐个 `in` 比逐字遍历字典树更快；
+match_mode='segment' 时改为在分词结果（关键词集合）中查找，配置中的关键词在编译后注册到分词器。
+"""
+
+import copy
+import json
+import logging
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.scoring.priority_scorer import PriorityScorer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORING_PATH = 'config/scoring.json'
+
+
+def default_config() -> Dict[str, Any]:
+    """与PriorityScorer硬编码规则等价的默认配置（配置文件缺省的项以此补齐）"""
+    impact = PriorityScorer.IMPACT_PATTERNS
+    return {
+        'relevance': {
+            'max': 40,
+            'groups': [
+                {'name': name, 'weight': weight, 'keywords': list(PriorityScorer.RELEVANCE_KEYWORDS[name])}
+                for name, weight in (('core', 10), ('important', 5), ('general', 2))
+            ],
+        },
+        'timeliness': {'max': 25, 'decay_days': 7},
+        'impact': {
+            'max': 20,
+            'funding': [{'min': low, 'score': score} for low, score in impact['funding']],
+            'datacenter_scale': [{'min': low, 'score': score} for low, score in impact['datacenter_scale']],
+            'industry_impact': dict(impact['industry_impact']),
+        },
+        'credibility': {'tiers': {'1': 15, '2': 8, '3': 3}, 'default': 8},
+        'priority': {'high': 70, 'medium': 40},
+        'llm': {'weight': 0.0},
+    }
+
+
+def _merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """按键递归覆盖（列表整体替换）"""
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _thresholds(entries: Iterable[Dict[str, Any]]) -> Tuple[Tuple[float, int], ...]:
+    return tuple(sorted(((float(e['min']), int(e['score'])) for e in entries), reverse=True))
+
+
+class CompiledScoring:
+    """编译后的评分规则（只读，引擎重新加载时整体替换）"""
+
+    __slots__ = (
+        'keywords', 'relevance_max', 'timeliness_max', 'decay_days',
+        'funding', 'datacenter_scale', 'industry', 'impact_max',
+        'tiers', 'default_tier_score', 'high', 'medium', 'llm_weight',
+    )
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Args:
+            config: 完整配置（已用默认配置补齐）
+
+        Raises:
+            ValueError: 配置取值不合法
+        """
+        relevance = config['relevance']
+        weights: Dict[str, int] = {}
+        for group in relevance['groups']:
+            for keyword in group['keywords']:
+                keyword = keyword.strip()
+                if keyword:
+                    weights[keyword] = max(weights.get(keyword, 0), int(group['weight']))
+        self.keywords = tuple(sorted(weights.items(), key=lambda item: -item[1]))
+        self.relevance_max = int(relevance['max'])
+
+        self.timeliness_max = int(config['timeliness']['max'])
+        self.decay_days = int(config['timeliness']['decay_days'])
+        if self.decay_days <= 0:
+            raise ValueError("timeliness.decay_days 必须大于0")
+
+        impact = config['impact']
+        self.funding = _thresholds(impact['funding'])
+        self.datacenter_scale = _thresholds(impact['datacenter_scale'])
+        self.industry = tuple(sorted(impact['industry_impact'].items(), key=lambda item: -item[1]))
+        self.impact_max = int(impact['max'])
+
+        credibility = config['credibility']
+        self.tiers = {int(tier): int(score) for tier, score in credibility['tiers'].items()}
+        self.default_tier_score = int(credibility['default'])
+
+        self.high = int(config['priority']['high'])
+        self.medium = int(config['priority']['medium'])
+        if self.medium > self.high:
+            raise ValueError("priority.medium 不能大于 priority.high")
+
+        self.llm_weight = float(config['llm']['weight'])
+        if not 0 <= self.llm_weight <= 1:
+            raise ValueError("llm.weight 必须在0到1之间")
+
+
+class ScoringEngine(PriorityScorer):
+    """
+    配置驱动的评分引擎
+
+    接口与PriorityScorer一致（可直接传给ArticleProcessor），另外提供批量评分 score_many()。
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Any]] = None,
+        path: Optional[str] = None,
+        reload_interval: float = 5.0,
+        match_mode: Optional[str] = None,
+    ):
+        """
+        Args:
+            config: 配置（缺省的项使用默认值）；为None时从path加载
+            path: 配置文件路径（提供时支持自动重新加载）
+            reload_interval: 检查配置文件修改的最小间隔（秒），0为每次评分都检查
+            match_mode: 关键词匹配模式（见PriorityScorer），默认读取环境变量KEYWORD_MATCH_MODE
+        """
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = time.monotonic()
+
+        if config is None:
+            if path is None:
+                raise ValueError("需要提供config或path")
+            self._mtime = Path(path).stat().st_mtime
+            config = self._read(path)
+        self.config = _merge(default_config(), config)
+        self.compiled = CompiledScoring(self.config)
+        super().__init__(match_mode)
+
+    @classmethod
+    def from_file(
+        cls, path: str = DEFAULT_SCORING_PATH, reload_interval: float = 5.0, match_mode: Optional[str] = None
+    ) -> 'ScoringEngine':
+        """从JSON配置文件加载"""
+        return cls(path=path, reload_interval=reload_interval, match_mode=match_mode)
+
+    def _match_keywords(self) -> List[str]:
+        compiled = self.compiled
+        return [keyword for keyword, _ in compiled.keywords] + [keyword for keyword, _ in compiled.industry]
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Any]:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def reload(self) -> bool:
+        """
+        重新加载配置文件
+
+        Returns:
+            是否加载了新配置（文件读取或编译失败时记录日志并保留旧配置）
+        """
+        if not self.path:
+            return False
+        with self._lock:
+            try:
+                mtime = Path(self.path).stat().st_mtime
+                config = _merge(default_config(), self._read(self.path))
+                compiled = CompiledScoring(config)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"评分配置重新加载失败，继续使用旧配置: {e}")
+                return False
+            self.config, self.compiled, self._mtime = config, compiled, mtime
+            if self._segmenter is not None:
+                self._segmenter.add_keywords(self._match_keywords())
+        logger.info(f"评分配置已重新加载: {self.path}")
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """配置文件修改时间变化时重新加载（两次检查间隔不小于reload_interval）"""
+        if not self.path:
+            return False
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return False
+        self._checked_at = now
+        try:
+            mtime = Path(self.path).stat().st_mtime
+        except OSError:
+            return False
+        return mtime != self._mtime and self.reload()
+
+    # ---- 各维度评分（使用编译后的规则） ----
+
+    def calculate_relevance_score(
+        self, title: Optional[str], content: Optional[str], compiled: Optional[CompiledScoring] = None
+    ) -> int:
+        """计算业务相关性评分（每个关键词只计一次，达到上限即停止）"""
+        compiled = compiled or self.compiled
+        text = self._keyword_haystack(title, content)
+        score = 0
+        for keyword, weight in compiled.keywords:
+            if keyword in text:
+                score += weight
+                if score >= compiled.relevance_max:
+                    return compiled.relevance_max
+        return score
+
+    def calculate_timeliness_score(
+        self, publish_date: Optional[date], compiled: Optional[CompiledScoring] = None, today: Optional[date] = None
+    ) -> int:
+        """计算时效性评分（decay_days内线性衰减，未来日期视为当天）"""
+        compiled = compiled or self.compiled
+        if not publish_date:
+            return 0
+        today = today or date.today()
+        if publish_date > today:
+            return compiled.timeliness_max
+        days_ago = (today - publish_date).days
+        if days_ago >= compiled.decay_days:
+            return 0
+        return int(compiled.timeliness_max * (1 - days_ago / compiled.decay_days))
+
+    @staticmethod
+    def _threshold_score(values: List[float], thresholds: Tuple[Tuple[float, int], ...]) -> int:
+        if not values:
+            return 0
+        value = max(values)
+        for low, score in thresholds:
+            if value >= low:
+                return score
+        return 0
+
+    def calculate_impact_score(
+        self, title: Optional[str], content: Optional[str], compiled: Optional[CompiledScoring] = None
+    ) -> int:
+        """计算影响范围评分（融资金额、机柜规模、行业影响关键词取最高）"""
+        compiled = compiled or self.compiled
+        text = (title or '') + " " + (content or '')
+        score = max(
+            self._threshold_score(self._find_amounts(text), compiled.funding),
+            self._threshold_score(self._find_score_racks(text), compiled.datacenter_scale),
+        )
+        keywords = self._keyword_haystack(title, content, text)
+        for keyword, keyword_score in compiled.industry:
+            if keyword_score <= score:
+                break
+            if keyword in keywords:
+                score = keyword_score
+                break
+        return min(score, compiled.impact_max)
+
+    def calculate_credibility_score(self, tier: int, compiled: Optional[CompiledScoring] = None) -> int:
+        """计算来源可信度评分"""
+        compiled = compiled or self.compiled
+        return compiled.tiers.get(tier, compiled.default_tier_score)
+
+    def map_priority_level(self, total_score: int, compiled: Optional[CompiledScoring] = None) -> str:
+        """按配置的阈值映射优先级等级"""
+        compiled = compiled or self.compiled
+        if total_score >= compiled.high:
+            return "高"
+        elif total_score >= compiled.medium:
+            return "中"
+        return "低"
+
+    def _score(
+        self,
+        compiled: CompiledScoring,
+        today: date,
+        title: Optional[str],
+        content: Optional[str],
+        publish_date: Optional[date],
+        source_tier: int,
+        llm_total_score: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        relevance = self.calculate_relevance_score(title, content, compiled)
+        timeliness = self.calculate_timeliness_score(publish_date, compiled, today)
+        impact = self.calculate_impact_score(title, content, compiled)
+        credibility = self.calculate_credibility_score(source_tier, compiled)
+
+        total = relevance + timeliness + impact + credibility
+        if compiled.llm_weight and llm_total_score is not None:
+            # LLM总分0-50，换算到100分后按权重与规则评分加权
+            llm_score = min(max(llm_total_score, 0), 50) * 2
+            total = round(total * (1 - compiled.llm_weight) + llm_score * compiled.llm_weight)
+
+        return {
+            'relevance_score': relevance,
+            'timeliness_score': timeliness,
+            'impact_score': impact,
+            'credibility_score': credibility,
+            'total_score': total,
+            'priority': self.map_priority_level(total, compiled),
+        }
+
+    def calculate_total_score(
+        self,
+        title: Optional[str],
+        content: Optional[str],
+        publish_date: Optional[date],
+        source_tier: int,
+        llm_total_score: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        计算总评分
+
+        llm.weight 大于0时，总分为规则评分与LLM评分（换算到100分）的加权平均；默认为0，只用规则评分。
+
+        Returns:
+            包含各维度评分和总分的字典（与PriorityScorer相同）
+        """
+        self.reload_if_changed()
+        return self._score(self.compiled, date.today(), title, content, publish_date, source_tier, llm_total_score)
+
+    def score_many(self, articles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        批量评分（整批只检查一次配置更新、使用同一份配置和同一个"今天"）
+
+        Args:
+            articles: 文章字典，字段 title / content / publish_date / source_tier（或tier）/ llm_total_score（可选）
+
+        Returns:
+            与输入顺序一致的评分结果列表
+        """
+        self.reload_if_changed()
+        compiled = self.compiled
+        today = date.today()
+        return [
+            self._score(
+                compiled, today,
+                article.get('title'), article.get('content'), article.get('publish_date'),
+                article.get('source_tier', article.get('tier', 2)), article.get('llm_total_score'),
+            )
+            for article in articles
+        ]
+
+
+def load_scorer(path: str = DEFAULT_SCORING_PATH) -> PriorityScorer:
+    """配置文件存在时加载ScoringEngine，否则使用默认规则的PriorityScorer"""
+    if not Path(path).exists():
+        return PriorityScorer()
+    return ScoringEngine.from_file(path)
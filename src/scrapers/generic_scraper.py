@@ -15,6 +15,8 @@ import logging
 import re
 import json
 
+from src.utils.metrics import NullMetrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -92,13 +94,40 @@ class GenericScraper:
             limit: Maximum number of articles to fetch
 
         Returns:
-            List of article dictionaries
+            List of article dictionaries (empty list on fetch failure)
+        """
+        try:
+            html_content = self.fetch_html()
+        except Exception:
+            return []
+        if not html_content:
+            return []
+
+        # Parse articles
+        articles = self.parse_articles(html_content)
+        return articles[:limit]
+
+    def fetch_html(self, metrics=None) -> str:
         """
+        Fetch rendered HTML of the list page
+
+        Args:
+            metrics: Optional RunMetrics, receives browser_launch/page_load timings
+
+        Returns:
+            HTML content as string
+
+        Raises:
+            Exception: Browser launch or page load failure (logged and re-raised, so that
+                callers can tell a failed fetch from a page without articles)
+        """
+        metrics = metrics or NullMetrics()
         try:
             with sync_playwright() as p:
-                browser = p.chromium.launch(headless=True)
-                # Create page with SSL errors ignored
-                page = browser.new_page(ignore_https_errors=True)
+                with metrics.timer("browser_launch"):
+                    browser = p.chromium.launch(headless=True)
+                    # Create page with SSL errors ignored
+                    page = browser.new_page(ignore_https_errors=True)
 
                 page.set_extra_http_headers({
                     "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -106,20 +135,19 @@ class GenericScraper:
                 })
 
                 # Navigate to list page
-                page.goto(self.list_url, wait_until="domcontentloaded", timeout=30000)
-                page.wait_for_timeout(2000)
+                with metrics.timer("page_load"):
+                    page.goto(self.list_url, wait_until="domcontentloaded", timeout=30000)
+                    page.wait_for_timeout(2000)
 
-                # Get HTML
-                html_content = page.content()
-                browser.close()
+                    # Get HTML
+                    html_content = page.content()
 
-                # Parse articles
-                articles = self.parse_articles(html_content)
-                return articles[:limit]
+                browser.close()
+                return html_content
 
         except Exception as e:
             logger.error(f"Error fetching articles from {self.name}: {e}")
-            return []
+            raise
 
     def parse_articles(self, html: str) -> List[Dict]:
         """
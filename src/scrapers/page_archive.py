@@ -0,0 +1,187 @@
+"""
+Page archive for offline replay
+
+Stores fetched list-page HTML so that a collection run can be replayed
+through parse_articles and the rest of the pipeline without touching
+the network.
+
+Layout (content-addressed, gzip-compressed):
+
+    <root>/objects/ab/ab12...ef.html.gz   # one blob per distinct page body
+    <root>/runs/<run_id>.json            # manifest: source name -> blob hash
+
+Identical pages fetched in different runs share a single blob.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import gzip
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """
+    Content-addressed store of list-page HTML, grouped by run
+    """
+
+    def __init__(self, root: str = "data/page_archive"):
+        """
+        Initialize archive
+
+        Args:
+            root: Archive root directory
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.runs_dir = self.root / "runs"
+
+    @staticmethod
+    def new_run_id() -> str:
+        """
+        Generate a run id based on the current time
+
+        Returns:
+            Run id like "20251108-080000"
+        """
+        return datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    @staticmethod
+    def content_hash(html: str) -> str:
+        """
+        Compute the content address of a page
+
+        Args:
+            html: HTML content
+
+        Returns:
+            SHA-256 hex digest
+        """
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.html.gz"
+
+    def _manifest_path(self, run_id: str) -> Path:
+        return self.runs_dir / f"{run_id}.json"
+
+    def save_page(self, run_id: str, source_name: str, url: str, html: str) -> str:
+        """
+        Store a fetched page and register it in the run manifest
+
+        Args:
+            run_id: Run id
+            source_name: Media source name
+            url: URL the page was fetched from
+            html: HTML content
+
+        Returns:
+            Content hash of the stored page
+        """
+        digest = self.content_hash(html)
+        object_path = self._object_path(digest)
+
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_suffix(".tmp")
+            with gzip.open(tmp_path, "wb") as f:
+                f.write(html.encode("utf-8"))
+            os.replace(tmp_path, object_path)
+
+        manifest = self.load_manifest(run_id) or {
+            "run_id": run_id,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "pages": {},
+        }
+        manifest["pages"][source_name] = {
+            "url": url,
+            "sha256": digest,
+            "size": len(html),
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._write_manifest(run_id, manifest)
+
+        return digest
+
+    def _write_manifest(self, run_id: str, manifest: Dict):
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        path = self._manifest_path(run_id)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def load_manifest(self, run_id: str) -> Optional[Dict]:
+        """
+        Load the manifest of a run
+
+        Args:
+            run_id: Run id
+
+        Returns:
+            Manifest dictionary, or None if the run does not exist
+        """
+        path = self._manifest_path(run_id)
+        if not path.exists():
+            return None
+
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_page(self, run_id: str, source_name: str) -> Optional[str]:
+        """
+        Load the stored page of a source in a run
+
+        Args:
+            run_id: Run id
+            source_name: Media source name
+
+        Returns:
+            HTML content, or None if the source was not recorded
+        """
+        manifest = self.load_manifest(run_id)
+        if not manifest:
+            return None
+
+        entry = manifest["pages"].get(source_name)
+        if not entry:
+            return None
+
+        object_path = self._object_path(entry["sha256"])
+        if not object_path.exists():
+            logger.warning(f"Archived page missing for {source_name} in run {run_id}")
+            return None
+
+        with gzip.open(object_path, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def list_runs(self) -> List[str]:
+        """
+        List recorded run ids
+
+        Returns:
+            Run ids, oldest first
+        """
+        if not self.runs_dir.exists():
+            return []
+        return sorted(p.stem for p in self.runs_dir.glob("*.json"))
+
+    def list_sources(self, run_id: str) -> List[str]:
+        """
+        List the sources recorded in a run
+
+        Args:
+            run_id: Run id
+
+        Returns:
+            Source names
+        """
+        manifest = self.load_manifest(run_id)
+        if not manifest:
+            return []
+        return list(manifest["pages"].keys())
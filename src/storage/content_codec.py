@@ -0,0 +1,94 @@
+"""
+文章正文压缩编码
+
+正文存放在article_content表（v4），按行记录编码方式，不同编码写入的数据可以共存：
+- raw: 不压缩（短文本压缩收益小于开销）
+- zlib: 标准库，默认
+- zstd: 需要安装zstandard，压缩/解压更快，通过环境变量 ARTICLE_CONTENT_CODEC=zstd 启用
+"""
+
+import logging
+import os
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_RAW = 'raw'
+CODEC_ZLIB = 'zlib'
+CODEC_ZSTD = 'zstd'
+
+# 短于此长度（字节）的正文不压缩
+MIN_COMPRESS_SIZE = 256
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def get_default_codec() -> str:
+    """
+    获取写入正文使用的编码（环境变量ARTICLE_CONTENT_CODEC，默认zlib）
+
+    请求zstd但未安装zstandard时回退到zlib。
+    """
+    codec = os.getenv('ARTICLE_CONTENT_CODEC', CODEC_ZLIB).lower()
+    if codec == CODEC_ZSTD and zstandard is None:
+        logger.warning("未安装zstandard，正文压缩回退到zlib")
+        return CODEC_ZLIB
+    if codec not in (CODEC_RAW, CODEC_ZLIB, CODEC_ZSTD):
+        logger.warning(f"未知的正文编码 {codec}，使用zlib")
+        return CODEC_ZLIB
+    return codec
+
+
+def compress_content(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """
+    压缩正文
+
+    Args:
+        text: 正文
+        codec: 编码（默认get_default_codec()）
+
+    Returns:
+        (实际使用的编码, 压缩后的数据)
+    """
+    data = text.encode('utf-8')
+    codec = codec or get_default_codec()
+
+    if codec == CODEC_RAW or len(data) < MIN_COMPRESS_SIZE:
+        return CODEC_RAW, data
+    if codec == CODEC_ZSTD:
+        return CODEC_ZSTD, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    return CODEC_ZLIB, zlib.compress(data, ZLIB_LEVEL)
+
+
+def decompress_content(codec: str, blob: bytes) -> str:
+    """
+    解压正文
+
+    Args:
+        codec: 写入时记录的编码
+        blob: 压缩数据
+
+    Returns:
+        正文
+
+    Raises:
+        ValueError: 未知编码，或zstd数据但未安装zstandard
+    """
+    if codec == CODEC_RAW:
+        data = bytes(blob)
+    elif codec == CODEC_ZLIB:
+        data = zlib.decompress(blob)
+    elif codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("正文使用zstd压缩，需要安装zstandard")
+        data = zstandard.ZstdDecompressor().decompress(blob)
+    else:
+        raise ValueError(f"未知的正文编码: {codec}")
+    return data.decode('utf-8')
@@ -6,22 +6,54 @@
 
 import sqlite3
 import hashlib
-from datetime import date, datetime, timedelta
+import json
+from contextlib import contextmanager
+from datetime import date, timedelta
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 
+from src.storage.content_codec import compress_content, decompress_content
+from src.storage.migrations import migrate, rebuild_daily_aggregates, split_categories
+from src.storage.records import parse_date, to_records
+
 
 class Database:
     """数据库管理类"""
 
-    def __init__(self, db_path: str = "data/intelligence.db"):
+    # 文章插入语句（verb为INSERT或INSERT OR IGNORE）
+    _INSERT_ARTICLE_SQL = """
+        {verb} INTO articles (
+            title, url, url_hash, source, source_tier,
+            publish_date, content, summary,
+            category, priority, score,
+            score_relevance, score_timeliness, score_impact, score_credibility,
+            llm_relevance_score, llm_importance_score, llm_category_score, llm_total_score,
+            llm_category_suggestion, llm_reason,
+            link_valid, summary_generated
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # daily_aggregates可分组的维度
+    AGGREGATE_DIMENSIONS = ('day', 'source', 'category', 'priority')
+
+    def __init__(self, db_path: str = "data/intelligence.db", read_only: bool = False):
         """
         初始化数据库连接
 
         Args:
             db_path: 数据库文件路径，使用":memory:"创建内存数据库
+            read_only: 只读连接（不建表、不迁移，可在线程间传递；供DatabasePool的读连接使用）
         """
         self.db_path = db_path
+        self.read_only = read_only
+        self._in_batch = False
+        self._savepoints = 0  # 批量写入中嵌套的操作层数
+
+        if read_only:
+            uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            return
 
         # 如果是文件数据库，确保目录存在
         if db_path != ":memory:":
@@ -29,9 +61,12 @@ class Database:
 
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row  # 使查询结果可以像字典一样访问
+        # 新库启用增量回收（已有表的库需VACUUM后生效，见retention.enable_incremental_vacuum）
+        self.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
 
         self._create_tables()
         self._create_indexes()
+        migrate(self.conn)
 
     def _create_tables(self):
         """创建数据库表"""
@@ -53,7 +88,7 @@ class Database:
                 publish_date DATE NOT NULL,
                 collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
-                -- 内容
+                -- 内容（正文压缩存储在article_content表，v4起此列为NULL）
                 content TEXT,
                 summary TEXT,
 
@@ -88,6 +123,62 @@ class Database:
             )
         """)
 
+        # 创建runs表（每次采集运行的指标汇总）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                started_at TIMESTAMP NOT NULL,
+                finished_at TIMESTAMP,
+                duration_seconds REAL DEFAULT 0,
+                status TEXT,
+
+                -- 汇总计数
+                sources_total INTEGER DEFAULT 0,
+                sources_ok INTEGER DEFAULT 0,
+                articles_fetched INTEGER DEFAULT 0,
+                articles_stored INTEGER DEFAULT 0,
+                llm_calls INTEGER DEFAULT 0,
+
+                -- 完整运行报告（JSON）
+                report TEXT
+            )
+        """)
+
+        # 创建运行日志表（断点续采：记录每次运行中已完成的源和已完成LLM分析的文章）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS run_sources (
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stats TEXT,
+                finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, source)
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS run_articles (
+                run_id TEXT NOT NULL,
+                url_hash TEXT NOT NULL,
+                source TEXT,
+                llm_result TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (run_id, url_hash)
+            )
+        """)
+
+        # 创建relevance_labels表（LLM相关性判定记录，含被拒绝的文章，用于训练本地相关性模型）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS relevance_labels (
+                url_hash TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT NOT NULL,
+                content TEXT,
+                source TEXT,
+                relevance_score INTEGER NOT NULL,
+                labeled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         self.conn.commit()
 
     def _create_indexes(self):
@@ -96,12 +187,9 @@ class Database:
 
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_publish_date ON articles(publish_date DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_priority ON articles(priority)",
-            "CREATE INDEX IF NOT EXISTS idx_category ON articles(category)",
             "CREATE INDEX IF NOT EXISTS idx_collected_at ON articles(collected_at DESC)",
             "CREATE INDEX IF NOT EXISTS idx_source ON articles(source)",
-            "CREATE INDEX IF NOT EXISTS idx_link_valid ON articles(link_valid)",
-            "CREATE INDEX IF NOT EXISTS idx_processed ON articles(processed)",
+            # 复合/部分索引见 migrations.py（v3）
         ]
 
         for index_sql in indexes:
@@ -109,6 +197,61 @@ class Database:
 
         self.conn.commit()
 
+    def _commit(self):
+        """提交（批量写入期间推迟到批结束统一提交）"""
+        if not self._in_batch:
+            self.conn.commit()
+
+    def _rollback(self):
+        """回滚（批量写入期间只回滚最内层的操作，不影响同批其他操作）"""
+        if self._in_batch and self._savepoints:
+            self.conn.execute(f"ROLLBACK TO op_{self._savepoints}")
+        else:
+            self.conn.rollback()
+
+    @contextmanager
+    def batch(self):
+        """
+        批量写入：块内各方法的提交合并为一次事务提交
+
+        块内每个操作应包在operation()中，单个操作失败只回滚该操作。
+        """
+        if self.conn.in_transaction:
+            self.conn.commit()
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_batch = True
+        try:
+            yield self
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self._in_batch = False
+
+    @contextmanager
+    def operation(self):
+        """
+        批量写入中的单个操作（保存点，可嵌套），异常时回滚到操作开始前
+
+        不在批量写入中时不做任何处理（各方法自行提交）。
+        """
+        if not self._in_batch:
+            yield self
+            return
+
+        self._savepoints += 1
+        name = f"op_{self._savepoints}"
+        self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute(f"ROLLBACK TO {name}")
+            raise
+        finally:
+            self.conn.execute(f"RELEASE {name}")
+            self._savepoints -= 1
+
     @staticmethod
     def generate_url_hash(url: str) -> str:
         """
@@ -145,6 +288,8 @@ class Database:
         llm_category_suggestion: Optional[str] = None,
         llm_reason: Optional[str] = None,
         link_valid: bool = True,
+        entities: Optional[List[Dict[str, Any]]] = None,
+        facts: Optional[List[Dict[str, Any]]] = None,
     ) -> Optional[int]:
         """
         插入文章到数据库
@@ -171,68 +316,271 @@ class Database:
             llm_category_suggestion: LLM建议的分类（可选）
             llm_reason: LLM判断理由（可选）
             link_valid: 链接是否有效
+            entities: 抽取的实体（可选，EntityExtractor.extract()的结果，写入article_entities）
+            facts: 数值事实（可选，PriorityScorer.extract_facts()的结果，写入article_facts）
 
         Returns:
             插入的文章ID，如果URL重复则返回None
         """
         cursor = self.conn.cursor()
 
-        # 生成URL哈希
-        url_hash = self.generate_url_hash(url)
+        row = self._build_article_row(
+            title=title,
+            url=url,
+            source=source,
+            publish_date=publish_date,
+            content=content,
+            source_tier=source_tier,
+            summary=summary,
+            category=category,
+            priority=priority,
+            score=score,
+            score_relevance=score_relevance,
+            score_timeliness=score_timeliness,
+            score_impact=score_impact,
+            score_credibility=score_credibility,
+            llm_relevance_score=llm_relevance_score,
+            llm_importance_score=llm_importance_score,
+            llm_category_score=llm_category_score,
+            llm_total_score=llm_total_score,
+            llm_category_suggestion=llm_category_suggestion,
+            llm_reason=llm_reason,
+            link_valid=link_valid,
+        )
 
-        try:
-            cursor.execute(
-                """
-                INSERT INTO articles (
-                    title, url, url_hash, source, source_tier,
-                    publish_date, content, summary,
-                    category, priority, score,
-                    score_relevance, score_timeliness, score_impact, score_credibility,
-                    llm_relevance_score, llm_importance_score, llm_category_score, llm_total_score,
-                    llm_category_suggestion, llm_reason,
-                    link_valid, summary_generated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    title,
-                    url,
-                    url_hash,
-                    source,
-                    source_tier,
-                    publish_date,
-                    content,
-                    summary,
-                    category,
-                    priority,
-                    score,
-                    score_relevance,
-                    score_timeliness,
-                    score_impact,
-                    score_credibility,
-                    llm_relevance_score,
-                    llm_importance_score,
-                    llm_category_score,
-                    llm_total_score,
-                    llm_category_suggestion,
-                    llm_reason,
-                    1 if link_valid else 0,
-                    1 if summary else 0,
-                ),
-            )
+        # 批量写入中自成一个保存点，URL重复时只回滚本次插入
+        with self.operation():
+            try:
+                cursor.execute(self._INSERT_ARTICLE_SQL.format(verb="INSERT"), row)
+                article_id = cursor.lastrowid
+
+                self._store_contents(cursor, [(article_id, content)])
+                self._sync_sources(cursor, [(source, source_tier)])
+                self._sync_article_categories(cursor, [(article_id, category)])
+                if entities:
+                    self._store_entities(cursor, [(article_id, entities)])
+                if facts:
+                    self._store_facts(cursor, [(article_id, facts)])
+
+                self._commit()
+                return article_id
+
+            except sqlite3.IntegrityError:
+                # URL已存在，返回None
+                self._rollback()
+                return None
+
+    def article_exists(self, url: str) -> bool:
+        """
+        检查文章是否已入库
 
-            self.conn.commit()
-            return cursor.lastrowid
+        Args:
+            url: 文章URL
 
-        except sqlite3.IntegrityError:
-            # URL已存在，返回None
-            return None
+        Returns:
+            是否存在
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT 1 FROM articles WHERE url_hash = ? LIMIT 1", (self.generate_url_hash(url),)
+        )
+        return cursor.fetchone() is not None
+
+    def insert_articles(self, articles: List[Dict[str, Any]]) -> int:
+        """
+        批量插入文章（单个事务，重复URL自动跳过）
+
+        Args:
+            articles: 文章字典列表，字段与insert_article的参数一致
+
+        Returns:
+            实际插入的文章数量
+        """
+        if not articles:
+            return 0
+
+        rows = [self._build_article_row(**article) for article in articles]
+
+        cursor = self.conn.cursor()
+        with self.operation():
+            try:
+                max_id = cursor.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]
+                cursor.executemany(self._INSERT_ARTICLE_SQL.format(verb="INSERT OR IGNORE"), rows)
+
+                # 本批新插入的文章（AUTOINCREMENT保证新ID大于插入前的最大ID）
+                inserted = cursor.execute(
+                    "SELECT id, url_hash, source, source_tier, category FROM articles WHERE id > ?",
+                    (max_id,),
+                ).fetchall()
+                contents = {}
+                entities = {}
+                facts = {}
+                for row, article in zip(rows, articles):
+                    # 同一批内重复的URL以第一篇为准（与INSERT OR IGNORE一致）
+                    contents.setdefault(row[2], article.get("content"))
+                    entities.setdefault(row[2], article.get("entities"))
+                    facts.setdefault(row[2], article.get("facts"))
+                self._store_contents(cursor, [(r["id"], contents.get(r["url_hash"])) for r in inserted])
+                self._store_entities(
+                    cursor, [(r["id"], entities[r["url_hash"]]) for r in inserted if entities.get(r["url_hash"])]
+                )
+                self._store_facts(
+                    cursor, [(r["id"], facts[r["url_hash"]]) for r in inserted if facts.get(r["url_hash"])]
+                )
+                self._sync_sources(cursor, {(r["source"], r["source_tier"]) for r in inserted})
+                self._sync_article_categories(cursor, [(r["id"], r["category"]) for r in inserted])
+
+                self._commit()
+            except Exception:
+                self._rollback()
+                raise
+
+        return len(inserted)
+
+    def _store_contents(self, cursor: sqlite3.Cursor, items):
+        """压缩写入正文（items为(article_id, content)，空正文不写入）"""
+        rows = []
+        for article_id, content in items:
+            if content:
+                codec, body = compress_content(content)
+                rows.append((article_id, codec, len(content.encode("utf-8")), body))
+        cursor.executemany(
+            "INSERT OR REPLACE INTO article_content (article_id, codec, raw_size, body) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+
+    def _sync_sources(self, cursor: sqlite3.Cursor, sources):
+        """登记新出现的媒体源，并回填文章的source_id"""
+        cursor.executemany(
+            "INSERT OR IGNORE INTO sources (name, tier) VALUES (?, ?)", list(sources)
+        )
+        cursor.execute(
+            """
+            UPDATE articles
+            SET source_id = (SELECT id FROM sources WHERE sources.name = articles.source)
+            WHERE source_id IS NULL
+            """
+        )
 
-    def get_article_by_id(self, article_id: int) -> Optional[Dict[str, Any]]:
+    def _sync_article_categories(self, cursor: sqlite3.Cursor, items):
+        """
+        按文章的分类字符串重建article_categories关联（items为(article_id, category)）
+
+        关联表冗余了文章的score/publish_date，按分类查询可直接在关联表索引上过滤和排序。
+        """
+        items = list(items)
+        cursor.executemany(
+            "DELETE FROM article_categories WHERE article_id = ?",
+            [(article_id,) for article_id, _ in items],
+        )
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO article_categories (category, article_id, score, publish_date)
+            SELECT ?, id, score, publish_date FROM articles WHERE id = ?
+            """,
+            [(c, article_id) for article_id, category in items for c in split_categories(category)],
+        )
+
+    def _store_entities(self, cursor: sqlite3.Cursor, items):
+        """重建文章的实体关联（items为(article_id, entities)，publish_date从文章冗余）"""
+        items = list(items)
+        cursor.executemany(
+            "DELETE FROM article_entities WHERE article_id = ?",
+            [(article_id,) for article_id, _ in items],
+        )
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO article_entities
+                (entity, article_id, entity_type, mentions, in_title, source, publish_date)
+            SELECT ?, id, ?, ?, ?, ?, publish_date FROM articles WHERE id = ?
+            """,
+            [
+                (e["name"], e.get("type", "company"), e.get("mentions", 1),
+                 1 if e.get("in_title") else 0, e.get("source", "dict"), article_id)
+                for article_id, entities in items for e in entities or []
+            ],
+        )
+
+    def _store_facts(self, cursor: sqlite3.Cursor, items):
+        """重建文章的数值事实（items为(article_id, facts)，publish_date从文章冗余）"""
+        items = list(items)
+        cursor.executemany(
+            "DELETE FROM article_facts WHERE article_id = ?",
+            [(article_id,) for article_id, _ in items],
+        )
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO article_facts (article_id, fact_type, value, unit, raw_text, publish_date)
+            SELECT id, ?, ?, ?, ?, publish_date FROM articles WHERE id = ?
+            """,
+            [
+                (f["type"], f["value"], f.get("unit", ""), f.get("text"), article_id)
+                for article_id, facts in items for f in facts or []
+            ],
+        )
+
+    def _build_article_row(
+        self,
+        title: str,
+        url: str,
+        source: str,
+        publish_date: date,
+        content: str,
+        source_tier: int = 2,
+        summary: Optional[str] = None,
+        category: Optional[str] = None,
+        priority: Optional[str] = None,
+        score: int = 0,
+        score_relevance: int = 0,
+        score_timeliness: int = 0,
+        score_impact: int = 0,
+        score_credibility: int = 0,
+        llm_relevance_score: int = 0,
+        llm_importance_score: int = 0,
+        llm_category_score: int = 0,
+        llm_total_score: int = 0,
+        llm_category_suggestion: Optional[str] = None,
+        llm_reason: Optional[str] = None,
+        link_valid: bool = True,
+        entities: Optional[List[Dict[str, Any]]] = None,
+        facts: Optional[List[Dict[str, Any]]] = None,
+    ) -> tuple:
+        """构建与_INSERT_ARTICLE_SQL列顺序一致的参数元组（正文、实体、数值事实另表存储，content列为NULL）"""
+        return (
+            title,
+            url,
+            self.generate_url_hash(url),
+            source,
+            source_tier,
+            publish_date,
+            None,
+            summary,
+            category,
+            priority,
+            score,
+            score_relevance,
+            score_timeliness,
+            score_impact,
+            score_credibility,
+            llm_relevance_score,
+            llm_importance_score,
+            llm_category_score,
+            llm_total_score,
+            llm_category_suggestion,
+            llm_reason,
+            1 if link_valid else 0,
+            1 if summary else 0,
+        )
+
+    def get_article_by_id(
+        self, article_id: int, with_content: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         按ID查询文章
 
         Args:
             article_id: 文章ID
+            with_content: 是否加载正文（从article_content解压）
 
         Returns:
             文章字典，如果不存在则返回None
@@ -246,13 +594,52 @@ class Database:
             return None
 
         article = dict(row)
+        if with_content:
+            article["content"] = self.get_article_content(article_id)
         # 转换日期字符串为date对象
-        if article.get("publish_date"):
-            article["publish_date"] = datetime.strptime(
-                article["publish_date"], "%Y-%m-%d"
-            ).date()
+        article["publish_date"] = parse_date(article.get("publish_date"))
         return article
 
+    def get_article_content(self, article_id: int) -> Optional[str]:
+        """
+        按需加载文章正文
+
+        列表查询（周报、分类、优先级等）不读取正文，返回的content字段为None；
+        需要正文时用本方法或get_article_contents单独加载。
+
+        Args:
+            article_id: 文章ID
+
+        Returns:
+            正文，没有正文时返回None
+        """
+        return self.get_article_contents([article_id]).get(article_id)
+
+    def get_article_contents(self, article_ids: List[int]) -> Dict[int, str]:
+        """
+        批量加载文章正文
+
+        Args:
+            article_ids: 文章ID列表
+
+        Returns:
+            {文章ID: 正文}（没有正文的文章不在结果中）
+        """
+        cursor = self.conn.cursor()
+        contents = {}
+        ids = list(article_ids)
+        # 每批不超过SQLite的参数个数上限
+        for i in range(0, len(ids), 500):
+            batch = ids[i:i + 500]
+            cursor.execute(
+                f"SELECT article_id, codec, body FROM article_content "
+                f"WHERE article_id IN ({','.join('?' * len(batch))})",
+                batch,
+            )
+            for row in cursor.fetchall():
+                contents[row["article_id"]] = decompress_content(row["codec"], row["body"])
+        return contents
+
     def get_all_articles(self) -> List[Dict[str, Any]]:
         """
         获取所有文章
@@ -294,12 +681,15 @@ class Database:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
-    def get_articles_for_weekly_report(self, days: int = 7) -> List[Dict[str, Any]]:
+    def get_articles_for_weekly_report(
+        self, days: int = 7, as_records: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         获取用于周报的文章（过去N天，不包括第N天）
 
         Args:
             days: 天数，默认7天
+            as_records: 返回ArticleRecord（包装查询行，不逐行转换为dict，publish_date按需转换）
 
         Returns:
             文章列表，按评分降序排列
@@ -319,13 +709,13 @@ class Database:
         )
 
         rows = cursor.fetchall()
+        if as_records:
+            return to_records(rows)
+
         articles = []
         for row in rows:
             article = dict(row)
-            if article.get("publish_date"):
-                article["publish_date"] = datetime.strptime(
-                    article["publish_date"], "%Y-%m-%d"
-                ).date()
+            article["publish_date"] = parse_date(article.get("publish_date"))
             articles.append(article)
         return articles
 
@@ -350,7 +740,7 @@ class Database:
             (summary, article_id),
         )
 
-        self.conn.commit()
+        self._commit()
 
     def update_article_scores(
         self,
@@ -403,8 +793,9 @@ class Database:
                 article_id,
             ),
         )
+        self._sync_article_categories(cursor, [(article_id, category)])
 
-        self.conn.commit()
+        self._commit()
 
     def update_link_validity(self, article_id: int, valid: bool):
         """
@@ -426,7 +817,7 @@ class Database:
             (1 if valid else 0, article_id),
         )
 
-        self.conn.commit()
+        self._commit()
 
     def get_articles_by_priority(self, priority: str) -> List[Dict[str, Any]]:
         """
@@ -452,29 +843,257 @@ class Database:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
-    def get_articles_by_category(self, category: str) -> List[Dict[str, Any]]:
+    def get_articles_by_category(
+        self, category: str, start_date: Optional[date] = None
+    ) -> List[Dict[str, Any]]:
         """
-        按分类查询文章
+        按分类查询文章（多分类文章如"投资,技术"同时属于两个分类）
 
         Args:
             category: 分类（投资/技术/政策/市场）
+            start_date: 起始发布日期（可选）
 
         Returns:
             文章列表
         """
         cursor = self.conn.cursor()
 
+        # 在关联表上完成过滤和排序（idx_article_categories_score / _date），只回表取结果行
+        if start_date:
+            cursor.execute(
+                """
+                SELECT a.* FROM article_categories c
+                JOIN articles a ON a.id = c.article_id
+                WHERE c.category = ? AND c.publish_date >= ?
+                ORDER BY c.score DESC, c.publish_date DESC
+                """,
+                (category, start_date),
+            )
+        else:
+            cursor.execute(
+                """
+                SELECT a.* FROM article_categories c
+                JOIN articles a ON a.id = c.article_id
+                WHERE c.category = ?
+                ORDER BY c.score DESC, c.publish_date DESC
+                """,
+                (category,),
+            )
+
+        rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    def save_article_entities(self, article_id: int, entities: List[Dict[str, Any]]):
+        """
+        保存文章的实体（替换已有的实体关联）
+
+        Args:
+            article_id: 文章ID
+            entities: EntityExtractor.extract()的结果
+        """
+        cursor = self.conn.cursor()
+        self._store_entities(cursor, [(article_id, entities)])
+        self._commit()
+
+    def articles_for_entity(
+        self, name: str, days: Optional[int] = None, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        按实体查询文章时间线（走article_entities索引，不扫描正文或标题）
+
+        Args:
+            name: 实体标准名称（如"万国数据"）
+            days: 最近N天（含今天），None为全部
+            limit: 最多返回的文章数
+
+        Returns:
+            文章列表（不含正文），按发布日期降序；每篇带mentions/in_title/entity_source字段
+        """
+        conditions = ["e.entity = ?"]
+        params: List[Any] = [name]
+        if days is not None:
+            conditions.append("e.publish_date >= ?")
+            params.append(date.today() - timedelta(days=days - 1))
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT a.*, e.mentions, e.in_title, e.source AS entity_source
+            FROM article_entities e
+            JOIN articles a ON a.id = e.article_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY e.publish_date DESC
+            {"LIMIT ?" if limit else ""}
+            """,
+            params + ([limit] if limit else []),
+        )
+
+        articles = []
+        for row in cursor.fetchall():
+            article = dict(row)
+            article["publish_date"] = parse_date(article.get("publish_date"))
+            articles.append(article)
+        return articles
+
+    def get_entity_counts(
+        self, days: Optional[int] = None, entity_type: Optional[str] = None, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        统计各实体的文章数
+
+        Args:
+            days: 最近N天（含今天），None为全部
+            entity_type: 只统计某类实体（company/region）
+            limit: 返回的实体数
+
+        Returns:
+            [{'entity', 'entity_type', 'article_count', 'title_count', 'last_date'}]，按文章数降序
+        """
+        # GROUP BY +entity：不按主键顺序分组，先用idx_article_entities_publish覆盖索引取出窗口内的行
+        conditions = []
+        params: List[Any] = []
+        if days is not None:
+            conditions.append("publish_date >= ?")
+            params.append(date.today() - timedelta(days=days - 1))
+        if entity_type:
+            conditions.append("entity_type = ?")
+            params.append(entity_type)
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT entity, entity_type, COUNT(*) AS article_count,
+                   SUM(in_title) AS title_count, MAX(publish_date) AS last_date
+            FROM article_entities
+            {"WHERE " + " AND ".join(conditions) if conditions else ""}
+            GROUP BY +entity
+            ORDER BY article_count DESC, entity
+            LIMIT ?
+            """,
+            params + [limit],
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    # 数值事实类型（与PriorityScorer.extract_facts()一致）和投资额汇总的分组方式
+    FACT_TYPES = ('investment', 'racks', 'power', 'pue')
+    INVESTMENT_GROUPS = ('week', 'region', 'source')
+
+    def save_article_facts(self, article_id: int, facts: List[Dict[str, Any]]):
+        """
+        保存文章的数值事实（替换已有的事实）
+
+        Args:
+            article_id: 文章ID
+            facts: PriorityScorer.extract_facts()的结果
+        """
+        cursor = self.conn.cursor()
+        self._store_facts(cursor, [(article_id, facts)])
+        self._commit()
+
+    def get_article_facts(self, article_id: int) -> List[Dict[str, Any]]:
+        """
+        获取文章的数值事实
+
+        Returns:
+            [{'fact_type', 'value', 'unit', 'raw_text'}]，按类型和数值排序
+        """
+        cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT * FROM articles
-            WHERE category = ?
-            ORDER BY score DESC, publish_date DESC
+            SELECT fact_type, value, unit, raw_text FROM article_facts
+            WHERE article_id = ? ORDER BY fact_type, value
             """,
-            (category,),
+            (article_id,),
         )
+        return [dict(row) for row in cursor.fetchall()]
 
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows]
+    def get_fact_stats(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        按事实类型统计日期范围内的数值
+
+        每篇文章每类只取一个值，避免同一项目的分期/重复数字重复计算：
+        投资额、机柜数、功率取最大值（总规模），PUE取最小值（"从1.5降至1.2"取达到的值）。
+
+        Args:
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+
+        Returns:
+            [{'fact_type', 'unit', 'article_count', 'total', 'min_value', 'max_value', 'avg_value'}]
+        """
+        # 列出全部类型：按(fact_type, publish_date)索引逐类型取日期范围，而不是扫描整个索引
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT fact_type, unit, COUNT(*) AS article_count, SUM(value) AS total,
+                   MIN(value) AS min_value, MAX(value) AS max_value, ROUND(AVG(value), 4) AS avg_value
+            FROM (
+                SELECT fact_type, article_id, MAX(unit) AS unit,
+                       CASE WHEN fact_type = 'pue' THEN MIN(value) ELSE MAX(value) END AS value
+                FROM article_facts
+                WHERE fact_type IN ({", ".join("?" * len(self.FACT_TYPES))})
+                  AND publish_date >= ? AND publish_date <= ?
+                GROUP BY fact_type, article_id
+            )
+            GROUP BY fact_type
+            ORDER BY fact_type
+            """,
+            (*self.FACT_TYPES, start_date, end_date),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_investment_totals(
+        self, start_date: date, end_date: date, group_by: str = 'week'
+    ) -> List[Dict[str, Any]]:
+        """
+        按周/区域/来源汇总公布的投资额（亿元）
+
+        每篇文章取其中的最大金额（总投资额，一期、二期等分项通常小于总额）。
+        按区域汇总时，区域来自article_entities，涉及多个区域的文章计入每个区域，未识别区域的归入"其他"。
+
+        Args:
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+            group_by: 'week'（周一为每周开始）/ 'region' / 'source'
+
+        Returns:
+            [{group_by, 'article_count', 'total_amount', 'max_amount'}]；
+            按周时按周升序，其余按总额降序
+        """
+        if group_by not in self.INVESTMENT_GROUPS:
+            raise ValueError(f"不支持的分组: {group_by}（可选: {', '.join(self.INVESTMENT_GROUPS)}）")
+
+        if group_by == 'week':
+            # date(d, 'weekday 0')为当天或之后的周日，再减6天为本周一
+            key, joins, order = "date(f.publish_date, 'weekday 0', '-6 days')", "", "week"
+        elif group_by == 'region':
+            key = "COALESCE(e.entity, '其他')"
+            joins = """
+                LEFT JOIN article_entities e
+                ON e.article_id = f.article_id AND e.entity_type = 'region'
+            """
+            order = "total_amount DESC, region"
+        else:
+            key, joins, order = "a.source", "JOIN articles a ON a.id = f.article_id", "total_amount DESC, source"
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT {key} AS {group_by}, COUNT(*) AS article_count,
+                   ROUND(SUM(f.amount), 4) AS total_amount, MAX(f.amount) AS max_amount
+            FROM (
+                SELECT article_id, publish_date, MAX(value) AS amount
+                FROM article_facts
+                WHERE fact_type = 'investment' AND publish_date >= ? AND publish_date <= ?
+                GROUP BY article_id
+            ) f
+            {joins}
+            GROUP BY 1
+            ORDER BY {order}
+            """,
+            (start_date, end_date),
+        )
+        return [dict(row) for row in cursor.fetchall()]
 
     def get_articles_ready_for_report(
         self, days: int = 7
@@ -513,21 +1132,342 @@ class Database:
         rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
+    def get_daily_aggregates(
+        self, start_date: date, end_date: date, group_by: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        从按日汇总表读取日期范围内的统计（不扫描articles，代价与天数成正比）
+
+        Args:
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+            group_by: 分组维度（day/source/category/priority），None为整个范围合计
+
+        Returns:
+            [{维度: 值, 'article_count', 'score_sum', 'avg_score', 'llm_count',
+              'avg_llm_relevance', 'avg_llm_importance', 'avg_llm_total'}]，按文章数降序
+        """
+        if group_by is not None and group_by not in self.AGGREGATE_DIMENSIONS:
+            raise ValueError(f"不支持的汇总维度: {group_by}")
+
+        key = f"{group_by}, " if group_by else ""
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT {key}
+                   SUM(article_count) AS article_count,
+                   SUM(score_sum) AS score_sum,
+                   ROUND(1.0 * SUM(score_sum) / SUM(article_count), 1) AS avg_score,
+                   SUM(llm_count) AS llm_count,
+                   ROUND(1.0 * SUM(llm_relevance_sum) / NULLIF(SUM(llm_count), 0), 1) AS avg_llm_relevance,
+                   ROUND(1.0 * SUM(llm_importance_sum) / NULLIF(SUM(llm_count), 0), 1) AS avg_llm_importance,
+                   ROUND(1.0 * SUM(llm_total_sum) / NULLIF(SUM(llm_count), 0), 1) AS avg_llm_total
+            FROM daily_aggregates
+            WHERE day >= ? AND day <= ?
+            {f"GROUP BY {group_by}" if group_by else ""}
+            HAVING SUM(article_count) > 0
+            ORDER BY article_count DESC
+            """,
+            (start_date.isoformat(), end_date.isoformat()),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def get_article_titles(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        按日期范围只读取标题（关键词统计用，不读取其他列）
+
+        Args:
+            start_date: 开始日期（含）
+            end_date: 结束日期（含）
+
+        Returns:
+            [{'id', 'publish_date', 'title'}]
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT id, publish_date, title FROM articles WHERE publish_date >= ? AND publish_date <= ?",
+            (start_date, end_date),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    def rebuild_daily_aggregates(self):
+        """按articles表重新计算按日汇总表（正常情况下由触发器维护，无需调用）"""
+        rebuild_daily_aggregates(self.conn)
+        self._commit()
+
+    def save_run(self, report: Dict[str, Any], status: str = "success"):
+        """
+        保存一次采集运行的指标报告（同一run_id重复保存时覆盖）
+
+        Args:
+            report: RunMetrics.to_dict()导出的运行报告
+            status: 运行状态（success/failed/interrupted）
+        """
+        counters = report.get("counters", {})
+        sources = report.get("sources", [])
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO runs (
+                run_id, started_at, finished_at, duration_seconds, status,
+                sources_total, sources_ok, articles_fetched, articles_stored, llm_calls,
+                report
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                report["run_id"],
+                report["started_at"],
+                report.get("finished_at"),
+                report.get("duration_seconds", 0),
+                status,
+                len(sources),
+                sum(1 for s in sources if s.get("status") == "success"),
+                counters.get("articles_fetched", 0),
+                counters.get("articles_stored", 0),
+                counters.get("llm_calls", 0),
+                json.dumps(report, ensure_ascii=False, default=str),
+            ),
+        )
+        self._commit()
+
+    def get_recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        获取最近的采集运行记录
+
+        Args:
+            limit: 返回数量
+
+        Returns:
+            运行记录列表（report字段已解析为字典），按开始时间降序
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT * FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)
+        )
+
+        runs = []
+        for row in cursor.fetchall():
+            run = dict(row)
+            run["report"] = json.loads(run["report"]) if run["report"] else {}
+            runs.append(run)
+        return runs
+
+    def get_resumable_run(self) -> Optional[str]:
+        """
+        获取最近一次未正常结束的运行ID
+
+        状态为running（进程中途退出）或failed（没有一个源采集成功）的运行可以续采。
+
+        Returns:
+            运行ID，没有则返回None
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT run_id, status FROM runs ORDER BY started_at DESC LIMIT 1"
+        )
+        row = cursor.fetchone()
+        if row and row["status"] in ("running", "failed"):
+            return row["run_id"]
+        return None
+
+    def save_run_source(self, run_id: str, stats: Dict[str, Any]):
+        """
+        记录运行中已完成的源
+
+        Args:
+            run_id: 运行ID
+            stats: 源的采集统计
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO run_sources (run_id, source, status, stats)
+            VALUES (?, ?, ?, ?)
+            """,
+            (run_id, stats["source"], stats["status"],
+             json.dumps(stats, ensure_ascii=False, default=str)),
+        )
+        self._commit()
+
+    def get_run_sources(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        获取运行中已完成的源
+
+        Args:
+            run_id: 运行ID
+
+        Returns:
+            {源名称: 采集统计}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT source, stats FROM run_sources WHERE run_id = ?", (run_id,)
+        )
+        return {row["source"]: json.loads(row["stats"]) for row in cursor.fetchall()}
+
+    def save_run_article(self, run_id: str, url: str, llm_result: Dict[str, Any],
+                         source: Optional[str] = None):
+        """
+        记录运行中已完成LLM分析的文章（续采时复用分析结果）
+
+        Args:
+            run_id: 运行ID
+            url: 文章URL
+            llm_result: LLM分析结果
+            source: 媒体源名称
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO run_articles (run_id, url_hash, source, llm_result)
+            VALUES (?, ?, ?, ?)
+            """,
+            (run_id, self.generate_url_hash(url), source,
+             json.dumps(llm_result, ensure_ascii=False)),
+        )
+        self._commit()
+
+    def get_run_articles(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        获取运行中已完成LLM分析的文章
+
+        Args:
+            run_id: 运行ID
+
+        Returns:
+            {url_hash: LLM分析结果}
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT url_hash, llm_result FROM run_articles WHERE run_id = ?", (run_id,)
+        )
+        return {row["url_hash"]: json.loads(row["llm_result"]) for row in cursor.fetchall()}
+
+    def save_relevance_label(
+        self,
+        url: str,
+        title: str,
+        relevance_score: int,
+        content: Optional[str] = None,
+        source: Optional[str] = None,
+    ):
+        """
+        记录一次LLM相关性判定（同一URL重复判定时覆盖）
+
+        Args:
+            url: 文章URL
+            title: 文章标题
+            relevance_score: LLM相关性评分（0-20）
+            content: 送入LLM的内容
+            source: 媒体源名称
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO relevance_labels (
+                url_hash, url, title, content, source, relevance_score
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (self.generate_url_hash(url), url, title, content, source, relevance_score),
+        )
+        self._commit()
+
+    def get_relevance_training_data(self) -> List[Dict[str, Any]]:
+        """
+        获取相关性模型训练数据
+
+        合并relevance_labels表（全部LLM判定，含拒绝）与articles表中已有的LLM评分
+        （早于relevance_labels表入库的文章），同一URL以relevance_labels为准。
+        使用默认评分的文章（LLM不可用时写入）不参与训练。
+
+        Returns:
+            [{'title', 'content', 'relevance_score'}, ...]
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            """
+            SELECT NULL AS id, title, content, relevance_score FROM relevance_labels
+            UNION ALL
+            SELECT a.id, a.title, NULLIF(a.summary, ''), a.llm_relevance_score
+            FROM articles a
+            WHERE a.llm_relevance_score > 0
+              AND a.llm_reason NOT LIKE '%默认%'
+              AND NOT EXISTS (SELECT 1 FROM relevance_labels r WHERE r.url_hash = a.url_hash)
+            """
+        )
+        records = [dict(row) for row in cursor.fetchall()]
+
+        # 没有摘要的文章用正文训练
+        missing = [r["id"] for r in records if r["id"] is not None and r["content"] is None]
+        contents = self.get_article_contents(missing) if missing else {}
+        for record in records:
+            article_id = record.pop("id")
+            if record["content"] is None and article_id is not None:
+                record["content"] = contents.get(article_id)
+        return records
+
+    def sync_sources(self, sources: List[Dict[str, Any]]):
+        """
+        按媒体源配置更新sources表（等级、启用状态）
+
+        Args:
+            sources: config/media-sources.json中的媒体源列表（name/tier/active，未标记active视为停用）
+        """
+        cursor = self.conn.cursor()
+        cursor.executemany(
+            """
+            INSERT INTO sources (name, tier, active) VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                tier = excluded.tier,
+                active = excluded.active,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [(s["name"], s.get("tier", 2), 1 if s.get("active", False) else 0) for s in sources],
+        )
+        self._commit()
+
+    def get_sources(self, active_only: bool = False) -> List[Dict[str, Any]]:
+        """
+        获取媒体源列表（含各源文章数）
+
+        Args:
+            active_only: 只返回启用的源
+
+        Returns:
+            媒体源列表，按等级、名称排序
+        """
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT s.*, (SELECT COUNT(*) FROM articles a WHERE a.source_id = s.id) AS article_count
+            FROM sources s
+            {"WHERE s.active = 1" if active_only else ""}
+            ORDER BY s.tier, s.name
+            """
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
     def clear_all_articles(self):
         """清空所有历史文章数据"""
         cursor = self.conn.cursor()
 
         try:
+            cursor.execute("DELETE FROM article_categories")
+            cursor.execute("DELETE FROM article_entities")
+            cursor.execute("DELETE FROM article_facts")
+            cursor.execute("DELETE FROM article_content")
             cursor.execute("DELETE FROM articles")
             cursor.execute("DELETE FROM sqlite_sequence WHERE name='articles'")
-            self.conn.commit()
+            self._commit()
 
-            # 执行VACUUM优化数据库文件大小
-            cursor.execute("VACUUM")
+            # 执行VACUUM优化数据库文件大小（批量写入的事务内不能执行）
+            if not self._in_batch:
+                cursor.execute("VACUUM")
 
             return True
         except Exception as e:
-            self.conn.rollback()
+            self._rollback()
             raise e
 
     def close(self):
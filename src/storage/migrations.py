@@ -0,0 +1,380 @@
+"""
+数据库结构迁移
+
+使用SQLite的 PRAGMA user_version 记录结构版本，Database初始化时自动升级到最新版本。
+每个迁移在单个事务（BEGIN IMMEDIATE）中执行，执行前重新读取版本号，
+多个连接同时初始化同一数据库时只有一个会执行迁移。
+
+版本：
+- v1: 基础结构（articles/runs/run_sources/run_articles/relevance_labels，由Database._create_tables创建）
+- v2: 规范化的sources表（媒体源等级、启用状态）和article_categories分类关联表
+- v3: 按实际查询调整索引（复合/部分索引，删除低选择性的单列索引），
+      article_categories冗余score/publish_date以便分类查询走索引排序
+- v4: 正文移到article_content表并压缩存储，articles.content置空（列表查询不再读取正文）
+- v5: daily_aggregates按日汇总表（来源/分类/优先级维度），由articles上的触发器增量维护
+- v6: article_entities文章-实体（公司/区域）关联表，按实体查询时间线
+- v7: article_facts文章数值事实表（投资额、机柜数、功率、PUE），入库时提取，供统计查询
+"""
+
+import logging
+import re
+import sqlite3
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.storage.content_codec import compress_content
+
+logger = logging.getLogger(__name__)
+
+# 版本号 -> (说明, 迁移函数)
+MIGRATIONS: Dict[int, Tuple[str, Callable[[sqlite3.Connection], None]]] = {}
+
+# 多分类分隔符（"投资,技术"、"投资，技术"、"投资、技术"）
+_CATEGORY_SPLIT_RE = re.compile(r'[,，、/]')
+
+
+def migration(version: int, description: str):
+    """注册迁移函数"""
+    def decorator(func):
+        MIGRATIONS[version] = (description, func)
+        return func
+    return decorator
+
+
+def split_categories(category: Optional[str]) -> List[str]:
+    """
+    拆分多分类字符串
+
+    Args:
+        category: 分类字符串（如"投资,技术"）
+
+    Returns:
+        去重后的分类列表（保持原顺序）
+    """
+    if not category:
+        return []
+    result = []
+    for part in _CATEGORY_SPLIT_RE.split(category):
+        part = part.strip()
+        if part and part not in result:
+            result.append(part)
+    return result
+
+
+def latest_version() -> int:
+    """最新结构版本"""
+    return max(MIGRATIONS)
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    """读取数据库当前结构版本"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[int]:
+    """
+    升级数据库结构
+
+    Args:
+        conn: 数据库连接
+        target: 目标版本（默认最新）
+
+    Returns:
+        本次执行的迁移版本列表
+    """
+    target = target or latest_version()
+    applied = []
+
+    if conn.in_transaction:
+        conn.commit()
+
+    for version in sorted(v for v in MIGRATIONS if v <= target):
+        if get_version(conn) >= version:
+            continue
+
+        description, func = MIGRATIONS[version]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 获得写锁后重新检查，其他连接可能已完成迁移
+            if get_version(conn) >= version:
+                conn.rollback()
+                continue
+            func(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(f"数据库结构已升级到 v{version}: {description}")
+        applied.append(version)
+
+    return applied
+
+
+@migration(1, "基础结构")
+def _v1_baseline(conn: sqlite3.Connection):
+    # 基础表由Database._create_tables创建（CREATE TABLE IF NOT EXISTS），这里只记录版本
+    pass
+
+
+@migration(2, "sources表与article_categories分类关联表")
+def _v2_sources_and_categories(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL,
+            tier INTEGER DEFAULT 2,
+            active BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_categories (
+            category TEXT NOT NULL,
+            article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            PRIMARY KEY (category, article_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_article_categories_article ON article_categories(article_id)"
+    )
+
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+    if 'source_id' not in columns:
+        conn.execute("ALTER TABLE articles ADD COLUMN source_id INTEGER REFERENCES sources(id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_source_id ON articles(source_id)")
+
+    # 迁移已有数据：媒体源
+    conn.execute("""
+        INSERT OR IGNORE INTO sources (name, tier)
+        SELECT source, MIN(source_tier) FROM articles GROUP BY source
+    """)
+    conn.execute("""
+        UPDATE articles
+        SET source_id = (SELECT id FROM sources WHERE sources.name = articles.source)
+        WHERE source_id IS NULL
+    """)
+
+    # 迁移已有数据：拆分多分类字符串
+    rows = conn.execute("SELECT id, category FROM articles WHERE category IS NOT NULL").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO article_categories (category, article_id) VALUES (?, ?)",
+        [(category, row[0]) for row in rows for category in split_categories(row[1])],
+    )
+
+
+@migration(3, "按查询调整索引")
+def _v3_query_indexes(conn: sqlite3.Connection):
+    # 按优先级查询：等值过滤 + 按评分排序，复合索引免去排序
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_priority_score
+        ON articles(priority, score DESC, publish_date DESC)
+    """)
+    # 周报就绪查询：三个标记列做部分索引条件，只索引可直接出报告的文章
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ready_publish_date
+        ON articles(publish_date)
+        WHERE processed = 1 AND summary_generated = 1 AND link_valid = 1
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at DESC)")
+
+    # 被复合索引/article_categories取代，或选择性过低（布尔列）的单列索引
+    for name in ('idx_priority', 'idx_category', 'idx_link_valid', 'idx_processed'):
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # 分类关联表冗余排序字段：按分类查询直接在关联表上完成过滤和排序，只回表取结果行
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(article_categories)")}
+    if 'score' not in columns:
+        conn.execute("ALTER TABLE article_categories ADD COLUMN score INTEGER DEFAULT 0")
+        conn.execute("ALTER TABLE article_categories ADD COLUMN publish_date DATE")
+    conn.execute("""
+        UPDATE article_categories
+        SET score = (SELECT score FROM articles WHERE articles.id = article_categories.article_id),
+            publish_date = (SELECT publish_date FROM articles WHERE articles.id = article_categories.article_id)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_categories_score
+        ON article_categories(category, score DESC, publish_date DESC)
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_categories_date
+        ON article_categories(category, publish_date)
+    """)
+
+    # 更新查询规划器统计信息（只分析需要的表）
+    conn.execute("PRAGMA optimize")
+
+
+@migration(4, "正文压缩存储到article_content表")
+def _v4_article_content(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_content (
+            article_id INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+            codec TEXT NOT NULL,
+            raw_size INTEGER NOT NULL,
+            body BLOB NOT NULL
+        )
+    """)
+
+    # 分批迁移已有正文，避免一次性读入整个库
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            "SELECT id, content FROM articles WHERE id > ? AND content IS NOT NULL ORDER BY id LIMIT 1000",
+            (last_id,),
+        ).fetchall()
+        if not rows:
+            break
+        batch = []
+        for article_id, content in rows:
+            codec, body = compress_content(content)
+            batch.append((article_id, codec, len(content.encode('utf-8')), body))
+        conn.executemany(
+            "INSERT OR REPLACE INTO article_content (article_id, codec, raw_size, body) VALUES (?, ?, ?, ?)",
+            batch,
+        )
+        last_id = rows[-1][0]
+
+    # 释放的页面在执行VACUUM后才会归还给文件系统
+    conn.execute("UPDATE articles SET content = NULL WHERE content IS NOT NULL")
+
+
+# daily_aggregates的维度取值（NULL统一为空字符串，主键不允许NULL）
+_AGGREGATE_KEY = {
+    'day': "COALESCE(date({row}.publish_date), '')",
+    'source': "COALESCE({row}.source, '')",
+    'category': "COALESCE({row}.category, '')",
+    'priority': "COALESCE({row}.priority, '')",
+}
+_AGGREGATE_MEASURES = {
+    'article_count': "1",
+    'score_sum': "COALESCE({row}.score, 0)",
+    # LLM评分默认为0，只统计经过LLM分析（总分>0）的文章
+    'llm_count': "(COALESCE({row}.llm_total_score, 0) > 0)",
+    'llm_relevance_sum': "COALESCE({row}.llm_relevance_score, 0)",
+    'llm_importance_sum': "COALESCE({row}.llm_importance_score, 0)",
+    'llm_total_sum': "COALESCE({row}.llm_total_score, 0)",
+}
+
+
+def _aggregate_add_sql(row: str) -> str:
+    """把一行文章计入daily_aggregates（UPSERT）"""
+    columns = list(_AGGREGATE_KEY) + list(_AGGREGATE_MEASURES)
+    values = [expr.format(row=row) for expr in list(_AGGREGATE_KEY.values()) + list(_AGGREGATE_MEASURES.values())]
+    updates = ', '.join(f"{m} = {m} + excluded.{m}" for m in _AGGREGATE_MEASURES)
+    return (
+        f"INSERT INTO daily_aggregates ({', '.join(columns)}) VALUES ({', '.join(values)}) "
+        f"ON CONFLICT ({', '.join(_AGGREGATE_KEY)}) DO UPDATE SET {updates};"
+    )
+
+
+def _aggregate_remove_sql(row: str) -> str:
+    """从daily_aggregates中减去一行文章（减到0的汇总行删除）"""
+    updates = ', '.join(f"{m} = {m} - {expr.format(row=row)}" for m, expr in _AGGREGATE_MEASURES.items())
+    where = ' AND '.join(f"{k} = {expr.format(row=row)}" for k, expr in _AGGREGATE_KEY.items())
+    return (
+        f"UPDATE daily_aggregates SET {updates} WHERE {where}; "
+        f"DELETE FROM daily_aggregates WHERE {where} AND article_count <= 0;"
+    )
+
+
+def rebuild_daily_aggregates(conn: sqlite3.Connection):
+    """按articles表重新计算daily_aggregates（迁移时回填，或修复汇总数据）"""
+    group = ', '.join(expr.format(row='articles') for expr in _AGGREGATE_KEY.values())
+    sums = ', '.join(
+        f"SUM({expr.format(row='articles')})" for expr in _AGGREGATE_MEASURES.values()
+    )
+    conn.execute("DELETE FROM daily_aggregates")
+    conn.execute(
+        f"INSERT INTO daily_aggregates ({', '.join(list(_AGGREGATE_KEY) + list(_AGGREGATE_MEASURES))}) "
+        f"SELECT {group}, {sums} FROM articles GROUP BY {group}"
+    )
+
+
+@migration(5, "daily_aggregates按日汇总表与维护触发器")
+def _v5_daily_aggregates(conn: sqlite3.Connection):
+    # 存合计而不是平均值，增量加减后仍然精确；平均值在查询时用 合计/数量 计算
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS daily_aggregates (
+            day TEXT NOT NULL,
+            source TEXT NOT NULL,
+            category TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            article_count INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            llm_count INTEGER NOT NULL DEFAULT 0,
+            llm_relevance_sum INTEGER NOT NULL DEFAULT 0,
+            llm_importance_sum INTEGER NOT NULL DEFAULT 0,
+            llm_total_sum INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, source, category, priority)
+        ) WITHOUT ROWID
+    """)
+
+    # 插入、删除（含归档）和评分更新都在同一事务内同步汇总
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_aggregates_insert AFTER INSERT ON articles
+        BEGIN {_aggregate_add_sql('NEW')} END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_aggregates_delete AFTER DELETE ON articles
+        BEGIN {_aggregate_remove_sql('OLD')} END
+    """)
+    watched = ['publish_date', 'source', 'category', 'priority', 'score',
+               'llm_relevance_score', 'llm_importance_score', 'llm_total_score']
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_daily_aggregates_update
+        AFTER UPDATE OF {', '.join(watched)} ON articles
+        BEGIN {_aggregate_remove_sql('OLD')} {_aggregate_add_sql('NEW')} END
+    """)
+
+    rebuild_daily_aggregates(conn)
+
+
+@migration(6, "article_entities文章实体关联表")
+def _v6_article_entities(conn: sqlite3.Connection):
+    # 与article_categories相同：冗余publish_date，按实体查时间线只在关联表索引上过滤和排序
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_entities (
+            entity TEXT NOT NULL,
+            article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            entity_type TEXT NOT NULL,
+            mentions INTEGER NOT NULL DEFAULT 1,
+            in_title BOOLEAN NOT NULL DEFAULT 0,
+            source TEXT NOT NULL DEFAULT 'dict',
+            publish_date DATE,
+            PRIMARY KEY (entity, article_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_entities_date
+        ON article_entities(entity, publish_date DESC)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_article_entities_article ON article_entities(article_id)")
+    # 按时间窗口统计各实体的文章数（覆盖索引，统计时不回表）
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_entities_publish
+        ON article_entities(publish_date, entity, entity_type, in_title)
+    """)
+    # 已有文章的实体由 extract_entities.py --all 按词典补建
+
+
+@migration(7, "article_facts文章数值事实表")
+def _v7_article_facts(conn: sqlite3.Connection):
+    # 每篇文章每类事实的每个不同数值一行；冗余publish_date，按类型和时间窗口统计只读覆盖索引
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS article_facts (
+            article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+            fact_type TEXT NOT NULL,
+            value REAL NOT NULL,
+            unit TEXT NOT NULL DEFAULT '',
+            raw_text TEXT,
+            publish_date DATE,
+            PRIMARY KEY (article_id, fact_type, value)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_article_facts_type_date
+        ON article_facts(fact_type, publish_date, article_id, value, unit)
+    """)
+    # 已有文章的事实由 extract_facts.py --all 补建
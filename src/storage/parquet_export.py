@@ -0,0 +1,258 @@
+"""
+文章表导出为Parquet（按月分区）
+
+分析场景（各源评分分布、分类数量趋势等）读取导出的Parquet文件，不在在线SQLite库上做全表扫描。
+
+- 导出：按id顺序分批读取（fetchmany），每批转换为Arrow RecordBatch，按发布月份写入
+  export_dir/month=YYYY-MM/part-<起始id>-<结束id>.parquet（hive分区）
+- 增量：导出状态（已导出的最大id）记录在 export_dir/_export_state.json，
+  再次导出只处理新插入的文章；已导出文章之后的评分更新需要 full=True 重新导出
+- 读取：load_articles_frame() 按日期范围只读取涉及的月份分区，返回pandas DataFrame
+
+依赖pyarrow（读取为DataFrame还需要pandas），均为可选依赖：
+    pip install pyarrow pandas
+"""
+
+import json
+import logging
+import shutil
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.storage.database import Database
+from src.storage.records import parse_date
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # 可选依赖
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPORT_DIR = 'data/analytics'
+STATE_FILE = '_export_state.json'
+DEFAULT_BATCH_SIZE = 5000
+
+# 导出的列（正文不导出，见article_content）
+EXPORT_COLUMNS = [
+    ('id', 'int64'),
+    ('title', 'string'),
+    ('url', 'string'),
+    ('source', 'string'),
+    ('source_id', 'int64'),
+    ('source_tier', 'int32'),
+    ('publish_date', 'date32'),
+    ('collected_at', 'string'),
+    ('summary', 'string'),
+    ('category', 'string'),
+    ('priority', 'string'),
+    ('score', 'int32'),
+    ('score_relevance', 'int32'),
+    ('score_timeliness', 'int32'),
+    ('score_impact', 'int32'),
+    ('score_credibility', 'int32'),
+    ('llm_relevance_score', 'int32'),
+    ('llm_importance_score', 'int32'),
+    ('llm_category_score', 'int32'),
+    ('llm_total_score', 'int32'),
+    ('llm_category_suggestion', 'string'),
+    ('link_valid', 'bool'),
+    ('summary_generated', 'bool'),
+    ('processed', 'bool'),
+]
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet导出需要pyarrow：pip install pyarrow pandas")
+
+
+def export_schema() -> 'pa.Schema':
+    """导出文件的Arrow schema"""
+    _require_pyarrow()
+    types = {
+        'int64': pa.int64(), 'int32': pa.int32(), 'string': pa.string(),
+        'date32': pa.date32(), 'bool': pa.bool_(),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_COLUMNS])
+
+
+def load_state(export_dir: str) -> Dict[str, Any]:
+    """
+    读取导出状态
+
+    Returns:
+        {'last_id': 已导出的最大文章id, 'exported_at': 上次导出时间, 'rows': 累计导出行数}
+    """
+    path = Path(export_dir) / STATE_FILE
+    if not path.exists():
+        return {'last_id': 0, 'exported_at': None, 'rows': 0}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _save_state(export_dir: str, state: Dict[str, Any]):
+    path = Path(export_dir) / STATE_FILE
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    tmp.replace(path)
+
+
+def _to_batch(rows: List, schema: 'pa.Schema') -> 'pa.RecordBatch':
+    columns = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if field.name == 'publish_date':
+            values = [parse_date(v) for v in values]
+        elif pa.types.is_boolean(field.type):
+            values = [None if v is None else bool(v) for v in values]
+        columns.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def export_articles(
+    db: Database,
+    export_dir: str = DEFAULT_EXPORT_DIR,
+    full: bool = False,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    增量导出文章到按月分区的Parquet文件
+
+    新文件先写为临时文件，全部写完后再改名并更新导出状态，
+    中途失败不会留下不完整的分区文件，下次导出从上次成功的位置继续。
+
+    Args:
+        db: 数据库
+        export_dir: 导出目录
+        full: 删除已有导出，从头重新导出
+        batch_size: 每次从SQLite读取并转换的行数
+
+    Returns:
+        {月份: 本次导出行数}
+    """
+    _require_pyarrow()
+    directory = Path(export_dir)
+    if full and directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    state = load_state(export_dir)
+    schema = export_schema()
+    names = [name for name, _ in EXPORT_COLUMNS]
+    available = {row[1] for row in db.conn.execute("PRAGMA table_info(articles)")}
+    select_list = ', '.join(name if name in available else f'NULL AS {name}' for name in names)
+
+    cursor = db.conn.cursor()
+    cursor.execute(
+        f"SELECT {select_list} FROM articles WHERE id > ? ORDER BY id",
+        (state['last_id'],),
+    )
+
+    writers: Dict[str, Any] = {}
+    counts: Dict[str, int] = {}
+    id_range: Dict[str, List[int]] = {}
+    last_id = state['last_id']
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            by_month: Dict[str, List] = {}
+            for row in rows:
+                by_month.setdefault(str(row['publish_date'])[:7], []).append(row)
+            for month, month_rows in by_month.items():
+                if month not in writers:
+                    partition = directory / f'month={month}'
+                    partition.mkdir(exist_ok=True)
+                    tmp_path = partition / f'.part-{month_rows[0]["id"]}.parquet.tmp'
+                    writers[month] = (pq.ParquetWriter(str(tmp_path), schema, compression='zstd'), tmp_path)
+                    id_range[month] = [month_rows[0]['id'], month_rows[-1]['id']]
+                writers[month][0].write_batch(_to_batch(month_rows, schema))
+                counts[month] = counts.get(month, 0) + len(month_rows)
+                id_range[month][1] = month_rows[-1]['id']
+            last_id = rows[-1]['id']
+    except BaseException:
+        for writer, tmp_path in writers.values():
+            writer.close()
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+    for month, (writer, tmp_path) in writers.items():
+        writer.close()
+        first, last = id_range[month]
+        tmp_path.replace(tmp_path.parent / f'part-{first}-{last}.parquet')
+
+    if counts:
+        _save_state(export_dir, {
+            'last_id': last_id,
+            'exported_at': date.today().isoformat(),
+            'rows': state.get('rows', 0) + sum(counts.values()),
+        })
+        logger.info(f"已导出 {sum(counts.values())} 篇文章到 {export_dir}（{len(counts)} 个月份）")
+    return dict(sorted(counts.items()))
+
+
+def _months(start_date: date, end_date: date) -> List[str]:
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append(f'{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def load_articles_table(
+    export_dir: str,
+    start_date: date,
+    end_date: date,
+    columns: Optional[List[str]] = None,
+) -> 'pa.Table':
+    """
+    按日期范围读取导出的文章（Arrow Table）
+
+    Args:
+        export_dir: 导出目录
+        start_date: 开始日期
+        end_date: 结束日期
+        columns: 只读取的列（默认全部）
+
+    Returns:
+        pyarrow.Table
+    """
+    _require_pyarrow()
+    directory = Path(export_dir)
+    partitions = [directory / f'month={m}' for m in _months(start_date, end_date)]
+    files = [str(p) for partition in partitions if partition.exists() for p in sorted(partition.glob('part-*.parquet'))]
+    if not files:
+        return export_schema().empty_table().select(columns or export_schema().names)
+
+    dataset = ds.dataset(files, schema=export_schema(), format='parquet')
+    condition = (ds.field('publish_date') >= pa.scalar(start_date, pa.date32())) & \
+                (ds.field('publish_date') <= pa.scalar(end_date, pa.date32()))
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+def load_articles_frame(
+    export_dir: str,
+    start_date: date,
+    end_date: date,
+    columns: Optional[List[str]] = None,
+):
+    """
+    按日期范围读取导出的文章为pandas DataFrame（需要pandas）
+
+    Args:
+        export_dir: 导出目录
+        start_date: 开始日期
+        end_date: 结束日期
+        columns: 只读取的列（默认全部）
+
+    Returns:
+        pandas.DataFrame
+    """
+    return load_articles_table(export_dir, start_date, end_date, columns).to_pandas()
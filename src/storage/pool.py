@@ -0,0 +1,248 @@
+"""
+数据库连接池（读写分离）
+
+sqlite3连接默认只能在创建它的线程中使用，多个连接同时写入又会出现"database is locked"。
+DatabasePool把一个数据库文件的访问拆成：
+
+- 一个写线程：独占唯一的写连接，从队列中取出写操作，按批合并为一个事务提交
+  （每个操作一个保存点，单个操作失败只回滚该操作，结果/异常通过Future返回）
+- 多个只读连接：WAL模式下读取不被写入阻塞，按需借出给调用线程
+
+线程中使用：
+    with DatabasePool('data/intelligence.db') as pool:
+        exists = pool.read(Database.article_exists, url)
+        article_id = pool.write(Database.insert_article, **article)
+        future = pool.submit(Database.save_relevance_label, **label)   # 不等待
+
+asyncio中使用：
+    exists = await pool.aread(Database.article_exists, url)
+    article_id = await pool.awrite(Database.insert_article, **article)
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.storage.database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READERS = 4
+# 每批最多合并的写操作数
+DEFAULT_WRITE_BATCH = 100
+# 队列为空时等待更多写操作合并的时间（秒）
+DEFAULT_WRITE_LINGER = 0.005
+
+# 写线程停止标记
+_STOP = object()
+
+
+class DatabasePool:
+    """单写多读的数据库连接池"""
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DEFAULT_READERS,
+        write_batch: int = DEFAULT_WRITE_BATCH,
+        write_linger: float = DEFAULT_WRITE_LINGER,
+    ):
+        """
+        Args:
+            db_path: 数据库文件路径（不支持:memory:，读写连接需要共享同一文件）
+            readers: 只读连接数（同时进行的读操作上限）
+            write_batch: 每个事务最多合并的写操作数
+            write_linger: 写队列为空时等待后续写操作合并的时间（秒）
+        """
+        if db_path == ':memory:':
+            raise ValueError("连接池需要文件数据库（读写连接共享同一文件）")
+
+        self.db_path = db_path
+        self.write_batch = max(1, write_batch)
+        self.write_linger = max(0.0, write_linger)
+        self._write_q: queue.Queue = queue.Queue()
+        self._closed = False
+        self._stats = {'writes': 0, 'write_errors': 0, 'batches': 0, 'max_batch': 0, 'reads': 0}
+        self._stats_lock = threading.Lock()
+
+        # 写线程启动前先完成建表和迁移，并切换到WAL（持久化在数据库文件中）
+        ready = Future()
+        self._writer = threading.Thread(
+            target=self._write_loop, args=(ready,), name='db-writer', daemon=True
+        )
+        self._writer.start()
+        ready.result()
+
+        self._readers: queue.LifoQueue = queue.LifoQueue()
+        self._all_readers: List[Database] = []
+        for _ in range(max(1, readers)):
+            reader = Database(db_path, read_only=True)
+            self._all_readers.append(reader)
+            self._readers.put(reader)
+
+    # ---------- 读 ----------
+
+    @contextmanager
+    def reader(self) -> Iterator[Database]:
+        """借出一个只读连接（所有只读连接都在使用时阻塞等待）"""
+        self._check_open()
+        db = self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put(db)
+
+    def read(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        在只读连接上执行 func(db, *args, **kwargs)
+
+        Args:
+            func: 读操作，通常是Database的方法（如Database.get_articles_for_weekly_report）
+
+        Returns:
+            func的返回值
+        """
+        with self.reader() as db:
+            result = func(db, *args, **kwargs)
+        with self._stats_lock:
+            self._stats['reads'] += 1
+        return result
+
+    async def aread(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """read()的asyncio版本（在线程池中执行，不阻塞事件循环）"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.read(func, *args, **kwargs))
+
+    # ---------- 写 ----------
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        提交写操作 func(db, *args, **kwargs)，由写线程按批执行
+
+        Returns:
+            Future，结果为func的返回值；操作失败时为对应异常
+        """
+        self._check_open()
+        future = Future()
+        self._write_q.put((func, args, kwargs, future))
+        return future
+
+    def write(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """提交写操作并等待完成（含事务提交）"""
+        return self.submit(func, *args, **kwargs).result()
+
+    async def awrite(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """write()的asyncio版本"""
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def flush(self):
+        """等待此前提交的写操作全部提交"""
+        self.write(lambda db: None)
+
+    def _write_loop(self, ready: Future):
+        try:
+            db = Database(self.db_path)
+            db.conn.execute("PRAGMA journal_mode = WAL")
+            # WAL模式下NORMAL同步级别不会损坏数据库，只可能丢失最后几个事务
+            db.conn.execute("PRAGMA synchronous = NORMAL")
+        except BaseException as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+
+        try:
+            while True:
+                batch, stop = self._next_batch()
+                if batch:
+                    self._run_batch(db, batch)
+                if stop:
+                    break
+        finally:
+            db.close()
+
+    def _next_batch(self) -> Tuple[List, bool]:
+        """取出一批写操作（阻塞等待第一个，之后短暂等待以合并更多）"""
+        item = self._write_q.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.write_linger
+        while len(batch) < self.write_batch:
+            try:
+                timeout = deadline - time.monotonic()
+                item = self._write_q.get(timeout=timeout) if timeout > 0 else self._write_q.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_batch(self, db: Database, batch: List):
+        results = []
+        try:
+            with db.batch():
+                for func, args, kwargs, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with db.operation():
+                            results.append((future, func(db, *args, **kwargs), None))
+                    except Exception as e:
+                        results.append((future, None, e))
+        except Exception as e:
+            # 提交失败：整批操作都未生效
+            logger.error(f"批量写入提交失败: {e}")
+            for _, _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            with self._stats_lock:
+                self._stats['write_errors'] += len(batch)
+            return
+
+        # 提交成功后再通知调用方，write()返回时数据已持久化
+        errors = 0
+        for future, result, error in results:
+            if error is not None:
+                errors += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        with self._stats_lock:
+            self._stats['writes'] += len(results) - errors
+            self._stats['write_errors'] += errors
+            self._stats['batches'] += 1
+            self._stats['max_batch'] = max(self._stats['max_batch'], len(batch))
+
+    # ---------- 生命周期 ----------
+
+    def stats(self) -> Dict[str, int]:
+        """读写统计（写操作数、失败数、批次数、最大批大小、读操作数）"""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("连接池已关闭")
+
+    def close(self):
+        """执行完已提交的写操作后关闭所有连接"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_q.put(_STOP)
+        self._writer.join()
+        for reader in self._all_readers:
+            reader.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,234 @@
+"""
+查询计划审计
+
+对Database的每个查询/更新方法执行一次代表性调用，通过trace回调捕获实际执行的SQL，
+逐条运行 EXPLAIN QUERY PLAN，标出全表扫描（SCAN）和临时B树排序（USE TEMP B-TREE）。
+
+审计会真实执行写入方法，应在数据库副本上运行（见 audit_queries.py，默认复制到内存）。
+"""
+
+import re
+import sqlite3
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.storage.database import Database
+from src.storage.migrations import migrate
+
+
+# 设计上需要遍历整表/小表的查询，不计入告警
+EXPECTED_FULL_SCANS = {
+    'get_all_articles',            # 导出全部文章
+    'get_relevance_training_data',  # 全部LLM判定作为训练数据
+    'get_sources',                 # sources表只有几十行
+    'sync_sources',
+    'get_recent_runs',             # 按started_at索引顺序读取，LIMIT提前结束
+    'get_resumable_run',
+}
+
+# 日期窗口查询：先按日期范围取出窗口内的文章（几千行），再对窗口排序。
+# 按评分顺序扫描索引需要遍历全部文章，实测在50万行时反而更慢（见docs/benchmarks.md）
+EXPECTED_TEMP_SORTS = {
+    'get_articles_by_date_range',
+    'get_articles_for_weekly_report',
+    'get_articles_ready_for_report',
+    'get_sources',
+    'get_daily_aggregates',        # 按维度分组的是窗口内的汇总行（天数×维度组合），不是文章
+    'get_entity_counts',           # 按文章数排序的是分组后的实体（几十个），不是关联行
+    'get_fact_stats',              # 窗口内含数值事实的文章按文章分组，再按类型汇总
+    'get_investment_totals',
+}
+
+_SAMPLE_ARTICLE = {
+    'title': '查询审计样例文章',
+    'url': 'https://audit.example.com/sample.html',
+    'source': '审计样例源',
+    'source_tier': 2,
+    'publish_date': date.today(),
+    'content': '样例内容',
+    'category': '投资,技术',
+    'score': 50,
+}
+
+
+def copy_to_memory(db_path: str) -> Database:
+    """
+    把数据库文件复制到内存并升级到最新结构，审计只作用于副本
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        内存中的Database
+    """
+    db = Database(':memory:')
+    source = sqlite3.connect(db_path)
+    try:
+        source.backup(db.conn)
+    finally:
+        source.close()
+
+    # 备份覆盖了内存库的全部内容，按旧文件的版本重新补齐表结构
+    db._create_tables()
+    db._create_indexes()
+    migrate(db.conn)
+    return db
+
+
+def audited_calls() -> List[Tuple[str, Callable[[Database], Any]]]:
+    """
+    被审计的方法及代表性调用
+
+    Returns:
+        [(方法名, 调用函数), ...]
+    """
+    today = date.today()
+    return [
+        ('insert_article', lambda db: db.insert_article(**_SAMPLE_ARTICLE)),
+        ('insert_articles', lambda db: db.insert_articles([
+            dict(_SAMPLE_ARTICLE, url=f'https://audit.example.com/batch-{i}.html') for i in range(2)
+        ])),
+        ('article_exists', lambda db: db.article_exists(_SAMPLE_ARTICLE['url'])),
+        ('get_article_by_id', lambda db: db.get_article_by_id(1)),
+        ('get_article_contents', lambda db: db.get_article_contents([1, 2, 3])),
+        ('get_all_articles', lambda db: db.get_all_articles()),
+        ('get_articles_by_date_range',
+         lambda db: db.get_articles_by_date_range(today - timedelta(days=7), today)),
+        ('get_articles_for_weekly_report', lambda db: db.get_articles_for_weekly_report(7)),
+        ('get_articles_by_priority', lambda db: db.get_articles_by_priority('高')),
+        ('get_articles_by_category', lambda db: db.get_articles_by_category('投资')),
+        ('get_articles_by_category(start_date)',
+         lambda db: db.get_articles_by_category('投资', today - timedelta(days=7))),
+        ('get_articles_ready_for_report', lambda db: db.get_articles_ready_for_report(7)),
+        ('get_daily_aggregates(category)',
+         lambda db: db.get_daily_aggregates(today - timedelta(days=13), today, group_by='category')),
+        ('get_article_titles', lambda db: db.get_article_titles(today - timedelta(days=13), today)),
+        ('save_article_entities', lambda db: db.save_article_entities(1, [
+            {'name': '万国数据', 'type': 'company', 'mentions': 2, 'in_title': True, 'source': 'dict'},
+        ])),
+        ('articles_for_entity', lambda db: db.articles_for_entity('万国数据', days=90, limit=50)),
+        ('get_entity_counts', lambda db: db.get_entity_counts(days=30)),
+        ('save_article_facts', lambda db: db.save_article_facts(1, [
+            {'type': 'investment', 'value': 50.0, 'unit': '亿元', 'text': '50亿元'},
+        ])),
+        ('get_article_facts', lambda db: db.get_article_facts(1)),
+        ('get_fact_stats', lambda db: db.get_fact_stats(today - timedelta(days=29), today)),
+        ('get_investment_totals(week)',
+         lambda db: db.get_investment_totals(today - timedelta(days=89), today, group_by='week')),
+        ('get_investment_totals(region)',
+         lambda db: db.get_investment_totals(today - timedelta(days=89), today, group_by='region')),
+        ('update_article_summary', lambda db: db.update_article_summary(1, '样例摘要')),
+        ('update_article_scores',
+         lambda db: db.update_article_scores(1, '投资', '高', 80, 30, 20, 15, 15)),
+        ('update_link_validity', lambda db: db.update_link_validity(1, True)),
+        ('get_recent_runs', lambda db: db.get_recent_runs(10)),
+        ('get_resumable_run', lambda db: db.get_resumable_run()),
+        ('get_run_sources', lambda db: db.get_run_sources('audit')),
+        ('get_run_articles', lambda db: db.get_run_articles('audit')),
+        ('get_relevance_training_data', lambda db: db.get_relevance_training_data()),
+        ('sync_sources', lambda db: db.sync_sources([{'name': '审计样例源', 'tier': 2, 'active': True}])),
+        ('get_sources', lambda db: db.get_sources()),
+    ]
+
+
+def _is_auditable(sql: str) -> bool:
+    head = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+    return head in ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'WITH')
+
+
+def _template(sql: str) -> str:
+    """去掉字面量，用于合并同一语句的多次执行（如executemany）"""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def explain(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """返回查询计划的各行描述"""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def _plan_flags(plan: List[str]) -> Dict[str, bool]:
+    # 子查询的结果（"CO-ROUTINE f" / "MATERIALIZE f"）只含已按索引过滤的行，扫描它不是全表扫描
+    subqueries = {
+        line.split(None, 1)[1] for line in plan
+        if line.startswith(('CO-ROUTINE ', 'MATERIALIZE ')) and ' ' in line
+    }
+    return {
+        # "SCAN t"（无索引）为全表扫描；"SCAN t USING INDEX"为整个索引扫描，同样遍历全部行
+        'full_scan': any(
+            line.startswith('SCAN ') and 'COVERING INDEX' not in line and line[5:] not in subqueries
+            for line in plan
+        ),
+        'temp_btree': any('USE TEMP B-TREE' in line for line in plan),
+    }
+
+
+def audit_database(db: Database) -> List[Dict[str, Any]]:
+    """
+    审计Database各方法的查询计划（会真实执行写入，应传入数据库副本）
+
+    Returns:
+        [{'method', 'statements': [{'sql', 'plan', 'full_scan', 'temp_btree'}], 'warnings': [...]}]
+    """
+    results = []
+    for method, call in audited_calls():
+        captured: List[str] = []
+        db.conn.set_trace_callback(captured.append)
+        error = None
+        try:
+            call(db)
+        except Exception as e:  # 审计不因单个方法失败中断
+            error = str(e)
+        finally:
+            db.conn.set_trace_callback(None)
+
+        statements = []
+        seen = set()
+        for sql in captured:
+            if not _is_auditable(sql):
+                continue
+            key = _template(sql)
+            if key in seen:
+                continue
+            seen.add(key)
+            plan = explain(db.conn, sql)
+            statements.append({'sql': key, 'plan': plan, **_plan_flags(plan)})
+
+        base = method.split('(')[0]
+        warnings = []
+        if any(s['full_scan'] for s in statements) and base not in EXPECTED_FULL_SCANS:
+            warnings.append('全表扫描')
+        if any(s['temp_btree'] for s in statements) and base not in EXPECTED_TEMP_SORTS:
+            warnings.append('临时B树排序')
+        if error:
+            warnings.append(f'执行失败: {error}')
+
+        results.append({'method': method, 'statements': statements, 'warnings': warnings})
+    return results
+
+
+def format_audit_report(results: List[Dict[str, Any]], verbose: bool = False) -> str:
+    """
+    格式化审计结果
+
+    Args:
+        results: audit_database()的结果
+        verbose: 是否输出SQL语句
+
+    Returns:
+        报告文本
+    """
+    lines = []
+    for result in results:
+        status = '⚠ ' + '，'.join(result['warnings']) if result['warnings'] else '✓'
+        lines.append(f"{result['method']:<40} {status}")
+        for statement in result['statements']:
+            if verbose:
+                lines.append(f"    SQL: {statement['sql'][:160]}")
+            for step in statement['plan']:
+                lines.append(f"      {step}")
+
+    warned = sum(1 for r in results if r['warnings'])
+    lines.append(f"\n共审计 {len(results)} 个方法，{warned} 个有告警")
+    return '\n'.join(lines)
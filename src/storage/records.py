@@ -0,0 +1,79 @@
+"""
+轻量文章记录
+
+查询结果默认逐行转换为dict，并对publish_date逐行调用strptime。周报等只读场景
+可改用ArticleRecord：直接包装sqlite3.Row（不复制列值），publish_date在首次访问时
+才转换为date并缓存。
+
+ArticleRecord实现只读Mapping接口（record['title']、record.get('score', 0)、
+dict(record)），也支持属性访问（record.title），可直接替代文章字典传给报告生成器。
+"""
+
+import sqlite3
+from collections.abc import Mapping
+from datetime import date
+from typing import Any, Iterator, List
+
+
+# 需要转换为date的列
+_DATE_COLUMNS = frozenset({'publish_date'})
+
+
+def parse_date(value: Any) -> Any:
+    """'YYYY-MM-DD'字符串转换为date（已是date或为空时原样返回）"""
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return value
+    return value
+
+
+class ArticleRecord(Mapping):
+    """包装sqlite3.Row的只读文章记录"""
+
+    __slots__ = ('_row', '_publish_date')
+
+    _UNSET = object()
+
+    def __init__(self, row: sqlite3.Row):
+        self._row = row
+        self._publish_date = self._UNSET
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _DATE_COLUMNS:
+            if self._publish_date is self._UNSET:
+                self._publish_date = parse_date(self._lookup(key))
+            return self._publish_date
+        return self._lookup(key)
+
+    def _lookup(self, key: str) -> Any:
+        try:
+            return self._row[key]
+        except (IndexError, KeyError):
+            raise KeyError(key) from None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._row.keys())
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._row.keys()
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(id={self.get('id')!r}, title={self.get('title')!r})"
+
+
+def to_records(rows: List[sqlite3.Row]) -> List[ArticleRecord]:
+    """把查询结果包装为ArticleRecord列表"""
+    return [ArticleRecord(row) for row in rows]
@@ -0,0 +1,309 @@
+"""
+数据保留与归档
+
+在线数据库只保留最近N天的文章，更早的文章按发布月份迁移到归档库
+（archive_dir/articles_YYYY-MM.db，结构与在线库相同），使日常写入和周报查询
+面对的数据量不随运行年限增长。
+
+- 归档：按月ATTACH归档库，在一个事务内复制文章（含正文、分类、实体关联和数值事实）后从在线库删除
+- 历史查询：按日期范围逐个ATTACH涉及的月份归档库，与在线库的结果合并
+- 空间回收：新库使用auto_vacuum=INCREMENTAL，删除后可分批回收空闲页，不必整库VACUUM
+"""
+
+import logging
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.storage.database import Database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARCHIVE_DIR = 'data/archive'
+
+# 随文章一起归档的关联表（都以article_id关联articles.id）
+_ARTICLE_TABLES = ('article_content', 'article_categories', 'article_entities', 'article_facts')
+
+# auto_vacuum取值：0=NONE, 1=FULL, 2=INCREMENTAL
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def archive_path(archive_dir: str, month: str) -> Path:
+    """
+    月份归档库路径
+
+    Args:
+        archive_dir: 归档目录
+        month: 月份（YYYY-MM）
+
+    Returns:
+        归档库文件路径
+    """
+    return Path(archive_dir) / f'articles_{month}.db'
+
+
+def _months_between(start_date: date, end_date: date) -> List[str]:
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append(f'{year:04d}-{month:02d}')
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({table})")]
+
+
+def _copy_columns(conn: sqlite3.Connection, table: str) -> str:
+    """在线库与归档库共有的列（旧库可能缺少新版本增加的列），按列名复制"""
+    archived = set(_columns(conn, 'arch', table))
+    return ', '.join(c for c in _columns(conn, 'main', table) if c in archived)
+
+
+def list_archives(archive_dir: str = DEFAULT_ARCHIVE_DIR) -> List[str]:
+    """
+    列出已有归档的月份
+
+    Returns:
+        月份列表（YYYY-MM，升序）
+    """
+    directory = Path(archive_dir)
+    if not directory.exists():
+        return []
+    return sorted(p.stem[len('articles_'):] for p in directory.glob('articles_*.db'))
+
+
+def get_archivable_months(db: Database, days: int) -> Dict[str, int]:
+    """
+    统计超过保留期的文章（按发布月份）
+
+    Args:
+        db: 在线数据库
+        days: 保留天数
+
+    Returns:
+        {月份: 文章数}
+    """
+    cutoff = date.today() - timedelta(days=days)
+    rows = db.conn.execute(
+        """
+        SELECT substr(publish_date, 1, 7) AS month, COUNT(*) AS n
+        FROM articles WHERE publish_date < ?
+        GROUP BY month ORDER BY month
+        """,
+        (cutoff,),
+    ).fetchall()
+    return {row[0]: row[1] for row in rows}
+
+
+def archive_old_articles(
+    db: Database,
+    days: int,
+    archive_dir: str = DEFAULT_ARCHIVE_DIR,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    把发布日期早于保留期的文章迁移到月份归档库
+
+    每个月份在一个事务内完成复制和删除，中途失败不会丢失或重复数据；
+    同一文章重复归档时以归档库中已有的记录为准。
+
+    Args:
+        db: 在线数据库
+        days: 保留天数（早于 今天-days 的文章被归档）
+        archive_dir: 归档目录
+        dry_run: 只统计，不迁移
+
+    Returns:
+        {月份: 归档文章数}
+    """
+    months = get_archivable_months(db, days)
+    if dry_run or not months:
+        return months
+
+    cutoff = date.today() - timedelta(days=days)
+    Path(archive_dir).mkdir(parents=True, exist_ok=True)
+    conn = db.conn
+    if conn.in_transaction:
+        conn.commit()
+
+    archived = {}
+    for month in months:
+        path = archive_path(archive_dir, month)
+        # 用Database初始化归档库，结构（表、索引、迁移版本）与在线库一致
+        Database(str(path)).close()
+
+        conn.execute("ATTACH DATABASE ? AS arch", (str(path),))
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                CREATE TEMP TABLE archive_ids AS
+                SELECT id FROM main.articles
+                WHERE publish_date < ? AND substr(publish_date, 1, 7) = ?
+                """,
+                (cutoff, month),
+            )
+
+            columns = _copy_columns(conn, 'sources')
+            conn.execute(f"INSERT OR IGNORE INTO arch.sources ({columns}) SELECT {columns} FROM main.sources")
+
+            columns = _copy_columns(conn, 'articles')
+            conn.execute(f"""
+                INSERT OR IGNORE INTO arch.articles ({columns})
+                SELECT {columns} FROM main.articles WHERE id IN (SELECT id FROM archive_ids)
+            """)
+            for table in _ARTICLE_TABLES:
+                columns = _copy_columns(conn, table)
+                conn.execute(f"""
+                    INSERT OR IGNORE INTO arch.{table} ({columns})
+                    SELECT {columns} FROM main.{table} WHERE article_id IN (SELECT id FROM archive_ids)
+                """)
+                conn.execute(f"DELETE FROM main.{table} WHERE article_id IN (SELECT id FROM archive_ids)")
+
+            count = conn.execute("DELETE FROM main.articles WHERE id IN (SELECT id FROM archive_ids)").rowcount
+            conn.execute("DROP TABLE temp.archive_ids")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute("DETACH DATABASE arch")
+
+        archived[month] = count
+        logger.info(f"已归档 {month}: {count} 篇 -> {path}")
+
+    return archived
+
+
+def _parse_dates(rows) -> List[Dict[str, Any]]:
+    articles = []
+    for row in rows:
+        article = dict(row)
+        if isinstance(article.get('publish_date'), str):
+            article['publish_date'] = datetime.strptime(article['publish_date'], '%Y-%m-%d').date()
+        articles.append(article)
+    return articles
+
+
+def get_articles_with_archive(
+    db: Database,
+    start_date: date,
+    end_date: date,
+    archive_dir: str = DEFAULT_ARCHIVE_DIR,
+) -> List[Dict[str, Any]]:
+    """
+    跨在线库和归档库按日期范围查询文章（不含正文）
+
+    逐个ATTACH日期范围涉及且存在的月份归档库（SQLite默认最多同时附加10个库），
+    查询后立即DETACH。
+
+    Args:
+        db: 在线数据库
+        start_date: 开始日期
+        end_date: 结束日期
+        archive_dir: 归档目录
+
+    Returns:
+        文章列表，按发布日期降序；每篇文章带archive字段（所在归档月份，在线库为None）
+    """
+    conn = db.conn
+    # 按在线库的列对齐（较早创建的归档库可能缺少新增的列）
+    columns = _columns(conn, 'main', 'articles')
+    rows = list(conn.execute(
+        f"SELECT {', '.join(columns)}, NULL AS archive FROM main.articles "
+        f"WHERE publish_date BETWEEN ? AND ?",
+        (start_date, end_date),
+    ))
+
+    for month in _months_between(start_date, end_date):
+        path = archive_path(archive_dir, month)
+        if not path.exists():
+            continue
+        conn.execute("ATTACH DATABASE ? AS arch", (str(path),))
+        try:
+            existing = set(_columns(conn, 'arch', 'articles'))
+            select_list = ', '.join(c if c in existing else f'NULL AS {c}' for c in columns)
+            rows += conn.execute(
+                f"SELECT {select_list}, ? AS archive FROM arch.articles "
+                f"WHERE publish_date BETWEEN ? AND ?",
+                (month, start_date, end_date),
+            ).fetchall()
+        finally:
+            conn.execute("DETACH DATABASE arch")
+
+    rows.sort(key=lambda row: row['publish_date'], reverse=True)
+    return _parse_dates(rows)
+
+
+def enable_incremental_vacuum(db: Database) -> bool:
+    """
+    把已有数据库切换到auto_vacuum=INCREMENTAL（需要一次整库VACUUM）
+
+    Returns:
+        是否执行了切换（已是INCREMENTAL时返回False）
+    """
+    if db.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+        return False
+    if db.conn.in_transaction:
+        db.conn.commit()
+    db.conn.execute(f"PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}")
+    db.conn.execute("VACUUM")
+    return True
+
+
+def incremental_vacuum(db: Database, pages: Optional[int] = None) -> int:
+    """
+    回收空闲页
+
+    auto_vacuum=INCREMENTAL的库只回收指定页数（默认全部），每次持锁时间短；
+    其他库回退到整库VACUUM。
+
+    Args:
+        db: 数据库
+        pages: 最多回收的页数
+
+    Returns:
+        回收的页数
+    """
+    conn = db.conn
+    if conn.in_transaction:
+        conn.commit()
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == AUTO_VACUUM_INCREMENTAL:
+        # incremental_vacuum每执行一步回收一页，execute()只执行一步，用executescript执行到结束
+        conn.executescript(f"PRAGMA incremental_vacuum({int(pages or 0)});")
+    else:
+        conn.execute("VACUUM")
+
+    return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+def database_stats(db: Database) -> Dict[str, Any]:
+    """
+    数据库空间与数据分布统计
+
+    Returns:
+        {'articles', 'oldest', 'newest', 'page_size', 'page_count', 'freelist_count', 'size_bytes', 'auto_vacuum'}
+    """
+    conn = db.conn
+    count, oldest, newest = conn.execute(
+        "SELECT COUNT(*), MIN(publish_date), MAX(publish_date) FROM articles"
+    ).fetchone()
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    return {
+        'articles': count,
+        'oldest': oldest,
+        'newest': newest,
+        'page_size': page_size,
+        'page_count': page_count,
+        'freelist_count': conn.execute("PRAGMA freelist_count").fetchone()[0],
+        'size_bytes': page_size * page_count,
+        'auto_vacuum': {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}.get(
+            conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        ),
+    }
@@ -0,0 +1,88 @@
+"""
+LLM API共享HTTP会话
+
+所有LLM客户端（文章分析、摘要生成、周报洞察）共用一个连接池化的requests.Session：
+1. 长连接复用：同一API地址的后续调用跳过TCP+TLS握手
+2. 连接池大小可配置，与流水线模式的LLM并发线程数匹配
+3. 请求gzip压缩的响应
+4. 连接超时与读取超时分开设置：连接失败快速报错，生成较慢的响应仍可等待
+
+requests基于urllib3，不支持HTTP/2；长连接复用已能省去每次调用的握手开销。
+"""
+
+import os
+import threading
+from typing import Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# 默认连接池大小（每个API地址保持的空闲长连接数）
+DEFAULT_POOL_SIZE = 10
+# 默认超时（秒）
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def create_session(pool_size: Optional[int] = None) -> requests.Session:
+    """
+    创建连接池化的HTTP会话
+
+    Args:
+        pool_size: 连接池大小（默认读取环境变量LLM_HTTP_POOL_SIZE）
+
+    Returns:
+        requests.Session
+    """
+    pool_size = pool_size or int(os.getenv('LLM_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+    session = requests.Session()
+    # 重试由各客户端自行控制（LLM调用失败时降级或按退避重试），这里不重试
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=False, max_retries=0)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    获取进程内共享的HTTP会话（首次调用时创建）
+
+    requests.Session的连接池是线程安全的，可被多个LLM工作线程共用。
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session():
+    """关闭共享会话（释放所有长连接）"""
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def get_timeout() -> Tuple[float, float]:
+    """
+    获取LLM API调用超时
+
+    Returns:
+        (连接超时, 读取超时)，分别读取环境变量LLM_CONNECT_TIMEOUT、LLM_READ_TIMEOUT
+    """
+    return (
+        float(os.getenv('LLM_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)),
+        float(os.getenv('LLM_READ_TIMEOUT', DEFAULT_READ_TIMEOUT)),
+    )
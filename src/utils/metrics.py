@@ -0,0 +1,213 @@
+"""
+运行指标采集
+
+轻量级的阶段计时器、计数器和直方图，用于定位采集流程中的耗时热点。
+一次运行的指标可导出为结构化JSON运行报告，或Prometheus textfile格式。
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+
+# 直方图分桶（秒）
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class Histogram:
+    """固定分桶直方图"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        """记录一个观测值"""
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0,
+            'min': round(self.min, 6) if self.min is not None else None,
+            'max': round(self.max, 6) if self.max is not None else None,
+            'buckets': {str(b): c for b, c in zip(self.buckets, self.bucket_counts)},
+        }
+
+
+class RunMetrics:
+    """
+    单次运行的指标集合（线程安全）
+
+    用法：
+        metrics = RunMetrics(run_id)
+        with metrics.timer('llm'):
+            analyzer.analyze_article(...)
+        metrics.incr('stored')
+        metrics.write_json('data/run_reports/xxx.json')
+    """
+
+    def __init__(self, run_id: Optional[str] = None):
+        """
+        Args:
+            run_id: 运行ID（默认按当前时间生成）
+        """
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.started_at = datetime.now()
+        self.finished_at = None
+        self.counters: Dict[str, int] = {}
+        self.stages: Dict[str, Histogram] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self.sources = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, stage: str):
+        """
+        阶段计时上下文管理器（异常时同样计时）
+
+        Args:
+            stage: 阶段名称（如browser_launch/page_load/parse/llm/score/db_write）
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, time.perf_counter() - start)
+
+    def observe_stage(self, stage: str, seconds: float):
+        """记录一次阶段耗时"""
+        with self._lock:
+            if stage not in self.stages:
+                self.stages[stage] = Histogram()
+            self.stages[stage].observe(seconds)
+
+    def incr(self, name: str, value: int = 1):
+        """计数器累加"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float, buckets=DEFAULT_BUCKETS):
+        """记录一个任意直方图观测值"""
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(buckets)
+            self.histograms[name].observe(value)
+
+    def add_source(self, stats: Dict):
+        """记录单个源的统计结果"""
+        with self._lock:
+            self.sources.append(dict(stats))
+
+    def finish(self):
+        """标记运行结束"""
+        self.finished_at = datetime.now()
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at or datetime.now()
+        return (end - self.started_at).total_seconds()
+
+    def to_dict(self) -> Dict:
+        """导出为结构化运行报告"""
+        with self._lock:
+            return {
+                'run_id': self.run_id,
+                'started_at': self.started_at.isoformat(timespec='seconds'),
+                'finished_at': self.finished_at.isoformat(timespec='seconds') if self.finished_at else None,
+                'duration_seconds': round(self.duration, 3),
+                'counters': dict(self.counters),
+                'stages': {name: h.to_dict() for name, h in self.stages.items()},
+                'histograms': {name: h.to_dict() for name, h in self.histograms.items()},
+                'sources': list(self.sources),
+            }
+
+    def write_json(self, path: str) -> str:
+        """
+        写出JSON运行报告
+
+        Args:
+            path: 输出文件路径
+
+        Returns:
+            输出文件路径
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, json.dumps(self.to_dict(), ensure_ascii=False, indent=2, default=str))
+        return path
+
+    def to_prometheus(self, prefix: str = 'ci_collection') -> str:
+        """导出为Prometheus文本格式"""
+        lines = []
+        with self._lock:
+            lines.append(f'# HELP {prefix}_stage_seconds Time spent per collection stage')
+            lines.append(f'# TYPE {prefix}_stage_seconds histogram')
+            for stage, h in sorted(self.stages.items()):
+                for bound, count in zip(h.buckets, h.bucket_counts):
+                    lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'{prefix}_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {h.count}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                lines.append(f'{prefix}_{name}_total {value}')
+
+        lines.append(f'# TYPE {prefix}_last_run_duration_seconds gauge')
+        lines.append(f'{prefix}_last_run_duration_seconds {self.duration:.3f}')
+        lines.append(f'# TYPE {prefix}_last_run_timestamp_seconds gauge')
+        lines.append(f'{prefix}_last_run_timestamp_seconds {int(self.started_at.timestamp())}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str) -> str:
+        """
+        写出Prometheus textfile（原子替换，供node_exporter textfile collector读取）
+
+        Args:
+            path: 输出文件路径（通常以.prom结尾）
+
+        Returns:
+            输出文件路径
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write(path, self.to_prometheus())
+        return path
+
+
+class NullMetrics(RunMetrics):
+    """不记录任何内容的指标对象（未启用指标时使用）"""
+
+    def observe_stage(self, stage: str, seconds: float):
+        pass
+
+    def incr(self, name: str, value: int = 1):
+        pass
+
+    def observe(self, name: str, value: float, buckets=DEFAULT_BUCKETS):
+        pass
+
+    def add_source(self, stats: Dict):
+        pass
+
+
+def _atomic_write(path: str, text: str):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
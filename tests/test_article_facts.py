@@ -0,0 +1,173 @@
+"""
+数值事实提取与article_facts统计单元测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.processing.article_processor import ArticleProcessor
+from src.scoring.priority_scorer import USD_CNY_RATE, PriorityScorer
+from src.storage.database import Database
+
+
+TODAY = date(2025, 11, 14)  # 周五
+START = TODAY - timedelta(days=30)
+
+
+@pytest.fixture
+def scorer():
+    return PriorityScorer()
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    yield database
+    database.close()
+
+
+def _facts(scorer, text):
+    return {(f['type'], f['value']) for f in scorer.extract_facts('', text)}
+
+
+def _insert(db, scorer, i, days_ago, title, content='', source='中国IDC圈', regions=()):
+    return db.insert_article(
+        title=title, url=f'https://a.com/{i}', source=source, source_tier=1,
+        publish_date=TODAY - timedelta(days=days_ago), content=content,
+        facts=scorer.extract_facts(title, content),
+        entities=[{'name': region, 'type': 'region'} for region in regions],
+    )
+
+
+class TestExtractFacts:
+    """测试从文本提取数值事实"""
+
+    def test_investment_amounts(self, scorer):
+        facts = _facts(scorer, '总投资50亿元，其中1,200万元用于配套，另获5亿美元融资')
+        assert facts == {('investment', 50.0), ('investment', 0.12), ('investment', 5 * USD_CNY_RATE)}
+
+    def test_amount_without_currency_ignored(self, scorer):
+        assert _facts(scorer, '年用电量2亿度，服务10万用户') == set()
+
+    def test_racks(self, scorer):
+        facts = _facts(scorer, '规划3万机柜，一期5000个标准机柜，300架机柜')
+        assert facts == {('racks', 30000), ('racks', 5000), ('racks', 300)}
+
+    def test_power_normalized_to_mw(self, scorer):
+        facts = _facts(scorer, 'IT负载120MW，二期0.5GW，另有1.2万千瓦；年用电10MWh')
+        assert facts == {('power', 120), ('power', 500), ('power', 12)}
+
+    def test_pue(self, scorer):
+        facts = _facts(scorer, 'PUE降至1.15，设计PUE值低于1.2，PUE达到5.5')
+        assert facts == {('pue', 1.15), ('pue', 1.2)}
+
+    def test_duplicate_values_kept_once(self, scorer):
+        facts = scorer.extract_facts('投资50亿元', '该项目投资50亿元')
+        assert len(facts) == 1
+        assert facts[0] == {'type': 'investment', 'value': 50.0, 'unit': '亿元', 'text': '50亿元'}
+
+    def test_empty_text(self, scorer):
+        assert scorer.extract_facts(None, None) == []
+
+    @pytest.mark.parametrize('text', ['3000架机柜', '5000台机柜', '2000标准机柜', '1.2万标准机柜'])
+    def test_datacenter_score_unchanged_by_fact_extraction(self, scorer, text):
+        # 事实提取识别"架/台/标准机柜"，评分沿用原有规则，已有文章的评分不变
+        assert _facts(scorer, text)
+        assert scorer._extract_datacenter_score(text) == 0
+
+    def test_datacenter_score(self, scorer):
+        assert scorer._extract_datacenter_score('建设1.5万个机柜') == 20
+        assert scorer._extract_datacenter_score('建设6000个机柜') == 15
+        assert scorer._extract_datacenter_score('建设300机柜') == 10
+
+
+class TestFactStorage:
+    """测试事实入库与汇总查询"""
+
+    def test_insert_stores_facts(self, db, scorer):
+        article_id = _insert(db, scorer, 1, 0, '投资50亿元建设数据中心', 'PUE降至1.2')
+        facts = db.get_article_facts(article_id)
+        assert [(f['fact_type'], f['value'], f['unit']) for f in facts] == [
+            ('investment', 50.0, '亿元'), ('pue', 1.2, ''),
+        ]
+        publish_dates = db.conn.execute("SELECT DISTINCT publish_date FROM article_facts").fetchall()
+        assert [row[0] for row in publish_dates] == [TODAY.isoformat()]
+
+    def test_insert_articles_stores_facts(self, db, scorer):
+        db.insert_articles([
+            dict(title=f'项目{i}投资{i + 1}亿元', url=f'https://b.com/{i}', source='DCD',
+                 publish_date=TODAY, content='', facts=scorer.extract_facts(f'项目{i}投资{i + 1}亿元', ''))
+            for i in range(3)
+        ])
+        totals = db.get_investment_totals(START, TODAY, group_by='source')
+        assert totals == [{'source': 'DCD', 'article_count': 3, 'total_amount': 6.0, 'max_amount': 3.0}]
+
+    def test_investment_totals_by_week(self, db, scorer):
+        _insert(db, scorer, 1, 0, '投资50亿元，一期20亿元')   # 本周：每篇取最大金额
+        _insert(db, scorer, 2, 4, '投资10亿元')               # 周一，同一周
+        _insert(db, scorer, 3, 5, '投资3亿元')                # 上周日
+        _insert(db, scorer, 4, 60, '投资100亿元')             # 窗口外
+
+        totals = db.get_investment_totals(START, TODAY, group_by='week')
+        assert totals == [
+            {'week': '2025-11-03', 'article_count': 1, 'total_amount': 3.0, 'max_amount': 3.0},
+            {'week': '2025-11-10', 'article_count': 2, 'total_amount': 60.0, 'max_amount': 50.0},
+        ]
+
+    def test_investment_totals_by_region(self, db, scorer):
+        _insert(db, scorer, 1, 0, '投资50亿元', regions=['张家口', '京津冀'])
+        _insert(db, scorer, 2, 1, '投资10亿元', regions=['张家口'])
+        _insert(db, scorer, 3, 2, '投资5亿元')
+
+        totals = {row['region']: row['total_amount'] for row in
+                  db.get_investment_totals(START, TODAY, group_by='region')}
+        assert totals == {'张家口': 60.0, '京津冀': 50.0, '其他': 5.0}
+
+    def test_rejects_unknown_group(self, db):
+        with pytest.raises(ValueError):
+            db.get_investment_totals(START, TODAY, group_by='category')
+
+    def test_fact_stats(self, db, scorer):
+        _insert(db, scorer, 1, 0, 'PUE从1.5降至1.2', '3万机柜')
+        _insert(db, scorer, 2, 1, 'PUE 1.3', '5000个机柜')
+        stats = {row['fact_type']: row for row in db.get_fact_stats(START, TODAY)}
+        assert stats['pue']['article_count'] == 2
+        assert stats['pue']['min_value'] == 1.2          # 每篇文章取达到的（最低）PUE
+        assert stats['pue']['max_value'] == 1.3
+        assert stats['racks']['total'] == 35000
+        assert stats['racks']['unit'] == '个'
+
+    def test_save_replaces_facts(self, db, scorer):
+        article_id = _insert(db, scorer, 1, 0, '投资50亿元')
+        db.save_article_facts(article_id, scorer.extract_facts('投资8亿元', ''))
+        assert [f['value'] for f in db.get_article_facts(article_id)] == [8.0]
+
+    def test_clear_all_articles_clears_facts(self, db, scorer):
+        _insert(db, scorer, 1, 0, '投资50亿元')
+        db.clear_all_articles()
+        assert db.conn.execute("SELECT COUNT(*) FROM article_facts").fetchone()[0] == 0
+
+
+class TestProcessorRecord:
+    """测试处理器在入库记录中附带数值事实"""
+
+    ANALYSIS = {
+        'summary': '摘要', 'category': '投资',
+        'llm_result': {
+            'relevance_score': 18, 'importance_score': 12, 'category_score': 8,
+            'total_score': 30, 'category': '投资', 'reason': '',
+        },
+    }
+
+    def test_build_record_includes_facts(self, scorer):
+        processor = ArticleProcessor(scorer=scorer)
+        article = {'title': '投资50亿元建设3万机柜', 'url': 'https://a.com/1', 'content': ''}
+        record = processor.build_record(article, {'name': 'DCD', 'tier': 2}, self.ANALYSIS)
+        assert {(f['type'], f['value']) for f in record['facts']} == {('investment', 50.0), ('racks', 30000)}
+
+    def test_build_record_without_scorer(self):
+        processor = ArticleProcessor()
+        article = {'title': '投资50亿元', 'url': 'https://a.com/1', 'content': ''}
+        record = processor.build_record(article, {'name': 'DCD', 'tier': 2}, self.ANALYSIS)
+        assert 'facts' not in record
@@ -281,5 +281,80 @@ class TestCategoryClassifier:
             assert "市场" in categories, f"关键词 '{keyword}' 应识别为市场类"
 
 
+
+class TestClassifyMany:
+    """测试批量加权分类"""
+
+    @pytest.fixture
+    def classifier(self):
+        return CategoryClassifier()
+
+    def test_scores_count_occurrences_with_title_boost(self, classifier):
+        scores = classifier.classify_many([
+            {'title': '某公司完成C轮融资', 'content': '本轮融资由知名机构领投，融资将用于扩建'},
+        ])[0]
+        # 标题1次 × TITLE_BOOST + 正文2次
+        assert scores == {'投资': 1 * classifier.TITLE_BOOST + 2}
+
+    def test_generic_keywords_weighted_down(self, classifier):
+        scores = classifier.classify_many([{'title': '', 'content': '公司发布新品'}])[0]
+        assert scores == {'技术': 0.5 + 1.0}
+
+    def test_keyword_not_matched_across_title_and_body(self, classifier):
+        assert classifier.classify_many([{'title': '融', 'content': '资'}]) == [{}]
+
+    def test_batch_matches_single(self, classifier):
+        articles = [
+            {'title': '工信部印发绿色数据中心行动计划', 'content': '要求新建数据中心PUE低于1.3'},
+            {'title': '液冷技术突破', 'content': None, 'summary': '散热效率提升30%'},
+            {'title': '上海举办马拉松比赛'},
+        ]
+        batch = classifier.classify_many(articles)
+        assert batch == [classifier.classify_many([a])[0] for a in articles]
+        assert set(batch[1]) == {'技术'}
+        assert batch[2] == {}
+
+    def test_select_labels(self, classifier):
+        assert classifier.select_labels({}) == ['其他']
+        assert classifier.select_labels({'投资': 0.5}) == ['其他']
+        # 低于最高得分×LABEL_SHARE的类别不入选，结果按分类优先级排序
+        assert classifier.select_labels({'市场': 10.0, '投资': 5.0, '技术': 1.0}) == ['投资', '市场']
+
+    def test_processor_fallback_uses_classifier(self, classifier):
+        from src.processing.article_processor import ArticleProcessor
+        processor = ArticleProcessor(classifier=classifier)
+        article = {'title': '某公司完成10亿元融资', 'url': 'https://a.com/1', 'content': '投资机构领投'}
+        analysis = processor.analyze(article, {'route': None, 'llm_content': ''})
+        assert analysis['outcome'] == 'fallback'
+        assert analysis['category'] == '投资'
+        assert analysis['llm_result']['category'] == '投资'
+
+    def test_processor_fallback_on_default_llm_result(self, classifier):
+        from src.processing.article_processor import ArticleProcessor
+
+        class FailingAnalyzer:
+            """调用失败时与LLMArticleAnalyzer一样返回默认评分"""
+            def analyze_article(self, title, content):
+                return {'relevance_score': 10, 'importance_score': 10, 'category_score': 5,
+                        'total_score': 20, 'category': '其他', 'summary': title,
+                        'reason': 'LLM分析连接失败，使用默认评分', 'is_default': True}
+
+        processor = ArticleProcessor(llm_analyzer=FailingAnalyzer(), classifier=classifier)
+        article = {'title': '某公司完成10亿元融资', 'url': 'https://a.com/1', 'content': '投资机构领投'}
+        analysis = processor.analyze(article, {'route': None, 'llm_content': ''})
+        assert analysis['outcome'] == 'fallback'
+        assert analysis['category'] == ','.join(classifier.select_labels(
+            classifier.classify_many([{'title': article['title'], 'content': article['content']}])[0]
+        )) == '投资'
+        assert analysis['llm_error'] == 'LLM分析连接失败，使用默认评分'
+        assert analysis['journal'] is None and analysis['label'] is None
+
+    def test_processor_fallback_without_classifier(self):
+        from src.processing.article_processor import ArticleProcessor
+        article = {'title': '某公司完成10亿元融资', 'url': 'https://a.com/1'}
+        analysis = ArticleProcessor().analyze(article, {'route': None, 'llm_content': ''})
+        assert analysis['category'] == '其他'
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,131 @@
+"""
+正文压缩存储（article_content）单元测试
+"""
+
+import sqlite3
+import zlib
+from datetime import date
+
+import pytest
+
+from src.storage.content_codec import (
+    CODEC_RAW, CODEC_ZLIB, compress_content, decompress_content, get_default_codec,
+)
+from src.storage.database import Database
+from tests.test_migrations import V1_ARTICLES
+
+
+LONG_CONTENT = '某公司宣布在乌兰察布投资建设液冷智算中心，规划机柜5000个，PUE低于1.2。' * 20
+
+
+class TestContentCodec:
+    """测试正文编码"""
+
+    def test_zlib_roundtrip(self):
+        codec, blob = compress_content(LONG_CONTENT, CODEC_ZLIB)
+        assert codec == CODEC_ZLIB
+        assert len(blob) < len(LONG_CONTENT.encode('utf-8'))
+        assert decompress_content(codec, blob) == LONG_CONTENT
+
+    def test_short_text_stored_raw(self):
+        assert compress_content('短正文', CODEC_ZLIB) == (CODEC_RAW, '短正文'.encode('utf-8'))
+
+    def test_default_codec_from_env(self, monkeypatch):
+        monkeypatch.delenv('ARTICLE_CONTENT_CODEC', raising=False)
+        assert get_default_codec() == CODEC_ZLIB
+        monkeypatch.setenv('ARTICLE_CONTENT_CODEC', 'raw')
+        assert get_default_codec() == CODEC_RAW
+        monkeypatch.setenv('ARTICLE_CONTENT_CODEC', 'lz4')
+        assert get_default_codec() == CODEC_ZLIB
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            decompress_content('lz4', b'')
+
+
+class TestLazyContent:
+    """测试正文分离存储与按需加载"""
+
+    @pytest.fixture
+    def db(self):
+        database = Database(':memory:')
+        yield database
+        database.close()
+
+    def test_insert_article_stores_compressed_body(self, db):
+        article_id = db.insert_article(
+            title='液冷智算中心', url='https://a.com/1', source='源', publish_date=date.today(),
+            content=LONG_CONTENT,
+        )
+
+        row = db.conn.execute(
+            "SELECT codec, raw_size, body FROM article_content WHERE article_id = ?", (article_id,)
+        ).fetchone()
+        assert row['codec'] == CODEC_ZLIB
+        assert row['raw_size'] == len(LONG_CONTENT.encode('utf-8'))
+        assert zlib.decompress(row['body']).decode('utf-8') == LONG_CONTENT
+        assert db.conn.execute("SELECT content FROM articles").fetchone()[0] is None
+
+    def test_listing_queries_skip_body(self, db):
+        db.insert_article(title='液冷智算中心', url='https://a.com/1', source='源',
+                          publish_date=date.today(), content=LONG_CONTENT)
+
+        [article] = db.get_articles_for_weekly_report(7)
+        assert article['content'] is None
+        assert db.get_article_content(article['id']) == LONG_CONTENT
+        assert db.get_article_by_id(article['id'])['content'] == LONG_CONTENT
+        assert db.get_article_by_id(article['id'], with_content=False)['content'] is None
+
+    def test_insert_articles_batch_bodies(self, db):
+        articles = [
+            dict(title=f'文章{i}', url=f'https://a.com/{i}', source='源', publish_date=date.today(),
+                 content=f'正文{i}' + LONG_CONTENT)
+            for i in range(3)
+        ]
+        articles.append(dict(articles[0], content='重复URL的另一篇正文'))
+        assert db.insert_articles(articles) == 3
+
+        ids = [a['id'] for a in db.get_all_articles()]
+        contents = db.get_article_contents(ids)
+        assert sorted(c[:3] for c in contents.values()) == ['正文0', '正文1', '正文2']
+
+    def test_empty_content_not_stored(self, db):
+        article_id = db.insert_article(title='无正文', url='https://a.com/1', source='源',
+                                       publish_date=date.today(), content='')
+        assert db.get_article_content(article_id) is None
+        assert db.conn.execute("SELECT COUNT(*) FROM article_content").fetchone()[0] == 0
+
+    def test_training_data_falls_back_to_body(self, db):
+        db.insert_article(title='无摘要', url='https://a.com/1', source='源', publish_date=date.today(),
+                          content=LONG_CONTENT, llm_relevance_score=15, llm_reason='相关')
+        db.insert_article(title='有摘要', url='https://a.com/2', source='源', publish_date=date.today(),
+                          content=LONG_CONTENT, summary='摘要', llm_relevance_score=12, llm_reason='相关')
+
+        records = {r['title']: r for r in db.get_relevance_training_data()}
+        assert records['无摘要']['content'] == LONG_CONTENT
+        assert records['有摘要']['content'] == '摘要'
+
+    def test_clear_all_articles_clears_bodies(self, db):
+        db.insert_article(title='文章', url='https://a.com/1', source='源', publish_date=date.today(),
+                          content=LONG_CONTENT)
+        db.clear_all_articles()
+        assert db.conn.execute("SELECT COUNT(*) FROM article_content").fetchone()[0] == 0
+
+
+def test_legacy_bodies_migrated(tmp_path):
+    """v4迁移把articles.content移到article_content"""
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.execute(V1_ARTICLES)
+    conn.executemany(
+        "INSERT INTO articles (title, url, url_hash, source, publish_date, content) VALUES (?, ?, ?, ?, ?, ?)",
+        [('长文', 'https://a.com/1', 'h1', '源', '2025-11-01', LONG_CONTENT),
+         ('短文', 'https://a.com/2', 'h2', '源', '2025-11-02', '短正文'),
+         ('无正文', 'https://a.com/3', 'h3', '源', '2025-11-03', None)],
+    )
+    conn.commit()
+    conn.close()
+
+    with Database(path) as db:
+        assert db.conn.execute("SELECT COUNT(*) FROM articles WHERE content IS NOT NULL").fetchone()[0] == 0
+        assert db.get_article_contents([1, 2, 3]) == {1: LONG_CONTENT, 2: '短正文'}
@@ -183,6 +183,42 @@ class TestArticleInsertion:
         collected_at = datetime.fromisoformat(article["collected_at"])
         assert collected_at.date() == date.today()
 
+    def test_insert_articles_bulk(self, db):
+        """测试批量插入（重复URL跳过，返回实际插入数）"""
+        db.insert_article(
+            title="已存在",
+            url="https://example.com/bulk-0",
+            source="测试媒体",
+            publish_date=date.today(),
+            content="内容",
+        )
+
+        articles = [
+            {
+                "title": f"批量文章{i}",
+                "url": f"https://example.com/bulk-{i}",
+                "source": "测试媒体",
+                "publish_date": date.today(),
+                "content": "内容",
+                "summary": "摘要" if i % 2 else None,
+                "score": i,
+            }
+            for i in range(5)
+        ]
+
+        inserted = db.insert_articles(articles)
+
+        assert inserted == 4
+        assert len(db.get_all_articles()) == 5
+        by_url = {a["url"]: a for a in db.get_all_articles()}
+        assert by_url["https://example.com/bulk-0"]["title"] == "已存在"
+        assert by_url["https://example.com/bulk-3"]["summary_generated"] == 1
+        assert by_url["https://example.com/bulk-4"]["summary_generated"] == 0
+
+    def test_insert_articles_empty(self, db):
+        """测试批量插入空列表"""
+        assert db.insert_articles([]) == 0
+
 
 class TestArticleRetrieval:
     """测试文章查询"""
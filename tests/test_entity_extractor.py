@@ -0,0 +1,207 @@
+"""
+实体抽取与article_entities索引单元测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.processing.article_processor import ArticleProcessor
+from src.processing.entity_extractor import EntityExtractor, reindex_entities
+from src.processing.keyword_trie import KeywordTrie
+from src.storage.database import Database
+
+
+ENTITIES = {
+    'companies': [
+        {'name': '万国数据', 'aliases': ['GDS']},
+        {'name': '世纪互联', 'aliases': ['VNET', '21Vianet']},
+        {'name': '万国', 'aliases': []},
+    ],
+    'regions': [
+        {'name': '张家口', 'aliases': []},
+    ],
+}
+
+
+@pytest.fixture
+def extractor():
+    return EntityExtractor(ENTITIES)
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    yield database
+    database.close()
+
+
+def _insert(db, i, days_ago, title, content='正文', entities=None):
+    return db.insert_article(
+        title=title, url=f'https://a.com/{i}', source='中国IDC圈', source_tier=1,
+        publish_date=date.today() - timedelta(days=days_ago), content=content,
+        category='投资', score=50, entities=entities,
+    )
+
+
+class TestKeywordTrie:
+    """测试关键词字典树"""
+
+    def test_longest_match_wins(self):
+        trie = KeywordTrie(['万国', '万国数据'])
+        assert trie.findall('万国数据中心与万国') == ['万国数据', '万国']
+
+    def test_case_insensitive_with_value(self):
+        trie = KeywordTrie()
+        trie.add('GDS', '万国数据')
+        assert trie.findall('gds和GDS') == ['万国数据', '万国数据']
+        assert trie.get('gds') == '万国数据'
+        assert 'Gds' in trie
+
+    def test_ascii_word_boundary(self):
+        trie = KeywordTrie(['GDS', 'AWS'])
+        assert trie.findall('GDSX and XAWS') == []
+        assert trie.findall('与GDS合作') == ['GDS']
+
+    def test_letter_and_digit_boundaries(self):
+        trie = KeywordTrie(['GPU', '5G', 'PUE', 'AI算力'])
+        assert trie.findall('H100GPU与15G') == ['GPU']
+        assert trie.findall('PUE1.2，5G网络') == ['PUE', '5G']
+        assert trie.findall('OPENAI算力与AI算力') == ['AI算力']
+
+    def test_words_added_after_scan(self):
+        trie = KeywordTrie(['液冷'])
+        assert trie.findall('液冷机柜') == ['液冷']
+        trie.add('机柜')
+        assert trie.findall('液冷机柜') == ['液冷', '机柜']
+
+    def test_count(self):
+        trie = KeywordTrie(['液冷', '算力'])
+        assert trie.count('液冷算力液冷') == {'液冷': 2, '算力': 1}
+        assert len(trie) == 2
+
+
+class TestEntityExtractor:
+    """测试实体抽取"""
+
+    def test_aliases_map_to_canonical_name(self, extractor):
+        entities = extractor.extract('GDS在张家口扩建', '万国数据宣布……VNET同日发布财报')
+        by_name = {e['name']: e for e in entities}
+        assert set(by_name) == {'万国数据', '张家口', '世纪互联'}
+        assert by_name['万国数据']['mentions'] == 2
+        assert by_name['万国数据']['in_title'] is True
+        assert by_name['张家口']['type'] == 'region'
+        assert by_name['世纪互联']['in_title'] is False
+
+    def test_title_entities_first(self, extractor):
+        entities = extractor.extract('世纪互联发布财报', '万国数据 万国数据 万国数据')
+        assert [e['name'] for e in entities] == ['世纪互联', '万国数据']
+
+    def test_llm_names_only_kept_when_in_text(self, extractor):
+        entities = extractor.extract(
+            '某某科技投资数据中心', '正文', ['某某科技', '不存在的公司', 'GDS', 123]
+        )
+        assert [(e['name'], e['source']) for e in entities] == [('某某科技', 'llm')]
+
+    def test_llm_fill_disabled(self):
+        extractor = EntityExtractor(ENTITIES, llm_fill=False)
+        assert extractor.extract('某某科技投资', '', ['某某科技']) == []
+
+    def test_empty_text(self, extractor):
+        assert extractor.extract(None, None) == []
+
+    def test_default_dictionary_loads(self):
+        extractor = EntityExtractor.from_file()
+        assert len(extractor) > 0
+        assert extractor.canonical('gds') == '万国数据'
+
+
+class TestEntityStorage:
+    """测试实体关联入库与查询"""
+
+    def test_insert_article_stores_entities(self, db, extractor):
+        article_id = _insert(db, 1, 0, 'GDS在张家口扩建',
+                             entities=extractor.extract('GDS在张家口扩建', '万国数据'))
+        rows = db.conn.execute(
+            "SELECT entity, mentions, in_title, publish_date FROM article_entities WHERE article_id = ?",
+            (article_id,),
+        ).fetchall()
+        assert {row['entity']: row['mentions'] for row in rows} == {'万国数据': 2, '张家口': 1}
+        assert all(row['publish_date'] == date.today().isoformat() for row in rows)
+
+    def test_insert_articles_stores_entities(self, db, extractor):
+        db.insert_articles([
+            dict(title=f'世纪互联动态{i}', url=f'https://b.com/{i}', source='DCD',
+                 publish_date=date.today(), content='', entities=extractor.extract(f'世纪互联动态{i}'))
+            for i in range(3)
+        ])
+        assert len(db.articles_for_entity('世纪互联')) == 3
+
+    def test_articles_for_entity_timeline(self, db, extractor):
+        for i, days_ago in enumerate([0, 5, 40]):
+            title = f'万国数据新闻{i}'
+            _insert(db, i, days_ago, title, entities=extractor.extract(title))
+        _insert(db, 9, 1, '无关新闻', entities=[])
+
+        timeline = db.articles_for_entity('万国数据')
+        assert [a['title'] for a in timeline] == ['万国数据新闻0', '万国数据新闻1', '万国数据新闻2']
+        assert isinstance(timeline[0]['publish_date'], date)
+        assert timeline[0]['in_title'] == 1
+        assert len(db.articles_for_entity('万国数据', days=30)) == 2
+        assert len(db.articles_for_entity('万国数据', limit=1)) == 1
+
+    def test_save_replaces_entities(self, db, extractor):
+        article_id = _insert(db, 1, 0, 'GDS扩建', entities=extractor.extract('GDS扩建'))
+        db.save_article_entities(article_id, extractor.extract('世纪互联扩建'))
+        assert db.articles_for_entity('万国数据') == []
+        assert len(db.articles_for_entity('世纪互联')) == 1
+
+    def test_entity_counts(self, db, extractor):
+        _insert(db, 1, 0, 'GDS扩建', entities=extractor.extract('GDS扩建'))
+        _insert(db, 2, 1, '张家口项目', content='万国数据',
+                entities=extractor.extract('张家口项目', '万国数据'))
+        _insert(db, 3, 60, '万国数据旧闻', entities=extractor.extract('万国数据旧闻'))
+
+        counts = db.get_entity_counts(days=30)
+        assert counts[0]['entity'] == '万国数据'
+        assert counts[0]['article_count'] == 2
+        assert counts[0]['title_count'] == 1
+        assert [row['entity'] for row in db.get_entity_counts(entity_type='region')] == ['张家口']
+
+    def test_clear_all_articles_clears_entities(self, db, extractor):
+        _insert(db, 1, 0, 'GDS扩建', entities=extractor.extract('GDS扩建'))
+        db.clear_all_articles()
+        assert db.conn.execute("SELECT COUNT(*) FROM article_entities").fetchone()[0] == 0
+
+    def test_reindex_existing_articles(self, db, extractor):
+        _insert(db, 1, 0, '扩建项目', content='世纪互联在张家口')
+        _insert(db, 2, 1, 'GDS扩建')
+        totals = reindex_entities(db, extractor, batch_size=1)
+        assert totals == {'articles': 2, 'entities': 3}
+        assert len(db.articles_for_entity('张家口')) == 1
+        assert len(db.articles_for_entity('万国数据')) == 1
+
+
+class TestProcessorRecord:
+    """测试处理器在入库记录中附带实体"""
+
+    def _analysis(self, companies):
+        return {
+            'summary': '摘要', 'category': '投资',
+            'llm_result': {
+                'relevance_score': 18, 'importance_score': 12, 'category_score': 8,
+                'total_score': 30, 'category': '投资', 'reason': '', 'companies': companies,
+            },
+        }
+
+    def test_build_record_includes_entities(self, extractor):
+        processor = ArticleProcessor(entity_extractor=extractor)
+        article = {'title': 'GDS与某某科技合作', 'url': 'https://a.com/1', 'content': '张家口项目'}
+        record = processor.build_record(article, {'name': 'DCD', 'tier': 2}, self._analysis(['某某科技']))
+        assert [e['name'] for e in record['entities']] == ['万国数据', '某某科技', '张家口']
+
+    def test_build_record_without_extractor(self):
+        processor = ArticleProcessor()
+        article = {'title': 'GDS扩建', 'url': 'https://a.com/1', 'content': ''}
+        record = processor.build_record(article, {'name': 'DCD', 'tier': 2}, self._analysis([]))
+        assert 'entities' not in record
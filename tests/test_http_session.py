@@ -0,0 +1,61 @@
+"""
+LLM共享HTTP会话单元测试
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_llm_server import StubLLMServer
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.reporting.report_summarizer import WeeklyReportSummarizer
+from src.utils import http_session
+from src.utils.http_session import create_session, get_session, get_timeout
+
+
+class TestHTTPSession:
+    """测试连接池化的HTTP会话"""
+
+    def test_shared_across_clients(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test')
+        summarizer = WeeklyReportSummarizer(api_key='key', api_base='http://test')
+
+        assert analyzer.session is get_session()
+        assert summarizer.session is analyzer.session
+
+    def test_pool_size_from_env(self, monkeypatch):
+        monkeypatch.setenv('LLM_HTTP_POOL_SIZE', '16')
+        session = create_session()
+
+        assert session.get_adapter('https://api.example.com')._pool_maxsize == 16
+        assert 'gzip' in session.headers['Accept-Encoding']
+
+    def test_split_timeouts(self, monkeypatch):
+        assert get_timeout() == (5.0, 30.0)
+
+        monkeypatch.setenv('LLM_CONNECT_TIMEOUT', '2')
+        monkeypatch.setenv('LLM_READ_TIMEOUT', '60')
+        assert get_timeout() == (2.0, 60.0)
+
+    def test_close_session_recreates(self):
+        session = get_session()
+        http_session.close_session()
+        assert get_session() is not session
+
+    def test_connections_are_reused(self):
+        with StubLLMServer() as server:
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub')
+            for i in range(5):
+                analyzer.analyze_article(f'数据中心新闻{i}', '内容')
+            stats = server.config.stats()
+
+        assert stats['requests'] == 5
+        assert stats['connections'] == 1
+
+    def test_concurrent_calls_bounded_by_pool(self):
+        with StubLLMServer(latency_ms=20) as server:
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub')
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda i: analyzer.analyze_article(f'标题{i}', '内容'), range(20)))
+            stats = server.config.stats()
+
+        assert stats['requests'] == 20
+        assert stats['connections'] <= 4
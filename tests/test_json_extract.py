@@ -0,0 +1,229 @@
+"""
+LLM返回JSON容错提取与缺失字段追问单元测试
+"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+from src.processing.json_extract import (
+    build_reask_prompt,
+    extract_json_object,
+    json_mode_unsupported,
+    missing_fields,
+    post_with_json_mode_fallback,
+    repair_json,
+)
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.reporting.report_summarizer import WeeklyReportSummarizer
+
+
+FULL = {
+    'relevance_score': 18, 'importance_score': 16, 'category_score': 9,
+    'category': '投资', 'reason': '涉及数据中心投资',
+    'summary': '某公司宣布投资50亿元建设数据中心，规划机柜1万个，采用液冷技术降低PUE。',
+}
+
+
+class TestExtractJsonObject:
+    """测试JSON容错提取"""
+
+    def test_plain_json(self):
+        assert extract_json_object(json.dumps(FULL)) == FULL
+
+    def test_markdown_fence_and_prose(self):
+        text = f'好的，分析结果如下：\n```json\n{json.dumps(FULL, ensure_ascii=False)}\n```\n希望有帮助。'
+        assert extract_json_object(text) == FULL
+
+    def test_trailing_comma(self):
+        assert extract_json_object('{"a": 1, "b": [1, 2,],}') == {'a': 1, 'b': [1, 2]}
+
+    def test_single_quotes_and_fullwidth_colon(self):
+        assert extract_json_object("{'a': 'x', \"b\"：2}") == {'a': 'x', 'b': 2}
+
+    def test_braces_inside_strings(self):
+        assert extract_json_object('{"s": "含}括号{", "n": 3}') == {'s': '含}括号{', 'n': 3}
+
+    def test_truncated_keeps_complete_members(self):
+        text = '{"relevance_score": 15, "importance_score": 12, "summary": "某公司宣布投'
+        assert extract_json_object(text) == {'relevance_score': 15, 'importance_score': 12}
+
+    def test_truncated_number_is_dropped(self):
+        # 截断在数字中间时无法判断数字是否完整
+        assert extract_json_object('{"relevance_score": 1') is None
+
+    def test_skips_non_object_braces(self):
+        assert extract_json_object('示例{无效} 结果：{"a": 1}') == {'a': 1}
+
+    def test_no_json(self):
+        assert extract_json_object('这不是JSON格式') is None
+        assert extract_json_object('') is None
+
+    def test_repair_leaves_valid_json(self):
+        text = json.dumps(FULL, ensure_ascii=False)
+        assert json.loads(repair_json(text)) == FULL
+
+    def test_missing_fields(self):
+        assert missing_fields({'a': 1, 'b': ''}, ('a', 'b', 'c')) == ['b', 'c']
+        assert missing_fields(None, ('a',)) == ['a']
+
+    def test_reask_prompt_keeps_prefix(self):
+        prompt = build_reask_prompt('原始Prompt', ['summary', 'category'])
+        assert prompt.startswith('原始Prompt')
+        assert 'summary, category' in prompt
+
+
+class TestAnalyzerReask:
+    """测试分析器只追问缺失字段"""
+
+    def _analyzer(self):
+        return LLMArticleAnalyzer('key', 'http://test', json_mode=False)
+
+    def test_missing_fields_are_reasked(self):
+        analyzer = self._analyzer()
+        partial = {k: FULL[k] for k in ('relevance_score', 'importance_score', 'category_score')}
+        followup = {'category': '投资', 'summary': FULL['summary']}
+
+        with patch.object(analyzer, '_call_llm_api',
+                          side_effect=[json.dumps(partial), json.dumps(followup)]) as mock_call:
+            result = analyzer.analyze_article('某公司投资数据中心', '内容')
+
+        assert mock_call.call_count == 2
+        reask_prompt = mock_call.call_args_list[1][0][0]
+        assert 'category, summary' in reask_prompt
+        assert mock_call.call_args_list[1][1]['max_tokens'] < 500
+        assert result['summary'] == FULL['summary']
+        assert result['category'] == '投资'
+        assert 'is_default' not in result
+
+    def test_complete_response_not_reasked(self):
+        analyzer = self._analyzer()
+        with patch.object(analyzer, '_call_llm_api', return_value=json.dumps(FULL)) as mock_call:
+            analyzer.analyze_article('某公司投资数据中心', '内容')
+        assert mock_call.call_count == 1
+
+    def test_low_relevance_not_reasked(self):
+        analyzer = self._analyzer()
+        with patch.object(analyzer, '_call_llm_api', return_value='{"relevance_score": 3}') as mock_call:
+            result = analyzer.analyze_article('某地举办马拉松比赛', '内容')
+        assert mock_call.call_count == 1
+        assert result['relevance_score'] == 3
+
+    def test_truncated_response_recovered(self):
+        analyzer = self._analyzer()
+        text = json.dumps(FULL, ensure_ascii=False)[:-20]
+        followup = {'summary': FULL['summary']}
+
+        with patch.object(analyzer, '_call_llm_api', side_effect=[text, json.dumps(followup)]):
+            result = analyzer.analyze_article('某公司投资数据中心', '内容')
+
+        assert result['relevance_score'] == 18
+        assert result['summary'] == FULL['summary']
+
+
+def _response(status, body=None):
+    response = MagicMock()
+    response.status_code = status
+    response.text = json.dumps(body or {})
+    response.json.return_value = body
+    return response
+
+
+class TestJsonMode:
+    """测试response_format JSON模式及不支持时的降级"""
+
+    OK = {'choices': [{'message': {'content': json.dumps(FULL)}}]}
+
+    def test_json_mode_requested(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', json_mode=True)
+        with patch.object(analyzer.session, 'post', return_value=_response(200, self.OK)) as post:
+            analyzer.analyze_article('某公司投资数据中心', '内容')
+
+        assert post.call_args[1]['json']['response_format'] == {'type': 'json_object'}
+
+    def test_unsupported_json_mode_disabled(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', json_mode=True)
+        responses = [_response(400, {'error': 'response_format not supported'}), _response(200, self.OK)]
+
+        with patch.object(analyzer.session, 'post', side_effect=responses) as post:
+            result = analyzer.analyze_article('某公司投资数据中心', '内容')
+
+        assert result['relevance_score'] == 18
+        assert 'response_format' not in post.call_args_list[1][1]['json']
+        assert analyzer.json_mode is False
+
+    def test_unrelated_bad_request_keeps_json_mode(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', json_mode=True)
+        error = {'error': {'message': "This model's maximum context length is 8192 tokens"}}
+        responses = [_response(400, error), _response(200, self.OK), _response(200, self.OK)]
+
+        with patch.object(analyzer.session, 'post', side_effect=responses) as post:
+            result = analyzer.analyze_article('某公司投资数据中心', '内容')
+            analyzer.analyze_article('某公司投资数据中心', '内容')
+
+        assert result['relevance_score'] == 18
+        assert 'response_format' not in post.call_args_list[1][1]['json']
+        assert analyzer.json_mode is True
+        assert post.call_args_list[2][1]['json']['response_format'] == {'type': 'json_object'}
+
+    def test_summarizer_unrelated_bad_request_keeps_json_mode(self):
+        summarizer = WeeklyReportSummarizer(api_key='key')
+        summarizer.json_mode = True
+        ok = {'choices': [{'message': {'content': '{}'}}]}
+        responses = [_response(422, {'error': 'unknown model: stub'}), _response(200, ok)]
+
+        with patch.object(summarizer.session, 'post', side_effect=responses) as post:
+            summarizer._call_llm_api('prompt')
+
+        assert 'response_format' not in post.call_args_list[1][1]['json']
+        assert summarizer.json_mode is True
+
+    def test_json_mode_error_detection(self):
+        assert json_mode_unsupported('{"error": "response_format is not supported"}')
+        assert json_mode_unsupported('Invalid value: JSON_OBJECT')
+        assert not json_mode_unsupported('context length exceeded')
+        assert not json_mode_unsupported(None)
+
+    def test_fallback_helper(self):
+        session = MagicMock()
+        session.post.side_effect = [_response(400, {'error': 'response_format is not supported'}),
+                                    _response(200, self.OK)]
+        payload = {'model': 'm', 'response_format': {'type': 'json_object'}}
+
+        response, supported = post_with_json_mode_fallback(session, 'http://test', payload, timeout=5)
+
+        assert response.status_code == 200 and supported is False
+        assert 'response_format' in payload  # 调用方的请求体不被修改
+        assert session.post.call_args_list[1][1] == {'json': {'model': 'm'}, 'timeout': 5}
+
+        # 没有请求JSON模式时不重试
+        session.post.side_effect = [_response(400)]
+        response, supported = post_with_json_mode_fallback(session, 'http://test', {'model': 'm'})
+        assert response.status_code == 400 and supported is True
+
+    def test_json_mode_from_env(self, monkeypatch):
+        monkeypatch.setenv('LLM_JSON_MODE', 'false')
+        assert LLMArticleAnalyzer('key', 'http://test').json_mode is False
+        assert WeeklyReportSummarizer(api_key='key').json_mode is False
+
+
+class TestSummarizerParse:
+    """测试周报洞察解析"""
+
+    def test_prose_wrapped_json(self):
+        summarizer = WeeklyReportSummarizer(api_key='key')
+        text = '以下是结果：{"executive_summary": "本周IDC行业投资活跃", "section_insights": {"投资动态": "资金集中"},}'
+        insights = summarizer._parse_response(text)
+
+        assert insights['executive_summary'] == '本周IDC行业投资活跃'
+        assert insights['section_insights'] == {'投资动态': '资金集中'}
+
+    def test_missing_summary_reasked(self):
+        summarizer = WeeklyReportSummarizer(api_key='key')
+        with patch.object(summarizer, '_call_llm_api',
+                          return_value='{"executive_summary": "本周算力投资加速"}') as mock_call:
+            insights = summarizer._parse_response('{"section_insights": {"投资动态": "资金集中"}}',
+                                                  prompt='原始Prompt')
+
+        assert mock_call.call_count == 1
+        assert insights['executive_summary'] == '本周算力投资加速'
+        assert insights['section_insights'] == {'投资动态': '资金集中'}
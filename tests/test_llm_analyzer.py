@@ -210,5 +210,79 @@ class TestLLMArticleAnalyzer(unittest.TestCase):
             self.assertGreaterEqual(len(categories), 2)
 
 
+class TestLLMCascade(unittest.TestCase):
+    """级联模式测试类"""
+
+    FULL_RESPONSE = json.dumps({
+        "relevance_score": 18,
+        "importance_score": 16,
+        "category_score": 9,
+        "category": "投资",
+        "reason": "涉及数据中心投资",
+        "summary": "某公司宣布投资50亿元建设数据中心，规划机柜1万个，采用液冷技术降低PUE。"
+    })
+
+    def _analyzer(self):
+        from src.processing.llm_analyzer import LLMArticleAnalyzer
+        return LLMArticleAnalyzer("test_key", "http://test.api", "big-model",
+                                  cascade=True, triage_model="small-model")
+
+    def test_triage_rejects_without_full_analysis(self):
+        """测试初筛拒绝的文章只调用一次小模型"""
+        analyzer = self._analyzer()
+
+        with patch.object(analyzer, '_call_llm_api', return_value='{"relevance_score": 3}') as mock_call:
+            result = analyzer.analyze_article("某白酒品牌发布新品", "内容")
+
+        self.assertEqual(mock_call.call_count, 1)
+        self.assertEqual(mock_call.call_args[1]['model'], "small-model")
+        self.assertLessEqual(mock_call.call_args[1]['max_tokens'], 50)
+        self.assertEqual(result['relevance_score'], 3)
+        self.assertEqual(result['cascade_stage'], 'triage')
+
+    def test_triage_pass_escalates_to_full_model(self):
+        """测试初筛通过的文章进行完整分析"""
+        analyzer = self._analyzer()
+
+        with patch.object(analyzer, '_call_llm_api',
+                          side_effect=['{"relevance_score": 17}', self.FULL_RESPONSE]) as mock_call:
+            result = analyzer.analyze_article("某公司投资50亿建设数据中心", "内容")
+
+        self.assertEqual(mock_call.call_count, 2)
+        self.assertIsNone(mock_call.call_args_list[1][1].get('model'))
+        self.assertEqual(result['importance_score'], 16)
+        self.assertNotIn('cascade_stage', result)
+
+    def test_triage_failure_falls_back_to_full_analysis(self):
+        """测试初筛失败时直接进行完整分析"""
+        analyzer = self._analyzer()
+
+        with patch.object(analyzer, '_call_llm_api',
+                          side_effect=[Exception("timeout"), self.FULL_RESPONSE]):
+            result = analyzer.analyze_article("某公司投资50亿建设数据中心", "内容")
+
+        self.assertEqual(result['relevance_score'], 18)
+
+    def test_cascade_configured_from_env(self):
+        """测试通过环境变量启用级联模式"""
+        from src.processing.llm_analyzer import LLMArticleAnalyzer
+
+        with patch.dict('os.environ', {'LLM_CASCADE_ENABLED': 'true', 'LLM_TRIAGE_MODEL': 'flash'}):
+            analyzer = LLMArticleAnalyzer("k", "http://test.api", "big-model")
+
+        self.assertTrue(analyzer.cascade)
+        self.assertEqual(analyzer.triage_model, "flash")
+
+    def test_cascade_disabled_by_default(self):
+        """测试默认不启用级联模式"""
+        from src.processing.llm_analyzer import LLMArticleAnalyzer
+
+        with patch.dict('os.environ', {}, clear=True):
+            analyzer = LLMArticleAnalyzer("k", "http://test.api", "big-model")
+
+        self.assertFalse(analyzer.cascade)
+        self.assertEqual(analyzer.triage_model, "big-model")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+"""
+LLM流式输出与提前终止单元测试
+"""
+
+import json
+import time
+from unittest.mock import MagicMock
+
+from benchmarks.stub_llm_server import StubLLMServer
+from src.processing.article_processor import ArticleProcessor
+from src.processing.json_extract import complete_number_field
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.utils.metrics import RunMetrics
+
+
+def sse_response(text, chunk_size=4):
+    lines = []
+    for i in range(0, len(text), chunk_size):
+        lines.append('data: ' + json.dumps({'choices': [{'delta': {'content': text[i:i + chunk_size]}}]}))
+        lines.append('')
+    lines.append('data: [DONE]')
+    response = MagicMock()
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+def split_by_relevance(server_url, n=40):
+    """用非流式调用找出桩服务判为相关/不相关的标题"""
+    analyzer = LLMArticleAnalyzer('key', server_url, 'stub', streaming=False, json_mode=False)
+    relevant, irrelevant = [], []
+    for i in range(n):
+        title = f'数据中心新闻{i}'
+        score = analyzer.analyze_article(title, '内容')['relevance_score']
+        (relevant if score >= 8 else irrelevant).append(title)
+    return relevant, irrelevant
+
+
+class TestCompleteNumberField:
+    """测试流式文本中的数值字段读取"""
+
+    def test_waits_for_delimiter(self):
+        assert complete_number_field('{"relevance_score": 1', 'relevance_score') is None
+        assert complete_number_field('{"relevance_score": 15,', 'relevance_score') == 15
+        assert complete_number_field('{"relevance_score": 3}', 'relevance_score') == 3
+        assert complete_number_field('{"relevance_score": 3\n', 'relevance_score') == 3
+
+    def test_missing_field(self):
+        assert complete_number_field('{"importance_score": 3,', 'relevance_score') is None
+
+
+class TestReadStream:
+    """测试SSE解析"""
+
+    def test_reads_all_chunks(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', streaming=True)
+        response = sse_response('{"relevance_score": 18, "summary": "中文摘要"}')
+
+        text, usage = analyzer._read_stream(response)
+
+        assert json.loads(text) == {'relevance_score': 18, 'summary': '中文摘要'}
+        assert usage == {}
+        assert response.encoding == 'utf-8'
+        response.close.assert_called_once()
+
+    def test_stop_when_closes_early(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', streaming=True)
+        full = '{"relevance_score": 3, "importance_score": 5, "summary": "很长的摘要内容"}'
+        response = sse_response(full)
+
+        text, _ = analyzer._read_stream(
+            response, stop_when=lambda t: complete_number_field(t, 'relevance_score') is not None
+        )
+
+        assert len(text) < len(full)
+        response.close.assert_called_once()
+
+
+class TestStreamingAnalyzer:
+    """测试流式分析（桩服务）"""
+
+    def test_relevant_article_same_as_non_streaming(self):
+        with StubLLMServer() as server:
+            relevant, _ = split_by_relevance(server.url)
+            plain = LLMArticleAnalyzer('key', server.url, 'stub', streaming=False)
+            streaming = LLMArticleAnalyzer('key', server.url, 'stub', streaming=True)
+            expected = plain.analyze_article(relevant[0], '内容')
+            result = streaming.analyze_article(relevant[0], '内容')
+
+        assert result == expected
+        assert 'stream_aborted' not in result
+
+    def test_irrelevant_article_aborted(self):
+        with StubLLMServer(chunk_delay_ms=20) as server:
+            _, irrelevant = split_by_relevance(server.url)
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub', streaming=True)
+
+            start = time.perf_counter()
+            result = analyzer.analyze_article(irrelevant[0], '内容')
+            elapsed = time.perf_counter() - start
+
+            # 提前断开后连接池仍可继续使用
+            analyzer.analyze_article(irrelevant[0], '内容')
+
+        assert result['relevance_score'] < 8
+        assert result['stream_aborted'] is True
+        assert '提前终止' in result['reason']
+        # 完整回复约30个分块（约0.6秒），相关性字段在前3个分块内输出
+        assert elapsed < 0.3
+        assert analyzer.token_usage.to_dict()['completion_tokens'] < 30
+
+    def test_abort_on_newline_terminated_score(self, monkeypatch):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', streaming=True)
+        truncated = '{\n "relevance_score": 5\n'
+
+        def fake_call(prompt, saved_tokens=0, stop_when=None, **kwargs):
+            assert stop_when(truncated) is True
+            return truncated
+
+        monkeypatch.setattr(analyzer, '_call_llm_api', fake_call)
+        result = analyzer.analyze_article('某地举办马拉松比赛', '内容')
+
+        assert result['relevance_score'] == 5
+        assert result['total_score'] == 5
+        assert result['stream_aborted'] is True
+        assert 'is_default' not in result
+
+        processor = ArticleProcessor(llm_analyzer=analyzer)
+        article = {'title': '某地举办马拉松比赛', 'url': 'https://example.com/1'}
+        assert processor.analyze(article, processor.prefilter(article))['outcome'] == 'llm_rejected'
+
+    def test_aborted_counted_in_metrics(self):
+        analyzer = MagicMock()
+        analyzer.analyze_article.return_value = {
+            'relevance_score': 3, 'importance_score': 10, 'category_score': 5, 'total_score': 13,
+            'category': '其他', 'reason': '相关性3分，提前终止输出', 'summary': '标题',
+            'stream_aborted': True,
+        }
+        metrics = RunMetrics('run1')
+        processor = ArticleProcessor(llm_analyzer=analyzer, metrics=metrics)
+        article = {'title': '某地举办马拉松比赛', 'url': 'https://example.com/1'}
+
+        analysis = processor.analyze(article, processor.prefilter(article))
+
+        assert analysis['outcome'] == 'llm_rejected'
+        assert metrics.to_dict()['counters']['llm_stream_aborted'] == 1
@@ -0,0 +1,121 @@
+"""
+运行指标单元测试
+"""
+
+import json
+import pytest
+
+from src.storage.database import Database
+from src.utils.metrics import Histogram, NullMetrics, RunMetrics
+
+
+class TestHistogram:
+    """测试直方图"""
+
+    def test_observe_updates_buckets(self):
+        h = Histogram(buckets=(0.1, 1, 10))
+        for value in (0.05, 0.5, 5, 50):
+            h.observe(value)
+
+        data = h.to_dict()
+        assert data['count'] == 4
+        assert data['min'] == 0.05
+        assert data['max'] == 50
+        # 分桶为累计计数（Prometheus语义）
+        assert data['buckets'] == {'0.1': 1, '1': 2, '10': 3}
+
+
+class TestRunMetrics:
+    """测试运行指标"""
+
+    def test_timer_records_stage(self):
+        metrics = RunMetrics('run-1')
+        with metrics.timer('parse'):
+            pass
+        with metrics.timer('parse'):
+            pass
+
+        stage = metrics.to_dict()['stages']['parse']
+        assert stage['count'] == 2
+        assert stage['sum'] >= 0
+
+    def test_timer_records_on_exception(self):
+        metrics = RunMetrics('run-1')
+        with pytest.raises(ValueError):
+            with metrics.timer('llm'):
+                raise ValueError('boom')
+
+        assert metrics.to_dict()['stages']['llm']['count'] == 1
+
+    def test_counters(self):
+        metrics = RunMetrics('run-1')
+        metrics.incr('stored')
+        metrics.incr('stored', 4)
+
+        assert metrics.to_dict()['counters'] == {'stored': 5}
+
+    def test_write_json(self, tmp_path):
+        metrics = RunMetrics('run-1')
+        metrics.incr('articles_fetched', 3)
+        metrics.add_source({'source': '测试媒体', 'status': 'success'})
+        metrics.finish()
+
+        path = metrics.write_json(str(tmp_path / 'reports' / 'run-1.json'))
+
+        with open(path, encoding='utf-8') as f:
+            report = json.load(f)
+        assert report['run_id'] == 'run-1'
+        assert report['counters']['articles_fetched'] == 3
+        assert report['sources'][0]['source'] == '测试媒体'
+        assert report['finished_at'] is not None
+
+    def test_prometheus_format(self, tmp_path):
+        metrics = RunMetrics('run-1')
+        metrics.observe_stage('page_load', 1.5)
+        metrics.incr('articles_stored', 7)
+
+        path = metrics.write_prometheus(str(tmp_path / 'ci.prom'))
+        text = open(path, encoding='utf-8').read()
+
+        assert 'ci_collection_stage_seconds_bucket{stage="page_load",le="2.5"} 1' in text
+        assert 'ci_collection_stage_seconds_bucket{stage="page_load",le="+Inf"} 1' in text
+        assert 'ci_collection_stage_seconds_count{stage="page_load"} 1' in text
+        assert 'ci_collection_articles_stored_total 7' in text
+
+    def test_null_metrics_records_nothing(self):
+        metrics = NullMetrics()
+        with metrics.timer('llm'):
+            pass
+        metrics.incr('stored')
+
+        data = metrics.to_dict()
+        assert data['stages'] == {}
+        assert data['counters'] == {}
+
+
+class TestRunsTable:
+    """测试runs表持久化"""
+
+    def test_save_and_get_runs(self):
+        db = Database(':memory:')
+        metrics = RunMetrics('20251108-080000')
+        metrics.incr('articles_fetched', 20)
+        metrics.incr('articles_stored', 12)
+        metrics.incr('llm_calls', 18)
+        metrics.add_source({'source': 'A', 'status': 'success'})
+        metrics.add_source({'source': 'B', 'status': 'failed'})
+        metrics.finish()
+
+        db.save_run(metrics.to_dict())
+        runs = db.get_recent_runs()
+
+        assert len(runs) == 1
+        run = runs[0]
+        assert run['run_id'] == '20251108-080000'
+        assert run['sources_total'] == 2
+        assert run['sources_ok'] == 1
+        assert run['articles_fetched'] == 20
+        assert run['articles_stored'] == 12
+        assert run['llm_calls'] == 18
+        assert run['report']['counters']['llm_calls'] == 18
+        db.close()
@@ -0,0 +1,184 @@
+"""
+数据库结构迁移单元测试
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from src.storage.database import Database
+from src.storage.migrations import get_version, latest_version, migrate, split_categories
+
+
+V1_ARTICLES = """
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        url TEXT UNIQUE NOT NULL,
+        url_hash TEXT UNIQUE NOT NULL,
+        source TEXT NOT NULL,
+        source_tier INTEGER DEFAULT 2,
+        publish_date DATE NOT NULL,
+        collected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        content TEXT,
+        summary TEXT,
+        category TEXT,
+        categories TEXT,
+        priority TEXT,
+        score INTEGER DEFAULT 0,
+        score_relevance INTEGER DEFAULT 0,
+        score_timeliness INTEGER DEFAULT 0,
+        score_impact INTEGER DEFAULT 0,
+        score_credibility INTEGER DEFAULT 0,
+        llm_relevance_score INTEGER DEFAULT 0,
+        llm_importance_score INTEGER DEFAULT 0,
+        llm_category_score INTEGER DEFAULT 0,
+        llm_total_score INTEGER DEFAULT 0,
+        llm_category_suggestion TEXT,
+        llm_reason TEXT,
+        link_valid BOOLEAN DEFAULT 1,
+        summary_generated BOOLEAN DEFAULT 0,
+        processed BOOLEAN DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """迁移框架之前创建的数据库（user_version = 0）"""
+    path = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(path)
+    conn.execute(V1_ARTICLES)
+    rows = [
+        ('液冷数据中心投产', 'https://a.com/1', 'h1', '中国IDC圈', 1, '2025-11-01', '投资,技术', 80),
+        ('算力政策发布', 'https://a.com/2', 'h2', '中国IDC圈', 1, '2025-11-02', '政策', 60),
+        ('边缘节点扩容', 'https://b.com/1', 'h3', '通信世界网', 2, '2025-11-03', '市场、技术', 40),
+        ('未分类文章', 'https://b.com/2', 'h4', '通信世界网', 2, '2025-11-04', None, 10),
+    ]
+    conn.executemany(
+        "INSERT INTO articles (title, url, url_hash, source, source_tier, publish_date, category, score) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+class TestMigrations:
+    """测试迁移框架"""
+
+    def test_new_database_at_latest_version(self):
+        with Database(':memory:') as db:
+            assert get_version(db.conn) == latest_version()
+
+    def test_migrate_is_idempotent(self):
+        with Database(':memory:') as db:
+            assert migrate(db.conn) == []
+
+    def test_legacy_database_upgraded(self, legacy_db):
+        with Database(legacy_db) as db:
+            assert get_version(db.conn) == latest_version()
+
+            sources = {s['name']: s for s in db.get_sources()}
+            assert sources['中国IDC圈']['tier'] == 1
+            assert sources['中国IDC圈']['article_count'] == 2
+            assert sources['通信世界网']['article_count'] == 2
+
+            tech = db.get_articles_by_category('技术')
+            assert [a['title'] for a in tech] == ['液冷数据中心投产', '边缘节点扩容']
+            assert len(db.get_articles_by_category('政策')) == 1
+
+    def test_legacy_daily_aggregates_backfilled(self, legacy_db):
+        with Database(legacy_db) as db:
+            rows = db.get_daily_aggregates(date(2025, 11, 1), date(2025, 11, 30), group_by='source')
+            counts = {row['source']: row['article_count'] for row in rows}
+            assert counts == {'中国IDC圈': 2, '通信世界网': 2}
+            assert db.get_daily_aggregates(date(2025, 11, 1), date(2025, 11, 30))[0]['avg_score'] == 47.5
+
+    def test_split_categories(self):
+        assert split_categories('投资,技术') == ['投资', '技术']
+        assert split_categories('投资， 技术、投资') == ['投资', '技术']
+        assert split_categories('') == []
+        assert split_categories(None) == []
+
+    def test_concurrent_connections_migrate_once(self, legacy_db):
+        db1 = Database(legacy_db)
+        db2 = Database(legacy_db)
+        assert get_version(db2.conn) == latest_version()
+        db1.close()
+        db2.close()
+
+
+class TestNormalizedWrites:
+    """测试写入时维护sources和article_categories"""
+
+    @pytest.fixture
+    def db(self):
+        database = Database(':memory:')
+        yield database
+        database.close()
+
+    def test_insert_article_registers_source_and_categories(self, db):
+        article_id = db.insert_article(
+            title='某公司投资液冷数据中心', url='https://a.com/1', source='中国IDC圈', source_tier=1,
+            publish_date=date(2025, 11, 1), content='', category='投资,技术',
+        )
+
+        assert db.get_article_by_id(article_id)['source_id'] == db.get_sources()[0]['id']
+        assert [a['id'] for a in db.get_articles_by_category('投资')] == [article_id]
+        assert [a['id'] for a in db.get_articles_by_category('技术')] == [article_id]
+
+    def test_insert_articles_batch(self, db):
+        articles = [
+            dict(title=f'文章{i}', url=f'https://a.com/{i}', source=f'源{i % 2}',
+                 publish_date=date(2025, 11, 1), content='', category='投资' if i % 2 else '技术')
+            for i in range(6)
+        ]
+        assert db.insert_articles(articles) == 6
+        # 重复插入不计数，也不重复登记分类
+        assert db.insert_articles(articles) == 0
+
+        assert len(db.get_articles_by_category('投资')) == 3
+        assert len(db.get_articles_by_category('技术')) == 3
+        assert [s['article_count'] for s in db.get_sources()] == [3, 3]
+
+    def test_update_scores_resyncs_categories(self, db):
+        article_id = db.insert_article(
+            title='文章', url='https://a.com/1', source='源', publish_date=date(2025, 11, 1),
+            content='', category='投资',
+        )
+        db.update_article_scores(article_id, '政策,市场', '中', 50, 20, 10, 10, 10)
+
+        assert db.get_articles_by_category('投资') == []
+        assert len(db.get_articles_by_category('政策')) == 1
+        assert len(db.get_articles_by_category('市场')) == 1
+
+    def test_category_query_date_filter(self, db):
+        db.insert_article(title='旧', url='https://a.com/1', source='源', publish_date=date(2025, 1, 1),
+                          content='', category='投资')
+        db.insert_article(title='新', url='https://a.com/2', source='源', publish_date=date(2025, 11, 1),
+                          content='', category='投资')
+
+        recent = db.get_articles_by_category('投资', start_date=date(2025, 6, 1))
+        assert [a['title'] for a in recent] == ['新']
+
+    def test_sync_sources_from_config(self, db):
+        db.sync_sources([
+            {'name': '中国IDC圈', 'tier': 1, 'active': True},
+            {'name': '停用源', 'tier': 3},
+        ])
+        db.sync_sources([{'name': '中国IDC圈', 'tier': 2, 'active': False}])
+
+        sources = {s['name']: s for s in db.get_sources()}
+        assert sources['中国IDC圈']['tier'] == 2
+        assert sources['中国IDC圈']['active'] == 0
+        assert db.get_sources(active_only=True) == []
+
+    def test_clear_all_articles_clears_categories(self, db):
+        db.insert_article(title='文章', url='https://a.com/1', source='源', publish_date=date(2025, 11, 1),
+                          content='', category='投资')
+        db.clear_all_articles()
+        assert db.conn.execute("SELECT COUNT(*) FROM article_categories").fetchone()[0] == 0
@@ -0,0 +1,134 @@
+"""
+Tests for PageArchive and offline replay
+"""
+
+import gzip
+import pytest
+from datetime import date
+from unittest.mock import patch
+
+from src.scrapers.page_archive import PageArchive
+from src.storage.database import Database
+
+
+SOURCE = {
+    "name": "测试媒体",
+    "url": "https://example.com",
+    "tier": 2,
+    "active": True,
+    "scraper_config": {
+        "list_url": "https://example.com/news/",
+        "article_container": "div.item",
+        "title_selector": "a.title",
+        "link_selector": "a.title",
+        "date_selector": "span.date",
+    },
+}
+
+SAMPLE_HTML = """
+<div class="item">
+    <a class="title" href="/a/1.html">某公司投资50亿元建设数据中心</a>
+    <span class="date">2025-11-03</span>
+</div>
+<div class="item">
+    <a class="title" href="/a/2.html">液冷技术助力智算中心PUE降至1.15</a>
+    <span class="date">2025-11-04</span>
+</div>
+"""
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Create archive in a temp directory"""
+    return PageArchive(str(tmp_path / "archive"))
+
+
+class TestPageArchive:
+    """Test storing and loading pages"""
+
+    def test_save_and_load_page(self, archive):
+        archive.save_page("run1", "测试媒体", "https://example.com/news/", SAMPLE_HTML)
+
+        assert archive.load_page("run1", "测试媒体") == SAMPLE_HTML
+
+    def test_page_is_stored_compressed(self, archive):
+        digest = archive.save_page("run1", "测试媒体", "https://example.com/", SAMPLE_HTML)
+
+        blob = archive.root / "objects" / digest[:2] / f"{digest}.html.gz"
+        assert blob.exists()
+        assert gzip.decompress(blob.read_bytes()).decode("utf-8") == SAMPLE_HTML
+
+    def test_identical_pages_share_one_blob(self, archive):
+        d1 = archive.save_page("run1", "媒体A", "https://a.com/", SAMPLE_HTML)
+        d2 = archive.save_page("run2", "媒体B", "https://b.com/", SAMPLE_HTML)
+
+        assert d1 == d2
+        assert len(list((archive.root / "objects").rglob("*.html.gz"))) == 1
+
+    def test_manifest_lists_sources_per_run(self, archive):
+        archive.save_page("run1", "媒体A", "https://a.com/", "<html>a</html>")
+        archive.save_page("run1", "媒体B", "https://b.com/", "<html>b</html>")
+        archive.save_page("run2", "媒体A", "https://a.com/", "<html>a2</html>")
+
+        assert sorted(archive.list_sources("run1")) == ["媒体A", "媒体B"]
+        assert archive.list_runs() == ["run1", "run2"]
+        assert archive.load_page("run2", "媒体A") == "<html>a2</html>"
+
+    def test_missing_run_or_source_returns_none(self, archive):
+        assert archive.load_page("nope", "媒体A") is None
+        archive.save_page("run1", "媒体A", "https://a.com/", "<html></html>")
+        assert archive.load_page("run1", "媒体B") is None
+        assert archive.list_sources("nope") == []
+
+
+class TestReplay:
+    """Test replaying archived pages through the collection pipeline"""
+
+    def test_replay_parses_archived_page_without_network(self, archive):
+        from run_collection import collect_from_source
+
+        archive.save_page("run1", SOURCE["name"], SOURCE["scraper_config"]["list_url"], SAMPLE_HTML)
+        db = Database(":memory:")
+
+        with patch("src.scrapers.generic_scraper.sync_playwright") as mock_playwright:
+            stats = collect_from_source(
+                SOURCE, db, limit=10, archive=archive, run_id="run1", replay=True
+            )
+            mock_playwright.assert_not_called()
+
+        assert stats["status"] == "success"
+        assert stats["fetched"] == 2
+        assert stats["stored"] == 2
+        urls = {a["url"] for a in db.get_all_articles()}
+        assert "https://example.com/a/1.html" in urls
+        db.close()
+
+    def test_record_mode_archives_fetched_page(self, archive):
+        from run_collection import collect_from_source
+
+        db = Database(":memory:")
+        with patch(
+            "src.scrapers.generic_scraper.GenericScraper.fetch_html", return_value=SAMPLE_HTML
+        ):
+            collect_from_source(SOURCE, db, limit=10, archive=archive, run_id="rec1")
+
+        assert archive.load_page("rec1", SOURCE["name"]) == SAMPLE_HTML
+        db.close()
+
+    def test_replay_records_stage_metrics(self, archive):
+        from run_collection import collect_from_source
+        from src.utils.metrics import RunMetrics
+
+        archive.save_page("run1", SOURCE["name"], SOURCE["scraper_config"]["list_url"], SAMPLE_HTML)
+        db = Database(":memory:")
+        metrics = RunMetrics("m1")
+
+        stats = collect_from_source(
+            SOURCE, db, limit=10, archive=archive, run_id="run1", replay=True, metrics=metrics
+        )
+
+        stages = metrics.to_dict()["stages"]
+        assert stages["parse"]["count"] == 1
+        assert stages["db_write"]["count"] == 2
+        assert stats["duration_seconds"] >= 0
+        db.close()
@@ -0,0 +1,109 @@
+"""
+Parquet导出单元测试
+"""
+
+from datetime import date
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from src.storage.database import Database
+from src.storage.parquet_export import (
+    export_articles,
+    load_articles_frame,
+    load_articles_table,
+    load_state,
+)
+
+
+DATES = [date(2024, 1, 5), date(2024, 1, 20), date(2024, 2, 10), date(2024, 3, 1)]
+
+
+def _insert(db, i, publish_date, score=50):
+    article_id = db.insert_article(
+        title=f'文章{i}', url=f'https://a.com/{i}', source='中国IDC圈' if i % 2 else 'DCD',
+        source_tier=1, publish_date=publish_date, content=f'正文{i}' * 100, category='投资',
+    )
+    db.conn.execute("UPDATE articles SET score = ? WHERE id = ?", (score, article_id))
+    db.conn.commit()
+    return article_id
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / 'live.db'))
+    for i, publish_date in enumerate(DATES):
+        _insert(database, i, publish_date, score=40 + i)
+    yield database
+    database.close()
+
+
+class TestExport:
+    """测试导出"""
+
+    def test_partitions_by_month(self, db, tmp_path):
+        export_dir = tmp_path / 'analytics'
+        exported = export_articles(db, str(export_dir), batch_size=2)
+
+        assert exported == {'2024-01': 2, '2024-02': 1, '2024-03': 1}
+        assert sorted(p.name for p in export_dir.glob('month=*')) == \
+            ['month=2024-01', 'month=2024-02', 'month=2024-03']
+        assert not list(export_dir.rglob('*.tmp'))
+
+    def test_content_not_exported(self, db, tmp_path):
+        export_articles(db, str(tmp_path / 'analytics'))
+        table = load_articles_table(str(tmp_path / 'analytics'), date(2024, 1, 1), date(2024, 12, 31))
+        assert 'content' not in table.column_names
+        assert table.schema.field('publish_date').type == pa.date32()
+
+    def test_incremental_exports_only_new_rows(self, db, tmp_path):
+        export_dir = str(tmp_path / 'analytics')
+        export_articles(db, export_dir)
+        assert export_articles(db, export_dir) == {}
+
+        new_id = _insert(db, 10, date(2024, 1, 25))
+        assert export_articles(db, export_dir) == {'2024-01': 1}
+
+        state = load_state(export_dir)
+        assert state['last_id'] == new_id
+        assert state['rows'] == 5
+        assert len(list((tmp_path / 'analytics' / 'month=2024-01').glob('part-*.parquet'))) == 2
+
+    def test_full_rewrites_export(self, db, tmp_path):
+        export_dir = str(tmp_path / 'analytics')
+        export_articles(db, export_dir)
+        db.conn.execute("UPDATE articles SET score = 99")
+        db.conn.commit()
+
+        assert export_articles(db, export_dir, full=True) == {'2024-01': 2, '2024-02': 1, '2024-03': 1}
+        frame = load_articles_frame(export_dir, date(2024, 1, 1), date(2024, 12, 31))
+        assert len(frame) == 4
+        assert set(frame['score']) == {99}
+
+
+class TestLoad:
+    """测试按日期范围读取"""
+
+    def test_filters_date_range(self, db, tmp_path):
+        export_dir = str(tmp_path / 'analytics')
+        export_articles(db, export_dir)
+
+        frame = load_articles_frame(export_dir, date(2024, 1, 10), date(2024, 2, 29))
+        assert sorted(frame['title']) == ['文章1', '文章2']
+
+    def test_selected_columns(self, db, tmp_path):
+        export_dir = str(tmp_path / 'analytics')
+        export_articles(db, export_dir)
+
+        frame = load_articles_frame(export_dir, date(2024, 1, 1), date(2024, 1, 31), columns=['source', 'score'])
+        assert list(frame.columns) == ['source', 'score']
+        assert sorted(frame['score']) == [40, 41]
+
+    def test_empty_range(self, db, tmp_path):
+        export_dir = str(tmp_path / 'analytics')
+        export_articles(db, export_dir)
+
+        table = load_articles_table(export_dir, date(2023, 1, 1), date(2023, 12, 31), columns=['title'])
+        assert table.num_rows == 0
+        assert table.column_names == ['title']
@@ -0,0 +1,179 @@
+"""
+流水线采集单元测试
+"""
+
+import threading
+import time
+import pytest
+from datetime import date
+from unittest.mock import MagicMock
+
+from src.processing.article_processor import ArticleProcessor
+from src.processing.pipeline import CollectionPipeline
+from src.scrapers.page_archive import PageArchive
+from src.storage.database import Database
+
+
+def make_source(name):
+    return {
+        'name': name,
+        'url': 'https://example.com',
+        'tier': 2,
+        'active': True,
+        'scraper_config': {
+            'list_url': f'https://example.com/{name}/',
+            'article_container': 'div.item',
+            'title_selector': 'a.title',
+            'link_selector': 'a.title',
+            'date_selector': 'span.date',
+        },
+    }
+
+
+def make_html(name, titles):
+    items = ''.join(
+        f'<div class="item"><a class="title" href="/{name}/{i}.html">{t}</a>'
+        f'<span class="date">2025-11-0{i % 9 + 1}</span></div>'
+        for i, t in enumerate(titles)
+    )
+    return f'<html><body>{items}</body></html>'
+
+
+TITLES = [
+    '某公司投资50亿元建设数据中心',
+    '液冷技术助力智算中心PUE降至1.15',
+    '某白酒品牌发布新品',          # 负面关键词过滤
+    '某地举办马拉松比赛',          # LLM拒绝
+]
+
+
+def fake_analyzer(delay=0.0):
+    analyzer = MagicMock()
+
+    def analyze(title, content):
+        time.sleep(delay)
+        relevance = 3 if '马拉松' in title else 18
+        return {
+            'relevance_score': relevance, 'importance_score': 12, 'category_score': 8,
+            'total_score': relevance + 12, 'category': '投资', 'reason': '测试',
+            'summary': f'{title}的摘要',
+        }
+
+    analyzer.analyze_article.side_effect = analyze
+    return analyzer
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    for name in ('源A', '源B'):
+        archive.save_page('run1', name, f'https://example.com/{name}/', make_html(name, TITLES))
+    return archive
+
+
+def run_pipeline(tmp_path, archive, analyzer, **kwargs):
+    db_path = str(tmp_path / 'test.db')
+    Database(db_path).close()
+    pipeline = CollectionPipeline(
+        db_path, ArticleProcessor(llm_analyzer=analyzer),
+        archive=archive, run_id='run1', replay=True, **kwargs
+    )
+    return db_path, pipeline.run([make_source('源A'), make_source('源B')])
+
+
+class TestCollectionPipeline:
+    """测试流水线采集"""
+
+    def test_stats_per_source(self, tmp_path, archive):
+        db_path, results = run_pipeline(tmp_path, archive, fake_analyzer())
+
+        assert [s['source'] for s in results] == ['源A', '源B']
+        for stats in results:
+            assert stats['status'] == 'success'
+            assert stats['fetched'] == 4
+            assert stats['quick_filtered'] == 1
+            assert stats['llm_rejected'] == 1
+            assert stats['stored'] == 2
+            assert stats['avg_relevance'] == 18
+
+        with Database(db_path) as db:
+            assert len(db.get_all_articles()) == 4
+            # LLM判定（含拒绝）写入训练标签
+            assert len(db.get_relevance_training_data()) == 6
+
+    def test_existing_articles_are_deduplicated(self, tmp_path, archive):
+        db_path, _ = run_pipeline(tmp_path, archive, fake_analyzer())
+        analyzer = fake_analyzer()
+
+        pipeline = CollectionPipeline(
+            db_path, ArticleProcessor(llm_analyzer=analyzer),
+            archive=archive, run_id='run1', replay=True,
+        )
+        results = pipeline.run([make_source('源A')])
+
+        # 已入库的2篇在去重阶段跳过，只有被拒绝的文章会再次送入LLM
+        assert results[0]['duplicates'] == 2
+        assert results[0]['stored'] == 0
+        assert analyzer.analyze_article.call_count == 1
+
+    def test_llm_workers_run_concurrently(self, tmp_path, archive):
+        active = []
+        peak = [0]
+        lock = threading.Lock()
+        analyzer = fake_analyzer()
+        inner = analyzer.analyze_article.side_effect
+
+        def tracked(title, content):
+            with lock:
+                active.append(1)
+                peak[0] = max(peak[0], len(active))
+            try:
+                time.sleep(0.05)
+                return inner(title, content)
+            finally:
+                with lock:
+                    active.pop()
+
+        analyzer.analyze_article.side_effect = tracked
+        _, results = run_pipeline(tmp_path, archive, analyzer, llm_workers=4, queue_size=2)
+
+        assert peak[0] > 1
+        assert sum(s['stored'] for s in results) == 4
+
+    def test_small_batches_and_queues(self, tmp_path, archive):
+        _, results = run_pipeline(tmp_path, archive, fake_analyzer(), batch_size=1, queue_size=1)
+        assert sum(s['stored'] for s in results) == 4
+
+    def test_bad_record_does_not_drop_batch(self, tmp_path, archive):
+        processor = ArticleProcessor(llm_analyzer=fake_analyzer())
+        build_record = processor.build_record
+
+        def broken(article, source, analysis):
+            record = build_record(article, source, analysis)
+            if '液冷' in article['title']:
+                record['publish_date'] = None  # 违反NOT NULL约束
+            return record
+
+        processor.build_record = broken
+        db_path = str(tmp_path / 'test.db')
+        Database(db_path).close()
+        results = CollectionPipeline(
+            db_path, processor, archive=archive, run_id='run1', replay=True
+        ).run([make_source('源A')])
+
+        assert results[0]['stored'] == 1
+        assert results[0]['errors'] + results[0]['duplicates'] == 1
+
+    def test_missing_archive_page_marks_source(self, tmp_path, archive):
+        db_path = str(tmp_path / 'test.db')
+        Database(db_path).close()
+        results = CollectionPipeline(
+            db_path, ArticleProcessor(), archive=archive, run_id='run1', replay=True
+        ).run([make_source('源A'), make_source('源C')])
+
+        assert results[0]['status'] == 'success'
+        assert results[1]['status'] == 'no_articles'
+
+    def test_memory_database_rejected(self):
+        with pytest.raises(ValueError):
+            CollectionPipeline(':memory:', ArticleProcessor())
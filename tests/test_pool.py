@@ -0,0 +1,157 @@
+"""
+数据库连接池（单写多读）单元测试
+"""
+
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+
+from src.storage.database import Database
+from src.storage.pool import DatabasePool
+
+
+def article(i, **overrides):
+    data = dict(title=f'文章{i}', url=f'https://a.com/{i}', source='中国IDC圈',
+                publish_date=date.today(), content=f'正文{i}')
+    data.update(overrides)
+    return data
+
+
+@pytest.fixture
+def pool(tmp_path):
+    with DatabasePool(str(tmp_path / 'pool.db'), readers=2) as database_pool:
+        yield database_pool
+
+
+class TestDatabasePool:
+    """测试连接池读写"""
+
+    def test_concurrent_writes_and_reads(self, pool):
+        def work(i):
+            article_id = pool.write(Database.insert_article, **article(i))
+            assert pool.read(Database.article_exists, f'https://a.com/{i}')
+            return article_id
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(work, range(200)))
+
+        assert len(set(ids)) == 200
+        assert len(pool.read(Database.get_all_articles)) == 200
+        stats = pool.stats()
+        assert stats['writes'] == 200
+        assert stats['batches'] <= 200
+        assert stats['reads'] == 201
+
+    def test_wal_mode(self, pool):
+        assert pool.read(lambda db: db.conn.execute("PRAGMA journal_mode").fetchone()[0]) == 'wal'
+
+    def test_readers_are_read_only(self, pool):
+        with pytest.raises(sqlite3.OperationalError):
+            pool.read(Database.insert_article, **article(1))
+
+    def test_failed_operation_does_not_affect_batch(self, pool):
+        def insert_then_fail(db):
+            db.insert_article(**article(99))
+            raise RuntimeError('操作失败')
+
+        pool.write(lambda db: None)  # 等待写线程空闲，使以下操作进入同一批
+        futures = [
+            pool.submit(Database.insert_article, **article(1)),
+            pool.submit(insert_then_fail),
+            pool.submit(Database.insert_article, **article(1)),  # 重复URL
+            pool.submit(Database.insert_article, **article(2)),
+        ]
+
+        assert futures[0].result() is not None
+        with pytest.raises(RuntimeError):
+            futures[1].result()
+        assert futures[2].result() is None
+        assert futures[3].result() is not None
+
+        urls = {a['url'] for a in pool.read(Database.get_all_articles)}
+        assert urls == {'https://a.com/1', 'https://a.com/2'}
+        assert pool.stats()['write_errors'] == 1
+
+    def test_close_flushes_pending_writes(self, tmp_path):
+        path = str(tmp_path / 'pool.db')
+        pool = DatabasePool(path)
+        for i in range(50):
+            pool.submit(Database.insert_article, **article(i))
+        pool.close()
+
+        with Database(path) as db:
+            assert len(db.get_all_articles()) == 50
+        with pytest.raises(RuntimeError):
+            pool.submit(Database.insert_article, **article(51))
+
+    def test_asyncio(self, pool):
+        async def main():
+            ids = await asyncio.gather(*[
+                pool.awrite(Database.insert_article, **article(i)) for i in range(20)
+            ])
+            exists = await pool.aread(Database.article_exists, 'https://a.com/5')
+            return ids, exists
+
+        ids, exists = asyncio.run(main())
+        assert len(set(ids)) == 20
+        assert exists
+
+    def test_memory_database_rejected(self):
+        with pytest.raises(ValueError):
+            DatabasePool(':memory:')
+
+
+class TestDatabaseBatch:
+    """测试Database的批量写入"""
+
+    def test_nested_operation_rollback(self, tmp_path):
+        db = Database(str(tmp_path / 'batch.db'))
+        with db.batch():
+            with db.operation():
+                db.insert_article(**article(1))
+                with pytest.raises(RuntimeError):
+                    with db.operation():
+                        db.insert_article(**article(2))
+                        raise RuntimeError('内层失败')
+                # 重复URL只回滚该次插入
+                assert db.insert_article(**article(1)) is None
+                db.insert_article(**article(3))
+
+        assert sorted(a['url'] for a in db.get_all_articles()) == ['https://a.com/1', 'https://a.com/3']
+        db.close()
+
+    def test_operation_outside_batch_commits_normally(self):
+        with Database(':memory:') as db:
+            with db.operation():
+                db.insert_article(**article(1))
+            assert not db.conn.in_transaction
+            assert db.article_exists('https://a.com/1')
+
+    def test_concurrent_pools_on_same_file(self, tmp_path):
+        """两个进程级写入者（各自的连接池）同时写入同一文件不报database is locked"""
+        path = str(tmp_path / 'shared.db')
+        pools = [DatabasePool(path), DatabasePool(path)]
+        errors = []
+
+        def writer(pool, offset):
+            try:
+                for i in range(100):
+                    pool.write(Database.insert_article, **article(offset + i))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(p, n * 1000)) for n, p in enumerate(pools)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        for p in pools:
+            p.close()
+
+        assert errors == []
+        with Database(path) as db:
+            assert len(db.get_all_articles()) == 200
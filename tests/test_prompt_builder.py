@@ -0,0 +1,142 @@
+"""
+Prompt构建与Token预算单元测试
+"""
+
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.processing.prompt_builder import (
+    TokenUsage,
+    compact_content,
+    estimate_tokens,
+    prepare_content,
+    select_sentences,
+    sentence_score,
+)
+
+
+TITLE = '某公司投资50亿元建设数据中心'
+
+RAW_CONTENT = """某公司投资50亿元建设数据中心
+点击查看更多精彩内容
+近日，某公司宣布投资50亿元在贵州建设数据中心。
+现场气氛热烈，嘉宾云集。
+项目规划机柜1万个，设计PUE低于1.2，采用液冷技术。
+责任编辑：张三
+分享到：微信 微博
+上一篇：某地举办文化节
+"""
+
+
+class TestEstimateTokens:
+    """测试token估算"""
+
+    def test_chinese_counts_per_char(self):
+        assert estimate_tokens('数据中心') == 4
+
+    def test_ascii_words_are_cheaper(self):
+        assert estimate_tokens('datacenter') == 3
+        assert estimate_tokens('') == 0
+
+
+class TestCompactContent:
+    """测试样板文本清理"""
+
+    def test_removes_boilerplate_and_title_line(self):
+        text = compact_content(TITLE, RAW_CONTENT)
+
+        assert '点击查看' not in text
+        assert '责任编辑' not in text
+        assert '分享到' not in text
+        assert '上一篇' not in text
+        assert not text.startswith(TITLE)
+        assert '项目规划机柜1万个' in text
+
+    def test_collapses_whitespace_and_duplicate_lines(self):
+        text = compact_content('标题', '第一段   内容\n\n\n第一段 内容\n第二段')
+        assert text == '第一段 内容\n第二段'
+
+    def test_title_only_content_kept(self):
+        # 没有摘要和正文时预过滤以标题作为LLM内容，不能清理成空
+        assert compact_content(TITLE, TITLE) == TITLE
+        assert prepare_content(TITLE, f' {TITLE} \n分享到：微信', 100)[0] == TITLE
+
+
+class TestSelectSentences:
+    """测试按预算挑选句子"""
+
+    def test_informative_sentences_score_higher(self):
+        assert sentence_score('项目规划机柜1万个，设计PUE低于1.2。') > sentence_score('现场气氛热烈。')
+
+    def test_within_budget_returns_unchanged(self):
+        assert select_sentences('短内容。', 100) == '短内容。'
+
+    def test_keeps_lead_and_informative_sentences(self):
+        text = compact_content(TITLE, RAW_CONTENT)
+        selected = select_sentences(text, 50)
+
+        assert selected.startswith('近日，某公司宣布投资50亿元')
+        assert '机柜1万个' in selected
+        assert '气氛热烈' not in selected
+        assert estimate_tokens(selected) <= 50
+
+    def test_prepare_content_reports_tokens(self):
+        text, stats = prepare_content(TITLE, RAW_CONTENT, 50)
+
+        assert stats['content_tokens'] == estimate_tokens(text)
+        assert stats['original_tokens'] > stats['content_tokens']
+
+
+class TestAnalyzerTokenUsage:
+    """测试分析器的预算与用量统计"""
+
+    def test_long_content_trimmed_to_budget(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test', content_token_budget=50)
+        long_content = RAW_CONTENT + '无关的填充内容。' * 200
+
+        with patch.object(analyzer, '_call_llm_api', return_value='{}') as mock_call:
+            analyzer.analyze_article(TITLE, long_content)
+
+        prompt = mock_call.call_args[0][0]
+        article_part = prompt.split('【文章信息】')[1]
+        assert estimate_tokens(article_part) < 100
+        assert mock_call.call_args[1]['saved_tokens'] > 0
+
+    def test_instructions_are_a_stable_prefix(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test')
+        p1 = analyzer._build_prompt('标题一', '内容一')
+        p2 = analyzer._build_prompt('标题二', '内容二')
+
+        prefix = p1.split('【文章信息】')[0]
+        assert p2.startswith(prefix)
+
+    def test_usage_recorded_from_api_response(self):
+        analyzer = LLMArticleAnalyzer('key', 'http://test')
+        response = MagicMock()
+        response.json.return_value = {
+            'choices': [{'message': {'content': json.dumps({
+                'relevance_score': 18, 'importance_score': 12, 'category': '投资', 'summary': '摘要',
+            })}}],
+            'usage': {'prompt_tokens': 640, 'completion_tokens': 120},
+        }
+
+        with patch.object(analyzer.session, 'post', return_value=response):
+            analyzer.analyze_article(TITLE, RAW_CONTENT)
+
+        usage = analyzer.token_usage.to_dict()
+        assert usage['calls'] == 1
+        assert usage['prompt_tokens'] == 640
+        assert usage['completion_tokens'] == 120
+        assert usage['saved_tokens'] > 0
+
+    def test_token_usage_accumulates(self):
+        usage = TokenUsage()
+        usage.record(100, 20, 5)
+        usage.record(50, 10)
+
+        assert usage.to_dict() == {
+            'calls': 2, 'prompt_tokens': 150, 'completion_tokens': 30, 'saved_tokens': 5,
+        }
+        assert usage.last['prompt_tokens'] == 50
@@ -0,0 +1,114 @@
+"""
+查询计划审计与v3索引单元测试
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage.database import Database
+from src.storage.query_audit import _plan_flags, audit_database, copy_to_memory, explain, format_audit_report
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    today = date.today()
+    for i in range(30):
+        database.insert_article(
+            title=f'数据中心文章{i}', url=f'https://a.com/{i}', source='中国IDC圈', source_tier=1,
+            publish_date=today - timedelta(days=i), content='内容', category='投资,技术' if i % 2 else '政策',
+            priority='高' if i % 3 == 0 else '中', score=i * 3,
+        )
+    database.conn.execute("ANALYZE")
+    yield database
+    database.close()
+
+
+def _indexes(db):
+    return {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+class TestV3Indexes:
+    """v3索引"""
+
+    def test_indexes_created_and_dropped(self, db):
+        indexes = _indexes(db)
+        assert {'idx_priority_score', 'idx_ready_publish_date',
+                'idx_article_categories_score', 'idx_runs_started_at'} <= indexes
+        assert not indexes & {'idx_priority', 'idx_category', 'idx_link_valid', 'idx_processed'}
+
+    def test_category_rows_carry_score_and_date(self, db):
+        article_id = db.conn.execute("SELECT id FROM articles WHERE url = 'https://a.com/3'").fetchone()[0]
+        rows = db.conn.execute(
+            "SELECT category, score, publish_date FROM article_categories WHERE article_id = ?",
+            (article_id,),
+        ).fetchall()
+        assert {r[0] for r in rows} == {'投资', '技术'}
+        assert all(r[1] == 9 for r in rows)
+
+        db.update_article_scores(article_id, '市场', '高', 77, 30, 20, 15, 12)
+        rows = db.conn.execute(
+            "SELECT category, score FROM article_categories WHERE article_id = ?", (article_id,)
+        ).fetchall()
+        assert [tuple(r) for r in rows] == [('市场', 77)]
+
+    def test_category_query_ordered_by_score(self, db):
+        articles = db.get_articles_by_category('投资')
+        scores = [a['score'] for a in articles]
+        assert scores == sorted(scores, reverse=True)
+        recent = db.get_articles_by_category('投资', date.today() - timedelta(days=7))
+        assert {a['id'] for a in recent} <= {a['id'] for a in articles}
+        assert len(recent) < len(articles)
+
+    def test_priority_query_uses_composite_index(self, db):
+        plan = explain(db.conn, """
+            SELECT * FROM articles WHERE priority = '高' ORDER BY score DESC, publish_date DESC
+        """)
+        assert any('idx_priority_score' in line for line in plan)
+        assert not any('TEMP B-TREE' in line for line in plan)
+
+
+class TestQueryAudit:
+    """查询计划审计"""
+
+    def test_no_warnings_on_current_schema(self, db):
+        results = audit_database(db)
+        assert [r['method'] for r in results if r['warnings']] == []
+        methods = {r['method']: r for r in results}
+        assert methods['article_exists']['statements']
+        assert all(
+            line.startswith('SEARCH')
+            for s in methods['get_articles_by_priority']['statements'] for line in s['plan']
+        )
+
+    def test_missing_index_is_flagged(self, db):
+        db.conn.execute("DROP INDEX idx_priority_score")
+        results = {r['method']: r for r in audit_database(db)}
+        assert '全表扫描' in results['get_articles_by_priority']['warnings']
+        assert '临时B树排序' in results['get_articles_by_priority']['warnings']
+
+    def test_subquery_scan_is_not_full_scan(self):
+        assert not _plan_flags(['CO-ROUTINE f', 'SEARCH t USING INDEX idx (a=?)', 'SCAN f'])['full_scan']
+        assert _plan_flags(['CO-ROUTINE f', 'SCAN t', 'SCAN f'])['full_scan']
+
+    def test_report_format(self, db):
+        report = format_audit_report(audit_database(db), verbose=True)
+        assert 'get_articles_for_weekly_report' in report
+        assert 'SQL: SELECT' in report
+        assert '0 个有告警' in report
+
+    def test_copy_to_memory_leaves_file_untouched(self, tmp_path):
+        path = str(tmp_path / 'file.db')
+        with Database(path) as file_db:
+            file_db.insert_article(title='原文件文章', url='https://a.com/x', source='中国IDC圈',
+                                   publish_date=date.today(), content='内容')
+        copy = copy_to_memory(path)
+        audit_database(copy)
+        assert copy.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] > 1
+        copy.close()
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 1
+        conn.close()
@@ -0,0 +1,63 @@
+"""
+轻量文章记录（ArticleRecord）单元测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage.database import Database
+from src.storage.records import ArticleRecord, parse_date
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    for i in range(3):
+        database.insert_article(
+            title=f'文章{i}', url=f'https://a.com/{i}', source='中国IDC圈',
+            publish_date=date.today() - timedelta(days=i), content='正文', category='投资', score=50 + i,
+        )
+    yield database
+    database.close()
+
+
+class TestArticleRecord:
+    """测试ArticleRecord"""
+
+    def test_records_match_dicts(self, db):
+        records = db.get_articles_for_weekly_report(7, as_records=True)
+        dicts = db.get_articles_for_weekly_report(7)
+
+        assert all(isinstance(r, ArticleRecord) for r in records)
+        assert [dict(r) for r in records] == dicts
+
+    def test_mapping_and_attribute_access(self, db):
+        record = db.get_articles_for_weekly_report(7, as_records=True)[0]
+
+        assert record['title'] == record.title == '文章2'
+        assert record.get('missing', '默认') == '默认'
+        assert 'url' in record
+        assert 'missing' not in record
+        with pytest.raises(KeyError):
+            record['missing']
+        with pytest.raises(AttributeError):
+            record.missing
+
+    def test_publish_date_converted_lazily(self, db):
+        record = db.get_articles_for_weekly_report(7, as_records=True)[-1]
+
+        assert record._publish_date is ArticleRecord._UNSET
+        assert record['publish_date'] == date.today()
+        assert record.publish_date is record['publish_date']
+
+    def test_no_instance_dict(self, db):
+        record = db.get_articles_for_weekly_report(7, as_records=True)[0]
+        with pytest.raises(AttributeError):
+            record.__dict__
+
+    def test_parse_date(self):
+        assert parse_date('2025-11-01') == date(2025, 11, 1)
+        assert parse_date('2025-11-01 08:00:00') == date(2025, 11, 1)
+        assert parse_date(None) is None
+        assert parse_date('未知') == '未知'
@@ -0,0 +1,198 @@
+"""
+本地相关性模型单元测试
+"""
+
+import random
+import pytest
+from datetime import date
+
+from src.classification.relevance_model import (
+    RelevanceModel,
+    calibration_report,
+    choose_thresholds,
+    label_from_score,
+    train_from_records,
+)
+from src.storage.database import Database
+
+
+RELEVANT_TEMPLATES = [
+    '{c}投资{n}亿元建设{r}数据中心', '{c}发布液冷服务器，PUE降至1.{n}',
+    '{r}智算中心项目开工，规划机柜{n}千架', '{c}算力中心GPU集群上线',
+    '{r}出台数据中心绿色低碳发展政策', '{c}IDC业务收入增长{n}%',
+]
+IRRELEVANT_TEMPLATES = [
+    '{c}白酒销量增长{n}%', '{r}房地产市场成交回暖', '{c}发布新款汽车车型',
+    '{r}举办美食文化节', '{c}影视剧票房突破{n}亿', '{r}服装零售旺季来临',
+]
+COMPANIES = ['万国数据', '世纪互联', '秦淮数据', '阿里云', '腾讯', '中国移动']
+REGIONS = ['贵州', '内蒙古', '宁夏', '上海', '广东', '甘肃']
+
+
+def make_records(n, seed=0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        relevant = i % 2 == 0
+        template = rng.choice(RELEVANT_TEMPLATES if relevant else IRRELEVANT_TEMPLATES)
+        title = template.format(c=rng.choice(COMPANIES), r=rng.choice(REGIONS), n=rng.randint(1, 99))
+        records.append({
+            'title': title,
+            'content': '',
+            'relevance_score': rng.randint(12, 20) if relevant else rng.randint(0, 5),
+        })
+    return records
+
+
+class TestRelevanceModel:
+    """测试模型训练与预测"""
+
+    def test_featurize_is_normalized_and_stable(self):
+        model = RelevanceModel()
+        f1 = model.featurize('数据中心', '液冷')
+        f2 = model.featurize('数据中心', '液冷')
+
+        assert f1 == f2
+        assert sum(v * v for v in f1.values()) == pytest.approx(1.0)
+
+    def test_fit_separates_classes(self):
+        records = make_records(200)
+        model = RelevanceModel().fit(
+            [(r['title'], '') for r in records],
+            [label_from_score(r['relevance_score']) for r in records],
+        )
+
+        assert model.predict_proba('宁夏智算中心项目开工，规划机柜5千架') > 0.8
+        assert model.predict_proba('上海白酒销量增长20%') < 0.2
+
+    def test_route_uses_thresholds(self):
+        model = RelevanceModel(low_threshold=0.1, high_threshold=0.9)
+
+        assert model.route(0.05) == 'reject'
+        assert model.route(0.5) == 'uncertain'
+        assert model.route(0.95) == 'accept'
+
+    def test_untrained_model_never_routes(self):
+        model = RelevanceModel()
+        assert model.route(model.predict_proba('任意标题')) == 'uncertain'
+
+    def test_save_and_load(self, tmp_path):
+        model, _ = train_from_records(make_records(200))
+        path = model.save(str(tmp_path / 'model.json'))
+        loaded = RelevanceModel.load(path)
+
+        title = '贵州数据中心投资50亿元'
+        assert loaded.predict_proba(title) == pytest.approx(model.predict_proba(title), abs=1e-4)
+        assert loaded.low_threshold == model.low_threshold
+        assert loaded.high_threshold == model.high_threshold
+
+
+class TestCalibration:
+    """测试阈值选择与校准报告"""
+
+    def test_choose_thresholds_respects_error_rate(self):
+        probs = [i / 100 for i in range(100)]
+        labels = [1 if p >= 0.5 else 0 for p in probs]
+
+        low, high = choose_thresholds(probs, labels, max_error=0.0)
+
+        assert low == pytest.approx(0.5)
+        assert high == pytest.approx(0.5)
+
+    def test_overlapping_classes_leave_uncertain_band(self):
+        probs = [i / 100 for i in range(100)]
+        # 0.3-0.7之间标签交错
+        labels = [1 if p >= 0.7 else (i % 2 if p >= 0.3 else 0) for i, p in enumerate(probs)]
+
+        low, high = choose_thresholds(probs, labels, max_error=0.0)
+
+        assert low <= 0.31
+        assert high >= 0.69
+
+    def test_report_counts_routing(self):
+        report = calibration_report([0.05, 0.1, 0.5, 0.9, 0.95], [0, 1, 1, 1, 0], 0.2, 0.85)
+        routing = report['routing']
+
+        assert routing['rejected'] == 2
+        assert routing['accepted'] == 2
+        assert routing['uncertain'] == 1
+        assert routing['false_rejects'] == 1
+        assert routing['false_accepts'] == 1
+        assert routing['llm_call_reduction'] == pytest.approx(0.8)
+
+    def test_train_from_records_reduces_llm_calls(self):
+        model, report = train_from_records(make_records(400), max_error=0.02)
+
+        assert report['routing']['llm_call_reduction'] > 0.5
+        assert model.low_threshold <= model.high_threshold
+
+
+class TestTrainingData:
+    """测试训练数据读取"""
+
+    def test_labels_and_articles_are_merged(self):
+        db = Database(':memory:')
+        db.save_relevance_label('https://a.com/1', '白酒销量增长', 2, source='媒体A')
+        db.save_relevance_label('https://a.com/2', '数据中心开工', 18, content='内容')
+        db.insert_article(
+            title='数据中心开工', url='https://a.com/2', source='媒体A',
+            content='', publish_date=date.today(), llm_relevance_score=18, llm_reason='核心业务',
+        )
+        db.insert_article(
+            title='液冷方案发布', url='https://a.com/3', source='媒体A',
+            content='', publish_date=date.today(), llm_relevance_score=16, llm_reason='核心业务',
+        )
+        db.insert_article(
+            title='降级文章', url='https://a.com/4', source='媒体A',
+            content='', publish_date=date.today(), llm_relevance_score=10, llm_reason='LLM不可用，使用默认值',
+        )
+
+        records = db.get_relevance_training_data()
+
+        assert sorted(r['title'] for r in records) == sorted(['液冷方案发布', '数据中心开工', '白酒销量增长'])
+        db.close()
+
+
+class TestCollectionGate:
+    """测试采集流程中的模型预判"""
+
+    def test_model_routes_before_llm(self):
+        from unittest.mock import MagicMock, patch
+        from run_collection import collect_from_source
+        from src.classification.category_classifier import CategoryClassifier
+
+        source = {
+            'name': '测试媒体', 'tier': 2,
+            'scraper_config': {'list_url': 'https://example.com/news/'},
+        }
+        articles = [
+            {'title': '上海举办马拉松比赛', 'url': 'https://e.com/1'},
+            {'title': '宁夏智算中心项目开工，规划机柜5千架', 'url': 'https://e.com/2'},
+            {'title': '某公司发布年度报告', 'url': 'https://e.com/3'},
+        ]
+        model = MagicMock()
+        model.predict_proba.side_effect = [0.01, 0.99, 0.5]
+        model.route.side_effect = RelevanceModel(low_threshold=0.1, high_threshold=0.9).route
+
+        analyzer = MagicMock()
+        analyzer.analyze_article.return_value = {
+            'relevance_score': 3, 'importance_score': 5, 'category_score': 5,
+            'total_score': 8, 'category': '其他', 'reason': '不相关', 'summary': '摘要',
+        }
+
+        db = Database(':memory:')
+        with patch('run_collection.GenericScraper') as scraper_cls:
+            scraper_cls.return_value.fetch_html.return_value = '<html></html>'
+            scraper_cls.return_value.parse_articles.return_value = articles
+            stats = collect_from_source(
+                source, db, analyzer, classifier=CategoryClassifier(), relevance_model=model
+            )
+
+        assert stats['model_rejected'] == 1
+        assert stats['model_accepted'] == 1
+        assert stats['llm_rejected'] == 1
+        assert stats['stored'] == 1
+        assert analyzer.analyze_article.call_count == 1
+        # LLM判定（含拒绝）写入训练标签
+        assert [r['title'] for r in db.get_relevance_training_data()] == ['某公司发布年度报告']
+        db.close()
@@ -0,0 +1,127 @@
+"""
+数据保留与归档单元测试
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from src.storage.database import Database
+from src.storage.retention import (
+    archive_old_articles,
+    archive_path,
+    database_stats,
+    enable_incremental_vacuum,
+    get_archivable_months,
+    get_articles_with_archive,
+    incremental_vacuum,
+    list_archives,
+)
+
+
+TODAY = date.today()
+OLD_DATES = [date(2024, 1, 5), date(2024, 1, 20), date(2024, 2, 10)]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / 'live.db'))
+    for i, publish_date in enumerate(OLD_DATES + [TODAY, TODAY - timedelta(days=3)]):
+        database.insert_article(
+            title=f'文章{i}', url=f'https://a.com/{i}', source='中国IDC圈', source_tier=1,
+            publish_date=publish_date, content=f'正文{i}' * 100, category='投资,技术',
+        )
+    yield database
+    database.close()
+
+
+def _count(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class TestArchive:
+    """测试按月归档"""
+
+    def test_dry_run_only_counts(self, db, tmp_path):
+        archived = archive_old_articles(db, 365, str(tmp_path / 'archive'), dry_run=True)
+        assert archived == {'2024-01': 2, '2024-02': 1}
+        assert _count(db.conn, 'articles') == 5
+        assert list_archives(str(tmp_path / 'archive')) == []
+
+    def test_archive_moves_rows_by_month(self, db, tmp_path):
+        archive_dir = str(tmp_path / 'archive')
+        archived = archive_old_articles(db, 365, archive_dir)
+
+        assert archived == {'2024-01': 2, '2024-02': 1}
+        assert list_archives(archive_dir) == ['2024-01', '2024-02']
+        assert _count(db.conn, 'articles') == 2
+        assert _count(db.conn, 'article_content') == 2
+        assert _count(db.conn, 'article_categories') == 4
+        assert get_archivable_months(db, 365) == {}
+
+        with Database(str(archive_path(archive_dir, '2024-01'))) as archive:
+            titles = sorted(a['title'] for a in archive.get_all_articles())
+            assert titles == ['文章0', '文章1']
+            article_id = archive.get_all_articles()[0]['id']
+            assert archive.get_article_content(article_id).startswith('正文')
+            assert len(archive.get_articles_by_category('技术')) == 2
+            assert archive.get_sources()[0]['name'] == '中国IDC圈'
+
+    def test_archive_is_idempotent(self, db, tmp_path):
+        archive_dir = str(tmp_path / 'archive')
+        archive_old_articles(db, 365, archive_dir)
+        assert archive_old_articles(db, 365, archive_dir) == {}
+
+        # 归档后又写回同一URL的旧文章：再次归档不重复
+        db.insert_article(title='文章0', url='https://a.com/0', source='中国IDC圈',
+                          publish_date=OLD_DATES[0], content='正文')
+        assert archive_old_articles(db, 365, archive_dir) == {'2024-01': 1}
+        conn = sqlite3.connect(archive_path(archive_dir, '2024-01'))
+        assert _count(conn, 'articles') == 2
+        conn.close()
+
+    def test_history_query_spans_archives(self, db, tmp_path):
+        archive_dir = str(tmp_path / 'archive')
+        archive_old_articles(db, 365, archive_dir)
+
+        articles = get_articles_with_archive(db, date(2024, 1, 1), TODAY, archive_dir)
+        assert [a['archive'] for a in articles] == [None, None, '2024-02', '2024-01', '2024-01']
+        assert articles[-1]['publish_date'] == OLD_DATES[0]
+
+        january = get_articles_with_archive(db, date(2024, 1, 10), date(2024, 1, 31), archive_dir)
+        assert [a['title'] for a in january] == ['文章1']
+        # 查询完成后归档库已分离
+        assert 'arch' not in [row[1] for row in db.conn.execute("PRAGMA database_list")]
+
+
+class TestVacuum:
+    """测试空间回收"""
+
+    def test_new_database_uses_incremental_vacuum(self, db):
+        assert database_stats(db)['auto_vacuum'] == 'INCREMENTAL'
+
+    def test_incremental_vacuum_reclaims_pages(self, db, tmp_path):
+        db.insert_articles([
+            dict(title=f'旧文章{i}', url=f'https://b.com/{i}', source='源', publish_date=OLD_DATES[0],
+                 content=f'{i}号机房扩容' * 500)
+            for i in range(50)
+        ])
+        archive_old_articles(db, 365, str(tmp_path / 'archive'))
+        assert database_stats(db)['freelist_count'] > 0
+
+        assert incremental_vacuum(db) > 0
+        assert database_stats(db)['freelist_count'] == 0
+
+    def test_enable_incremental_on_legacy_database(self, tmp_path):
+        path = str(tmp_path / 'legacy.db')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE t (x)")
+        conn.commit()
+        conn.close()
+
+        with Database(path) as legacy:
+            assert database_stats(legacy)['auto_vacuum'] == 'NONE'
+            assert enable_incremental_vacuum(legacy) is True
+            assert database_stats(legacy)['auto_vacuum'] == 'INCREMENTAL'
+            assert enable_incremental_vacuum(legacy) is False
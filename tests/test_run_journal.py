@@ -0,0 +1,260 @@
+"""
+运行日志与续采单元测试
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.processing.article_processor import ArticleProcessor
+from src.processing.pipeline import CollectionPipeline
+from src.storage.database import Database
+from tests.test_pipeline import TITLES, archive, fake_analyzer, make_html, make_source  # noqa: F401
+
+
+LLM_RESULT = {
+    'relevance_score': 18, 'importance_score': 12, 'category_score': 8,
+    'total_score': 30, 'category': '投资', 'reason': '测试', 'summary': '摘要',
+}
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    yield database
+    database.close()
+
+
+def save_running(db, run_id, started_at):
+    db.save_run({'run_id': run_id, 'started_at': started_at}, status='running')
+
+
+class TestRunJournal:
+    """测试运行日志表"""
+
+    def test_resumable_run_only_when_running(self, db):
+        assert db.get_resumable_run() is None
+
+        save_running(db, 'run1', '2025-11-08T08:00:00')
+        assert db.get_resumable_run() == 'run1'
+
+        db.save_run({'run_id': 'run1', 'started_at': '2025-11-08T08:00:00'}, status='success')
+        assert db.get_resumable_run() is None
+
+    def test_only_latest_run_is_resumable(self, db):
+        save_running(db, 'run1', '2025-11-08T08:00:00')
+        db.save_run({'run_id': 'run2', 'started_at': '2025-11-09T08:00:00'}, status='success')
+        assert db.get_resumable_run() is None
+
+    def test_failed_run_is_resumable(self, db):
+        # 进程走完错误路径（没有源采集成功）时运行状态为failed，调度器的 --resume 重试应续采该运行
+        save_running(db, 'run1', '2025-11-08T08:00:00')
+        db.save_run({'run_id': 'run1', 'started_at': '2025-11-08T08:00:00'}, status='failed')
+        assert db.get_resumable_run() == 'run1'
+
+    def test_run_sources(self, db):
+        db.save_run_source('run1', {'source': '源A', 'status': 'success', 'stored': 3})
+        db.save_run_source('run1', {'source': '源A', 'status': 'success', 'stored': 5})
+        db.save_run_source('run2', {'source': '源B', 'status': 'success', 'stored': 1})
+
+        sources = db.get_run_sources('run1')
+        assert list(sources) == ['源A']
+        assert sources['源A']['stored'] == 5
+
+    def test_run_articles(self, db):
+        db.save_run_article('run1', 'https://example.com/1', LLM_RESULT, source='源A')
+        cached = db.get_run_articles('run1')
+
+        assert cached == {Database.generate_url_hash('https://example.com/1'): LLM_RESULT}
+        assert db.get_run_articles('run2') == {}
+
+
+class TestProcessorCache:
+    """测试续采时复用LLM分析结果"""
+
+    def test_cached_result_skips_llm(self):
+        analyzer = MagicMock()
+        url = 'https://example.com/1'
+        processor = ArticleProcessor(
+            llm_analyzer=analyzer,
+            llm_cache={Database.generate_url_hash(url): LLM_RESULT},
+        )
+        article = {'title': '某公司投资数据中心', 'url': url}
+
+        analysis = processor.analyze(article, processor.prefilter(article))
+
+        analyzer.analyze_article.assert_not_called()
+        assert analysis['outcome'] == 'llm_ok'
+        assert analysis['cached'] is True
+        assert analysis['journal'] is None
+
+    def test_fresh_result_is_journaled(self):
+        analyzer = MagicMock()
+        analyzer.analyze_article.return_value = LLM_RESULT
+        processor = ArticleProcessor(llm_analyzer=analyzer)
+        article = {'title': '某公司投资数据中心', 'url': 'https://example.com/1'}
+
+        analysis = processor.analyze(article, processor.prefilter(article))
+
+        assert analysis['journal'] == LLM_RESULT
+        assert analysis['cached'] is False
+
+    def test_default_result_not_journaled(self):
+        analyzer = MagicMock()
+        analyzer.analyze_article.return_value = dict(LLM_RESULT, is_default=True)
+        processor = ArticleProcessor(llm_analyzer=analyzer)
+        article = {'title': '某公司投资数据中心', 'url': 'https://example.com/1'}
+
+        assert processor.analyze(article, processor.prefilter(article))['journal'] is None
+
+
+class TestPipelineJournal:
+    """测试流水线写入运行日志并在续采时复用"""
+
+    def test_resume_reuses_llm_results(self, tmp_path, archive):
+        db_path = str(tmp_path / 'test.db')
+        Database(db_path).close()
+
+        CollectionPipeline(
+            db_path, ArticleProcessor(llm_analyzer=fake_analyzer()),
+            archive=archive, run_id='run1', replay=True, journal_run_id='r1',
+        ).run([make_source('源A')])
+
+        with Database(db_path) as db:
+            cached = db.get_run_articles('r1')
+        # 2篇入库 + 1篇LLM拒绝（负面关键词过滤的不调用LLM）
+        assert len(cached) == 3
+
+        # 模拟入库前中断：使用新数据库续采，LLM结果全部来自运行日志
+        resume_path = str(tmp_path / 'resume.db')
+        Database(resume_path).close()
+        analyzer = fake_analyzer()
+        results = CollectionPipeline(
+            resume_path, ArticleProcessor(llm_analyzer=analyzer, llm_cache=cached),
+            archive=archive, run_id='run1', replay=True,
+        ).run([make_source('源A')])
+
+        analyzer.analyze_article.assert_not_called()
+        assert results[0]['stored'] == 2
+        assert results[0]['llm_rejected'] == 1
+
+    def test_pipeline_journals_sources_as_they_finish(self, tmp_path, archive):
+        # 源B的标题带后缀，以便区分两个源的LLM调用
+        archive.save_page('run1', '源B', 'https://example.com/源B/',
+                          make_html('源B', [f'{t}（源B）' for t in TITLES]))
+        db_path = str(tmp_path / 'test.db')
+        Database(db_path).close()
+        sources = [make_source('源A'), make_source('源B')]
+
+        crash = threading.Event()
+        analyzer = fake_analyzer()
+        inner = analyzer.analyze_article.side_effect
+
+        def analyze(title, content):
+            if '源B' in title:
+                crash.wait(10)
+                raise KeyboardInterrupt  # 模拟进程在源B处理中途退出
+            return inner(title, content)
+
+        analyzer.analyze_article.side_effect = analyze
+        pipeline = CollectionPipeline(
+            db_path, ArticleProcessor(llm_analyzer=analyzer),
+            archive=archive, run_id='run1', replay=True, journal_run_id='r1',
+            llm_workers=4, batch_size=1,
+        )
+        errors = []
+        thread = threading.Thread(target=lambda: errors.extend(_run_catching(pipeline, sources)))
+        thread.start()
+
+        # 源A处理完即写入运行日志，不等流水线结束
+        with Database(db_path) as db:
+            deadline = time.monotonic() + 10
+            while '源A' not in db.get_run_sources('r1') and time.monotonic() < deadline:
+                time.sleep(0.01)
+            completed = db.get_run_sources('r1')
+        crash.set()
+        thread.join(10)
+
+        assert list(completed) == ['源A']
+        assert completed['源A']['stored'] == 2
+        assert isinstance(errors[0], KeyboardInterrupt)
+        with Database(db_path) as db:
+            completed = db.get_run_sources('r1')
+        assert list(completed) == ['源A']
+
+        # 续采：跳过已完成的源，只重新处理源B
+        analyzer = fake_analyzer()
+        remaining = [s for s in sources if s['name'] not in completed]
+        results = CollectionPipeline(
+            db_path, ArticleProcessor(llm_analyzer=analyzer),
+            archive=archive, run_id='run1', replay=True, journal_run_id='r1',
+        ).run(remaining)
+
+        assert [s['source'] for s in results] == ['源B']
+        assert results[0]['stored'] == 2
+        assert all('源B' in call.kwargs['title'] for call in analyzer.analyze_article.call_args_list)
+        with Database(db_path) as db:
+            assert set(db.get_run_sources('r1')) == {'源A', '源B'}
+
+    def test_failed_fetch_is_not_journaled(self, tmp_path):
+        db_path = str(tmp_path / 'test.db')
+        Database(db_path).close()
+        sources = [make_source('源A'), make_source('源B')]
+        fetched = []
+
+        def fake_playwright():
+            # 第一次打开源B的列表页时超时
+            playwright = MagicMock()
+            browser = playwright.__enter__.return_value.chromium.launch.return_value
+            page = browser.new_page.return_value
+            opened = []
+
+            def goto(url, **kwargs):
+                name = url.rstrip('/').rsplit('/', 1)[-1]
+                fetched.append(name)
+                if name == '源B' and fetched.count('源B') == 1:
+                    raise TimeoutError('页面加载超时')
+                opened.append(name)
+
+            page.goto.side_effect = goto
+            page.content.side_effect = lambda: make_html(opened[-1], TITLES)
+            return playwright
+
+        with patch('src.scrapers.generic_scraper.sync_playwright', side_effect=fake_playwright):
+            results = CollectionPipeline(
+                db_path, ArticleProcessor(llm_analyzer=fake_analyzer()), journal_run_id='r1',
+            ).run(sources)
+            assert [s['status'] for s in results] == ['success', 'failed']
+            with Database(db_path) as db:
+                completed = db.get_run_sources('r1')
+            # 抓取失败的源不算完成，续采时重新抓取
+            assert list(completed) == ['源A']
+
+            remaining = [s for s in sources if s['name'] not in completed]
+            results = CollectionPipeline(
+                db_path, ArticleProcessor(llm_analyzer=fake_analyzer()), journal_run_id='r1',
+            ).run(remaining)
+
+        assert fetched.count('源B') == 2 and fetched.count('源A') == 1
+        assert results[0]['status'] == 'success' and results[0]['stored'] == 2
+        with Database(db_path) as db:
+            assert set(db.get_run_sources('r1')) == {'源A', '源B'}
+
+    def test_serial_failed_fetch_marks_source_failed(self, db):
+        from run_collection import collect_from_source
+
+        with patch('src.scrapers.generic_scraper.sync_playwright') as playwright:
+            playwright.return_value.__enter__.return_value.chromium.launch.side_effect = TimeoutError('页面加载超时')
+            stats = collect_from_source(make_source('源A'), db, limit=10)
+
+        assert stats['status'] == 'failed'
+        assert '超时' in stats['error']
+
+
+def _run_catching(pipeline, sources):
+    try:
+        pipeline.run(sources)
+    except BaseException as e:
+        return [e]
+    return []
@@ -0,0 +1,197 @@
+"""
+配置驱动评分引擎单元测试
+"""
+
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from src.processing.article_processor import ArticleProcessor
+from src.scoring.priority_scorer import PriorityScorer
+from src.scoring.scoring_engine import (
+    DEFAULT_SCORING_PATH, ScoringEngine, default_config, load_scorer,
+)
+
+
+ARTICLES = [
+    ('阿里云投资100亿元建设智算中心', '新建3万机柜，PUE降至1.15，采用液冷技术', 0, 1),
+    ('某地发布数据中心行业标准', '涉及服务器、存储和网络', 2, 2),
+    ('GPU芯片供应紧张', '', 5, 3),
+    ('某白酒品牌发布新品', '', 1, 2),
+    ('', None, 10, 9),
+]
+
+
+def _articles():
+    return [
+        {'title': title, 'content': content, 'publish_date': date.today() - timedelta(days=days),
+         'source_tier': tier}
+        for title, content, days, tier in ARTICLES
+    ]
+
+
+def _write(path, config):
+    path.write_text(json.dumps(config, ensure_ascii=False), encoding='utf-8')
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / 'scoring.json'
+    _write(path, default_config())
+    return path
+
+
+class TestDefaults:
+    """测试默认配置与内置规则一致"""
+
+    def test_config_file_matches_builtin_rules(self):
+        with open(DEFAULT_SCORING_PATH, encoding='utf-8') as f:
+            config = json.load(f)
+        config.pop('version')
+        config.pop('description')
+        assert config == default_config()
+
+    def test_same_scores_as_priority_scorer(self):
+        legacy = PriorityScorer()
+        engine = ScoringEngine({})
+        for article in _articles():
+            expected = legacy.calculate_total_score(
+                article['title'], article['content'], article['publish_date'], article['source_tier']
+            )
+            assert engine.calculate_total_score(
+                article['title'], article['content'], article['publish_date'], article['source_tier']
+            ) == expected
+
+    def test_load_scorer_without_file(self, tmp_path):
+        scorer = load_scorer(str(tmp_path / 'missing.json'))
+        assert type(scorer) is PriorityScorer
+
+
+class TestConfiguredRules:
+    """测试配置项生效"""
+
+    def test_keyword_weights_and_cap(self):
+        engine = ScoringEngine({'relevance': {'max': 12, 'groups': [
+            {'name': 'core', 'weight': 7, 'keywords': ['液冷', '储能']},
+        ]}})
+        assert engine.calculate_relevance_score('液冷', '') == 7
+        assert engine.calculate_relevance_score('液冷储能', '') == 12
+        assert engine.calculate_relevance_score('数据中心', '') == 0
+
+    def test_duplicate_keyword_takes_highest_weight(self):
+        engine = ScoringEngine({'relevance': {'max': 40, 'groups': [
+            {'name': 'a', 'weight': 2, 'keywords': ['液冷']},
+            {'name': 'b', 'weight': 5, 'keywords': ['液冷']},
+        ]}})
+        assert engine.calculate_relevance_score('液冷', '') == 5
+
+    def test_priority_thresholds(self):
+        engine = ScoringEngine({'priority': {'high': 50, 'medium': 20}})
+        assert engine.map_priority_level(50) == '高'
+        assert engine.map_priority_level(20) == '中'
+        assert engine.map_priority_level(19) == '低'
+
+    def test_impact_thresholds_and_keywords(self):
+        engine = ScoringEngine({'impact': {
+            'max': 30,
+            'funding': [{'min': 50, 'score': 30}, {'min': 0, 'score': 1}],
+            'industry_impact': {'签约': 12},
+        }})
+        assert engine.calculate_impact_score('投资100亿元', '') == 30
+        assert engine.calculate_impact_score('投资1亿元', '') == 1
+        assert engine.calculate_impact_score('项目签约', '') == 12
+        # 未配置的项使用默认值
+        assert engine.calculate_impact_score('建设3万机柜', '') == 20
+
+    def test_timeliness_and_tiers(self):
+        engine = ScoringEngine({
+            'timeliness': {'max': 30, 'decay_days': 3},
+            'credibility': {'tiers': {'1': 20}, 'default': 1},
+        })
+        today = date.today()
+        assert engine.calculate_timeliness_score(today) == 30
+        assert engine.calculate_timeliness_score(today - timedelta(days=1)) == 20
+        assert engine.calculate_timeliness_score(today - timedelta(days=3)) == 0
+        assert engine.calculate_credibility_score(1) == 20
+        assert engine.calculate_credibility_score(2) == 8     # 未配置的等级沿用默认值
+        assert engine.calculate_credibility_score(4) == 1
+
+    def test_llm_weight_blends_llm_score(self):
+        article = ('某白酒品牌发布新品', '', date.today() - timedelta(days=10), 3)
+        rule_only = ScoringEngine({}).calculate_total_score(*article, llm_total_score=40)
+        blended = ScoringEngine({'llm': {'weight': 0.5}}).calculate_total_score(*article, llm_total_score=40)
+        assert rule_only['total_score'] == 13
+        assert blended['total_score'] == round(13 * 0.5 + 80 * 0.5)
+        assert blended['relevance_score'] == rule_only['relevance_score']
+
+    @pytest.mark.parametrize('override', [
+        {'timeliness': {'decay_days': 0}},
+        {'priority': {'high': 30, 'medium': 60}},
+        {'llm': {'weight': 1.5}},
+    ])
+    def test_invalid_config_rejected(self, override):
+        with pytest.raises(ValueError):
+            ScoringEngine(override)
+
+
+class TestBatchAndReload:
+    """测试批量评分与热加载"""
+
+    def test_score_many_matches_single(self):
+        engine = ScoringEngine({})
+        articles = _articles()
+        assert engine.score_many(articles) == [
+            engine.calculate_total_score(a['title'], a['content'], a['publish_date'], a['source_tier'])
+            for a in articles
+        ]
+
+    def test_score_many_accepts_tier_key(self):
+        engine = ScoringEngine({})
+        result = engine.score_many([{'title': '', 'tier': 1}])
+        assert result[0]['credibility_score'] == 15
+
+    def test_reload_when_file_changes(self, config_path):
+        engine = ScoringEngine.from_file(str(config_path), reload_interval=0)
+        assert engine.map_priority_level(60) == '中'
+
+        config = default_config()
+        config['priority'] = {'high': 60, 'medium': 30}
+        _write(config_path, config)
+        stat = config_path.stat()
+        os.utime(config_path, (stat.st_atime, stat.st_mtime + 10))
+
+        result = engine.score_many([{'title': '数据中心GPU智算中心IDC', 'publish_date': date.today(),
+                                     'source_tier': 1}])
+        assert engine.compiled.high == 60
+        assert result[0]['priority'] == engine.map_priority_level(result[0]['total_score'])
+
+    def test_reload_respects_interval(self, config_path):
+        engine = ScoringEngine.from_file(str(config_path), reload_interval=3600)
+        config = default_config()
+        config['priority'] = {'high': 60, 'medium': 30}
+        _write(config_path, config)
+        stat = config_path.stat()
+        os.utime(config_path, (stat.st_atime, stat.st_mtime + 10))
+        assert engine.reload_if_changed() is False
+        assert engine.compiled.high == 70
+
+    def test_broken_file_keeps_previous_config(self, config_path):
+        engine = ScoringEngine.from_file(str(config_path), reload_interval=0)
+        config_path.write_text('{"priority": ', encoding='utf-8')
+        assert engine.reload() is False
+        assert engine.compiled.high == 70
+
+    def test_engine_works_in_processor(self):
+        processor = ArticleProcessor(scorer=ScoringEngine({}))
+        analysis = {
+            'summary': '摘要', 'category': '投资',
+            'llm_result': {'relevance_score': 18, 'importance_score': 12, 'category_score': 8,
+                           'total_score': 30, 'category': '投资', 'reason': ''},
+        }
+        article = {'title': '投资50亿元建设数据中心', 'url': 'https://a.com/1', 'content': '',
+                   'publish_date': date.today()}
+        record = processor.build_record(article, {'name': 'DCD', 'tier': 1}, analysis)
+        assert record['score'] == 10 + 25 + 20 + 15
+        assert record['facts'][0]['value'] == 50.0
@@ -0,0 +1,142 @@
+"""
+分词式关键词匹配单元测试
+"""
+
+from datetime import date
+
+import pytest
+
+import src.processing.segmenter as segmenter_module
+from src.classification.category_classifier import CategoryClassifier
+from src.processing.segmenter import Segmenter, check_match_mode, get_segmenter
+from src.scoring.priority_scorer import PriorityScorer
+from src.scoring.scoring_engine import ScoringEngine
+
+
+KEYWORDS = ['上线', '标准', '机柜', 'PE', 'PUE', 'GPU', '云服务', '服务器', 'AI算力', '算力', '办法']
+
+
+@pytest.fixture
+def segmenter():
+    seg = Segmenter(words_path=None, backend='trie')
+    seg.add_keywords(KEYWORDS)
+    return seg
+
+
+class TestSegmenter:
+    """测试最大匹配分词与关键词统计"""
+
+    @pytest.mark.parametrize('text, expected', [
+        ('推动线上线下融合', {}),
+        ('新平台正式上线', {'上线': 1}),
+        ('规划5000个标准机柜', {'机柜': 1}),
+        ('没办法', {}),
+        ('数据安全管理办法', {'办法': 1}),
+    ])
+    def test_dictionary_words(self, segmenter, text, expected):
+        assert segmenter.keyword_counts(text) == expected
+
+    @pytest.mark.parametrize('text, expected', [
+        ('OPEN平台', {}),
+        ('PE基金入股', {'PE': 1}),
+        ('设计PUE1.2', {'PUE': 1}),
+        ('H100GPU集群', {'GPU': 1}),
+        ('gpu与pue', {'GPU': 1, 'PUE': 1}),
+        ('GPUs', {}),
+    ])
+    def test_ascii_word_boundaries(self, segmenter, text, expected):
+        assert segmenter.keyword_counts(text) == expected
+
+    def test_contained_and_overlapping_keywords(self, segmenter):
+        assert segmenter.keyword_counts('AI算力与算力网') == {'AI算力': 1, '算力': 2}
+        assert segmenter.tokens('阿里云服务器') == ['云服务器']
+        assert segmenter.keyword_counts('阿里云服务器') == {'云服务': 1, '服务器': 1}
+
+    def test_keywords_in_does_not_join_segments(self, segmenter):
+        assert segmenter.keywords_in('发布新品', '上线') == frozenset({'上线'})
+        assert segmenter.keywords_in('线', '上') == frozenset()
+
+    def test_words_file(self, tmp_path):
+        path = tmp_path / 'words.txt'
+        path.write_text('# 注释\n算力券 算力\n云服务商\n', encoding='utf-8')
+        seg = Segmenter(words_path=str(path), backend='trie')
+        seg.add_keywords(['算力', '云服务'])
+        assert seg.keyword_counts('发放算力券') == {}
+        assert seg.keyword_counts('云服务商') == {'云服务': 1}
+
+    def test_add_keywords_recompiles_and_clears_cache(self, segmenter):
+        assert segmenter.keyword_counts('液冷机柜') == {'机柜': 1}
+        segmenter.add_keywords(['液冷'])
+        assert segmenter.keyword_counts('液冷机柜') == {'液冷': 1, '机柜': 1}
+
+    def test_short_texts_cached(self, segmenter):
+        segmenter.keyword_counts('新平台正式上线')
+        segmenter.keyword_counts('新平台正式上线')
+        assert segmenter.cache_info()['hits'] == 1
+
+    def test_jieba_backend_falls_back_without_jieba(self, monkeypatch):
+        monkeypatch.setattr(segmenter_module, 'jieba', None)
+        assert Segmenter(backend='jieba').backend == 'trie'
+
+    def test_shared_segmenter(self):
+        assert get_segmenter() is get_segmenter()
+
+
+class TestMatchMode:
+    """测试评分器和分类器的分词匹配模式"""
+
+    def test_mode_validation(self, monkeypatch):
+        with pytest.raises(ValueError):
+            check_match_mode('fuzzy')
+        monkeypatch.setenv('KEYWORD_MATCH_MODE', 'segment')
+        assert PriorityScorer().match_mode == 'segment'
+        monkeypatch.setenv('KEYWORD_MATCH_MODE', 'unknown')
+        assert CategoryClassifier().match_mode == 'substring'
+
+    def test_scorer_precision(self):
+        substring = PriorityScorer(match_mode='substring')
+        segment = PriorityScorer(match_mode='segment')
+        # "标准机柜"不是行业标准；规模只有300个机柜时影响分只来自机柜数
+        assert substring.calculate_impact_score('新建300个机柜，均为标准机柜', '') == 20
+        assert segment.calculate_impact_score('新建300个机柜，均为标准机柜', '') == 10
+        assert segment.calculate_impact_score('发布数据中心国家标准', '') == 20
+        assert substring.calculate_relevance_score('OPENIDC大会', '') == 10
+        assert segment.calculate_relevance_score('OPENIDC大会', '') == 0
+
+    def test_engine_same_scores_without_ambiguous_words(self):
+        substring = ScoringEngine({}, match_mode='substring')
+        segment = ScoringEngine({}, match_mode='segment')
+        articles = [
+            {'title': '阿里云投资100亿元建设智算中心', 'content': '新建3万机柜，PUE降至1.15，采用液冷技术',
+             'publish_date': date.today(), 'source_tier': 1},
+            {'title': 'GPU芯片供应紧张', 'content': '云计算厂商扩容服务器', 'source_tier': 2},
+            {'title': '', 'content': None},
+        ]
+        assert segment.score_many(articles) == substring.score_many(articles)
+
+    def test_engine_registers_reloaded_keywords(self, tmp_path):
+        path = tmp_path / 'scoring.json'
+        path.write_text('{}', encoding='utf-8')
+        engine = ScoringEngine.from_file(str(path), reload_interval=0, match_mode='segment')
+        assert engine.calculate_relevance_score('部署储能电站', '') == 0
+        path.write_text('{"relevance": {"groups": [{"name": "core", "weight": 10, "keywords": ["储能"]}]}}',
+                        encoding='utf-8')
+        assert engine.reload() is True
+        assert engine.calculate_relevance_score('部署储能电站', '') == 10
+
+    def test_classifier_precision(self):
+        substring = CategoryClassifier(match_mode='substring')
+        segment = CategoryClassifier(match_mode='segment')
+        title, content = '推动线上线下融合', 'OPEN生态大会召开'
+        assert substring.classify(title, content) == ['投资', '技术']
+        assert segment.classify(title, content) == ['其他']
+        assert segment.classify_many([{'title': title, 'content': content}]) == [{}]
+
+    def test_classify_many_same_scores_without_ambiguous_words(self):
+        substring = CategoryClassifier(match_mode='substring')
+        segment = CategoryClassifier(match_mode='segment')
+        articles = [
+            {'title': '某公司完成10亿元融资', 'content': '本轮融资用于GPU集群研发，市场需求增长'},
+            {'title': '工信部印发算力基础设施行动计划', 'summary': '推进东数西算'},
+        ]
+        assert segment.classify_many(articles) == substring.classify_many(articles)
@@ -0,0 +1,70 @@
+"""
+LLM桩服务与压测工具测试
+"""
+
+from benchmarks.llm_load_test import percentile, run_load_test, WORKLOADS
+from benchmarks.stub_llm_server import StubLLMServer
+from src.processing.llm_analyzer import LLMArticleAnalyzer
+from src.reporting.report_summarizer import WeeklyReportSummarizer
+
+
+class TestStubLLMServer:
+    """测试桩服务与真实客户端的兼容性"""
+
+    def test_analyzer_gets_deterministic_result(self):
+        with StubLLMServer() as server:
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub')
+            r1 = analyzer.analyze_article('某公司投资50亿建设数据中心', '内容')
+            r2 = analyzer.analyze_article('某公司投资50亿建设数据中心', '内容')
+
+        assert r1 == r2
+        assert r1['reason'] == '桩服务确定性评分'
+        assert 0 <= r1['relevance_score'] <= 20
+
+    def test_summarizer_gets_insights(self):
+        with StubLLMServer() as server:
+            summarizer = WeeklyReportSummarizer(api_key='key', api_base=server.url, model='stub')
+            articles = [{'title': '液冷技术突破', 'priority': '高', 'score': 80, 'category': '技术'}]
+            insights = summarizer.generate_insights(articles, {'技术': articles})
+
+        assert insights['executive_summary'].startswith('本周IDC行业')
+        assert '技术进展' in insights['section_insights']
+
+    def test_rate_limit_injection(self):
+        with StubLLMServer(rate_limit_rate=1.0) as server:
+            analyzer = LLMArticleAnalyzer('key', server.url, 'stub')
+            result = analyzer.analyze_article('标题', '内容')
+            stats = server.config.stats()
+
+        # 429时分析器降级为默认评分
+        assert result['total_score'] == 20
+        assert stats == {'requests': 1, 'errors': 0, 'rate_limited': 1, 'connections': 1}
+
+    def test_seeded_fault_injection_is_reproducible(self):
+        def outcomes(seed):
+            with StubLLMServer(error_rate=0.3, rate_limit_rate=0.3, seed=seed) as server:
+                return [server.config.next_outcome()[1] for _ in range(20)]
+
+        assert outcomes(1) == outcomes(1)
+
+
+class TestLoadTest:
+    """测试压测工具"""
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0
+
+    def test_run_load_test_counts_outcomes(self):
+        with StubLLMServer(error_rate=0.5, seed=3) as server:
+            corpus = [{'title': f'标题{i}', 'content': '内容', 'category': '技术'} for i in range(5)]
+            call = WORKLOADS['analyzer'](server.url, 'stub', 5, corpus)
+            result = run_load_test(call, total_requests=20, concurrency=4)
+            server_errors = server.config.stats()['errors']
+
+        assert result['requests'] == 20
+        assert result['ok'] + result['outcomes'].get('http_500', 0) == 20
+        assert result['outcomes'].get('http_500', 0) == server_errors
+        assert result['p50_ms'] <= result['p99_ms']
@@ -0,0 +1,174 @@
+"""
+按日汇总表与周报趋势分析单元测试
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from src.reporting.report_generator import WeeklyReportGenerator
+from src.reporting.trend_analyzer import WeeklyTrendAnalyzer
+from src.storage.database import Database
+from src.storage.retention import archive_old_articles
+
+
+TODAY = date(2025, 11, 14)
+
+
+def _insert(db, i, days_ago, title='数据中心动态', source='中国IDC圈', category='投资', score=50, **kwargs):
+    return db.insert_article(
+        title=title, url=f'https://a.com/{i}', source=source, source_tier=1,
+        publish_date=TODAY - timedelta(days=days_ago), content='正文', category=category,
+        priority='中', score=score, **kwargs,
+    )
+
+
+def _aggregate_rows(db):
+    return db.conn.execute("SELECT COUNT(*) FROM daily_aggregates").fetchone()[0]
+
+
+@pytest.fixture
+def db():
+    database = Database(':memory:')
+    # 本周（0-6天前）
+    _insert(database, 1, 0, title='液冷数据中心完成融资', score=80, llm_total_score=40, llm_relevance_score=20)
+    _insert(database, 2, 1, title='液冷机柜发布', source='DCD', category='技术', score=60)
+    _insert(database, 3, 2, title='算力政策发布', category='政策,技术', score=70)
+    # 上周（7-13天前）
+    _insert(database, 4, 8, title='液冷方案', source='DCD', category='技术', score=40)
+    _insert(database, 5, 9, title='市场报告', category='市场', score=30)
+    yield database
+    database.close()
+
+
+class TestDailyAggregates:
+    """测试触发器维护按日汇总表"""
+
+    def test_insert_counts(self, db):
+        total = db.get_daily_aggregates(TODAY - timedelta(days=6), TODAY)[0]
+        assert total['article_count'] == 3
+        assert total['score_sum'] == 210
+        assert total['avg_score'] == 70.0
+        assert total['llm_count'] == 1
+        assert total['avg_llm_total'] == 40.0
+
+    def test_group_by_source(self, db):
+        rows = db.get_daily_aggregates(TODAY - timedelta(days=13), TODAY, group_by='source')
+        assert {row['source']: row['article_count'] for row in rows} == {'中国IDC圈': 3, 'DCD': 2}
+
+    def test_rejects_unknown_dimension(self, db):
+        with pytest.raises(ValueError):
+            db.get_daily_aggregates(TODAY, TODAY, group_by='title')
+
+    def test_score_update_moves_article(self, db):
+        article_id = _insert(db, 6, 0, category='投资', score=10)
+        db.update_article_scores(article_id, '市场', '高', 90, 30, 30, 20, 10)
+
+        rows = db.get_daily_aggregates(TODAY, TODAY, group_by='category')
+        by_category = {row['category']: row for row in rows}
+        assert by_category['投资']['article_count'] == 1
+        assert by_category['投资']['score_sum'] == 80
+        assert by_category['市场']['score_sum'] == 90
+
+    def test_delete_removes_empty_rows(self, db):
+        db.clear_all_articles()
+        assert _aggregate_rows(db) == 0
+
+    def test_matches_rebuild(self, db):
+        article_id = _insert(db, 7, 3, score=55)
+        db.update_article_scores(article_id, '技术', '低', 20, 5, 5, 5, 5)
+        before = [tuple(row) for row in db.conn.execute("SELECT * FROM daily_aggregates ORDER BY 1, 2, 3, 4")]
+        db.rebuild_daily_aggregates()
+        after = [tuple(row) for row in db.conn.execute("SELECT * FROM daily_aggregates ORDER BY 1, 2, 3, 4")]
+        assert before == after
+
+    def test_archive_moves_aggregates(self, tmp_path):
+        with Database(str(tmp_path / 'live.db')) as db:
+            db.insert_article(title='旧文章', url='https://a.com/old', source='DCD', source_tier=1,
+                              publish_date=date(2024, 1, 5), content='正文', score=40)
+            db.insert_article(title='新文章', url='https://a.com/new', source='DCD', source_tier=1,
+                              publish_date=date.today(), content='正文', score=60)
+            archive_old_articles(db, 365, str(tmp_path / 'archive'))
+            assert db.get_daily_aggregates(date(2024, 1, 1), date(2024, 1, 31)) == []
+            assert db.get_daily_aggregates(date.today(), date.today())[0]['article_count'] == 1
+
+        with Database(str(tmp_path / 'archive' / 'articles_2024-01.db')) as archive:
+            assert archive.get_daily_aggregates(date(2024, 1, 1), date(2024, 1, 31))[0]['article_count'] == 1
+
+
+class TestWeeklyTrendAnalyzer:
+    """测试周环比趋势"""
+
+    def test_windows(self):
+        (cur_start, cur_end), (prev_start, prev_end) = WeeklyTrendAnalyzer.windows(7, TODAY)
+        assert (cur_start, cur_end) == (TODAY - timedelta(days=6), TODAY)
+        assert (prev_start, prev_end) == (TODAY - timedelta(days=13), TODAY - timedelta(days=7))
+
+    def test_compare(self, db):
+        trends = WeeklyTrendAnalyzer(db).compare(7, TODAY)
+        assert trends['current']['article_count'] == 3
+        assert trends['previous']['article_count'] == 2
+        assert trends['previous']['avg_score'] == 35.0
+
+        categories = {c['name']: c for c in trends['categories']}
+        # 多分类文章计入每个分类
+        assert categories['技术'] == {'name': '技术', 'current': 2, 'previous': 1, 'delta': 1}
+        assert categories['市场']['delta'] == -1
+
+        sources = {s['name']: s['delta'] for s in trends['sources']}
+        assert sources == {'中国IDC圈': 1, 'DCD': 0}
+
+    def test_compare_empty_database(self):
+        with Database(':memory:') as empty:
+            trends = WeeklyTrendAnalyzer(empty).compare(7, TODAY)
+        assert trends['current']['article_count'] == 0
+        assert trends['categories'] == []
+
+    def test_weekly_series(self, db):
+        series = WeeklyTrendAnalyzer(db).weekly_series(weeks=3, days=7, end_date=TODAY)
+        assert [week['article_count'] for week in series] == [0, 2, 3]
+        assert series[-1]['end'] == TODAY
+        assert series[-1]['avg_score'] == 70.0
+        assert series[0]['avg_score'] is None
+
+    def test_rising_keywords(self, db):
+        analyzer = WeeklyTrendAnalyzer(db, keywords=['液冷', '融资', '市场'])
+        rising = analyzer.rising_keywords(7, TODAY, min_count=1)
+        assert rising[0] == {'keyword': '液冷', 'current': 2, 'previous': 1, 'delta': 1}
+        assert [k['keyword'] for k in rising] == ['液冷', '融资']
+
+        assert analyzer.rising_keywords(7, TODAY, min_count=2) == [rising[0]]
+
+
+class TestTrendSection:
+    """测试周报趋势章节"""
+
+    def test_section_in_report(self, monkeypatch):
+        monkeypatch.setenv('WEEKLY_TREND_ENABLED', 'true')
+        with Database(':memory:') as db:
+            today = date.today()
+            for i in range(3):
+                db.insert_article(title=f'液冷项目{i}', url=f'https://a.com/{i}', source='DCD', source_tier=1,
+                                  publish_date=today - timedelta(days=i), content='正文', category='技术',
+                                  priority='高', score=70, summary='摘要')
+            db.insert_article(title='液冷方案', url='https://a.com/old', source='DCD', source_tier=1,
+                              publish_date=today - timedelta(days=9), content='正文', category='技术',
+                              priority='高', score=50, summary='摘要')
+
+            report = WeeklyReportGenerator(database=db, enable_llm_summary=False).generate_report()
+
+        assert '## 📈 趋势对比' in report
+        assert '本周 3 篇，上周 1 篇（↑200.0%）' in report
+        assert '技术 3篇（+2）' in report
+        assert '液冷（1→3）' in report
+        assert report.index('趋势对比') < report.index('本周统计')
+
+    def test_section_disabled(self, monkeypatch):
+        monkeypatch.setenv('WEEKLY_TREND_ENABLED', 'false')
+        with Database(':memory:') as db:
+            db.insert_article(title='液冷项目', url='https://a.com/1', source='DCD', source_tier=1,
+                              publish_date=date.today(), content='正文', category='技术',
+                              priority='高', score=70, summary='摘要')
+            report = WeeklyReportGenerator(database=db, enable_llm_summary=False).generate_report()
+        assert '本周统计' in report
+        assert '趋势对比' not in report
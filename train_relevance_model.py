@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+IDC行业竞争情报系统 - 本地相关性模型训练脚本
+
+使用历次采集中LLM的相关性判定（relevance_labels表 + articles表）训练本地模型，
+并在留出集上选择路由阈值、输出校准报告。训练后的模型由 run_collection.py 自动加载。
+
+使用方法:
+    python3 train_relevance_model.py                      # 训练并保存到默认路径
+    python3 train_relevance_model.py --max-error 0.01     # 更严格的误判率
+    python3 train_relevance_model.py --dry-run            # 只输出校准报告，不保存
+"""
+
+import argparse
+import sys
+
+from src.storage.database import Database
+from src.classification.relevance_model import (
+    DEFAULT_MODEL_PATH,
+    RELEVANCE_THRESHOLD,
+    format_calibration_report,
+    label_from_score,
+    train_from_records,
+)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='训练本地相关性模型')
+    parser.add_argument('--db', type=str, default='data/intelligence.db',
+                        help='数据库文件路径')
+    parser.add_argument('--output', type=str, default=DEFAULT_MODEL_PATH,
+                        help=f'模型输出路径（默认: {DEFAULT_MODEL_PATH}）')
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help='留出集比例（默认0.2）')
+    parser.add_argument('--max-error', type=float, default=0.02,
+                        help='直接拒绝/接受区间允许的误判率（默认0.02）')
+    parser.add_argument('--min-samples', type=int, default=100,
+                        help='最少训练样本数（默认100）')
+    parser.add_argument('--epochs', type=int, default=8,
+                        help='训练轮数（默认8）')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='只输出校准报告，不保存模型')
+    args = parser.parse_args()
+
+    with Database(args.db) as db:
+        records = db.get_relevance_training_data()
+
+    positives = sum(label_from_score(r['relevance_score']) for r in records)
+    negatives = len(records) - positives
+    print(f"训练数据: {len(records)} 条（相关 {positives}，不相关 {negatives}，"
+          f"阈值 relevance_score ≥ {RELEVANCE_THRESHOLD}）")
+
+    if len(records) < args.min_samples or not positives or not negatives:
+        print(f"✗ 样本不足：至少需要 {args.min_samples} 条且同时包含相关/不相关样本")
+        print("  先用LLM正常采集若干轮，relevance_labels表会记录每次判定（含拒绝）")
+        sys.exit(1)
+
+    model, report = train_from_records(
+        records, holdout=args.holdout, max_error=args.max_error, epochs=args.epochs
+    )
+
+    print(f"\n留出集校准报告（{report['n']} 条）:")
+    print(format_calibration_report(report))
+
+    if args.dry_run:
+        print("\n(dry-run，未保存模型)")
+        return
+
+    path = model.save(args.output)
+    print(f"\n✓ 模型已保存: {path}")
+
+
+if __name__ == '__main__':
+    main()